@@ -0,0 +1,67 @@
+"""Cached settings read on every page: feature toggles, instance settings,
+terminology and the organization profile.
+
+Entries are versioned per group (konote/cache.py), invalidated by the
+post_save/post_delete signals in signals.py, and kept for
+SETTINGS_CACHE_TIMEOUT.
+"""
+from konote.cache import bump_version, get_or_set_versioned
+
+FEATURE_TOGGLES = "feature_toggles"
+INSTANCE_SETTINGS = "instance_settings"
+TERMINOLOGY = "terminology"
+ORGANIZATION_PROFILE = "organization_profile"
+
+ALL_GROUPS = (FEATURE_TOGGLES, INSTANCE_SETTINGS, TERMINOLOGY, ORGANIZATION_PROFILE)
+
+
+def _load_feature_flags():
+    from .models import FeatureToggle
+    from .views import DEFAULT_FEATURES, FEATURES_DEFAULT_ENABLED
+
+    # Start with defaults, then override with whatever is in the database
+    flags = {key: key in FEATURES_DEFAULT_ENABLED for key in DEFAULT_FEATURES}
+    flags.update(FeatureToggle.get_all_flags())
+    return flags
+
+
+def feature_flags():
+    """Feature key → enabled, with defaults for features not in the database."""
+    return get_or_set_versioned(FEATURE_TOGGLES, "", _load_feature_flags)
+
+
+def instance_settings():
+    """Dict of all InstanceSetting values. Do not mutate — copy first."""
+    from .models import InstanceSetting
+
+    return get_or_set_versioned(INSTANCE_SETTINGS, "", InstanceSetting.get_all)
+
+
+def terminology(lang_prefix="en"):
+    """Merged default and overridden terms for "en" or "fr"."""
+    from .models import TerminologyOverride
+
+    return get_or_set_versioned(
+        TERMINOLOGY, lang_prefix,
+        lambda: TerminologyOverride.get_all_terms(lang=lang_prefix),
+    )
+
+
+def _load_organization_profile():
+    from .models import OrganizationProfile
+
+    org = OrganizationProfile.get_solo()
+    return {
+        "operating_name": org.operating_name,
+        "website": org.website,
+    }
+
+
+def organization_profile():
+    """Organization name and website for templates."""
+    return get_or_set_versioned(ORGANIZATION_PROFILE, "", _load_organization_profile)
+
+
+def invalidate(*groups):
+    """Invalidate the given groups (all of them if none given)."""
+    bump_version(*(groups or ALL_GROUPS))
@@ -32,6 +32,7 @@ from django.db import transaction
 from django.utils import timezone
 
 from apps.admin_settings.models import FeatureToggle
+from apps.clients.activity import refresh_activity
 from apps.clients.models import ClientFile, ClientProgramEnrolment
 from apps.events.models import Alert, Event, EventType
 from apps.notes.models import (
@@ -87,6 +88,78 @@ class SeedAssignment:
     age: int | None = None
 
 
+class BulkSeedBuffer:
+    """Unsaved demo rows waiting to be written with bulk_create.
+
+    Rows are kept per model in the order each model was first added. The
+    engine always builds a parent (plan section, note) before its children
+    (targets, metric values), so flushing in that order assigns parent
+    primary keys before the children that point at them are inserted.
+
+    bulk_create skips save() and post_save, so flush() re-applies what those
+    would have done for demo rows: PlanTarget goal source and CIDS outcome
+    URIs, backdated created_at values, and Outcome Insights cache
+    invalidation. Achievement statuses are recomputed once by the engine
+    after the last flush.
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self):
+        self.pending = {}
+        self.created_at = {}
+
+    def __len__(self):
+        return sum(len(rows) for rows in self.pending.values())
+
+    def add(self, obj, created_at=None):
+        self.pending.setdefault(type(obj), []).append(obj)
+        if created_at is not None:
+            self.created_at[id(obj)] = created_at
+        return obj
+
+    def flush(self):
+        """Insert everything pending, in dependency order. Returns rows written."""
+        from apps.plans.cids import apply_target_cids_defaults
+        from apps.reports.insights_cache import bump_for_client
+
+        if not self.pending:
+            return 0
+
+        for target in self.pending.get(PlanTarget, []):
+            target.classify_goal_source()
+
+        written = 0
+        with transaction.atomic():
+            for model, rows in self.pending.items():
+                model.objects.bulk_create(rows, batch_size=self.BATCH_SIZE)
+                written += len(rows)
+
+                # auto_now_add overwrote created_at on insert
+                backdated = [row for row in rows if id(row) in self.created_at]
+                for row in backdated:
+                    row.created_at = self.created_at[id(row)]
+                if backdated:
+                    model.objects.bulk_update(backdated, ["created_at"], batch_size=self.BATCH_SIZE)
+
+            targets = [
+                target for target in self.pending.get(PlanTarget, [])
+                if apply_target_cids_defaults(target)
+            ]
+            if targets:
+                PlanTarget.objects.bulk_update(targets, ["cids_outcome_uri"], batch_size=self.BATCH_SIZE)
+
+        program_ids = defaultdict(set)
+        for note in self.pending.get(ProgressNote, []):
+            program_ids[note.client_file_id].add(note.author_program_id)
+        for client_file_id, programs in program_ids.items():
+            bump_for_client(client_file_id, [pk for pk in programs if pk])
+
+        self.pending = {}
+        self.created_at = {}
+        return written
+
+
 # ---------------------------------------------------------------------------
 # Generic trend value generators (extracted from seed_demo_data.py)
 # ---------------------------------------------------------------------------
@@ -522,10 +595,35 @@ class DemoDataEngine:
     and other data that matches the instance's configuration.
     """
 
-    def __init__(self, stdout=None, stderr=None):
+    # Bulk mode writes buffered rows after this many client assignments,
+    # bounding memory on large runs.
+    BULK_FLUSH_EVERY = 100
+
+    def __init__(self, stdout=None, stderr=None, bulk=False):
         self.stdout = stdout
         self.stderr = stderr
         self.now = timezone.now()
+        self.bulk = bulk
+        self._bulk_buffer = BulkSeedBuffer() if bulk else None
+        self._event_types = None
+
+    def _insert(self, obj, created_at=None):
+        """Save a new demo row now, or buffer it for bulk_create in bulk mode.
+
+        created_at backdates the row after insert (auto_now_add ignores any
+        value set beforehand).
+        """
+        if self.bulk:
+            return self._bulk_buffer.add(obj, created_at=created_at)
+        obj.save(force_insert=True)
+        if created_at is not None:
+            type(obj).objects.filter(pk=obj.pk).update(created_at=created_at)
+        return obj
+
+    def _flush_bulk(self):
+        if self.bulk and len(self._bulk_buffer):
+            written = self._bulk_buffer.flush()
+            self.log(f"  [bulk] wrote {written} buffered rows")
 
     def log(self, msg):
         if self.stdout:
@@ -2280,19 +2378,19 @@ class DemoDataEngine:
         if template and template_sections:
             # Use the actual plan template
             for section_tmpl in template_sections:
-                section = PlanSection.objects.create(
+                section = self._insert(PlanSection(
                     client_file=client,
                     name=section_tmpl.name,
                     program=program,
                     sort_order=section_tmpl.sort_order,
-                )
+                ))
                 target_templates = getattr(section_tmpl, "_demo_targets", None)
                 if target_templates is None:
                     target_templates = list(section_tmpl.targets.order_by("sort_order"))
                     section_tmpl._demo_targets = target_templates
 
                 for target_tmpl in target_templates:
-                    target = PlanTarget.objects.create(
+                    target = self._insert(PlanTarget(
                         plan_section=section,
                         client_file=client,
                         name=target_tmpl.name,
@@ -2302,14 +2400,14 @@ class DemoDataEngine:
                         ),
                         goal_source_method="heuristic",
                         sort_order=target_tmpl.sort_order,
-                    )
-                    PlanTargetRevision.objects.create(
+                    ))
+                    self._insert(PlanTargetRevision(
                         plan_target=target,
                         name=target.name,
                         description=target.description,
                         status="default",
                         changed_by=worker,
-                    )
+                    ))
                     # Distribute metrics across targets
                     target_metrics = self._assign_metrics_to_target(
                         target, metrics, len(all_targets),
@@ -2336,14 +2434,14 @@ class DemoDataEngine:
                 },
             ]
             for s_idx, sec_def in enumerate(generic_sections):
-                section = PlanSection.objects.create(
+                section = self._insert(PlanSection(
                     client_file=client,
                     name=sec_def["name"],
                     program=program,
                     sort_order=s_idx,
-                )
+                ))
                 for t_idx, (target_name, target_desc) in enumerate(sec_def["targets"]):
-                    target = PlanTarget.objects.create(
+                    target = self._insert(PlanTarget(
                         plan_section=section,
                         client_file=client,
                         name=target_name,
@@ -2351,14 +2449,14 @@ class DemoDataEngine:
                         goal_source=self._classify_goal_source(target_desc),
                         goal_source_method="heuristic",
                         sort_order=t_idx,
-                    )
-                    PlanTargetRevision.objects.create(
+                    ))
+                    self._insert(PlanTargetRevision(
                         plan_target=target,
                         name=target.name,
                         description=target.description,
                         status="default",
                         changed_by=worker,
-                    )
+                    ))
                     target_metrics = self._assign_metrics_to_target(
                         target, metrics, len(all_targets),
                     )
@@ -2376,19 +2474,22 @@ class DemoDataEngine:
                 first_target.client_goal,
             )
             first_target.goal_source_method = "heuristic"
-            first_target.save()
+            if not self.bulk:
+                first_target.save()
 
         # Set target_date from program defaults on all targets
         if hasattr(program, 'default_goal_review_days') and program.default_goal_review_days:
-            for target, _metrics in all_targets:
-                if not target.target_date:
-                    # Offset from the client's enrolment start, not from now
-                    enrolment = ClientProgramEnrolment.objects.filter(
-                        client_file=target.client_file, program=program,
-                    ).first()
-                    base_date = enrolment.started_at.date() if enrolment and enrolment.started_at else self.now.date()
+            undated = [target for target, _metrics in all_targets if not target.target_date]
+            if undated:
+                # Offset from the client's enrolment start, not from now
+                enrolment = ClientProgramEnrolment.objects.filter(
+                    client_file=client, program=program,
+                ).first()
+                base_date = enrolment.started_at.date() if enrolment and enrolment.started_at else self.now.date()
+                for target in undated:
                     target.target_date = base_date + timedelta(days=program.default_goal_review_days)
-                    target.save(update_fields=["target_date"])
+                    if not self.bulk:
+                        target.save(update_fields=["target_date"])
 
         return all_targets
 
@@ -2412,11 +2513,11 @@ class DemoDataEngine:
             assigned.append(universals[0])
 
         for m_idx, md in enumerate(assigned):
-            PlanTargetMetric.objects.create(
+            self._insert(PlanTargetMetric(
                 plan_target=target,
                 metric_def=md,
                 sort_order=m_idx,
-            )
+            ))
 
         return assigned
 
@@ -2449,11 +2550,12 @@ class DemoDataEngine:
             reverse=True,
         )
 
-        # Pre-generate metric value sequences
+        # Pre-generate metric value sequences. Keyed by the target object, not
+        # its pk, because bulk mode has not saved the targets yet.
         metric_sequences = {}
         for target, target_metrics in all_targets:
             for md in target_metrics:
-                key = (target.pk, md.pk)
+                key = (id(target), md.pk)
                 metric_sequences[key] = generate_trend_values(
                     trend, note_count, md.name, md,
                 )
@@ -2483,7 +2585,7 @@ class DemoDataEngine:
             else:
                 engagement = "valuing"
 
-            note = ProgressNote.objects.create(
+            note = ProgressNote(
                 client_file=client,
                 note_type=note_type,
                 interaction_type=interaction,
@@ -2501,11 +2603,6 @@ class DemoDataEngine:
                 engagement_observation=engagement,
             )
 
-            # Backdate created_at
-            ProgressNote.objects.filter(pk=note.pk).update(created_at=backdate)
-
-            needs_save = False
-
             # Add participant reflection to ~half of full notes
             if not is_quick and note_idx % 2 == 0:
                 reflection_idx = min(
@@ -2513,7 +2610,6 @@ class DemoDataEngine:
                     len(PARTICIPANT_REFLECTIONS_POOL) - 1,
                 )
                 note.participant_reflection = PARTICIPANT_REFLECTIONS_POOL[reflection_idx]
-                needs_save = True
 
             # Add participant suggestion to ~1/3 of full notes
             if not is_quick and note_idx % 3 == 1:
@@ -2523,10 +2619,9 @@ class DemoDataEngine:
                 note.suggestion_priority = random.choice(
                     ["noted", "worth_exploring", "important"],
                 )
-                needs_save = True
 
-            if needs_save:
-                note.save()
+            # Backdate created_at
+            self._insert(note, created_at=backdate)
 
             # For full notes, record metrics against each target
             if not is_quick:
@@ -2557,15 +2652,18 @@ class DemoDataEngine:
                     target_entries.append(pnt)
                     target_entry_specs.append((target, target_metrics))
 
-                created_entries = ProgressNoteTarget.objects.bulk_create(
-                    target_entries,
-                    batch_size=1000,
-                )
+                if self.bulk:
+                    created_entries = [self._insert(pnt) for pnt in target_entries]
+                else:
+                    created_entries = ProgressNoteTarget.objects.bulk_create(
+                        target_entries,
+                        batch_size=1000,
+                    )
 
                 metric_values = []
                 for created_entry, (target, target_metrics) in zip(created_entries, target_entry_specs):
                     for md in target_metrics:
-                        key = (target.pk, md.pk)
+                        key = (id(target), md.pk)
                         seq = metric_sequences[key]
                         val = seq[note_idx] if note_idx < len(seq) else seq[-1]
                         metric_values.append(MetricValue(
@@ -2574,14 +2672,19 @@ class DemoDataEngine:
                             value=str(val),
                         ))
 
-                if metric_values:
+                if self.bulk:
+                    for metric_value in metric_values:
+                        self._insert(metric_value)
+                elif metric_values:
                     MetricValue.objects.bulk_create(metric_values, batch_size=1000)
 
     # ----- Event generation -----
 
     def generate_events(self, client, program, worker, days_span):
         """Create realistic events for a client."""
-        event_types = {et.name: et for et in EventType.objects.all()}
+        if self._event_types is None:
+            self._event_types = {et.name: et for et in EventType.objects.all()}
+        event_types = self._event_types
 
         if not event_types:
             self.log_warning("  No EventType records found — skipping event generation.")
@@ -2610,13 +2713,13 @@ class DemoDataEngine:
                 })
 
         for evt in events_data:
-            Event.objects.create(
+            self._insert(Event(
                 client_file=client,
                 title=evt["title"],
                 event_type=evt["type"],
                 author_program=program,
                 start_timestamp=self.now - timedelta(days=evt["days_ago"]),
-            )
+            ))
 
     # ----- Alert generation -----
 
@@ -3515,6 +3618,9 @@ class DemoDataEngine:
                     f"— {program.name} ({trend})"
                 )
 
+                if assignment_index % self.BULK_FLUSH_EVERY == 0:
+                    self._flush_bulk()
+
                 if assignment_index % 25 == 0 or assignment_index == total_assignments:
                     elapsed = perf_counter() - assignment_stage_started_at
                     self.log(
@@ -3522,6 +3628,7 @@ class DemoDataEngine:
                         f"{assignment_index}/{total_assignments} done in {elapsed:.2f}s"
                     )
 
+            self._flush_bulk()
             total_assignment_elapsed = perf_counter() - assignment_stage_started_at
             self.log(
                 f"  [stage] process client assignments — done in {total_assignment_elapsed:.2f}s"
@@ -3568,6 +3675,12 @@ class DemoDataEngine:
                             f"any active program — its content was not used."
                         )
 
+            # Backdated notes and bulk inserts skip the activity summary signals
+            with self.timed_stage("refresh activity summaries"):
+                refresh_activity(
+                    ClientFile.objects.filter(is_demo=True).values_list("pk", flat=True)
+                )
+
             total_clients = len(client_assignments)
             self.log(
                 f"  Demo data generated: {total_clients} clients across "
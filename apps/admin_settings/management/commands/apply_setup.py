@@ -8,10 +8,11 @@ Usage:
 import json
 from pathlib import Path
 
-from django.core.cache import cache
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
+from apps.admin_settings import cached
+
 
 class Command(BaseCommand):
     help = "Apply a setup configuration file to initialise instance settings, terminology, features, programs, metrics, templates, and custom fields."
@@ -89,13 +90,7 @@ def apply_setup_config(config, dry_run=False, stdout=None):
 
 def _invalidate_setup_caches():
     """Clear cached template context that depends on setup-managed records."""
-    for cache_key in (
-        "feature_toggles",
-        "instance_settings",
-        "terminology_overrides_en",
-        "terminology_overrides_fr",
-    ):
-        cache.delete(cache_key)
+    cached.invalidate(cached.FEATURE_TOGGLES, cached.INSTANCE_SETTINGS, cached.TERMINOLOGY)
 
 
 def _normalise_features(features_data, config):
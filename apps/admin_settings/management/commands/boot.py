@@ -0,0 +1,115 @@
+"""
+Run every container start-up step in one process.
+
+Replaces the chain of separate manage.py calls in entrypoint.sh: migrations,
+tenant domain registration, audit lockdown, seeding, theme merge, and the
+translation, security and encryption checks. Steps whose inputs are
+unchanged since their last successful run are skipped, the final checks run
+concurrently, and a timing summary is printed at the end. See konote/boot.py.
+
+Usage:
+    python manage.py boot                      # Normal start-up
+    python manage.py boot --force              # Re-run every step
+    python manage.py boot --skip seed          # Leave out a step (repeatable)
+    python manage.py boot --full-encryption-check  # Decrypt every name
+    python manage.py boot --verbose            # Show each step's output
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from konote import boot
+
+STATUS_LABELS = {
+    boot.OK: "OK",
+    boot.SKIPPED: "SKIP",
+    boot.DISABLED: "OFF",
+    boot.WARNING: "WARN",
+    boot.FAILED: "FAIL",
+}
+
+
+class Command(BaseCommand):
+    help = "Run all start-up steps (migrations, seed, checks) in one process."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run every step even if its inputs have not changed.",
+        )
+        parser.add_argument(
+            "--skip",
+            action="append",
+            default=[],
+            metavar="STEP",
+            help="Step to leave out (can be given more than once).",
+        )
+        parser.add_argument(
+            "--full-encryption-check",
+            action="store_true",
+            help="Decrypt every stored name instead of a sample of new rows.",
+        )
+        parser.add_argument(
+            "--verbose",
+            action="store_true",
+            help="Print every step's output, not only for warnings, failures "
+            "and the migration, security and encryption steps.",
+        )
+
+    def handle(self, *args, **options):
+        phases = boot.default_phases(
+            full_encryption_check=options["full_encryption_check"],
+        )
+        names = {phase.name for phase in phases}
+        unknown = set(options["skip"]) - names
+        if unknown:
+            raise CommandError(
+                f"Unknown step(s): {', '.join(sorted(unknown))}. "
+                f"Steps are: {', '.join(phase.name for phase in phases)}"
+            )
+
+        self.verbose = options["verbose"]
+        self.stdout.write("KoNote start-up")
+        self.stdout.write("=" * 55)
+        report = boot.run_boot(
+            phases,
+            force=options["force"],
+            skip=options["skip"],
+            on_result=self._print_result,
+        )
+        self._print_summary(report)
+
+        if not report.ok:
+            raise CommandError(f"Start-up step '{report.stopped_by}' failed. Refusing to start.")
+
+    def _print_result(self, result):
+        label = STATUS_LABELS[result.status]
+        line = f"[{label:>4}] {result.name} ({result.seconds:.1f}s)"
+        if result.detail:
+            line += f" — {result.detail}"
+        if result.status == boot.FAILED:
+            self.stdout.write(self.style.ERROR(line))
+        elif result.status == boot.WARNING:
+            self.stdout.write(self.style.WARNING(line))
+        else:
+            self.stdout.write(line)
+
+        show_output = (
+            self.verbose
+            or result.show_output
+            or result.status in (boot.WARNING, boot.FAILED)
+        )
+        if show_output and result.output.strip():
+            for output_line in result.output.rstrip().splitlines():
+                self.stdout.write(f"    {output_line}")
+
+    def _print_summary(self, report):
+        counts = {}
+        for result in report.results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        parts = [
+            f"{counts[status]} {STATUS_LABELS[status].lower()}"
+            for status in STATUS_LABELS if counts.get(status)
+        ]
+        self.stdout.write("-" * 55)
+        self.stdout.write(f"Start-up steps: {', '.join(parts)} in {report.seconds:.1f}s")
@@ -9,6 +9,7 @@ Usage:
   python manage.py generate_demo_data --profile seeds/demo_profile.json
   python manage.py generate_demo_data --clients-per-program 5 --days 365
   python manage.py generate_demo_data --force  # regenerate from scratch
+  python manage.py generate_demo_data --bulk   # faster inserts for large runs
 """
 from pathlib import Path
 
@@ -69,6 +70,14 @@ class Command(BaseCommand):
             action="store_true",
             help="Enable demo mode for this run (alternative to DEMO_MODE=1 env var).",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help=(
+                "Buffer plans, notes, metric values and events and write them "
+                "with bulk inserts. Much faster for large runs."
+            ),
+        )
 
     def handle(self, *args, **options):
         if not settings.DEMO_MODE and not options["demo_mode"]:
@@ -77,7 +86,9 @@ class Command(BaseCommand):
             ))
             return
 
-        engine = DemoDataEngine(stdout=self.stdout, stderr=self.stderr)
+        engine = DemoDataEngine(
+            stdout=self.stdout, stderr=self.stderr, bulk=options["bulk"],
+        )
 
         profile_path = self._resolve_profile_path(options["profile"])
 
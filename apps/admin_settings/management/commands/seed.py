@@ -42,7 +42,7 @@ class Command(BaseCommand):
         from apps.admin_settings.demo_engine import DemoDataEngine
 
         self.stdout.write("  Using configuration-aware demo data engine...")
-        engine = DemoDataEngine(stdout=self.stdout, stderr=self.stderr)
+        engine = DemoDataEngine(stdout=self.stdout, stderr=self.stderr, bulk=True)
 
         try:
             success = engine.run(
@@ -72,7 +72,7 @@ class Command(BaseCommand):
 
         demo_profile = os.environ.get("DEMO_DATA_PROFILE", "")
         self.stdout.write("  Topping up demo data with config-aware engine...")
-        engine = DemoDataEngine(stdout=self.stdout, stderr=self.stderr)
+        engine = DemoDataEngine(stdout=self.stdout, stderr=self.stderr, bulk=True)
 
         try:
             success = engine.run(
@@ -619,6 +619,14 @@ class Command(BaseCommand):
             self.stderr.write(f"  WARNING: seed_demo_data failed: {e}")
             self.stderr.write("  App will start but may be missing demo data.")
 
+        # seed_demo_data backdates notes and events with queryset updates,
+        # which skip the activity summary signals
+        from apps.clients.activity import refresh_activity
+
+        refresh_activity(
+            ClientFile.objects.filter(is_demo=True).values_list("pk", flat=True)
+        )
+
     def _demo_email(self, username):
         """Build a demo email from DEMO_EMAIL_BASE env var, or fall back to example.com."""
         email_base = os.environ.get("DEMO_EMAIL_BASE", "")
@@ -1,23 +1,27 @@
 """Cache invalidation signals for terminology, features, and settings."""
-from django.core.cache import cache
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models import FeatureToggle, InstanceSetting, TerminologyOverride
+from . import cached
+from .models import FeatureToggle, InstanceSetting, OrganizationProfile, TerminologyOverride
 
 
 @receiver([post_save, post_delete], sender=TerminologyOverride)
 def invalidate_terminology_cache(sender, **kwargs):
     """Invalidate terminology caches for all languages."""
-    cache.delete("terminology_overrides_en")
-    cache.delete("terminology_overrides_fr")
+    cached.invalidate(cached.TERMINOLOGY)
 
 
 @receiver([post_save, post_delete], sender=FeatureToggle)
 def invalidate_feature_cache(sender, **kwargs):
-    cache.delete("feature_toggles")
+    cached.invalidate(cached.FEATURE_TOGGLES)
 
 
 @receiver([post_save, post_delete], sender=InstanceSetting)
 def invalidate_settings_cache(sender, **kwargs):
-    cache.delete("instance_settings")
+    cached.invalidate(cached.INSTANCE_SETTINGS)
+
+
+@receiver([post_save, post_delete], sender=OrganizationProfile)
+def invalidate_organization_profile_cache(sender, **kwargs):
+    cached.invalidate(cached.ORGANIZATION_PROFILE)
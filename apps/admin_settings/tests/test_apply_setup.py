@@ -11,13 +11,14 @@ import json
 import os
 import tempfile
 
-from django.core.cache import cache
 from django.core.management import call_command
 from django.core.management.base import CommandError
 from django.test import TestCase
 
 from io import StringIO
 
+from apps.admin_settings import cached
+
 
 class ApplySetupTests(TestCase):
     """Tests for the apply_setup management command."""
@@ -586,14 +587,15 @@ class ApplySetupTests(TestCase):
         }
         path = self._write_config(config)
 
-        cache.set("instance_settings", {"product_name": "Stale Name"}, 300)
-        cache.set("terminology_overrides_en", {"group_plural": "Groups"}, 300)
-        cache.set("terminology_overrides_fr", {"group_plural": "Groupes"}, 300)
-        cache.set("feature_toggles", {"attendance_navigation": False}, 300)
+        # Prime the caches with the pre-setup values
+        self.assertNotEqual(cached.instance_settings().get("product_name"), "Fresh Name")
+        self.assertNotEqual(cached.terminology("en").get("group_plural"), "Templates")
+        cached.terminology("fr")
+        cached.feature_flags()
 
         call_command("apply_setup", path, stdout=StringIO())
 
-        self.assertIsNone(cache.get("instance_settings"))
-        self.assertIsNone(cache.get("terminology_overrides_en"))
-        self.assertIsNone(cache.get("terminology_overrides_fr"))
-        self.assertIsNone(cache.get("feature_toggles"))
+        self.assertEqual(cached.instance_settings()["product_name"], "Fresh Name")
+        self.assertEqual(cached.terminology("en")["group_plural"], "Templates")
+        self.assertEqual(cached.terminology("fr")["group_plural"], "Templates")
+        self.assertTrue(cached.feature_flags()["attendance_navigation"])
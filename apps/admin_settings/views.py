@@ -1,7 +1,6 @@
 """Admin settings views: dashboard, terminology, features, instance settings."""
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.cache import cache
 from django.shortcuts import redirect, render
 from django.utils import timezone as tz
 from django.utils.translation import gettext as _, gettext_lazy as _lazy
@@ -636,7 +635,6 @@ def feature_toggle_action(request, feature_key):
         feature_key=feature_key,
         defaults={"is_enabled": new_state},
     )
-    cache.delete("feature_toggles")
 
     # Audit log when ai_assist_participant_data is toggled
     if feature_key == "ai_assist_participant_data":
@@ -1322,3 +1320,40 @@ def configuration_overview(request):
         # Audit
         "audit_entries": audit_entries,
     })
+
+
+# --- Performance Instrumentation ---
+
+@login_required
+@admin_required
+def performance(request):
+    """Recent request profiles from this server process (PERF_INSTRUMENTATION)."""
+    from django.conf import settings
+    from konote.instrumentation import recent_profiles
+
+    profiles = recent_profiles()
+    if request.GET.get("over_budget"):
+        profiles = [p for p in profiles if p["over_budget"]]
+
+    # Per-view summary, heaviest first
+    by_view = {}
+    for p in profiles:
+        row = by_view.setdefault(p["view"] or p["path"], {
+            "view": p["view"] or p["path"], "requests": 0,
+            "max_queries": 0, "max_decrypts": 0, "max_total_ms": 0.0, "total_ms": 0.0,
+        })
+        row["requests"] += 1
+        row["max_queries"] = max(row["max_queries"], p["queries"])
+        row["max_decrypts"] = max(row["max_decrypts"], p["decrypts"])
+        row["max_total_ms"] = max(row["max_total_ms"], p["total_ms"])
+        row["total_ms"] += p["total_ms"]
+    view_rows = sorted(by_view.values(), key=lambda r: r["max_total_ms"], reverse=True)
+    for row in view_rows:
+        row["avg_total_ms"] = row.pop("total_ms") / row["requests"]
+
+    return render(request, "admin_settings/performance.html", {
+        "enabled": settings.PERF_INSTRUMENTATION,
+        "profiles": profiles,
+        "view_rows": view_rows,
+        "over_budget_only": bool(request.GET.get("over_budget")),
+    })
@@ -0,0 +1,254 @@
+"""Ciphertext format scan for security_audit (ENC003).
+
+Every encrypted column should hold a Fernet token: url-safe base64 whose
+first decoded byte is the 0x80 version byte, so the stored text starts with
+"g" and is at least MIN_TOKEN_LENGTH characters. Plaintext written around
+the model setters fails one of those two tests.
+
+Two modes:
+
+- full: the format test runs in SQL, one query per chunk of primary keys,
+  so rows are never loaded or decoded in Python. Chunks can run on several
+  worker threads. Progress is saved after each chunk (per table high-water
+  mark), so an interrupted scan resumes where it stopped and a repeat scan
+  only checks rows added or updated since the last one, plus rows that
+  were invalid last time.
+- sample: checks a uniform random sample of rows per table in Python
+  (stricter: the base64 must decode) and reports an upper bound on the
+  invalid rate. Takes seconds on any table size; does not update the saved
+  scan state.
+"""
+import base64
+import json
+import math
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from django.apps import apps
+from django.db import connection
+from django.db.models import Max, Min, Q
+from django.db.models.functions import Length, Substr
+from django.utils import timezone
+
+# base64 of the 0x80 Fernet version byte
+TOKEN_PREFIX = b"g"
+# Base64 length of the 57 decoded bytes security_audit has always required
+MIN_TOKEN_LENGTH = 76
+
+# InstanceSetting key holding the per-table scan state (JSON)
+STATE_KEY = "security_audit_ciphertext_scan"
+# Invalid row ids remembered per table for re-checking on the next run
+MAX_REMEMBERED_INVALID = 1000
+
+
+@dataclass(frozen=True)
+class ScanTarget:
+    label: str
+    model: str
+    fields: tuple
+
+
+SCAN_TARGETS = (
+    ScanTarget("ClientFile", "clients.ClientFile", (
+        "_first_name_encrypted", "_middle_name_encrypted",
+        "_last_name_encrypted", "_birth_date_encrypted",
+    )),
+    ScanTarget("User", "auth_app.User", ("_email_encrypted",)),
+    ScanTarget("ClientDetailValue", "clients.ClientDetailValue", ("_value_encrypted",)),
+)
+
+
+@dataclass
+class ScanOutcome:
+    label: str
+    scanned: int = 0
+    issues: list = field(default_factory=list)
+    skipped: int = 0
+
+
+def is_valid_ciphertext(raw):
+    """Check if data looks like valid Fernet ciphertext (empty is valid)."""
+    if isinstance(raw, memoryview):
+        raw = bytes(raw)
+    if not raw:
+        return True
+    try:
+        decoded = base64.urlsafe_b64decode(raw)
+    except Exception:
+        return False
+    return len(decoded) >= 57 and decoded[0] == 0x80
+
+
+def _annotated(queryset, fields):
+    """Annotate length and first byte of each field for the SQL format test."""
+    annotations = {}
+    for name in fields:
+        annotations[f"{name}__scan_len"] = Length(name)
+        annotations[f"{name}__scan_head"] = Substr(name, 1, 1)
+    return queryset.annotate(**annotations)
+
+
+def _invalid_q(name):
+    non_empty = Q(**{f"{name}__scan_len__gt": 0})
+    bad_format = (
+        Q(**{f"{name}__scan_len__lt": MIN_TOKEN_LENGTH})
+        | ~Q(**{f"{name}__scan_head": TOKEN_PREFIX})
+    )
+    return non_empty & bad_format
+
+
+def _invalid_rows(target, extra_q):
+    """(pk, field) for every row matching extra_q that fails the format test."""
+    model = apps.get_model(target.model)
+    invalid_any = Q()
+    for name in target.fields:
+        invalid_any |= _invalid_q(name)
+    columns = ["pk"]
+    for name in target.fields:
+        columns += [f"{name}__scan_len", f"{name}__scan_head"]
+    rows = (
+        _annotated(model.objects.filter(extra_q), target.fields)
+        .filter(invalid_any)
+        .values_list(*columns)
+    )
+    found = []
+    for row in rows:
+        pk, values = row[0], row[1:]
+        for index, name in enumerate(target.fields):
+            length, head = values[2 * index], values[2 * index + 1]
+            if length and (length < MIN_TOKEN_LENGTH or bytes(head or b"") != TOKEN_PREFIX):
+                found.append((pk, name))
+    return found
+
+
+def load_state():
+    from apps.admin_settings.models import InstanceSetting
+
+    raw = InstanceSetting.get(STATE_KEY, "")
+    try:
+        return json.loads(raw) if raw else {}
+    except ValueError:
+        return {}
+
+
+def save_state(state):
+    from apps.admin_settings.models import InstanceSetting
+
+    InstanceSetting.objects.update_or_create(
+        setting_key=STATE_KEY, defaults={"setting_value": json.dumps(state)},
+    )
+
+
+def _run_chunk(target, tenant, pk_from, pk_to):
+    """Worker-thread body: scan one pk range on this thread's connection."""
+    if tenant is not None:
+        connection.set_tenant(tenant)
+    try:
+        return _invalid_rows(target, Q(pk__gt=pk_from, pk__lte=pk_to))
+    finally:
+        connection.close()
+
+
+def full_scan(target, state, chunk_size=50000, workers=1, rescan=False, progress=None):
+    """Scan a table in SQL, resuming from and updating its saved state.
+
+    state is the dict from load_state(); it is updated and saved after each
+    chunk, so an interrupted scan resumes at the last finished chunk.
+    """
+    model = apps.get_model(target.model)
+    table_state = {} if rescan else dict(state.get(target.label, {}))
+    started_at = timezone.now().isoformat()
+    checked_to = table_state.get("max_pk", 0)
+
+    outcome = ScanOutcome(target.label)
+
+    # Rows scanned before but changed since, and rows invalid last time
+    if checked_to:
+        changed_q = Q(pk__in=table_state.get("invalid", []))
+        if table_state.get("scanned_at"):
+            changed_q |= Q(pk__lte=checked_to, updated_at__gte=table_state["scanned_at"])
+        outcome.scanned += model.objects.filter(changed_q).count()
+        outcome.issues += _invalid_rows(target, changed_q)
+
+    top = model.objects.aggregate(top=Max("pk"))["top"] or 0
+    chunks = [
+        (low, min(low + chunk_size, top))
+        for low in range(checked_to, top, chunk_size)
+    ]
+    outcome.scanned += model.objects.filter(pk__gt=checked_to).count()
+    outcome.skipped = model.objects.count() - outcome.scanned
+
+    def finish_chunk(index, found):
+        outcome.issues.extend(found)
+        table_state["max_pk"] = chunks[index][1]
+        # An interrupted scan resumes with the rows it finished; rows updated
+        # after this scan started are picked up by the updated_at check.
+        table_state.setdefault("scanned_at", started_at)
+        table_state["invalid"] = sorted({pk for pk, _ in outcome.issues})[:MAX_REMEMBERED_INVALID]
+        state[target.label] = table_state
+        save_state(state)
+        if progress:
+            progress(target.label, index + 1, len(chunks))
+
+    if workers <= 1 or len(chunks) <= 1:
+        for index, (low, high) in enumerate(chunks):
+            finish_chunk(index, _invalid_rows(target, Q(pk__gt=low, pk__lte=high)))
+    else:
+        tenant = getattr(connection, "tenant", None)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # map() yields in submission order, so the saved high-water mark
+            # only ever covers chunks that have all finished.
+            results = pool.map(lambda chunk: _run_chunk(target, tenant, *chunk), chunks)
+            for index, found in enumerate(results):
+                finish_chunk(index, found)
+
+    table_state["max_pk"] = max(table_state.get("max_pk", 0), top)
+    table_state["scanned_at"] = started_at
+    table_state["invalid"] = sorted({pk for pk, _ in outcome.issues})[:MAX_REMEMBERED_INVALID]
+    state[target.label] = table_state
+    save_state(state)
+    return outcome
+
+
+def sample_scan(target, sample_size=1000, rng=None):
+    """Check a uniform random sample of rows with the Python decoder."""
+    rng = rng or random.Random()
+    model = apps.get_model(target.model)
+    outcome = ScanOutcome(target.label)
+
+    bounds = model.objects.aggregate(low=Min("pk"), high=Max("pk"))
+    if bounds["low"] is None:
+        return outcome
+    total = model.objects.count()
+    if total <= sample_size:
+        sample = model.objects.all()
+    else:
+        # Random ids over the pk range; gaps are skipped, so draw extra
+        span = bounds["high"] - bounds["low"] + 1
+        draw = min(span, math.ceil(sample_size * span / total * 1.2))
+        ids = rng.sample(range(bounds["low"], bounds["high"] + 1), draw)
+        sample = model.objects.filter(pk__in=ids)
+    for row in sample.only("pk", *target.fields)[:sample_size]:
+        outcome.scanned += 1
+        for name in target.fields:
+            raw = getattr(row, name)
+            if raw and not is_valid_ciphertext(raw):
+                outcome.issues.append((row.pk, name))
+    outcome.skipped = total - outcome.scanned
+    return outcome
+
+
+def invalid_rate_upper_bound(sampled, invalid, confidence=0.95):
+    """One-sided upper bound on the invalid row rate from a sample.
+
+    Uses the exact bound for zero failures (the "rule of three" at 95%) and
+    the normal approximation otherwise.
+    """
+    if not sampled:
+        return 1.0
+    if not invalid:
+        return 1 - (1 - confidence) ** (1 / sampled)
+    rate = invalid / sampled
+    z = 1.645 if confidence == 0.95 else 2.326
+    return min(1.0, rate + z * math.sqrt(rate * (1 - rate) / sampled))
@@ -0,0 +1,246 @@
+"""Start-up check that stored PII still decrypts with the current key.
+
+The container used to decrypt every client name and survey respondent name
+on every start, so boot time grew with the caseload. This check instead:
+
+- decrypts a random sample of the rows added since the last verified boot,
+  plus a small sample of rows verified before (a changed or wrong
+  FIELD_ENCRYPTION_KEY makes old rows fail too, so a few are enough);
+- escalates to a full scan of the table only when the sample finds a row
+  that does not decrypt (to report how many are affected), or when asked
+  with full=True;
+- records the highest primary key verified per table in an InstanceSetting,
+  so the next boot samples only rows added since.
+
+Full scans read the ciphertext in primary-key chunks and decrypt each chunk
+in a pool of worker processes. Workers receive the Fernet key and raw
+tokens only — no Django — so they can be spawned without setting Django up.
+"""
+import json
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from cryptography.fernet import InvalidToken
+from django.apps import apps
+from django.db.models import Count, Max, Min, Q
+
+# InstanceSetting key holding {table label: highest verified pk}
+STATE_KEY = "encryption_check_state"
+
+
+@dataclass(frozen=True)
+class CheckTarget:
+    label: str
+    model: str
+    fields: tuple
+    description: str
+
+
+CHECK_TARGETS = (
+    CheckTarget(
+        "SurveyResponse", "surveys.SurveyResponse",
+        ("_respondent_name_encrypted",), "survey respondent names",
+    ),
+    CheckTarget(
+        "ClientFile", "clients.ClientFile",
+        ("_first_name_encrypted", "_last_name_encrypted"), "client names",
+    ),
+)
+
+
+@dataclass
+class CheckOutcome:
+    label: str
+    description: str
+    mode: str = "sample"
+    checked: int = 0
+    failed: list = field(default_factory=list)
+    total: int = 0
+
+    @property
+    def ok(self):
+        return not self.failed
+
+
+# ── Worker side (no Django) ────────────────────────────────────────────
+
+_worker_fernet = None
+
+
+def _init_worker(fernet):
+    global _worker_fernet
+    _worker_fernet = fernet
+
+
+def _failed_rows(rows, fernet=None):
+    """pks of rows (pk, token, token, ...) with a token that does not decrypt."""
+    fernet = fernet or _worker_fernet
+    failed = []
+    for pk, *tokens in rows:
+        for token in tokens:
+            if not token:
+                continue
+            try:
+                fernet.decrypt(bytes(token))
+            except InvalidToken:
+                failed.append(pk)
+                break
+    return failed
+
+
+# ── Saved progress ─────────────────────────────────────────────────────
+
+def load_state():
+    from apps.admin_settings.models import InstanceSetting
+
+    raw = InstanceSetting.get(STATE_KEY, "")
+    try:
+        return json.loads(raw) if raw else {}
+    except ValueError:
+        return {}
+
+
+def save_state(state):
+    from apps.admin_settings.models import InstanceSetting
+
+    InstanceSetting.objects.update_or_create(
+        setting_key=STATE_KEY, defaults={"setting_value": json.dumps(state)},
+    )
+
+
+# ── Checks ─────────────────────────────────────────────────────────────
+
+def _queryset(target):
+    model = apps.get_model(target.model)
+    non_empty = Q()
+    for name in target.fields:
+        non_empty |= ~Q(**{name: b""}) & Q(**{f"{name}__isnull": False})
+    return model.objects.filter(non_empty)
+
+
+# Random ids tried per query, as a multiple of the rows still wanted, and
+# the number of rounds before falling back to ORDER BY RANDOM()
+DRAW_FACTOR = 3
+MAX_DRAW = 1000
+DRAW_ROUNDS = 5
+
+
+def _sample_rows(queryset, target, size, rng):
+    """Up to `size` uniformly random rows of queryset as (pk, token, ...)."""
+    stats = queryset.aggregate(low=Min("pk"), high=Max("pk"), total=Count("pk"))
+    if not stats["total"]:
+        return [], 0
+    columns = ("pk", *target.fields)
+    if stats["total"] <= size:
+        return list(queryset.values_list(*columns)), stats["total"]
+
+    # Random ids over the pk range, without reading every id. Each query
+    # looks up a bounded number of ids (gaps in the range return nothing)
+    # and repeats until the sample is full.
+    span = range(stats["low"], stats["high"] + 1)
+    found = {}
+    for _ in range(DRAW_ROUNDS):
+        wanted = size - len(found)
+        if not wanted:
+            break
+        draw = min(len(span), wanted * DRAW_FACTOR, MAX_DRAW)
+        ids = rng.sample(span, draw)
+        for row in queryset.filter(pk__in=ids).exclude(pk__in=list(found)).values_list(*columns)[:wanted]:
+            found[row[0]] = row
+    if len(found) < size:
+        # Very sparse pks: let the database pick the rest
+        rest = queryset.exclude(pk__in=list(found)).order_by("?").values_list(*columns)
+        for row in rest[:size - len(found)]:
+            found[row[0]] = row
+    return list(found.values()), stats["total"]
+
+
+def sample_check(target, fernet, verified_to=0, sample_size=200, recheck_size=20, rng=None):
+    """Decrypt a sample of rows added after verified_to, and a few from before."""
+    rng = rng or random.Random()
+    queryset = _queryset(target)
+    outcome = CheckOutcome(target.label, target.description)
+
+    for rows, total in (
+        _sample_rows(queryset.filter(pk__gt=verified_to), target, sample_size, rng),
+        _sample_rows(queryset.filter(pk__lte=verified_to), target, recheck_size, rng),
+    ):
+        outcome.checked += len(rows)
+        outcome.total += total
+        outcome.failed += _failed_rows(rows, fernet)
+    return outcome
+
+
+def full_check(target, fernet, chunk_size=5000, workers=1):
+    """Decrypt every row, chunk by chunk, in up to `workers` processes."""
+    queryset = _queryset(target).order_by("pk")
+    outcome = CheckOutcome(target.label, target.description, mode="full")
+
+    def chunks():
+        last_pk = 0
+        while True:
+            rows = list(
+                queryset.filter(pk__gt=last_pk).values_list("pk", *target.fields)[:chunk_size]
+            )
+            if not rows:
+                return
+            last_pk = rows[-1][0]
+            outcome.checked += len(rows)
+            yield [(pk, *(bytes(t) if t else b"" for t in tokens)) for pk, *tokens in rows]
+
+    if workers <= 1:
+        for rows in chunks():
+            outcome.failed += _failed_rows(rows, fernet)
+    else:
+        # spawn, not fork: the parent holds DB connections
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(fernet,),
+        ) as pool:
+            pending = []
+            for rows in chunks():
+                pending.append(pool.submit(_failed_rows, rows))
+                # Keep a bounded number of chunks in memory
+                if len(pending) >= workers * 2:
+                    outcome.failed += pending.pop(0).result()
+            for future in pending:
+                outcome.failed += future.result()
+    outcome.total = outcome.checked
+    return outcome
+
+
+def verify(targets=CHECK_TARGETS, full=False, sample_size=200, workers=1, rng=None):
+    """Check each target table; returns a CheckOutcome per table.
+
+    Tables that pass have their highest pk saved, so the next call only
+    samples newer rows (and rechecks a few older ones). A table whose sample
+    fails is scanned in full to count the affected rows.
+    """
+    from konote.encryption import _get_fernet
+
+    fernet = _get_fernet()
+    state = load_state()
+    outcomes = []
+    for target in targets:
+        top = _queryset(target).aggregate(top=Max("pk"))["top"] or 0
+        if full:
+            outcome = full_check(target, fernet, workers=workers)
+        else:
+            outcome = sample_check(
+                target, fernet, verified_to=state.get(target.label, 0),
+                sample_size=sample_size, rng=rng,
+            )
+            if not outcome.ok:
+                outcome = full_check(target, fernet, workers=workers)
+        if outcome.ok:
+            state[target.label] = top
+        else:
+            # Start from scratch once the key or data is fixed
+            state.pop(target.label, None)
+        outcomes.append(outcome)
+    save_state(state)
+    return outcomes
@@ -0,0 +1,162 @@
+"""Streaming CSV export of the audit log.
+
+Rows are read in chunks with QuerySet.iterator() — a server-side cursor on
+PostgreSQL — and written out as they are read, so memory use stays flat
+however many entries match. Output is plain CSV or gzip-compressed CSV.
+
+Exports above AUDIT_EXPORT_BACKGROUND_ROWS are not streamed. The view
+creates a SecureExportLink with generation_status "queued" and returns
+straight away; the run_audit_exports management command (cron) picks the
+link up, rebuilds the queryset from the filters saved on it, and writes the
+file to SECURE_EXPORT_DIR. The job runs outside the web workers, so a
+worker recycle or deploy can't silently kill it, and its status and any
+error are recorded on the link. The file is written to "<path>.part" and
+renamed when complete, so the link serves nothing until the file is whole.
+"""
+import csv
+import json
+import logging
+import os
+import zlib
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.reports.csv_utils import sanitise_csv_row
+
+from .filters import filter_audit_queryset, scoped_audit_queryset
+
+logger = logging.getLogger(__name__)
+
+HEADER = [
+    "Timestamp", "User", "IP Address", "Action", "Resource Type",
+    "Resource ID", "Program ID", "Demo Context",
+]
+_COLUMNS = (
+    "event_timestamp", "user_display", "ip_address", "action",
+    "resource_type", "resource_id", "program_id", "is_demo_context",
+)
+
+# Rows fetched per round trip, and rows per chunk handed to the response
+CHUNK_ROWS = 2000
+
+PARTIAL_SUFFIX = ".part"
+
+
+class _Echo:
+    """File-like object whose write() returns the text, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(queryset, chunk_rows=CHUNK_ROWS):
+    """Yield the export as CSV text, a chunk of rows at a time."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(sanitise_csv_row(HEADER))
+    lines = []
+    rows = queryset.values_list(*_COLUMNS).iterator(chunk_size=chunk_rows)
+    for timestamp, user, ip, action, resource_type, resource_id, program_id, is_demo in rows:
+        lines.append(writer.writerow(sanitise_csv_row([
+            timestamp.strftime("%Y-%m-%d %H:%M"),
+            user,
+            ip or "",
+            action,
+            resource_type,
+            resource_id or "",
+            program_id or "",
+            "Yes" if is_demo else "No",
+        ])))
+        if len(lines) >= chunk_rows:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def gzip_chunks(text_chunks):
+    """gzip-compress a stream of text chunks (UTF-8)."""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for text in text_chunks:
+        data = compressor.compress(text.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(queryset, compress=False):
+    """Bytes of the export, ready for a StreamingHttpResponse or a file."""
+    chunks = csv_chunks(queryset)
+    if compress:
+        return gzip_chunks(chunks)
+    return (text.encode("utf-8") for text in chunks)
+
+
+def write_export_file(queryset, file_path, compress=True):
+    """Write the export to file_path via a .part file renamed on completion."""
+    partial_path = file_path + PARTIAL_SUFFIX
+    try:
+        with open(partial_path, "wb") as handle:
+            for chunk in export_chunks(queryset, compress=compress):
+                handle.write(chunk)
+        os.replace(partial_path, file_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+
+# A job still "running" after this long is assumed dead (worker killed,
+# host restarted) and marked failed.
+STALE_JOB_MINUTES = 60
+
+
+def run_export_job(link):
+    """Write the file for one queued audit log export link.
+
+    Claims the link first (queued -> running) so two overlapping job runs
+    never write the same file. Returns True if the file was written.
+    """
+    from apps.reports.models import SecureExportLink
+
+    claimed = SecureExportLink.objects.filter(
+        pk=link.pk, generation_status="queued",
+    ).update(generation_status="running", generation_started_at=timezone.now())
+    if not claimed:
+        return False
+
+    try:
+        vals = json.loads(link.filters_json or "{}")
+        queryset = filter_audit_queryset(scoped_audit_queryset(link.created_by), vals)
+        write_export_file(queryset, link.file_path, compress=link.filename.endswith(".gz"))
+    except Exception as exc:
+        logger.exception("Audit log export failed for link %s", link.pk)
+        SecureExportLink.objects.filter(pk=link.pk).update(
+            generation_status="failed",
+            generation_error=f"{type(exc).__name__}: {exc}"[:1000],
+        )
+        return False
+
+    SecureExportLink.objects.filter(pk=link.pk).update(
+        generation_status="ready", generation_error="",
+    )
+    return True
+
+
+def fail_stale_jobs(stale_minutes=STALE_JOB_MINUTES):
+    """Mark jobs whose runner died mid-write as failed; returns how many."""
+    from apps.reports.models import SecureExportLink
+
+    cutoff = timezone.now() - timedelta(minutes=stale_minutes)
+    stale = list(SecureExportLink.objects.filter(
+        generation_status="running", generation_started_at__lt=cutoff,
+    ))
+    for link in stale:
+        partial_path = link.file_path + PARTIAL_SUFFIX
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+    SecureExportLink.objects.filter(pk__in=[link.pk for link in stale]).update(
+        generation_status="failed",
+        generation_error="The export job stopped before the file was complete.",
+    )
+    return len(stale)
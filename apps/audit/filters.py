@@ -0,0 +1,68 @@
+"""Scoping and filtering of audit log querysets.
+
+Shared by the audit log views, which read filters from GET parameters, and
+background exports (export.py), which replay the filters saved on their
+export link.
+"""
+from datetime import datetime
+
+from django.utils import timezone
+
+from apps.programs.access import get_user_program_ids
+
+from .models import AuditLog
+
+
+def scoped_audit_queryset(user):
+    """Return an AuditLog queryset scoped to the user's access level.
+
+    Admins see all entries. Program managers see entries scoped to their
+    programs (audit.view: PROGRAM in permissions matrix). Non-admin users
+    without PM roles are already blocked by the @requires_permission
+    decorator, so this function only needs to handle admin vs PM scoping.
+    """
+    qs = AuditLog.objects.using("audit").all()
+
+    if not getattr(user, "is_admin", False):
+        # Scope to programs where the user has an active role.
+        # request.user_program_role is only set by middleware for
+        # client-scoped URLs, so we query program IDs directly
+        # (consistent with all other admin views).
+        user_program_ids = get_user_program_ids(user)
+        qs = qs.filter(program_id__in=user_program_ids)
+
+    return qs
+
+
+def filter_audit_queryset(qs, vals):
+    """Apply filter values (date_from, action, ...) to an audit log queryset."""
+    if vals.get("demo_filter") == "real":
+        qs = qs.filter(is_demo_context=False)
+    elif vals.get("demo_filter") == "demo":
+        qs = qs.filter(is_demo_context=True)
+
+    if vals.get("date_from"):
+        try:
+            dt = datetime.strptime(vals["date_from"], "%Y-%m-%d")
+            qs = qs.filter(event_timestamp__gte=timezone.make_aware(dt))
+        except ValueError:
+            pass
+
+    if vals.get("date_to"):
+        try:
+            dt = datetime.strptime(vals["date_to"], "%Y-%m-%d")
+            dt = dt.replace(hour=23, minute=59, second=59)
+            qs = qs.filter(event_timestamp__lte=timezone.make_aware(dt))
+        except ValueError:
+            pass
+
+    if vals.get("user_display"):
+        qs = qs.filter(user_display__icontains=vals["user_display"])
+
+    if vals.get("action"):
+        qs = qs.filter(action=vals["action"])
+
+    if vals.get("resource_type"):
+        qs = qs.filter(resource_type__icontains=vals["resource_type"])
+
+    return qs
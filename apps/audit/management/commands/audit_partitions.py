@@ -0,0 +1,150 @@
+"""
+Management command: audit_partitions
+
+Maintains the monthly partitions of the audit_log table (PostgreSQL only —
+see apps/audit/partitions.py) and applies the audit retention period.
+
+- Creates partitions for the current month and the next --months-ahead
+  months, so new rows never land in the default partition.
+- With --retain-months, drops whole monthly partitions whose newest
+  possible row is older than the retention period. Rows are never deleted
+  one by one; the audit role has no DELETE privilege.
+
+Dropping partitions needs the role that owns audit_log (the one that runs
+migrate_audit). Every drop is itself recorded in the audit log.
+
+Usage:
+    python manage.py audit_partitions                       # Create upcoming partitions
+    python manage.py audit_partitions --retain-months 84    # ...and drop expired months
+    python manage.py audit_partitions --retain-months 84 --dry-run
+
+Intended to run monthly (e.g. cron via ops sidecar).
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+from django.utils import timezone
+
+from apps.audit import partitions
+from apps.audit.models import AuditLog
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming monthly audit_log partitions and drop partitions "
+        "older than the retention period (PostgreSQL only)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Months of partitions to create ahead of the current month (default: 3).",
+        )
+        parser.add_argument(
+            "--retain-months",
+            type=int,
+            default=None,
+            help="Drop partitions entirely older than this many months. Omit to keep everything.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would be created or dropped without changing anything.",
+        )
+        parser.add_argument(
+            "--database",
+            default="audit",
+            help="Database alias holding audit_log (default: audit).",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        dry_run = options["dry_run"]
+        retain_months = options["retain_months"]
+
+        if retain_months is not None and retain_months < 1:
+            raise CommandError("--retain-months must be at least 1.")
+
+        if not partitions.is_partitioned(using):
+            self.stdout.write(self.style.WARNING(
+                "audit_log is not partitioned on this database "
+                "(partitioning is PostgreSQL only) — nothing to do."
+            ))
+            return
+
+        now = timezone.now()
+        if dry_run:
+            self.stdout.write(self.style.WARNING("DRY RUN — no partitions will be changed.\n"))
+
+        # 1. Upcoming partitions
+        if dry_run:
+            self.stdout.write(
+                f"Would ensure partitions through "
+                f"{partitions.add_months(partitions.month_start(now), options['months_ahead']):%Y-%m}."
+            )
+        else:
+            created, blocked = partitions.ensure_partitions(
+                now, months_ahead=options["months_ahead"], using=using,
+            )
+            for name in created:
+                self.stdout.write(f"  Created {name}")
+            for name in blocked:
+                self.stdout.write(self.style.WARNING(
+                    f"  Could not create {name}: the default partition already holds "
+                    f"rows for that month. Move them before re-running."
+                ))
+            if not created and not blocked:
+                self.stdout.write("Upcoming partitions already exist.")
+
+        default_rows = partitions.default_partition_rows(using)
+        if default_rows:
+            self.stdout.write(self.style.WARNING(
+                f"{default_rows} row(s) are in {partitions.DEFAULT_PARTITION} — "
+                f"run this command more often or with a larger --months-ahead."
+            ))
+
+        # 2. Retention
+        if retain_months is None:
+            return
+
+        cutoff = partitions.add_months(partitions.month_start(now), -retain_months)
+        expired = partitions.expired_partitions(cutoff, using=using)
+        if not expired:
+            self.stdout.write(self.style.SUCCESS(
+                f"No partitions older than {cutoff:%Y-%m-%d} to drop."
+            ))
+            return
+
+        dropped = []
+        for partition in expired:
+            if dry_run:
+                self.stdout.write(f"  Would drop {partition.name} (before {partition.upper:%Y-%m-%d})")
+                continue
+            try:
+                partitions.drop_partition(partition.name, using=using)
+            except DatabaseError as e:
+                raise CommandError(
+                    f"Could not drop {partition.name}: {e}. Dropping partitions "
+                    f"needs the role that owns audit_log."
+                ) from e
+            dropped.append(partition.name)
+            self.stdout.write(f"  Dropped {partition.name}")
+
+        if dry_run:
+            return
+
+        AuditLog.objects.using(using).create(
+            event_timestamp=timezone.now(),
+            user_display="System",
+            action="delete",
+            resource_type="audit_log",
+            metadata={
+                "retention_months": retain_months,
+                "cutoff": cutoff.isoformat(),
+                "partitions_dropped": dropped,
+            },
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Dropped {len(dropped)} partition(s) older than {cutoff:%Y-%m-%d}."
+        ))
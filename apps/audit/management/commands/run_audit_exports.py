@@ -0,0 +1,58 @@
+"""
+Management command to write queued background audit log exports.
+
+Usage:
+    python manage.py run_audit_exports
+    python manage.py run_audit_exports --stale-minutes 30
+
+Audit log exports larger than AUDIT_EXPORT_BACKGROUND_ROWS are queued on a
+SecureExportLink instead of streamed (see apps/audit/export.py). Schedule
+this command every minute or two (per agency: run_across_tenants
+run_audit_exports). Jobs left "running" by a runner that died are marked
+failed so the requester sees an error instead of waiting forever.
+"""
+import logging
+
+from django.core.management.base import BaseCommand
+
+from apps.audit import export
+from apps.reports.models import SecureExportLink
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Write queued background audit log exports."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stale-minutes",
+            type=int,
+            default=export.STALE_JOB_MINUTES,
+            help=(
+                "Mark jobs still running after this many minutes as failed "
+                f"(default {export.STALE_JOB_MINUTES})."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        stale = export.fail_stale_jobs(options["stale_minutes"])
+        if stale:
+            self.stdout.write(self.style.WARNING(f"Marked {stale} interrupted export(s) as failed."))
+
+        queued = SecureExportLink.objects.filter(
+            export_type="audit_log", generation_status="queued",
+        ).select_related("created_by").order_by("created_at")
+
+        written = failed = 0
+        for link in queued:
+            if export.run_export_job(link):
+                written += 1
+            else:
+                link.refresh_from_db(fields=["generation_status"])
+                if link.generation_status == "failed":
+                    failed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} audit log export(s); {failed} failed."
+        ))
@@ -11,6 +11,12 @@ Usage:
     python manage.py security_audit --category=ENC,RBAC  # Specific categories
     python manage.py security_audit --json       # Machine-readable output
     python manage.py security_audit --fail-on-warn  # Exit 1 if warnings (for CI)
+    python manage.py security_audit --enc-scan=sample  # Quick sampled ciphertext check
+    python manage.py security_audit --enc-workers=4 --enc-rescan  # Parallel full rescan
+
+The ENC003 ciphertext check (apps/audit/ciphertext_scan.py) is incremental:
+a full scan remembers how far it got per table, so later runs only check
+new and updated rows.
 """
 
 import json
@@ -22,6 +28,7 @@ from django.core.management.base import BaseCommand
 from django.db import connections
 from django.utils import timezone
 
+from apps.audit import ciphertext_scan
 from apps.auth_app.constants import ALL_PROGRAM_ROLES
 
 
@@ -72,11 +79,48 @@ class Command(BaseCommand):
             action="store_true",
             help="Exit with code 1 if warnings present (for CI).",
         )
+        parser.add_argument(
+            "--enc-scan",
+            choices=["full", "sample"],
+            default="full",
+            help=(
+                "ENC003 ciphertext check: 'full' checks every new or changed row "
+                "in SQL (default); 'sample' checks a random sample per table."
+            ),
+        )
+        parser.add_argument(
+            "--enc-sample-size",
+            type=int,
+            default=1000,
+            help="Rows per table checked by --enc-scan=sample (default: 1000).",
+        )
+        parser.add_argument(
+            "--enc-workers",
+            type=int,
+            default=1,
+            help="Parallel workers for --enc-scan=full (default: 1).",
+        )
+        parser.add_argument(
+            "--enc-chunk-size",
+            type=int,
+            default=50000,
+            help="Rows per chunk for --enc-scan=full (default: 50000).",
+        )
+        parser.add_argument(
+            "--enc-rescan",
+            action="store_true",
+            help="Ignore saved ENC003 progress and scan every row again.",
+        )
 
     def handle(self, *args, **options):
         self.verbose = options["verbose"]
         self.json_output = options["json"]
         self.fail_on_warn = options["fail_on_warn"]
+        self.enc_scan = options["enc_scan"]
+        self.enc_sample_size = options["enc_sample_size"]
+        self.enc_workers = max(1, options["enc_workers"])
+        self.enc_chunk_size = max(1, options["enc_chunk_size"])
+        self.enc_rescan = options["enc_rescan"]
 
         # Parse categories
         all_categories = ["ENC", "RBAC", "AUD", "CFG", "DOC"]
@@ -186,37 +230,36 @@ class Command(BaseCommand):
 
     def _check_encrypted_fields(self):
         """ENC003: Verify encrypted fields contain valid ciphertext."""
-        from apps.auth_app.models import User
-        from apps.clients.models import ClientDetailValue, ClientFile
-
-        issues = []
-        scanned = 0
-
-        # Check ClientFile
-        for client in ClientFile.objects.all().iterator():
-            scanned += 1
-            for field in ["_first_name_encrypted", "_middle_name_encrypted",
-                          "_last_name_encrypted", "_birth_date_encrypted"]:
-                raw = getattr(client, field)
-                if raw and not self._is_valid_ciphertext(raw):
-                    issues.append(f"ClientFile pk={client.pk} {field}")
-
-        # Check User
-        for user in User.objects.all().iterator():
-            scanned += 1
-            raw = getattr(user, "_email_encrypted", None)
-            if raw and not self._is_valid_ciphertext(raw):
-                issues.append(f"User pk={user.pk} _email_encrypted")
-
-        # Check ClientDetailValue
-        for cdv in ClientDetailValue.objects.all().iterator():
-            scanned += 1
-            raw = getattr(cdv, "_value_encrypted", None)
-            if raw and not self._is_valid_ciphertext(raw):
-                issues.append(f"ClientDetailValue pk={cdv.pk} _value_encrypted")
+        if self.enc_scan == "sample":
+            outcomes = [
+                ciphertext_scan.sample_scan(target, self.enc_sample_size)
+                for target in ciphertext_scan.SCAN_TARGETS
+            ]
+        else:
+            state = ciphertext_scan.load_state()
+            outcomes = [
+                ciphertext_scan.full_scan(
+                    target, state,
+                    chunk_size=self.enc_chunk_size,
+                    workers=self.enc_workers,
+                    rescan=self.enc_rescan,
+                    progress=self._scan_progress,
+                )
+                for target in ciphertext_scan.SCAN_TARGETS
+            ]
+
+        issues = [
+            f"{outcome.label} pk={pk} {field}"
+            for outcome in outcomes
+            for pk, field in outcome.issues
+        ]
+        scanned = sum(outcome.scanned for outcome in outcomes)
+        skipped = sum(outcome.skipped for outcome in outcomes)
 
         if issues:
             detail = f"{len(issues)} fields with invalid ciphertext"
+            if self.enc_scan == "sample":
+                detail += f" in a sample of {scanned} records"
             if self.verbose:
                 detail += ": " + ", ".join(issues[:5])
                 if len(issues) > 5:
@@ -225,54 +268,61 @@ class Command(BaseCommand):
                 "ENC003", "No plaintext in encrypted fields",
                 CheckResult.FAIL, detail
             )
-        else:
-            return CheckResult(
-                "ENC003", "No plaintext in encrypted fields",
-                CheckResult.PASS, f"Scanned {scanned} records"
+
+        if self.enc_scan == "sample":
+            bound = ciphertext_scan.invalid_rate_upper_bound(scanned, 0)
+            detail = (
+                f"Sampled {scanned} records; invalid rate below "
+                f"{bound:.2%} at 95% confidence"
             )
+        else:
+            detail = f"Scanned {scanned} records"
+            if skipped:
+                detail += f" ({skipped} unchanged since last scan)"
+        return CheckResult(
+            "ENC003", "No plaintext in encrypted fields",
+            CheckResult.PASS, detail
+        )
+
+    def _scan_progress(self, label, done, total):
+        if self.verbose and not self.json_output and total > 1:
+            self.stderr.write(f"  ENC003 {label}: chunk {done}/{total}")
 
     def _is_valid_ciphertext(self, raw):
         """Check if data looks like valid Fernet ciphertext."""
-        if isinstance(raw, memoryview):
-            raw = bytes(raw)
-        if not raw or raw == b"":
-            return True  # Empty is OK
-        # Fernet ciphertext is base64, minimum ~57 bytes decoded
-        # and starts with version byte 0x80
-        try:
-            import base64
-            decoded = base64.urlsafe_b64decode(raw)
-            return len(decoded) >= 57 and decoded[0] == 0x80
-        except Exception:
-            return False
+        return ciphertext_scan.is_valid_ciphertext(raw)
 
     def _check_sensitive_custom_fields(self):
         """ENC004: Verify sensitive custom fields use encryption."""
+        from django.db.models import Q
+        from django.db.models.functions import Trim
+
         from apps.clients.models import ClientDetailValue, CustomFieldDefinition
 
-        sensitive_defs = CustomFieldDefinition.objects.filter(is_sensitive=True)
-        if not sensitive_defs.exists():
+        sensitive_count = CustomFieldDefinition.objects.filter(is_sensitive=True).count()
+        if not sensitive_count:
             return CheckResult(
                 "ENC004", "Sensitive custom fields encrypted",
                 CheckResult.PASS, "No sensitive fields defined"
             )
 
-        issues = []
-        for field_def in sensitive_defs:
-            # Check if any values have plaintext instead of encrypted
-            for cdv in ClientDetailValue.objects.filter(field_def=field_def):
-                if cdv.value and cdv.value.strip():  # Has plaintext
-                    if not cdv._value_encrypted:  # No encrypted value
-                        issues.append(f"CustomField '{field_def.name}' pk={cdv.pk}")
+        # Plaintext value with no encrypted value, counted in one query
+        unencrypted = (
+            ClientDetailValue.objects.filter(field_def__is_sensitive=True)
+            .annotate(trimmed=Trim("value"))
+            .exclude(trimmed="")
+            .filter(Q(_value_encrypted=b"") | Q(_value_encrypted__isnull=True))
+            .count()
+        )
 
-        if issues:
+        if unencrypted:
             return CheckResult(
                 "ENC004", "Sensitive custom fields encrypted",
-                CheckResult.FAIL, f"{len(issues)} unencrypted sensitive values"
+                CheckResult.FAIL, f"{unencrypted} unencrypted sensitive values"
             )
         return CheckResult(
             "ENC004", "Sensitive custom fields encrypted",
-            CheckResult.PASS, f"{sensitive_defs.count()} sensitive fields checked"
+            CheckResult.PASS, f"{sensitive_count} sensitive fields checked"
         )
 
     # -------------------------------------------------------------------------
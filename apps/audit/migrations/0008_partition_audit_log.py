@@ -0,0 +1,131 @@
+"""Convert audit_log into a table range-partitioned by month on event_timestamp.
+
+PostgreSQL only — SQLite keeps a plain table.
+
+Existing rows are not copied. The current table is renamed to
+audit_log_legacy and attached as the first partition (MINVALUE up to the
+start of next month). Attaching reads the rows but does not rewrite them:
+a CHECK constraint matching the partition range is added NOT VALID and then
+validated, which is the one scan that proves the rows fit, and ATTACH
+PARTITION skips its own check because of it. Attaching also builds the
+(id, event_timestamp) key index on the legacy table, which reads it again.
+New monthly partitions start after it, plus a default partition. The
+audit_partitions command creates further months ahead of time and drops
+expired ones.
+
+A partitioned table's primary key must include the partition column, so the
+database key becomes (id, event_timestamp). ids still come from a single
+sequence and stay unique; Django keeps treating id as the primary key.
+"""
+from datetime import datetime, timezone
+
+from django.db import migrations
+
+MONTHS_AHEAD = 3
+
+
+def _month_start(value):
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_month(value):
+    if value.month == 12:
+        return value.replace(year=value.year + 1, month=1)
+    return value.replace(month=value.month + 1)
+
+
+def partition_audit_log(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relname = 'audit_log' AND n.nspname = current_schema()"
+        )
+        if cursor.fetchone()[0] == "p":
+            return  # Already partitioned
+
+        cursor.execute("SELECT COALESCE(MAX(id), 0), MAX(event_timestamp), COUNT(*) > 0 FROM audit_log")
+        max_id, max_timestamp, has_rows = cursor.fetchone()
+
+        # Detach the id generator from the old table: identity column
+        # (Django >= 4.1) or serial sequence (older databases).
+        cursor.execute(
+            "SELECT attidentity FROM pg_attribute "
+            "WHERE attrelid = 'audit_log'::regclass AND attname = 'id'"
+        )
+        if cursor.fetchone()[0]:
+            cursor.execute("ALTER TABLE audit_log ALTER COLUMN id DROP IDENTITY")
+        else:
+            cursor.execute("SELECT pg_get_serial_sequence('audit_log', 'id')")
+            sequence = cursor.fetchone()[0]
+            cursor.execute("ALTER TABLE audit_log ALTER COLUMN id DROP DEFAULT")
+            if sequence:
+                cursor.execute(f"DROP SEQUENCE {sequence}")
+
+        cursor.execute("ALTER TABLE audit_log RENAME TO audit_log_legacy")
+        cursor.execute(
+            "ALTER TABLE audit_log_legacy RENAME CONSTRAINT audit_log_pkey TO audit_log_legacy_pkey"
+        )
+
+        cursor.execute(
+            "CREATE TABLE audit_log (LIKE audit_log_legacy INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (event_timestamp)"
+        )
+        cursor.execute("ALTER TABLE audit_log ADD PRIMARY KEY (id, event_timestamp)")
+        cursor.execute("CREATE SEQUENCE audit_log_id_seq AS bigint OWNED BY audit_log.id")
+        cursor.execute("ALTER TABLE audit_log ALTER COLUMN id SET DEFAULT nextval('audit_log_id_seq')")
+        cursor.execute("SELECT setval('audit_log_id_seq', %s, false)", [max_id + 1])
+
+        next_month = _add_month(_month_start(datetime.now(timezone.utc)))
+        if has_rows:
+            # Future-dated rows (clock skew) must still fit the legacy range
+            if max_timestamp is not None and max_timestamp >= next_month:
+                next_month = _add_month(_month_start(max_timestamp))
+            # Prove the range up front so ATTACH PARTITION does not scan again
+            cursor.execute(
+                "ALTER TABLE audit_log_legacy ADD CONSTRAINT audit_log_legacy_range "
+                "CHECK (event_timestamp IS NOT NULL AND event_timestamp < %s) NOT VALID",
+                [next_month],
+            )
+            cursor.execute("ALTER TABLE audit_log_legacy VALIDATE CONSTRAINT audit_log_legacy_range")
+            cursor.execute(
+                "ALTER TABLE audit_log ATTACH PARTITION audit_log_legacy "
+                "FOR VALUES FROM (MINVALUE) TO (%s)",
+                [next_month],
+            )
+            # The partition bound now enforces the same range
+            cursor.execute("ALTER TABLE audit_log_legacy DROP CONSTRAINT audit_log_legacy_range")
+            month = next_month
+        else:
+            cursor.execute("DROP TABLE audit_log_legacy")
+            month = _month_start(datetime.now(timezone.utc))
+
+        last = next_month
+        for _ in range(MONTHS_AHEAD):
+            last = _add_month(last)
+        while month <= last:
+            following = _add_month(month)
+            cursor.execute(
+                f"CREATE TABLE audit_log_y{month.year:04d}m{month.month:02d} "
+                "PARTITION OF audit_log FOR VALUES FROM (%s) TO (%s)",
+                [month, following],
+            )
+            month = following
+
+        cursor.execute("CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0007_auditlog_tenant_schema"),
+    ]
+
+    operations = [
+        # Reversing would mean copying every row back into a plain table;
+        # restore from backup instead.
+        migrations.RunPython(partition_audit_log, migrations.RunPython.noop),
+    ]
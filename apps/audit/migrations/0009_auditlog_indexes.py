@@ -0,0 +1,61 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:17
+
+from django.db import migrations, models
+
+
+def add_user_display_trigram_index(apps, schema_editor):
+    """GIN trigram index for the viewer's user_display icontains filter.
+
+    PostgreSQL only, and only when pg_trgm can be enabled — it needs CREATE
+    privilege on the database. Without it the filter still works, using the
+    partition pruning and the other indexes to narrow the scan.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if not cursor.fetchone():
+            cursor.execute("SAVEPOINT audit_trgm")
+            try:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT audit_trgm")
+                return
+            cursor.execute("RELEASE SAVEPOINT audit_trgm")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS audit_log_user_display_trgm "
+            "ON audit_log USING gin (upper(user_display) gin_trgm_ops)"
+        )
+
+
+def drop_user_display_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS audit_log_user_display_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0008_partition_audit_log'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['-event_timestamp', '-id'], name='audit_log_ts_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['program_id', '-event_timestamp'], name='audit_log_program_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['resource_type', 'resource_id', '-event_timestamp'], name='audit_log_resource_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['action', '-event_timestamp'], name='audit_log_action_ts_idx'),
+        ),
+        migrations.RunPython(add_user_display_trigram_index, drop_user_display_trigram_index),
+    ]
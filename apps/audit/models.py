@@ -121,6 +121,23 @@ class AuditLog(models.Model):
         ordering = ["-event_timestamp"]
         # Django-level protection — real protection is at PostgreSQL role level
         managed = True
+        # On PostgreSQL the table is range-partitioned by month on
+        # event_timestamp (migration 0008, see apps/audit/partitions.py), so
+        # every index is created per partition and date filters prune whole
+        # months before any index is read.
+        indexes = [
+            # Audit viewer keyset pagination: ORDER BY event_timestamp DESC, id DESC
+            models.Index(fields=["-event_timestamp", "-id"], name="audit_log_ts_id_idx"),
+            # Program manager scoping (program_id IN / = ...)
+            models.Index(fields=["program_id", "-event_timestamp"], name="audit_log_program_ts_idx"),
+            # program_audit_log: resource_type="clients" AND resource_id IN (...)
+            models.Index(
+                fields=["resource_type", "resource_id", "-event_timestamp"],
+                name="audit_log_resource_ts_idx",
+            ),
+            # Action filter and compliance_summary per-action counts
+            models.Index(fields=["action", "-event_timestamp"], name="audit_log_action_ts_idx"),
+        ]
 
     def __str__(self):
         return f"{self.event_timestamp} | {self.user_display} | {self.action} {self.resource_type}"
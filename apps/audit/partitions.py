@@ -0,0 +1,186 @@
+"""Monthly range partitions for the audit_log table (PostgreSQL only).
+
+Migration 0008 converts audit_log into a table partitioned by
+event_timestamp. Rows written before the conversion stay in one partition,
+audit_log_legacy, bounded from MINVALUE to the month after the conversion.
+After that there is one partition per calendar month (audit_log_y2026m03)
+plus a default partition that catches rows outside every monthly range, so
+an INSERT never fails because maintenance fell behind.
+
+Retention works on whole partitions: a month is removed by detaching and
+dropping its table, never with DELETE (the audit role has no DELETE
+privilege, and row-by-row deletes over 30M rows would bloat the table).
+
+These helpers are used by the audit_partitions management command. On
+SQLite (tests, local development) audit_log stays a plain table;
+is_partitioned() returns False there and callers should stop.
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connections
+
+TABLE = "audit_log"
+LEGACY_PARTITION = "audit_log_legacy"
+DEFAULT_PARTITION = "audit_log_default"
+
+_BOUND_RE = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+
+
+@dataclass
+class Partition:
+    name: str
+    # None means MINVALUE / MAXVALUE (legacy) or "no bounds" (default)
+    lower: datetime | None
+    upper: datetime | None
+    is_default: bool = False
+
+
+def month_start(value):
+    """First instant of value's month, in UTC."""
+    value = value.astimezone(dt_timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value, months):
+    month_index = value.month - 1 + months
+    return value.replace(year=value.year + month_index // 12, month=month_index % 12 + 1)
+
+
+def partition_name(month):
+    return f"{TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(using="audit"):
+    """True if audit_log is a partitioned table on this database."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relkind FROM pg_class c "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relname = %s AND n.nspname = current_schema()",
+            [TABLE],
+        )
+        row = cursor.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def _parse_bound(value):
+    value = value.strip()
+    if value.upper() in ("MINVALUE", "MAXVALUE"):
+        return None
+    return datetime.fromisoformat(value.strip("'"))
+
+
+def list_partitions(using="audit"):
+    """Return audit_log partitions ordered by lower bound (default last)."""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+            "FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "JOIN pg_namespace n ON n.oid = parent.relnamespace "
+            "WHERE parent.relname = %s AND n.nspname = current_schema()",
+            [TABLE],
+        )
+        rows = cursor.fetchall()
+
+    partitions = []
+    for name, bound in rows:
+        if bound == "DEFAULT":
+            partitions.append(Partition(name, None, None, is_default=True))
+            continue
+        match = _BOUND_RE.search(bound)
+        if not match:
+            continue
+        partitions.append(Partition(name, _parse_bound(match.group(1)), _parse_bound(match.group(2))))
+
+    partitions.sort(key=lambda p: (
+        p.is_default,
+        p.lower or datetime.min.replace(tzinfo=dt_timezone.utc),
+    ))
+    return partitions
+
+
+def ensure_partitions(now, months_ahead=3, using="audit"):
+    """Create monthly partitions from now's month through months_ahead.
+
+    Months already covered by an existing partition (including the legacy
+    one) are skipped. PostgreSQL refuses to create a partition whose range
+    already has rows in the default partition; such months are skipped and
+    reported so an operator can move the rows.
+
+    Returns (created, blocked) lists of partition names.
+    """
+    connection = connections[using]
+    partitions = list_partitions(using)
+    ranges = [p for p in partitions if not p.is_default]
+    has_default = any(p.is_default for p in partitions)
+    quote = connection.ops.quote_name
+
+    created, blocked = [], []
+    month = month_start(now)
+    last = add_months(month, months_ahead)
+    with connection.cursor() as cursor:
+        while month <= last:
+            next_month = add_months(month, 1)
+            covered = any(
+                (p.lower is None or p.lower <= month) and (p.upper is None or p.upper >= next_month)
+                for p in ranges
+            )
+            name = partition_name(month)
+            if not covered and has_default:
+                cursor.execute(
+                    f"SELECT EXISTS (SELECT 1 FROM {quote(DEFAULT_PARTITION)} "
+                    "WHERE event_timestamp >= %s AND event_timestamp < %s)",
+                    [month, next_month],
+                )
+                if cursor.fetchone()[0]:
+                    blocked.append(name)
+                    covered = True
+            if not covered:
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {quote(name)} PARTITION OF {quote(TABLE)} "
+                    "FOR VALUES FROM (%s) TO (%s)",
+                    [month, next_month],
+                )
+                created.append(name)
+            month = next_month
+    return created, blocked
+
+
+def expired_partitions(cutoff, using="audit"):
+    """Partitions whose every row is older than cutoff.
+
+    A partition qualifies only when its upper bound is at or before cutoff,
+    so a month is kept until all of it is past the retention period. The
+    default partition is never returned.
+    """
+    return [
+        p for p in list_partitions(using)
+        if not p.is_default and p.upper is not None and p.upper <= cutoff
+    ]
+
+
+def drop_partition(name, using="audit"):
+    """Detach a partition from audit_log, then drop it."""
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} DETACH PARTITION {quote(name)}")
+        cursor.execute(f"DROP TABLE {quote(name)}")
+
+
+def default_partition_rows(using="audit"):
+    """Row count in the default partition — non-zero means maintenance fell behind."""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT count(*) FROM {connection.ops.quote_name(DEFAULT_PARTITION)}"
+        )
+        return cursor.fetchone()[0]
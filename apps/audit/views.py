@@ -1,24 +1,27 @@
 """Audit log viewer — admin and program manager access."""
-import csv
+import json
+import os
+import uuid
 from datetime import datetime, timedelta
 from urllib.parse import urlencode
 
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
 from django.db import models
 from django.db.models import Count, Q
 from django.db.models.functions import TruncDate
-from django.http import HttpResponse, HttpResponseForbidden
+from django.http import HttpResponseForbidden, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from apps.auth_app.constants import ROLE_PROGRAM_MANAGER
 from apps.auth_app.decorators import admin_required, requires_permission
-from apps.programs.access import get_user_program_ids
-from apps.reports.csv_utils import sanitise_csv_row
 
+from . import export
+from .filters import filter_audit_queryset, scoped_audit_queryset
 from .models import AuditLog
+from .pagination import keyset_page
 
 # Filter keys supported by the admin audit log views.
 _ADMIN_FILTER_KEYS = ("date_from", "date_to", "user_display", "action", "resource_type", "demo_filter")
@@ -35,59 +38,15 @@ def _apply_audit_filters(qs, request, filter_keys=_ADMIN_FILTER_KEYS):
     - filter_query: URL-encoded query string for pagination links
     """
     vals = {key: request.GET.get(key, "") for key in filter_keys}
-
-    if vals.get("demo_filter") == "real":
-        qs = qs.filter(is_demo_context=False)
-    elif vals.get("demo_filter") == "demo":
-        qs = qs.filter(is_demo_context=True)
-
-    if vals.get("date_from"):
-        try:
-            dt = datetime.strptime(vals["date_from"], "%Y-%m-%d")
-            qs = qs.filter(event_timestamp__gte=timezone.make_aware(dt))
-        except ValueError:
-            pass
-
-    if vals.get("date_to"):
-        try:
-            dt = datetime.strptime(vals["date_to"], "%Y-%m-%d")
-            dt = dt.replace(hour=23, minute=59, second=59)
-            qs = qs.filter(event_timestamp__lte=timezone.make_aware(dt))
-        except ValueError:
-            pass
-
-    if vals.get("user_display"):
-        qs = qs.filter(user_display__icontains=vals["user_display"])
-
-    if vals.get("action"):
-        qs = qs.filter(action=vals["action"])
-
-    if vals.get("resource_type"):
-        qs = qs.filter(resource_type__icontains=vals["resource_type"])
+    qs = filter_audit_queryset(qs, vals)
 
     filter_query = urlencode({k: v for k, v in vals.items() if v})
     return qs, vals, filter_query
 
 
 def _scoped_audit_qs(request):
-    """Return an AuditLog queryset scoped to the user's access level.
-
-    Admins see all entries. Program managers see entries scoped to their
-    programs (audit.view: PROGRAM in permissions matrix). Non-admin users
-    without PM roles are already blocked by the @requires_permission
-    decorator, so this function only needs to handle admin vs PM scoping.
-    """
-    qs = AuditLog.objects.using("audit").all()
-
-    if not getattr(request.user, "is_admin", False):
-        # Scope to programs where the user has an active role.
-        # request.user_program_role is only set by middleware for
-        # client-scoped URLs, so we query program IDs directly
-        # (consistent with all other admin views).
-        user_program_ids = get_user_program_ids(request.user)
-        qs = qs.filter(program_id__in=user_program_ids)
-
-    return qs
+    """Return an AuditLog queryset scoped to the requesting user's access level."""
+    return scoped_audit_queryset(request.user)
 
 
 @login_required
@@ -98,10 +57,7 @@ def audit_log_list(request):
     qs = _scoped_audit_qs(request)
     qs, vals, filter_query = _apply_audit_filters(qs, request)
 
-    # Paginate
-    paginator = Paginator(qs, 50)
-    page_number = request.GET.get("page")
-    page = paginator.get_page(page_number)
+    page = keyset_page(qs, request, per_page=50)
 
     context = {
         "page": page,
@@ -122,33 +78,44 @@ def audit_log_list(request):
 @login_required
 @requires_permission("audit.view", allow_admin=True)
 def audit_log_export(request):
-    """Export filtered audit log as CSV."""
+    """Export filtered audit log as CSV, or gzipped CSV with ?compress=gzip.
+
+    The file is streamed as rows are read. Exports over
+    AUDIT_EXPORT_BACKGROUND_ROWS are queued for the run_audit_exports job
+    instead and downloaded through a secure export link.
+    """
 
     qs = _scoped_audit_qs(request)
     qs, vals, _ = _apply_audit_filters(qs, request)
+    compress = request.GET.get("compress") == "gzip"
+    filters_used = {k: v for k, v in vals.items() if v and k != "demo_filter"}
+
+    threshold = getattr(settings, "AUDIT_EXPORT_BACKGROUND_ROWS", 0)
+    row_count = qs.count() if threshold else None
+    background = bool(threshold) and row_count > threshold
 
-    # Build CSV response
     today = timezone.now().strftime("%Y-%m-%d")
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = f'attachment; filename="audit_log_{today}.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow(sanitise_csv_row(["Timestamp", "User", "IP Address", "Action", "Resource Type", "Resource ID", "Program ID", "Demo Context"]))
-
-    for entry in qs.iterator():
-        writer.writerow(sanitise_csv_row([
-            entry.event_timestamp.strftime("%Y-%m-%d %H:%M"),
-            entry.user_display,
-            entry.ip_address or "",
-            entry.action,
-            entry.resource_type,
-            entry.resource_id or "",
-            entry.program_id or "",
-            "Yes" if entry.is_demo_context else "No",
-        ]))
+    filename = f"audit_log_{today}.csv"
+    if compress or background:
+        filename += ".gz"
+
+    if background:
+        link = _queue_background_export(request, filename, vals)
+        response = render(request, "reports/export_link_preparing.html", {
+            "link": link,
+            "row_count": row_count,
+        })
+    else:
+        response = StreamingHttpResponse(
+            export.export_chunks(qs, compress=compress),
+            content_type="application/gzip" if compress else "text/csv",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
 
     # Log the export action
-    filters_used = {k: v for k, v in vals.items() if v and k != "demo_filter"}
+    metadata = {"filters": filters_used}
+    if background:
+        metadata.update({"background": True, "rows": row_count, "link_id": str(link.pk)})
 
     AuditLog.objects.using("audit").create(
         event_timestamp=timezone.now(),
@@ -157,12 +124,57 @@ def audit_log_export(request):
         action="export",
         resource_type="audit_log",
         is_demo_context=getattr(request.user, "is_demo", False),
-        metadata={"filters": filters_used},
+        metadata=metadata,
     )
 
     return response
 
 
+def _queue_background_export(request, filename, vals):
+    """Create a secure link for a large audit export, queued for run_audit_exports.
+
+    The link records the filters rather than the queryset; the job rebuilds
+    the queryset from them, scoped to the requesting user's access.
+
+    Audit rows hold staff names, usernames and IP addresses, so the link is
+    marked as containing PII and follows the same download re-check and
+    elevated-export rules as other PII exports.
+    """
+    from apps.auth_app.constants import ROLE_PROGRAM_MANAGER
+    from apps.programs.models import UserProgramRole
+    from apps.reports.models import SecureExportLink
+    from apps.reports.views import _notify_admins_elevated_export
+
+    export_dir = settings.SECURE_EXPORT_DIR
+    os.makedirs(export_dir, exist_ok=True)
+    link_id = uuid.uuid4()
+    file_path = os.path.join(export_dir, f"{link_id}_{filename}")
+
+    expiry_hours = getattr(settings, "SECURE_EXPORT_LINK_EXPIRY_HOURS", 24)
+    # PM exports of PII are always elevated, as in _save_export_and_create_link()
+    is_elevated = UserProgramRole.objects.filter(
+        user=request.user, role=ROLE_PROGRAM_MANAGER, status="active",
+    ).exists()
+    link = SecureExportLink.objects.create(
+        id=link_id,
+        created_by=request.user,
+        expires_at=timezone.now() + timedelta(hours=expiry_hours),
+        export_type="audit_log",
+        filters_json=json.dumps(vals),
+        client_count=0,
+        includes_notes=False,
+        contains_pii=True,
+        recipient="Audit log export",
+        filename=filename,
+        file_path=file_path,
+        is_elevated=is_elevated,
+        generation_status="queued",
+    )
+    if is_elevated:
+        _notify_admins_elevated_export(link, request)
+    return link
+
+
 @login_required
 def program_audit_log(request, program_id):
     """Program manager view: audit log for their program's clients.
@@ -199,10 +211,7 @@ def program_audit_log(request, program_id):
 
     qs, vals, filter_query = _apply_audit_filters(qs, request, _PROGRAM_FILTER_KEYS)
 
-    # Paginate
-    paginator = Paginator(qs, 50)
-    page_number = request.GET.get("page")
-    page = paginator.get_page(page_number)
+    page = keyset_page(qs, request, per_page=50)
 
     context = {
         "program": program,
@@ -0,0 +1,168 @@
+"""Maintained activity summaries and last-contact dates for participants.
+
+Each participant has a ClientActivitySummary row: their latest progress
+note (not cancelled), communication and meeting, their note count, and
+their open follow-ups. Their last contact — the latest of the three dates
+— is also stored on ClientFile.last_contact_at, which the participant list
+sorts and pages on. Lists and dashboards read these rows instead of
+aggregating the participant's notes on every page load.
+
+The rows are kept current by the signal receivers in
+apps/clients/signals.py. Code that writes notes, communications or
+meetings with queryset.update() or bulk_create() (merges, follow-up
+completion, reminder batches, demo seeding) skips those signals and calls
+refresh_activity() itself. `manage.py rebuild_client_activity` recomputes
+every row.
+"""
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from apps.notes.models import ProgressNote
+
+from .models import ClientActivitySummary, ClientFile
+
+BATCH_SIZE = 500
+
+SUMMARY_FIELDS = [
+    "last_note_at",
+    "last_communication_at",
+    "last_meeting_at",
+    "note_count",
+    "open_follow_ups",
+    "next_follow_up_date",
+]
+
+
+def compute_activity(client_ids):
+    """Aggregate each client's activity from the source rows.
+
+    Returns dict: {client_id: {summary field: value}}, with an entry for
+    every id given.
+
+    Performance: 3 aggregate queries, however many clients.
+    """
+    from apps.communications.models import Communication
+    from apps.events.models import Meeting
+
+    result = {
+        client_id: {
+            "last_note_at": None,
+            "last_communication_at": None,
+            "last_meeting_at": None,
+            "note_count": 0,
+            "open_follow_ups": 0,
+            "next_follow_up_date": None,
+        }
+        for client_id in client_ids
+    }
+    if not result:
+        return result
+    ids = list(result)
+
+    # Query 1: notes — latest, count, and open follow-ups per client
+    open_follow_up = Q(follow_up_date__isnull=False, follow_up_completed_at__isnull=True)
+    notes = (
+        ProgressNote.objects.filter(client_file_id__in=ids, status="default")
+        .values("client_file_id")
+        .annotate(
+            last=Max("created_at"),
+            count=Count("id"),
+            open=Count("id", filter=open_follow_up),
+            next=Min("follow_up_date", filter=open_follow_up),
+        )
+    )
+    for row in notes:
+        result[row["client_file_id"]].update(
+            last_note_at=row["last"],
+            note_count=row["count"],
+            open_follow_ups=row["open"],
+            next_follow_up_date=row["next"],
+        )
+
+    # Query 2: Last communication date per client
+    communications = (
+        Communication.objects.filter(client_file_id__in=ids)
+        .values("client_file_id").annotate(last=Max("created_at"))
+        .values_list("client_file_id", "last")
+    )
+    for client_id, last in communications:
+        result[client_id]["last_communication_at"] = last
+
+    # Query 3: Last meeting date per client (Meeting -> Event -> client_file)
+    meetings = (
+        Meeting.objects.filter(event__client_file_id__in=ids)
+        .values("event__client_file_id").annotate(last=Max("event__start_timestamp"))
+        .values_list("event__client_file_id", "last")
+    )
+    for client_id, last in meetings:
+        result[client_id]["last_meeting_at"] = last
+
+    return result
+
+
+def last_contact(activity):
+    """The latest of a summary's note, communication and meeting dates."""
+    dates = [
+        activity["last_note_at"],
+        activity["last_communication_at"],
+        activity["last_meeting_at"],
+    ]
+    valid_dates = [d for d in dates if d is not None]
+    return max(valid_dates) if valid_dates else None
+
+
+def last_contact_dates(client_ids):
+    """Batch-query last contact dates for a list of clients.
+
+    Returns dict: {client_id: datetime or None}
+    """
+    return {
+        client_id: last_contact(activity)
+        for client_id, activity in compute_activity(client_ids).items()
+    }
+
+
+def refresh_activity(client_ids):
+    """Recompute the activity summaries and last-contact dates of these clients.
+
+    Only rows whose values changed are written. ClientFile.updated_at is
+    left alone, so a refresh doesn't reorder lists sorted by last edit.
+    Returns the number of clients whose rows changed.
+    """
+    client_ids = list(dict.fromkeys(client_ids))
+    if not client_ids:
+        return 0
+    computed = compute_activity(client_ids)
+    existing = {
+        summary.client_file_id: summary
+        for summary in ClientActivitySummary.objects.filter(client_file_id__in=client_ids)
+    }
+    now = timezone.now()
+    changed = set()
+    to_create, to_update = [], []
+    contact_updates = []
+    for client_id, current in ClientFile.objects.filter(
+        pk__in=client_ids,
+    ).values_list("pk", "last_contact_at"):
+        values = computed[client_id]
+        summary = existing.get(client_id)
+        if summary is None:
+            to_create.append(ClientActivitySummary(client_file_id=client_id, **values))
+            changed.add(client_id)
+        elif any(getattr(summary, name) != value for name, value in values.items()):
+            for name, value in values.items():
+                setattr(summary, name, value)
+            summary.updated_at = now
+            to_update.append(summary)
+            changed.add(client_id)
+        contact = last_contact(values)
+        if contact != current:
+            contact_updates.append(ClientFile(pk=client_id, last_contact_at=contact))
+            changed.add(client_id)
+
+    ClientActivitySummary.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+    ClientActivitySummary.objects.bulk_update(
+        to_update, SUMMARY_FIELDS + ["updated_at"], batch_size=BATCH_SIZE,
+    )
+    ClientFile.objects.bulk_update(contact_updates, ["last_contact_at"], batch_size=BATCH_SIZE)
+    return len(changed)
@@ -0,0 +1,222 @@
+"""Set-based enrolment changes for the bulk transfer and discharge wizards.
+
+The wizards used to loop over the selected participants, running several
+queries and saves for each one, so closing a large program at year end
+could time out. These functions do the same work in a fixed number of
+queries, however many participants are selected:
+
+  1. Lock every affected service episode with one SELECT ... FOR UPDATE.
+  2. Work out each episode's new status in memory.
+  3. Write episode updates, new episodes, status history rows and audit
+     entries with bulk_update / bulk_create, in one transaction.
+
+New episodes are created with bulk_create, which skips model signals, so
+post_save is sent for each one afterwards (survey enrolment rules listen
+for it). bulk_update skips signals too, so cached Outcome Insights for the
+participants and programs involved are invalidated explicitly.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from apps.audit.models import AuditLog
+from apps.reports.insights_cache import bump_for_clients_on_commit
+
+from .models import ClientProgramEnrolment, ServiceEpisodeStatusChange
+
+BATCH_SIZE = 500
+
+
+def _status_change(episode, status, reason, user):
+    return ServiceEpisodeStatusChange(
+        episode=episode, status=status, reason=reason, changed_by=user,
+    )
+
+
+def _audit_entries(client_ids, user, now, metadata):
+    """One enrolment audit entry per participant, as the wizard always wrote."""
+    return [
+        AuditLog(
+            event_timestamp=now,
+            user_id=user.pk,
+            user_display=getattr(user, "display_name", str(user)),
+            action="update",
+            resource_type="enrolment",
+            resource_id=client_id,
+            is_demo_context=getattr(user, "is_demo", False),
+            metadata=metadata,
+        )
+        for client_id in client_ids
+    ]
+
+
+def _derive_episode_types(episodes):
+    """Set episode_type on unsaved episodes as ServiceEpisode.save() would.
+
+    Reads the clients' finished episodes in one query instead of two
+    queries per new episode.
+    """
+    client_ids = {ep.client_file_id for ep in episodes}
+    finished = ClientProgramEnrolment.objects.filter(
+        client_file_id__in=client_ids, status="finished",
+    ).values_list("client_file_id", "program_id", "end_reason")
+    programs_finished: dict[int, set] = {}
+    transferred_from: dict[int, set] = {}
+    for client_id, program_id, end_reason in finished:
+        programs_finished.setdefault(client_id, set()).add(program_id)
+        if end_reason == "transferred":
+            transferred_from.setdefault(client_id, set()).add(program_id)
+
+    for ep in episodes:
+        if ep.episode_type:
+            continue
+        if ep.program_id in programs_finished.get(ep.client_file_id, ()):
+            ep.episode_type = "re_enrolment"
+        elif transferred_from.get(ep.client_file_id, set()) - {ep.program_id}:
+            ep.episode_type = "transfer_in"
+        else:
+            ep.episode_type = "new_intake"
+
+
+def transfer_clients(clients, destination, user, source_program_id=None, reason=""):
+    """Move participants to `destination`, finishing their source episodes.
+
+    Mirrors the per-participant steps of the bulk transfer wizard: active
+    episodes in the source program (if given) are finished as
+    "transferred"; participants without an episode in the destination get
+    a new active one, and an inactive destination episode is reactivated.
+
+    Returns the number of participants whose enrolments changed.
+    """
+    clients = {client.pk: client for client in clients}
+    client_ids = list(clients)
+    now = timezone.now()
+    source_id = int(source_program_id) if source_program_id else None
+    programs = {destination.pk, source_id} - {None}
+
+    with transaction.atomic():
+        locked = list(
+            ClientProgramEnrolment.objects.select_for_update()
+            .filter(client_file_id__in=client_ids, program_id__in=programs)
+            .order_by("pk")
+        )
+
+        finished, reactivated, created = [], [], []
+        changed_clients = set()
+        if source_id:
+            for ep in locked:
+                if ep.program_id == source_id and ep.status == "active":
+                    ep.status = "finished"
+                    ep.ended_at = now
+                    ep.unenrolled_at = now
+                    ep.end_reason = "transferred"
+                    finished.append(ep)
+                    changed_clients.add(ep.client_file_id)
+
+        # The destination episode the wizard's get_or_create would return
+        destination_episode = {}
+        for ep in locked:
+            if ep.program_id == destination.pk:
+                destination_episode.setdefault(ep.client_file_id, ep)
+        for client_id in client_ids:
+            ep = destination_episode.get(client_id)
+            if ep is None:
+                created.append(ClientProgramEnrolment(
+                    client_file=clients[client_id], program=destination,
+                    status="active", started_at=now,
+                ))
+                changed_clients.add(client_id)
+            elif ep.status != "active":
+                ep.status = "active"
+                ep.unenrolled_at = None
+                reactivated.append(ep)
+                changed_clients.add(client_id)
+
+        bump_for_clients_on_commit(changed_clients, programs)
+        ClientProgramEnrolment.objects.bulk_update(
+            finished, ["status", "ended_at", "unenrolled_at", "end_reason"],
+            batch_size=BATCH_SIZE,
+        )
+        ClientProgramEnrolment.objects.bulk_update(
+            reactivated, ["status", "unenrolled_at"], batch_size=BATCH_SIZE,
+        )
+        # After the source episodes are finished, as the saves were ordered
+        _derive_episode_types(created)
+        ClientProgramEnrolment.objects.bulk_create(created, batch_size=BATCH_SIZE)
+
+        ServiceEpisodeStatusChange.objects.bulk_create(
+            [
+                _status_change(ep, "finished", "Bulk transfer to another program", user)
+                for ep in finished
+            ] + [
+                _status_change(ep, "active", "Enrolled via bulk transfer", user)
+                for ep in created
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        AuditLog.objects.using("audit").bulk_create(
+            _audit_entries(client_ids, user, now, {
+                "bulk_transfer": True,
+                "source_program_id": source_program_id,
+                "destination_program_id": destination.pk,
+                "reason": reason,
+            }),
+            batch_size=BATCH_SIZE,
+        )
+
+        for ep in created:
+            post_save.send(
+                sender=ClientProgramEnrolment, instance=ep, created=True,
+                update_fields=None, raw=False, using=ep._state.db,
+            )
+
+    return len(changed_clients)
+
+
+def discharge_clients(clients, program, user, end_reason, status_reason=""):
+    """Finish the participants' active episodes in `program`.
+
+    Returns the number of episodes finished.
+    """
+    client_ids = list(dict.fromkeys(client.pk for client in clients))
+    now = timezone.now()
+
+    with transaction.atomic():
+        episodes = list(
+            ClientProgramEnrolment.objects.select_for_update()
+            .filter(client_file_id__in=client_ids, program=program, status="active")
+            .order_by("pk")
+        )
+        for ep in episodes:
+            ep.status = "finished"
+            ep.ended_at = now
+            ep.unenrolled_at = now
+            ep.end_reason = end_reason
+            ep.status_reason = status_reason
+
+        bump_for_clients_on_commit({ep.client_file_id for ep in episodes}, [program.pk])
+        ClientProgramEnrolment.objects.bulk_update(
+            episodes,
+            ["status", "ended_at", "unenrolled_at", "end_reason", "status_reason"],
+            batch_size=BATCH_SIZE,
+        )
+        ServiceEpisodeStatusChange.objects.bulk_create(
+            [
+                _status_change(
+                    ep, "finished", f"Bulk discharge: {ep.get_end_reason_display()}", user,
+                )
+                for ep in episodes
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        AuditLog.objects.using("audit").bulk_create(
+            _audit_entries(client_ids, user, now, {
+                "bulk_discharge": True,
+                "program_id": program.pk,
+                "end_reason": end_reason,
+                "status_reason": status_reason,
+            }),
+            batch_size=BATCH_SIZE,
+        )
+
+    return len(episodes)
@@ -11,18 +11,16 @@ import time
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
-from django.utils import timezone
 from django.utils.translation import gettext as _
 
-from apps.audit.models import AuditLog
 from apps.auth_app.decorators import requires_permission
 from apps.programs.access import get_accessible_programs
 
+from .bulk_enrolment import discharge_clients, transfer_clients
 from .bulk_forms import BulkDischargeConfirmForm, BulkFilterForm, BulkTransferConfirmForm
-from .models import ClientProgramEnrolment, ServiceEpisodeStatusChange
+from .models import ClientProgramEnrolment
 from .views import _get_accessible_clients
 
 
@@ -240,73 +238,10 @@ def _bulk_transfer_execute(request, available_programs):
     accessible = _get_accessible_clients(request.user, active_program_ids=active_ids)
     clients_to_transfer = list(accessible.filter(pk__in=client_ids))
 
-    now = timezone.now()
-    transferred_count = 0
-
-    with transaction.atomic():
-        for client_obj in clients_to_transfer:
-            added = False
-            removed = False
-
-            # Remove from source program (if specified)
-            if source_program_id:
-                episodes = list(ClientProgramEnrolment.objects.filter(
-                    client_file=client_obj,
-                    program_id=source_program_id,
-                    status="active",
-                ))
-                for ep in episodes:
-                    ep.status = "finished"
-                    ep.ended_at = now
-                    ep.unenrolled_at = now
-                    ep.end_reason = "transferred"
-                    ep.save()
-                    ServiceEpisodeStatusChange.objects.create(
-                        episode=ep,
-                        status="finished",
-                        reason="Bulk transfer to another program",
-                        changed_by=request.user,
-                    )
-                    removed = True
-
-            # Add to destination program (idempotent)
-            enrolment, created = ClientProgramEnrolment.objects.get_or_create(
-                client_file=client_obj, program=destination,
-                defaults={"status": "active", "started_at": now},
-            )
-            if created:
-                ServiceEpisodeStatusChange.objects.create(
-                    episode=enrolment,
-                    status="active",
-                    reason="Enrolled via bulk transfer",
-                    changed_by=request.user,
-                )
-                added = True
-            elif enrolment.status != "active":
-                enrolment.status = "active"
-                enrolment.unenrolled_at = None
-                enrolment.save()
-                added = True
-
-            if added or removed:
-                transferred_count += 1
-
-            # Individual audit log entry per participant
-            AuditLog.objects.using("audit").create(
-                event_timestamp=now,
-                user_id=request.user.pk,
-                user_display=getattr(request.user, "display_name", str(request.user)),
-                action="update",
-                resource_type="enrolment",
-                resource_id=client_obj.pk,
-                is_demo_context=getattr(request.user, "is_demo", False),
-                metadata={
-                    "bulk_transfer": True,
-                    "source_program_id": source_program_id,
-                    "destination_program_id": destination.pk,
-                    "reason": reason,
-                },
-            )
+    transferred_count = transfer_clients(
+        clients_to_transfer, destination, request.user,
+        source_program_id=source_program_id, reason=reason,
+    )
 
     _clear_selection(request, "transfer")
 
@@ -477,47 +412,10 @@ def _bulk_discharge_execute(request, available_programs):
     accessible = _get_accessible_clients(request.user, active_program_ids=active_ids)
     clients_to_discharge = list(accessible.filter(pk__in=client_ids))
 
-    now = timezone.now()
-    discharged_count = 0
-
-    with transaction.atomic():
-        for client_obj in clients_to_discharge:
-            episodes = list(ClientProgramEnrolment.objects.filter(
-                client_file=client_obj,
-                program=source_program,
-                status="active",
-            ))
-            for ep in episodes:
-                ep.status = "finished"
-                ep.ended_at = now
-                ep.unenrolled_at = now
-                ep.end_reason = end_reason
-                ep.status_reason = status_reason
-                ep.save()
-                ServiceEpisodeStatusChange.objects.create(
-                    episode=ep,
-                    status="finished",
-                    reason=f"Bulk discharge: {ep.get_end_reason_display()}",
-                    changed_by=request.user,
-                )
-                discharged_count += 1
-
-            # Individual audit log entry per participant
-            AuditLog.objects.using("audit").create(
-                event_timestamp=now,
-                user_id=request.user.pk,
-                user_display=getattr(request.user, "display_name", str(request.user)),
-                action="update",
-                resource_type="enrolment",
-                resource_id=client_obj.pk,
-                is_demo_context=getattr(request.user, "is_demo", False),
-                metadata={
-                    "bulk_discharge": True,
-                    "program_id": source_program.pk,
-                    "end_reason": end_reason,
-                    "status_reason": status_reason,
-                },
-            )
+    discharged_count = discharge_clients(
+        clients_to_discharge, source_program, request.user,
+        end_reason, status_reason=status_reason,
+    )
 
     _clear_selection(request, "discharge")
 
@@ -10,14 +10,13 @@ import logging
 from datetime import timedelta
 
 from django.contrib.auth.decorators import login_required
-from django.core.cache import cache
 from django.db.models import Count, Q
 from django.shortcuts import render
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from apps.auth_app.constants import MANAGEMENT_ROLES
-from apps.clients.models import ClientProgramEnrolment
+from apps.clients.models import ClientActivitySummary, ClientProgramEnrolment
 from apps.notes.models import ProgressNote, SuggestionTheme
 from apps.programs.models import Program, UserProgramRole
 from apps.reports.insights import get_structured_insights
@@ -51,20 +50,29 @@ PROGRAM_LEARNING_LOOKBACK_DAYS = 90
 # Metric helper functions (single-program versions, kept for unit tests)
 # ---------------------------------------------------------------------------
 def _count_without_notes(active_client_ids, program_ids, month_start):
-    """Active clients with no ProgressNote created this month."""
+    """Active clients with no ProgressNote created this month.
+
+    A client whose latest note (in any program, per their activity
+    summary) is older than month_start has none this month, so only the
+    recently noted clients are checked against the program filter.
+    """
     from apps.notes.models import ProgressNote
 
     if not active_client_ids:
         return 0
-    clients_with_notes = set(
+    recently_noted = ClientActivitySummary.objects.filter(
+        client_file_id__in=active_client_ids,
+        last_note_at__gte=month_start,
+    ).values("client_file_id")
+    clients_with_notes = (
         ProgressNote.objects.filter(
-            client_file_id__in=active_client_ids,
+            client_file_id__in=recently_noted,
             author_program_id__in=program_ids,
             created_at__gte=month_start,
             status="default",
-        ).values_list("client_file_id", flat=True)
+        ).values("client_file_id").distinct().count()
     )
-    return len(set(active_client_ids) - clients_with_notes)
+    return len(set(active_client_ids)) - clients_with_notes
 
 
 def _batch_fhir_enrichment(filtered_program_ids, enrolment_stats,
@@ -239,8 +247,14 @@ def _count_overdue_followups(client_ids, today):
 
     if not client_ids:
         return 0
-    return ProgressNote.objects.filter(
+    # Only clients whose earliest open follow-up is already past can have
+    # overdue ones (indexed lookup on the activity summary)
+    with_overdue = ClientActivitySummary.objects.filter(
         client_file_id__in=client_ids,
+        next_follow_up_date__lt=today,
+    ).values("client_file_id")
+    return ProgressNote.objects.filter(
+        client_file_id__in=with_overdue,
         follow_up_date__lt=today,
         follow_up_completed_at__isnull=True,
         status="default",
@@ -995,16 +1009,9 @@ def _parse_date_range(request, now):
 
 def _get_feature_flags():
     """Return feature flags dict, using cache if available."""
-    flags = cache.get("feature_toggles")
-    if flags is None:
-        from apps.admin_settings.models import FeatureToggle
-        from apps.admin_settings.views import DEFAULT_FEATURES, FEATURES_DEFAULT_ENABLED
+    from apps.admin_settings import cached
 
-        db_flags = FeatureToggle.get_all_flags()
-        flags = {key: key in FEATURES_DEFAULT_ENABLED for key in DEFAULT_FEATURES}
-        flags.update(db_flags)
-        cache.set("feature_toggles", flags, 300)
-    return flags
+    return cached.feature_flags()
 
 
 
@@ -1612,13 +1619,15 @@ def executive_dashboard_pdf(request):
 
     html_content = render_to_string("reports/pdf_executive_dashboard.html", template_context, request=request)
 
-    # Attempt PDF conversion via WeasyPrint; fall back to HTML if unavailable.
+    # Attempt PDF conversion via WeasyPrint; fall back to HTML if unavailable
+    # or too slow.
+    from apps.reports.pdf_service import PDFRenderTimeout, render_pdf_bytes
+
     try:
-        from weasyprint import HTML as WeasyHTML
-        pdf_bytes = WeasyHTML(string=html_content).write_pdf()
+        pdf_bytes = render_pdf_bytes(html_content)
         response = HttpResponse(pdf_bytes, content_type="application/pdf")
         response["Content-Disposition"] = 'attachment; filename="executive-dashboard.pdf"'
-    except (ImportError, OSError):
+    except (ImportError, OSError, PDFRenderTimeout):
         response = HttpResponse(html_content, content_type="text/html")
         response["Content-Disposition"] = 'attachment; filename="executive-dashboard.html"'
 
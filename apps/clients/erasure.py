@@ -15,6 +15,7 @@ from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from apps.auth_app.constants import ROLE_PROGRAM_MANAGER
+from apps.reports.insights_cache import bump_for_clients_on_commit
 
 logger = logging.getLogger(__name__)
 
@@ -336,13 +337,13 @@ def _anonymise_client_pii(client, erasure_code):
     ClientDetailValue.objects.filter(
         client_file=client,
         field_def__is_sensitive=True,
-    ).update(_value_encrypted=b"", value="")
+    ).update(_value_encrypted=b"", value="", bucket_code=None)
 
     # Also blank non-sensitive custom field values (may contain identifying info)
     ClientDetailValue.objects.filter(
         client_file=client,
         field_def__is_sensitive=False,
-    ).update(value="")
+    ).update(value="", bucket_code=None)
 
     # Deactivate portal account and scrub all PII/credentials
     try:
@@ -462,6 +463,8 @@ def _execute_tier1_anonymise(erasure_request, ip_address):
     # Write audit FIRST — if this fails, erasure doesn't proceed
     _log_erasure_audit(erasure_request, client_pk, record_id, "update", ip_address)
 
+    # Cached insight quotes and attribution must not outlive the erasure
+    bump_for_clients_on_commit([client_pk])
     _scrub_registration_submissions(client)
     _anonymise_client_pii(client, erasure_request.erasure_code)
 
@@ -487,6 +490,8 @@ def _execute_tier2_anonymise_purge(erasure_request, ip_address):
     # Write audit FIRST — if this fails, erasure doesn't proceed
     _log_erasure_audit(erasure_request, client_pk, record_id, "update", ip_address)
 
+    # Cached insight quotes and attribution must not outlive the erasure
+    bump_for_clients_on_commit([client_pk])
     _scrub_registration_submissions(client)
     _anonymise_client_pii(client, erasure_request.erasure_code)
     _purge_narrative_content(client)
@@ -521,6 +526,7 @@ def _execute_tier3_full_erasure(erasure_request, ip_address):
     erasure_request.save(update_fields=["status", "scheduled_execution_at"])
 
 
+@transaction.atomic
 def execute_scheduled_tier3(erasure_request, ip_address="[cron]"):
     """Actually perform the Tier 3 deletion for a scheduled erasure.
 
@@ -540,6 +546,8 @@ def execute_scheduled_tier3(erasure_request, ip_address="[cron]"):
     record_id = client.record_id
 
     _log_erasure_audit(erasure_request, client_pk, record_id, "delete", ip_address)
+    # Read the programs to invalidate before the enrolments are deleted
+    bump_for_clients_on_commit([client_pk])
     _scrub_registration_submissions(client)
     client.delete()
 
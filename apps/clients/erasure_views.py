@@ -440,6 +440,7 @@ def erasure_receipt_pdf(request, pk):
     if not is_involved:
         return HttpResponseForbidden(_("You do not have access to this receipt."))
 
+    from apps.reports.pdf_service import PDFRenderTimeout
     from apps.reports.pdf_utils import is_pdf_available, render_pdf
 
     if not is_pdf_available():
@@ -464,6 +465,13 @@ def erasure_receipt_pdf(request, pk):
         "approvals": er.approvals.select_related("approved_by"),
     }
 
+    filename = f"erasure-receipt-{er.erasure_code}.pdf"
+    try:
+        response = render_pdf("clients/erasure/pdf_erasure_receipt.html", context, filename=filename)
+    except PDFRenderTimeout:
+        messages.error(request, _("The PDF took too long to generate. Please try again later."))
+        return redirect("erasure_request_detail", pk=pk)
+
     # Track first download
     if not er.receipt_downloaded_at:
         from django.utils import timezone as tz
@@ -484,8 +492,7 @@ def erasure_receipt_pdf(request, pk):
         },
     )
 
-    filename = f"erasure-receipt-{er.erasure_code}.pdf"
-    return render_pdf("clients/erasure/pdf_erasure_receipt.html", context, filename=filename)
+    return response
 
 
 # --- Email notifications ---
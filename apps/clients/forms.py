@@ -430,7 +430,7 @@ class CustomFieldDefinitionForm(forms.ModelForm):
         fields = [
             "group", "name", "input_type", "placeholder", "is_required",
             "is_sensitive", "front_desk_access", "is_dv_sensitive",
-            "show_on_create", "options_json", "sort_order", "status",
+            "show_on_create", "options_json", "report_bucket_codes", "sort_order", "status",
         ]
         widgets = {
             "options_json": forms.Textarea(attrs={"rows": 3, "placeholder": _('["Option 1", "Option 2"]')}),
@@ -438,6 +438,7 @@ class CustomFieldDefinitionForm(forms.ModelForm):
         labels = {
             "sort_order": _("Display order"),
             "is_dv_sensitive": _("DV-sensitive"),
+            "report_bucket_codes": _("Faster report grouping"),
         }
         help_texts = {
             "group": _("Choose where this field should appear on the participant file."),
@@ -450,10 +451,23 @@ class CustomFieldDefinitionForm(forms.ModelForm):
             "is_dv_sensitive": _("When checked, this field is hidden from front desk staff for participants with a DV safety flag."),
             "show_on_create": _("Show this field during new participant intake so staff can collect it right away."),
             "options_json": _("For dropdowns or multi-select fields, enter a JSON list such as [\"Option 1\", \"Option 2\"]."),
+            "report_bucket_codes": _("Dropdown fields only, and not for sensitive or DV-sensitive fields. Stores which option was chosen as a number, so reports can group participants without reading each answer."),
             "sort_order": _("Lower numbers appear earlier within the group."),
             "status": _("Archived fields stay on old records but are hidden from new use."),
         }
 
+    def clean(self):
+        cleaned = super().clean()
+        if cleaned.get("report_bucket_codes") and (
+            cleaned.get("is_sensitive") or cleaned.get("is_dv_sensitive")
+        ):
+            # A stored option number would reveal the encrypted answer
+            self.add_error(
+                "report_bucket_codes",
+                _("Faster report grouping cannot be used for sensitive or DV-sensitive fields."),
+            )
+        return cleaned
+
 
 # --- Erasure forms ---
 
@@ -1,7 +1,6 @@
 """Helper functions for client-related operations."""
 from urllib.parse import quote
 
-from django.core.cache import cache
 
 
 def get_document_folder_url(client):
@@ -16,13 +15,9 @@ def get_document_folder_url(client):
     Returns:
         str: The document folder URL with {record_id} replaced, or None.
     """
-    from apps.admin_settings.models import InstanceSetting
+    from apps.admin_settings import cached
 
-    # Try cache first
-    settings_dict = cache.get("instance_settings")
-    if settings_dict is None:
-        settings_dict = InstanceSetting.get_all()
-        cache.set("instance_settings", settings_dict, 300)
+    settings_dict = cached.instance_settings()
 
     provider = settings_dict.get("document_storage_provider", "none")
     template = settings_dict.get("document_storage_url_template", "")
@@ -43,13 +38,9 @@ def get_document_storage_info():
     Returns:
         dict: Contains 'provider', 'provider_display', and 'is_configured'.
     """
-    from apps.admin_settings.models import InstanceSetting
+    from apps.admin_settings import cached
 
-    # Try cache first
-    settings_dict = cache.get("instance_settings")
-    if settings_dict is None:
-        settings_dict = InstanceSetting.get_all()
-        cache.set("instance_settings", settings_dict, 300)
+    settings_dict = cached.instance_settings()
 
     provider = settings_dict.get("document_storage_provider", "none")
 
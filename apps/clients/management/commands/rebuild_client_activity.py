@@ -0,0 +1,80 @@
+"""
+Management command to rebuild participants' activity summaries.
+
+Usage:
+    python manage.py rebuild_client_activity                 # All participants
+    python manage.py rebuild_client_activity --client 12     # One participant (repeatable)
+    python manage.py rebuild_client_activity --name-buckets  # Also re-file names A-Z
+
+Summaries and last-contact dates are normally kept current by signals
+(see apps/clients/activity.py). Run this after imports or data fixes that
+write notes, communications or meetings with queryset.update() or raw SQL,
+or to repair any drift. Safe to re-run: only changed rows are written.
+
+--name-buckets also recomputes each participant's name_sort_bucket (the
+letter the participant list files them under), decrypting their names.
+Needed after migration clients 0045 ran without an encryption key.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+
+class Command(BaseCommand):
+    help = "Recompute participants' activity summaries and last-contact dates."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--client",
+            type=int,
+            action="append",
+            dest="client_ids",
+            help="Only rebuild this participant (ClientFile ID). Repeatable.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Participants per batch (default 500).",
+        )
+        parser.add_argument(
+            "--name-buckets",
+            action="store_true",
+            help="Also recompute the name sort letter (decrypts names).",
+        )
+
+    def handle(self, *args, **options):
+        from apps.clients.activity import refresh_activity
+        from apps.clients.models import ClientFile
+
+        client_ids = options["client_ids"]
+        if client_ids is None:
+            client_ids = list(ClientFile.objects.order_by("pk").values_list("pk", flat=True))
+        batch_size = max(options["batch_size"], 1)
+
+        changed = refiled = 0
+        for start in range(0, len(client_ids), batch_size):
+            batch = client_ids[start:start + batch_size]
+            with transaction.atomic():
+                changed += refresh_activity(batch)
+                if options["name_buckets"]:
+                    refiled += self._refresh_name_buckets(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt activity for {len(client_ids)} participant(s); {changed} changed."
+        ))
+        if options["name_buckets"]:
+            self.stdout.write(self.style.SUCCESS(f"Name sort letter updated for {refiled}."))
+
+    def _refresh_name_buckets(self, client_ids):
+        from apps.clients.models import ClientFile, name_sort_bucket
+
+        changed = []
+        for client in ClientFile.objects.filter(pk__in=client_ids).only(
+            "pk", "name_sort_bucket", "_first_name_encrypted", "_preferred_name_encrypted",
+        ):
+            bucket = name_sort_bucket(client.display_name)
+            if bucket != client.name_sort_bucket:
+                client.name_sort_bucket = bucket
+                changed.append(client)
+        ClientFile.objects.bulk_update(changed, ["name_sort_bucket"])
+        return len(changed)
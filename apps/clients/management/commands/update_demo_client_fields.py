@@ -93,7 +93,7 @@ class Command(BaseCommand):
             now = timezone.now()
             for cdv in cdvs_to_update:
                 cdv.updated_at = now
-            ClientDetailValue.objects.bulk_update(cdvs_to_update, ["_value_encrypted", "updated_at"])
+            ClientDetailValue.objects.bulk_update(cdvs_to_update, ["_value_encrypted", "bucket_code", "updated_at"])
 
         self.stdout.write(self.style.SUCCESS(f"  Updated {fields_updated} custom field values for demo clients."))
         if clients_missing:
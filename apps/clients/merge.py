@@ -17,6 +17,9 @@ from django.db import transaction
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from apps.reports.insights_cache import bump_for_clients_on_commit
+
+from .activity import refresh_activity
 from .matching import _iter_matchable_clients
 from .models import (
     ClientDetailValue,
@@ -362,6 +365,10 @@ def execute_merge(kept, archived, pii_choices, field_resolutions, user, ip_addre
     if errors:
         raise ValueError(" ".join(errors))
 
+    # Notes and enrolments move with queryset updates, which skip the
+    # insights cache signals; both participants' programs are read now
+    bump_for_clients_on_commit([kept.pk, archived.pk])
+
     # 3. Apply PII choices — copy fields from archived if admin chose them
     for field_name, choice in pii_choices.items():
         if choice == "archived":
@@ -394,6 +401,8 @@ def execute_merge(kept, archived, pii_choices, field_resolutions, user, ip_addre
     summary["erasure_requests"] = ErasureRequest.objects.filter(
         client_file=archived
     ).update(client_file=kept)
+    # Queryset updates skip the activity summary signals
+    refresh_activity([kept.pk, archived.pk])
 
     # 5. Handle enrolment conflicts — preserve history, don't delete
     kept_enrolment_programs = set(
@@ -452,6 +461,7 @@ def execute_merge(kept, archived, pii_choices, field_resolutions, user, ip_addre
                 )
                 kept_cdv.value = cdv.value
                 kept_cdv._value_encrypted = cdv._value_encrypted
+                kept_cdv.bucket_code = cdv.bucket_code
                 kept_cdv.save()
             # Delete archived's CDV (resolves unique constraint)
             cdv.delete()
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0042_alter_customfieldgroup_collapsed_by_default'),
+        ('programs', '0012_program_default_goal_review_days'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='serviceepisode',
+            index=models.Index(fields=['program', 'status', 'client_file'], name='idx_enrolment_program_status'),
+        ),
+        migrations.AddIndex(
+            model_name='serviceepisode',
+            index=models.Index(fields=['client_file', 'status'], name='idx_enrolment_client_status'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-19 00:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0043_report_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientdetailvalue',
+            name='bucket_code',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='customfielddefinition',
+            name='report_bucket_codes',
+            field=models.BooleanField(default=False, help_text='Dropdown fields only: store the option number with each answer so reports can group participants without decrypting values.'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+"""Add plaintext sort keys for the keyset-paginated participant list.
+
+Backfills each participant's name bucket (the first letter of the display
+name) and last contact date. Without an encryption key (CI, or a tenant
+migrated before its key is configured) names can't be read: buckets stay
+at the default "#" until `manage.py rebuild_client_activity --name-buckets`
+or the next save of each participant.
+"""
+import unicodedata
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+
+from konote.encryption import DecryptionError, decrypt_field
+
+
+BATCH_SIZE = 500
+
+
+def _bucket(name):
+    # Same rules as apps.clients.models.name_sort_bucket()
+    for char in unicodedata.normalize("NFKD", name or ""):
+        if unicodedata.combining(char):
+            continue
+        letter = char.upper()
+        return letter if "A" <= letter <= "Z" else "#"
+    return "#"
+
+
+def _decrypt(ciphertext):
+    try:
+        return decrypt_field(ciphertext)
+    except DecryptionError:
+        return ""
+
+
+def backfill_sort_keys(apps, schema_editor):
+    ClientFile = apps.get_model("clients", "ClientFile")
+    ProgressNote = apps.get_model("notes", "ProgressNote")
+    Communication = apps.get_model("communications", "Communication")
+    Meeting = apps.get_model("events", "Meeting")
+
+    latest = {}
+    sources = [
+        ProgressNote.objects.filter(status="default")
+        .values("client_file_id").annotate(last=Max("created_at"))
+        .values_list("client_file_id", "last"),
+        Communication.objects.values("client_file_id").annotate(last=Max("created_at"))
+        .values_list("client_file_id", "last"),
+        Meeting.objects.values("event__client_file_id").annotate(last=Max("event__start_timestamp"))
+        .values_list("event__client_file_id", "last"),
+    ]
+    for rows in sources:
+        for client_id, last in rows:
+            if last is not None and (latest.get(client_id) is None or last > latest[client_id]):
+                latest[client_id] = last
+
+    # decrypt_field() raises ValueError when no key is configured
+    read_names = bool(getattr(settings, "FIELD_ENCRYPTION_KEY", ""))
+    fields = ["name_sort_bucket", "last_contact_at"] if read_names else ["last_contact_at"]
+
+    clients = []
+    for client in ClientFile.objects.only(
+        "pk", "_first_name_encrypted", "_preferred_name_encrypted",
+    ).iterator(chunk_size=BATCH_SIZE):
+        if read_names:
+            name = _decrypt(client._preferred_name_encrypted) or _decrypt(client._first_name_encrypted)
+            client.name_sort_bucket = _bucket(name)
+        client.last_contact_at = latest.get(client.pk)
+        clients.append(client)
+        if len(clients) >= BATCH_SIZE:
+            ClientFile.objects.bulk_update(clients, fields)
+            clients = []
+    ClientFile.objects.bulk_update(clients, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0044_report_bucket_codes'),
+        ('notes', '0031_report_filter_indexes'),
+        ('communications', '0006_staffmessage_is_urgent'),
+        ('events', '0006_srecategory_event_is_sre_event_sre_flagged_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientfile',
+            name='last_contact_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='clientfile',
+            name='name_sort_bucket',
+            field=models.CharField(db_index=True, default='#', editable=False, max_length=1),
+        ),
+        migrations.RunPython(backfill_sort_keys, migrations.RunPython.noop),
+    ]
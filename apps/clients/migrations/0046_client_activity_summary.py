@@ -0,0 +1,87 @@
+"""Add per-participant activity summaries and backfill them.
+
+The backfill mirrors apps.clients.activity.compute_activity().
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Q
+
+
+def backfill_activity(apps, schema_editor):
+    ClientFile = apps.get_model("clients", "ClientFile")
+    ClientActivitySummary = apps.get_model("clients", "ClientActivitySummary")
+    ProgressNote = apps.get_model("notes", "ProgressNote")
+    Communication = apps.get_model("communications", "Communication")
+    Meeting = apps.get_model("events", "Meeting")
+
+    summaries = {
+        client_id: ClientActivitySummary(client_file_id=client_id)
+        for client_id in ClientFile.objects.values_list("pk", flat=True)
+    }
+
+    open_follow_up = Q(follow_up_date__isnull=False, follow_up_completed_at__isnull=True)
+    notes = (
+        ProgressNote.objects.filter(status="default")
+        .values("client_file_id")
+        .annotate(
+            last=Max("created_at"),
+            count=Count("id"),
+            open=Count("id", filter=open_follow_up),
+            next=Min("follow_up_date", filter=open_follow_up),
+        )
+    )
+    for row in notes:
+        summary = summaries.get(row["client_file_id"])
+        if summary is not None:
+            summary.last_note_at = row["last"]
+            summary.note_count = row["count"]
+            summary.open_follow_ups = row["open"]
+            summary.next_follow_up_date = row["next"]
+
+    communications = (
+        Communication.objects.values("client_file_id").annotate(last=Max("created_at"))
+        .values_list("client_file_id", "last")
+    )
+    for client_id, last in communications:
+        if client_id in summaries:
+            summaries[client_id].last_communication_at = last
+
+    meetings = (
+        Meeting.objects.values("event__client_file_id").annotate(last=Max("event__start_timestamp"))
+        .values_list("event__client_file_id", "last")
+    )
+    for client_id, last in meetings:
+        if client_id in summaries:
+            summaries[client_id].last_meeting_at = last
+
+    ClientActivitySummary.objects.bulk_create(summaries.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0045_client_list_sort_keys'),
+        ('notes', '0031_report_filter_indexes'),
+        ('communications', '0006_staffmessage_is_urgent'),
+        ('events', '0006_srecategory_event_is_sre_event_sre_flagged_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientActivitySummary',
+            fields=[
+                ('client_file', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='activity', serialize=False, to='clients.clientfile')),
+                ('last_note_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('last_communication_at', models.DateTimeField(blank=True, null=True)),
+                ('last_meeting_at', models.DateTimeField(blank=True, null=True)),
+                ('note_count', models.PositiveIntegerField(default=0, help_text='Progress notes, not counting cancelled ones.')),
+                ('open_follow_ups', models.PositiveIntegerField(default=0, help_text="Notes with a follow-up date that hasn't been completed.")),
+                ('next_follow_up_date', models.DateField(blank=True, db_index=True, help_text='Earliest follow-up date among the open follow-ups.', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'client_activity_summaries',
+            },
+        ),
+        migrations.RunPython(backfill_activity, migrations.RunPython.noop),
+    ]
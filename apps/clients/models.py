@@ -1,4 +1,6 @@
 """Client file and custom field models."""
+import unicodedata
+
 from django.conf import settings
 from django.db import models
 from django.utils import timezone
@@ -8,6 +10,20 @@ from apps.auth_app.constants import ROLE_RECEPTIONIST
 from konote.encryption import decrypt_field, encrypt_field, DecryptionError
 
 
+def name_sort_bucket(name):
+    """The letter a name is filed under in the participant list (A-Z, or "#").
+
+    Accents are ignored, so "Émilie" files under E. Anything that doesn't
+    start with a Latin letter files under "#".
+    """
+    for char in unicodedata.normalize("NFKD", name or ""):
+        if unicodedata.combining(char):
+            continue
+        letter = char.upper()
+        return letter if "A" <= letter <= "Z" else "#"
+    return "#"
+
+
 class ClientFileQuerySet(models.QuerySet):
     """Custom queryset for ClientFile with demo/real filtering."""
 
@@ -64,6 +80,13 @@ class ClientFile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Plaintext sort keys for the participant list, so it can order and
+    # paginate in SQL and decrypt only the rows on screen. The bucket is
+    # only the first letter of the display name (set in save()); the last
+    # contact date is maintained by apps.clients.activity.
+    name_sort_bucket = models.CharField(max_length=1, default="#", db_index=True, editable=False)
+    last_contact_at = models.DateTimeField(null=True, blank=True, db_index=True, editable=False)
+
     # Demo data separation
     is_demo = models.BooleanField(
         default=False,
@@ -277,6 +300,7 @@ class ClientFile(models.Model):
         # Auto-set existence flags for quick checks without decryption
         self.has_phone = bool(self._phone_encrypted and self._phone_encrypted != b"")
         self.has_email = bool(self._email_encrypted and self._email_encrypted != b"")
+        self.name_sort_bucket = name_sort_bucket(self.display_name)
         super().save(*args, **kwargs)
 
     def get_visible_fields(self, role):
@@ -337,6 +361,42 @@ class ClientFile(models.Model):
         return visible
 
 
+class ClientActivitySummary(models.Model):
+    """Denormalized activity counters for one participant.
+
+    Maintained by apps.clients.activity (through signals on notes,
+    communications and meetings) and repairable with
+    `manage.py rebuild_client_activity`. Lists and dashboards read this
+    row instead of aggregating the participant's notes on every load.
+    """
+
+    client_file = models.OneToOneField(
+        ClientFile, on_delete=models.CASCADE, primary_key=True,
+        related_name="activity",
+    )
+    last_note_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    last_communication_at = models.DateTimeField(null=True, blank=True)
+    last_meeting_at = models.DateTimeField(null=True, blank=True)
+    note_count = models.PositiveIntegerField(
+        default=0, help_text="Progress notes, not counting cancelled ones.",
+    )
+    open_follow_ups = models.PositiveIntegerField(
+        default=0, help_text="Notes with a follow-up date that hasn't been completed.",
+    )
+    next_follow_up_date = models.DateField(
+        null=True, blank=True, db_index=True,
+        help_text="Earliest follow-up date among the open follow-ups.",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = "clients"
+        db_table = "client_activity_summaries"
+
+    def __str__(self):
+        return f"Activity for participant #{self.client_file_id}"
+
+
 class ConsentEvent(models.Model):
     """Append-only history of privacy consent events for audit compliance.
 
@@ -512,6 +572,13 @@ class ServiceEpisode(models.Model):
     class Meta:
         app_label = "clients"
         db_table = "client_program_enrolments"
+        indexes = [
+            # "Active clients in program X" — includes client_file so the
+            # client ID list is read from the index alone
+            models.Index(fields=["program", "status", "client_file"], name="idx_enrolment_program_status"),
+            # Access checks and client list: a client's accessible enrolments
+            models.Index(fields=["client_file", "status"], name="idx_enrolment_client_status"),
+        ]
 
     def __str__(self):
         return f"{self.client_file} → {self.program}"
@@ -797,6 +864,16 @@ class CustomFieldDefinition(models.Model):
         help_text="Determines which validation and normalisation rules apply to this field.",
     )
     options_json = models.JSONField(default=list, blank=True, help_text="Options for select fields.")
+    # Dropdown fields that are neither sensitive nor DV-sensitive only: also
+    # store which option each value is (see ClientDetailValue.bucket_code),
+    # so reports can group in SQL without loading each value.
+    report_bucket_codes = models.BooleanField(
+        default=False,
+        help_text=_(
+            "Dropdown fields only: store the option number with each answer "
+            "so reports can group participants without decrypting values."
+        ),
+    )
     sort_order = models.IntegerField(default=0)
     status = models.CharField(
         max_length=20, default="active",
@@ -821,6 +898,48 @@ class CustomFieldDefinition(models.Model):
                 self.validation_type = detected
         super().save(*args, **kwargs)
 
+    @property
+    def uses_bucket_codes(self):
+        # Never for sensitive fields: the code would reveal the encrypted answer
+        return (
+            self.report_bucket_codes
+            and self.input_type == "select"
+            and not self.is_sensitive
+            and not self.is_dv_sensitive
+        )
+
+    def option_values(self):
+        """Stored values of the dropdown options, in option order."""
+        return [
+            option.get("value", "") if isinstance(option, dict) else option
+            for option in self.options_json or []
+        ]
+
+    def bucket_code_for(self, value):
+        """Bucket code for a raw value: 0 for blank, option position + 1, or None."""
+        if not self.uses_bucket_codes:
+            return None
+        if not value:
+            return 0
+        try:
+            return self.option_values().index(value) + 1
+        except ValueError:
+            return None
+
+    def refresh_bucket_codes(self):
+        """Recompute every stored bucket code after the options or setting change."""
+        values = ClientDetailValue.objects.filter(field_def=self)
+        if not self.uses_bucket_codes:
+            values.exclude(bucket_code=None).update(bucket_code=None)
+            return
+        changed = []
+        for cv in values.select_related("field_def"):
+            code = self.bucket_code_for(cv.get_value())
+            if code != cv.bucket_code:
+                cv.bucket_code = code
+                changed.append(cv)
+        ClientDetailValue.objects.bulk_update(changed, ["bucket_code"], batch_size=500)
+
 
 class ClientDetailValue(models.Model):
     """A custom field value for a specific client (EAV pattern)."""
@@ -829,6 +948,9 @@ class ClientDetailValue(models.Model):
     field_def = models.ForeignKey(CustomFieldDefinition, on_delete=models.CASCADE)
     value = models.TextField(default="", blank=True)
     _value_encrypted = models.BinaryField(default=b"", blank=True)
+    # Which dropdown option the value is (0 = blank), for fields with
+    # report_bucket_codes on; None when not stored or not an option.
+    bucket_code = models.PositiveSmallIntegerField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -853,6 +975,7 @@ class ClientDetailValue(models.Model):
         else:
             self.value = val
             self._value_encrypted = b""
+        self.bucket_code = self.field_def.bucket_code_for(val)
 
 
 class ErasureRequest(models.Model):
@@ -0,0 +1,148 @@
+"""Keyset pagination for the participant list.
+
+Names are encrypted, so the list used to decrypt every accessible
+participant to sort them before paginating. The default listing instead
+orders by a plaintext column on ClientFile (plus pk as a tie-breaker),
+pages with WHERE clauses on the last row seen rather than OFFSET, and
+only the rows on screen are decrypted.
+
+The name sort uses ClientFile.name_sort_bucket, the first letter only —
+storing more of an encrypted name in plaintext would leak it. Pages are
+therefore grouped by initial letter, with names sorted within each page,
+and the list header says so; it is not alphabetical across pages.
+
+Cursors are opaque tokens holding the sort value and pk of the row at the
+page boundary. They only ever narrow a queryset the caller has already
+scoped to the user's programs, so a hand-edited cursor can't widen access.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+from .models import ClientFile
+
+PAGE_SIZE = 25
+
+# sort name -> (ClientFile field, descending)
+KEYSET_SORTS = {
+    "name": ("name_sort_bucket", False),
+    "last_contact": ("last_contact_at", True),
+    "created": ("created_at", True),
+    "record_id": ("record_id", False),
+}
+
+
+class KeysetPage:
+    """One page of rows, shaped like the parts of Django's Page the templates use."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, count, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.count = count
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def encode_cursor(value, pk):
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+    raw = json.dumps([value, pk], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, field):
+    """Return (value, pk) from a cursor token, or None if it is malformed."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        value, pk = json.loads(raw)
+        value = None if value is None else field.to_python(value)
+        return value, int(pk)
+    except (ValueError, TypeError, ValidationError):
+        return None
+
+
+def _ordering(field, descending, nulls_last):
+    expression = F(field.name).desc if descending else F(field.name).asc
+    if not field.null:
+        expression = expression()
+    elif nulls_last:
+        expression = expression(nulls_last=True)
+    else:
+        expression = expression(nulls_first=True)
+    return [expression, "-pk" if descending else "pk"]
+
+
+def _beyond(field, value, pk, descending, nulls_last):
+    """Rows strictly after (value, pk) in the given ordering."""
+    op = "lt" if descending else "gt"
+    name = field.name
+    if value is None:
+        condition = Q(**{f"{name}__isnull": True, f"pk__{op}": pk})
+        if not nulls_last:
+            condition |= Q(**{f"{name}__isnull": False})
+        return condition
+    condition = Q(**{f"{name}__{op}": value}) | Q(**{name: value, f"pk__{op}": pk})
+    if field.null and nulls_last:
+        condition |= Q(**{f"{name}__isnull": True})
+    return condition
+
+
+def keyset_page(queryset, sort_by, after=None, before=None, page_size=PAGE_SIZE):
+    """Return a KeysetPage of `queryset` ordered by KEYSET_SORTS[sort_by].
+
+    `after` and `before` are cursors from a previous page's next_cursor and
+    previous_cursor. Runs one COUNT query and one page query (two when a
+    backwards step reaches the start of the list).
+    """
+    field_name, descending = KEYSET_SORTS.get(sort_by, KEYSET_SORTS["name"])
+    field = ClientFile._meta.get_field(field_name)
+    count = queryset.count()
+
+    def cursor_for(row):
+        return encode_cursor(getattr(row, field_name), row.pk)
+
+    before_key = decode_cursor(before, field) if not after else None
+    if before_key is not None:
+        # Walk backwards (reversed order, nulls first), then flip the rows
+        rows = list(
+            queryset.filter(_beyond(field, *before_key, not descending, nulls_last=False))
+            .order_by(*_ordering(field, not descending, nulls_last=False))[:page_size + 1]
+        )
+        if len(rows) > page_size:
+            rows = rows[:page_size][::-1]
+            return KeysetPage(rows, count, cursor_for(rows[-1]), cursor_for(rows[0]))
+        # Reached the start of the list — show a full first page instead
+        after = None
+
+    after_key = decode_cursor(after, field)
+    if after_key is not None:
+        queryset = queryset.filter(_beyond(field, *after_key, descending, nulls_last=True))
+    rows = list(queryset.order_by(*_ordering(field, descending, nulls_last=True))[:page_size + 1])
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    return KeysetPage(
+        rows,
+        count,
+        next_cursor=cursor_for(rows[-1]) if has_next else None,
+        previous_cursor=cursor_for(rows[0]) if after_key is not None and rows else None,
+    )
@@ -0,0 +1,78 @@
+"""Signals for the clients app.
+
+Keeps each participant's activity summary and last-contact date current
+as notes, communications and meetings are recorded, edited, cancelled or
+deleted (see activity.py), and invalidates cached Outcome Insights blocks
+when a participant joins or leaves a program.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .activity import refresh_activity
+
+
+def _deleting_client(origin):
+    """True when the delete cascades from a participant being deleted.
+
+    The summary is going too, so there is nothing to refresh — and a
+    refresh would recreate the summary row of a participant about to go.
+    """
+    from .models import ClientFile
+
+    model = getattr(origin, "model", type(origin))
+    return model is ClientFile
+
+
+@receiver(post_save, sender="notes.ProgressNote")
+@receiver(post_save, sender="communications.Communication")
+def update_activity_on_save(sender, instance, **kwargs):
+    """A new, edited or cancelled note or communication changes the summary."""
+    refresh_activity([instance.client_file_id])
+
+
+@receiver(post_save, sender="events.Meeting")
+def update_activity_on_meeting_save(sender, instance, created, **kwargs):
+    if created:
+        refresh_activity([instance.event.client_file_id])
+
+
+@receiver(post_save, sender="events.Event")
+def update_activity_on_event_save(sender, instance, created, **kwargs):
+    """A rescheduled meeting changes its client's last contact."""
+    if not created:
+        refresh_activity([instance.client_file_id])
+
+
+@receiver(post_delete, sender="notes.ProgressNote")
+@receiver(post_delete, sender="communications.Communication")
+@receiver(post_delete, sender="events.Event")
+def update_activity_on_delete(sender, instance, origin=None, **kwargs):
+    if not _deleting_client(origin):
+        refresh_activity([instance.client_file_id])
+
+
+@receiver(post_delete, sender="events.Meeting")
+def update_activity_on_meeting_delete(sender, instance, origin=None, **kwargs):
+    from apps.events.models import Event
+
+    if _deleting_client(origin):
+        return
+    client_id = Event.objects.filter(pk=instance.event_id).values_list(
+        "client_file_id", flat=True,
+    ).first()
+    if client_id is not None:
+        refresh_activity([client_id])
+
+
+@receiver(post_save, sender="clients.ServiceEpisode")
+@receiver(post_delete, sender="clients.ServiceEpisode")
+def invalidate_insights_on_enrolment_change(sender, instance, origin=None, **kwargs):
+    """Program insights cover the program's active participants."""
+    from apps.reports.insights_cache import bump_for_client
+
+    if _deleting_client(origin):
+        return
+    client_file_id = instance.client_file_id
+    program_ids = [instance.program_id]
+    transaction.on_commit(lambda: bump_for_client(client_file_id, program_ids))
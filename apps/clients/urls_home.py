@@ -102,20 +102,14 @@ def home(request):
 
         # --- Clients not seen in 30+ days ---
         thirty_days_ago = timezone.now() - timedelta(days=30)
-        # Get clients with recent notes
-        clients_with_recent_notes = set(
-            ProgressNote.objects.filter(
-                client_file_id__in=accessible_ids,
-                created_at__gte=thirty_days_ago,
-            ).values_list("client_file_id", flat=True)
-        )
-        # Active clients without recent notes
+        # Active clients without recent notes, read from each client's
+        # activity summary instead of scanning 30 days of notes
         needs_attention = []
         # Optimization: Filter in DB and limit to 10 immediately (PERF-CLI1)
         # This avoids fetching and decrypting names for up to 200 clients
         # when only 10 are displayed.
         attention_qs = accessible.filter(status="active").exclude(
-            pk__in=clients_with_recent_notes
+            activity__last_note_at__gte=thirty_days_ago
         )[:10]
 
         for c in attention_qs:
@@ -18,10 +18,12 @@ from apps.auth_app.decorators import _get_user_highest_role, admin_required, req
 from apps.auth_app.permissions import DENY, PERMISSIONS, can_access
 from apps.notes.models import ProgressNote
 from apps.programs.models import Program, UserProgramRole
+from konote.instrumentation import perf_budget
 from konote.utils import get_client_ip
 
 from .forms import ClientContactForm, ClientFileForm, ClientTransferForm, ConsentRecordForm, ConsentWithdrawalForm, CustomFieldDefinitionForm, CustomFieldGroupForm, CustomFieldValuesForm, DischargeForm, OnHoldForm
 from .helpers import get_client_tab_counts, get_document_folder_url
+from .paging import KEYSET_SORTS, keyset_page
 from .models import ClientDetailValue, ClientFile, ClientProgramEnrolment, ConsentEvent, CustomFieldDefinition, CustomFieldGroup, ServiceEpisode, ServiceEpisodeStatusChange
 from .validators import (
     normalize_phone_number, normalize_postal_code,
@@ -80,62 +82,6 @@ def _get_accessible_clients(user, active_program_ids=None):
     return base_queryset.filter(pk__in=client_ids).prefetch_related("enrolments__program")
 
 
-def _get_last_contact_dates(client_ids):
-    """Batch-query last contact dates for a list of clients.
-
-    Returns dict: {client_id: datetime or None}
-
-    Performance: 3 aggregate queries instead of 3N individual queries.
-    """
-    from django.db.models import Max
-    from apps.communications.models import Communication
-    from apps.events.models import Meeting
-
-    if not client_ids:
-        return {}
-
-    # Query 1: Last note date per client
-    note_dates = dict(
-        ProgressNote.objects.filter(
-            client_file_id__in=client_ids,
-            status="default",
-        ).values("client_file_id").annotate(
-            last_date=Max("created_at")
-        ).values_list("client_file_id", "last_date")
-    )
-
-    # Query 2: Last communication date per client
-    comm_dates = dict(
-        Communication.objects.filter(
-            client_file_id__in=client_ids,
-        ).values("client_file_id").annotate(
-            last_date=Max("created_at")
-        ).values_list("client_file_id", "last_date")
-    )
-
-    # Query 3: Last meeting date per client (Meeting -> Event -> client_file)
-    meeting_dates = dict(
-        Meeting.objects.filter(
-            event__client_file_id__in=client_ids,
-        ).values("event__client_file_id").annotate(
-            last_date=Max("event__start_timestamp")
-        ).values_list("event__client_file_id", "last_date")
-    )
-
-    # Merge: find max date across all three sources per client
-    result = {}
-    for client_id in client_ids:
-        dates = [
-            note_dates.get(client_id),
-            comm_dates.get(client_id),
-            meeting_dates.get(client_id),
-        ]
-        valid_dates = [d for d in dates if d is not None]
-        result[client_id] = max(valid_dates) if valid_dates else None
-
-    return result
-
-
 def _find_clients_with_matching_notes(client_ids, query_lower, user,
                                       active_program_ids=None):
     """Return set of client IDs whose progress notes contain the search query.
@@ -242,6 +188,7 @@ def _find_clients_with_matching_notes(client_ids, query_lower, user,
 
 
 @login_required
+@perf_budget(queries=60)
 def client_list(request):
     # CONF9: Use active program context from middleware if available
     active_ids = getattr(request, "active_program_ids", None)
@@ -290,54 +237,88 @@ def client_list(request):
     search_query = _strip_accents(request.GET.get("q", "").strip().lower())
     sort_by = request.GET.get("sort", "name")
 
-    # Batch-query last contact dates (3 aggregate queries total — not 3N).
-    # Queries all accessible client IDs, not just the current page, because
-    # sort-by-last-contact needs the full list before pagination. Acceptable
-    # up to ~2,000 clients (same ceiling as the encrypted-field search loop).
-    all_client_ids = list(clients.values_list("pk", flat=True))
-    last_contact_map = _get_last_contact_dates(all_client_ids)
-
-    # Decrypt names and build display list — two passes when searching:
-    # 1. Apply status/program filters, match by name/record ID
-    # 2. For unmatched clients, also search progress note content
-    client_data = []
-    unmatched = {}  # client.pk → item dict, for the note-search pass
-    for client in clients:
-        # Apply status filter (in Python because we're already iterating)
-        if status_filter and client.status != status_filter:
-            continue
-
+    def _list_item(client):
         # Only show enrolments in programs the user has access to.
         # Prevents leaking confidential program names.
         programs = [
             e.program for e in client.enrolments.all()
             if e.status in ServiceEpisode.ACCESSIBLE_STATUSES and e.program_id in user_program_ids
         ]
-
-        # Apply program filter
-        if program_filter:
-            program_ids = [p.pk for p in programs]
-            if int(program_filter) not in program_ids:
-                continue
-
         # QA-R8-UX13: name preserves original accents (e.g. "Benoît").
-        # _strip_accents() is ONLY applied to name.lower() for search comparison
-        # (line below); the item dict always holds the unstripped display name.
+        # _strip_accents() is ONLY applied to name.lower() for search comparison;
+        # the item dict always holds the unstripped display name.
         name = f"{client.display_name} {client.last_name}"
         # Check if user can edit plans for this participant
         enrolled_prog_ids = {p.pk for p in programs}
         can_edit_plan = bool(plan_edit_program_ids & enrolled_prog_ids)
-        item = {"client": client, "name": name, "programs": programs, "last_contact": last_contact_map.get(client.pk), "can_edit_plan": can_edit_plan}
+        return {"client": client, "name": name, "programs": programs, "last_contact": client.last_contact_at, "can_edit_plan": can_edit_plan}
 
-        # Apply editable plans filter
-        if editable_filter and not can_edit_plan:
-            continue
+    # Show create button if user's role grants client.create permission
+    user_role = _get_user_highest_role(request.user)
+    can_create = PERMISSIONS.get(user_role, {}).get("client.create", DENY) != DENY
+    # Base context shared by both single and split views
+    context = {
+        "has_mixed_roles": has_mixed_roles,
+        "accessible_programs": accessible_programs,
+        "status_filter": status_filter,
+        "program_filter": program_filter,
+        "editable_filter": editable_filter,
+        "has_plan_edit_programs": bool(plan_edit_program_ids),
+        "search_query": request.GET.get("q", ""),
+        "sort_by": sort_by,
+        "can_create": can_create,
+    }
+
+    # Filters run in SQL so filtered-out participants are never decrypted.
+    # Program and editable-plan filters only count enrolments in the user's
+    # own programs — the ones the list shows.
+    if status_filter:
+        clients = clients.filter(status=status_filter)
+    if program_filter or editable_filter:
+        enrolment_programs = set(user_program_ids)
+        if program_filter:
+            enrolment_programs &= {int(program_filter)}
+        if editable_filter:
+            enrolment_programs &= plan_edit_program_ids
+        clients = clients.filter(pk__in=ClientProgramEnrolment.objects.filter(
+            program_id__in=enrolment_programs,
+            status__in=ServiceEpisode.ACCESSIBLE_STATUSES,
+        ).values("client_file_id"))
+
+    # Default listing (no search, one section): order and paginate in SQL,
+    # then decrypt only the rows on this page. Searching needs every
+    # participant's decrypted name, and the caseload/oversight split sorts
+    # two lists, so those keep the in-memory path below.
+    if not search_query and not has_mixed_roles:
+        if sort_by not in KEYSET_SORTS:
+            sort_by = context["sort_by"] = "name"
+        page = keyset_page(
+            clients, sort_by,
+            after=request.GET.get("after"), before=request.GET.get("before"),
+        )
+        page.object_list = [_list_item(client) for client in page.object_list]
+        if sort_by == "name":
+            # Rows are grouped by first letter in SQL (labelled in the
+            # header); order by full name within the page
+            page.object_list.sort(key=lambda c: (c["client"].name_sort_bucket, c["name"].lower()))
+        context["page"] = page
+        if request.headers.get("HX-Request"):
+            return render(request, "clients/_client_list_table.html", context)
+        return render(request, "clients/list.html", context)
+
+    # Decrypt names and build display list — two passes when searching:
+    # 1. Match by name/record ID
+    # 2. For unmatched clients, also search progress note content
+    client_data = []
+    unmatched = {}  # client.pk → item dict, for the note-search pass
+    for client in clients:
+        item = _list_item(client)
 
         # Apply text search (name, record ID, or — via second pass — note content)
         # BUG-13: accent-insensitive — strip accents from name/record before comparing
         if search_query:
             record = (client.record_id or "").lower()
-            if search_query in _strip_accents(name.lower()) or search_query in _strip_accents(record):
+            if search_query in _strip_accents(item["name"].lower()) or search_query in _strip_accents(record):
                 client_data.append(item)
             else:
                 unmatched[client.pk] = item
@@ -355,32 +336,20 @@ def client_list(request):
             client_data.append(unmatched[cid])
 
     # Sort helper — reused for both single and split lists
-    if sort_by == "last_contact":
+    if sort_by in ("last_contact", "created"):
         from datetime import datetime as dt
         epoch = dt(2000, 1, 1, 0, 0)
         min_dt = timezone.make_aware(epoch) if timezone.is_aware(timezone.now()) else epoch
-        _sort_fn = lambda c: c["last_contact"] or min_dt  # noqa: E731
+        _field = "last_contact_at" if sort_by == "last_contact" else "created_at"
+        _sort_fn = lambda c: getattr(c["client"], _field) or min_dt  # noqa: E731
         _sort_reverse = True
+    elif sort_by == "record_id":
+        _sort_fn = lambda c: c["client"].record_id  # noqa: E731
+        _sort_reverse = False
     else:
         _sort_fn = lambda c: c["name"].lower()  # noqa: E731
         _sort_reverse = False
 
-    # Show create button if user's role grants client.create permission
-    user_role = _get_user_highest_role(request.user)
-    can_create = PERMISSIONS.get(user_role, {}).get("client.create", DENY) != DENY
-    # Base context shared by both single and split views
-    context = {
-        "has_mixed_roles": has_mixed_roles,
-        "accessible_programs": accessible_programs,
-        "status_filter": status_filter,
-        "program_filter": program_filter,
-        "editable_filter": editable_filter,
-        "has_plan_edit_programs": bool(plan_edit_program_ids),
-        "search_query": request.GET.get("q", ""),
-        "sort_by": sort_by,
-        "can_create": can_create,
-    }
-
     # Build section-specific context
     if has_mixed_roles:
         # Split participants: caseload (staff programs) vs oversight (PM programs).
@@ -1142,6 +1111,7 @@ def _build_client_detail_base_context(request, client, *, active_tab):
 
 
 @login_required
+@perf_budget(queries=60)
 def client_detail(request, client_id):
     # Security: Only fetch clients matching user's demo status
     base_queryset = get_client_queryset(request.user)
@@ -1210,8 +1180,8 @@ def client_detail(request, client_id):
 
     # Compute effective sharing state for the note sharing toggle (QA-R7-PRIVACY2).
     # Binary: ON if field is "consent", or "default" with agency toggle on.
-    from django.core.cache import cache as _cache
-    _flags = _cache.get("feature_toggles") or {}
+    from apps.admin_settings import cached
+    _flags = cached.feature_flags()
     _agency_shares = _flags.get("cross_program_note_sharing", True)
     if client.cross_program_sharing == "consent":
         sharing_effective = True
@@ -1972,6 +1942,8 @@ def custom_field_def_edit(request, field_id):
         form = CustomFieldDefinitionForm(request.POST, instance=field_def)
         if form.is_valid():
             form.save()
+            if {"report_bucket_codes", "input_type", "options_json", "is_sensitive", "is_dv_sensitive"} & set(form.changed_data):
+                field_def.refresh_bucket_codes()
             messages.success(request, _("Field updated."))
             return redirect("clients:custom_field_admin")
     else:
@@ -5,11 +5,17 @@ Usage:
     python manage.py send_reminders              # Send reminders for meetings in next 36h
     python manage.py send_reminders --dry-run    # Preview without sending
     python manage.py send_reminders --hours 24   # Custom lookahead window
+    python manage.py send_reminders --workers 8  # More concurrent SMS sends
 
 Intended to run as a scheduled task (e.g., hourly cron via ops sidecar).
 Finds meetings in the next N hours that haven't had a reminder sent yet,
 sends via the client's preferred channel (SMS or email), and logs results.
 Failed reminders are retried on subsequent runs.
+
+Reminders are sent as one batch (see send_reminders_batch): one Twilio
+client for the whole run, sends spread over a small thread pool, and
+results saved in bulk after each chunk of sends, so a run killed partway
+(e.g. by run_across_tenants --timeout) doesn't resend what already went out.
 """
 import logging
 from datetime import timedelta
@@ -17,7 +23,11 @@ from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from apps.communications.services import check_and_send_health_alert, send_reminder
+from apps.communications.services import (
+    DEFAULT_REMINDER_WORKERS,
+    check_and_send_health_alert,
+    send_reminders_batch,
+)
 from apps.events.models import Meeting
 
 logger = logging.getLogger(__name__)
@@ -45,6 +55,12 @@ class Command(BaseCommand):
             default=DEFAULT_HOURS,
             help=f"Lookahead window in hours (default: {DEFAULT_HOURS}).",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_REMINDER_WORKERS,
+            help=f"Concurrent sends (default: {DEFAULT_REMINDER_WORKERS}).",
+        )
 
     def handle(self, *args, **options):
         dry_run = options["dry_run"]
@@ -71,8 +87,8 @@ class Command(BaseCommand):
             .select_related("event", "event__client_file")
             .order_by("event__start_timestamp")
         )
-
-        total = meetings.count()
+        meetings = list(meetings)
+        total = len(meetings)
 
         if total == 0:
             self.stdout.write(self.style.SUCCESS(
@@ -86,24 +102,21 @@ class Command(BaseCommand):
         failed = 0
         skipped = 0
 
-        for meeting in meetings:
-            client_file = meeting.event.client_file
-            start = meeting.event.start_timestamp
-            label = f"Meeting on {start.strftime('%b %d at %I:%M %p')} (ID {meeting.pk})"
-
-            if dry_run:
-                channel = getattr(client_file, "preferred_contact_method", "none")
-                self.stdout.write(f"  Would remind: {label} — channel: {channel}")
+        if dry_run:
+            for meeting in meetings:
+                channel = getattr(meeting.event.client_file, "preferred_contact_method", "none")
+                self.stdout.write(f"  Would remind: {self._label(meeting)} — channel: {channel}")
                 skipped += 1
-                continue
+            self.stdout.write("")
+            self.stdout.write(self.style.SUCCESS(
+                f"DRY RUN complete: {skipped} meeting(s) would be processed."
+            ))
+            return
 
-            try:
-                success, reason = send_reminder(meeting)
-            except Exception:
-                logger.exception("Unexpected error sending reminder for meeting %s", meeting.pk)
-                success = False
-                reason = "Unexpected error"
+        results = send_reminders_batch(meetings, max_workers=options["workers"])
 
+        for meeting, success, reason in results:
+            label = self._label(meeting)
             if success:
                 sent += 1
                 self.stdout.write(f"  Sent: {label}")
@@ -117,12 +130,6 @@ class Command(BaseCommand):
 
         # Summary
         self.stdout.write("")
-        if dry_run:
-            self.stdout.write(self.style.SUCCESS(
-                f"DRY RUN complete: {skipped} meeting(s) would be processed."
-            ))
-            return
-
         summary_parts = []
         if sent:
             summary_parts.append(f"{sent} sent")
@@ -140,3 +147,8 @@ class Command(BaseCommand):
             check_and_send_health_alert()
         except Exception:
             logger.exception("Error checking system health after reminder batch")
+
+    @staticmethod
+    def _label(meeting):
+        start = meeting.event.start_timestamp
+        return f"Meeting on {start.strftime('%b %d at %I:%M %p')} (ID {meeting.pk})"
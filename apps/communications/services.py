@@ -5,15 +5,18 @@ sending, and logging. Docstrings explain business rules (the "why") for
 AI-assisted maintainers.
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 
 from django.conf import settings
 from django.core import signing
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.db import transaction
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from apps.clients.activity import refresh_activity
 from apps.communications.models import Communication, SystemHealthCheck
 
 logger = logging.getLogger(__name__)
@@ -59,6 +62,23 @@ DEFAULT_TEMPLATES = {
 }
 
 
+# Concurrent SMS sends in send_reminders_batch(). Twilio calls are network-bound.
+DEFAULT_REMINDER_WORKERS = 4
+
+# Meetings sent between database writes in send_reminders_batch(). Bounds how
+# many sent reminders go unrecorded if the job dies mid-batch.
+REMINDER_CHUNK_SIZE = 25
+
+
+def _get_setting(instance_settings, key, default=""):
+    """Read an InstanceSetting from a preloaded dict, or the database."""
+    from apps.admin_settings.models import InstanceSetting
+
+    if instance_settings is None:
+        return InstanceSetting.get(key, default)
+    return instance_settings.get(key, default)
+
+
 # ---------------------------------------------------------------------------
 # Pre-send checks
 # ---------------------------------------------------------------------------
@@ -96,13 +116,16 @@ def check_consent(client_file, channel):
     return True, "OK"
 
 
-def can_send(client_file, channel, method="staff"):
+def can_send(client_file, channel, method="staff", instance_settings=None, flags=None):
     """Check all prerequisites before sending a message.
 
     Args:
         client_file: The client to send to.
         channel: "sms" or "email".
         method: "staff" (manual send by a person) or "automated" (cron job).
+        instance_settings: Optional InstanceSetting.get_all() result, so
+            batch callers load settings once instead of once per client.
+        flags: Optional FeatureToggle.get_all_flags() result, as above.
 
     Returns (allowed: bool, reason: str).
     Checks are ordered from broadest restriction to narrowest:
@@ -113,19 +136,19 @@ def can_send(client_file, channel, method="staff"):
     5. Consent expiry — implied consent 2-year rule
     6. Contact info exists
     """
-    from apps.admin_settings.models import FeatureToggle, InstanceSetting
+    from apps.admin_settings.models import FeatureToggle
 
     # 0. Validate method parameter
     if method not in ("staff", "automated"):
         return False, _("Invalid send method")
 
     # 1. Safety-First mode
-    if InstanceSetting.get("safety_first_mode", "false") == "true":
+    if _get_setting(instance_settings, "safety_first_mode", "false") == "true":
         return False, _("Safety-First mode is enabled — no outbound messages")
 
     # 2. Messaging capability
-    staff_ok = InstanceSetting.get("staff_messaging_enabled", "false") == "true"
-    auto_ok = InstanceSetting.get("automated_reminders_enabled", "false") == "true"
+    staff_ok = _get_setting(instance_settings, "staff_messaging_enabled", "false") == "true"
+    auto_ok = _get_setting(instance_settings, "automated_reminders_enabled", "false") == "true"
     if method == "staff" and not staff_ok:
         return False, _("Staff messaging is not enabled")
     if method == "automated" and not auto_ok:
@@ -135,7 +158,8 @@ def can_send(client_file, channel, method="staff"):
         return False, _("Messaging is set to record-keeping only")
 
     # 3. Channel capability
-    flags = FeatureToggle.get_all_flags()
+    if flags is None:
+        flags = FeatureToggle.get_all_flags()
     if channel == "sms" and not flags.get("messaging_sms", False):
         return False, _("Text messaging is not set up")
     if channel == "email" and not flags.get("messaging_email", False):
@@ -160,7 +184,8 @@ def can_send(client_file, channel, method="staff"):
 # Message template rendering
 # ---------------------------------------------------------------------------
 
-def render_message_template(template_key, client_file, meeting, personal_note=""):
+def render_message_template(template_key, client_file, meeting, personal_note="",
+                            instance_settings=None):
     """Render a message template with meeting/client context.
 
     Uses admin-configured template from InstanceSetting, falling back
@@ -172,17 +197,16 @@ def render_message_template(template_key, client_file, meeting, personal_note=""
         client_file: The client receiving the message
         meeting: The meeting being reminded about
         personal_note: Optional staff note appended to the message
+        instance_settings: Optional preloaded InstanceSetting.get_all() dict
     """
-    from apps.admin_settings.models import InstanceSetting
-
     lang = getattr(client_file, "preferred_language", "en")
     key = f"{template_key}_{lang}"
     fallback_key = f"{template_key}_en"
 
     # Try admin-configured template, then default
     template_text = (
-        InstanceSetting.get(key, "")
-        or InstanceSetting.get(fallback_key, "")
+        _get_setting(instance_settings, key, "")
+        or _get_setting(instance_settings, fallback_key, "")
         or DEFAULT_TEMPLATES.get(key, DEFAULT_TEMPLATES.get(fallback_key, ""))
     )
 
@@ -192,7 +216,7 @@ def render_message_template(template_key, client_file, meeting, personal_note=""
     rendered = template_text.format(
         date=date_str,
         time=time_str,
-        org_phone=InstanceSetting.get("support_contact_phone", ""),
+        org_phone=_get_setting(instance_settings, "support_contact_phone", ""),
     )
 
     if personal_note:
@@ -234,12 +258,7 @@ def send_sms(phone_number, message_body):
         return False, _("SMS is not configured")
 
     try:
-        from twilio.rest import Client as TwilioClient
-
-        client = TwilioClient(
-            settings.TWILIO_ACCOUNT_SID,
-            settings.TWILIO_AUTH_TOKEN,
-        )
+        client = _get_twilio_client()
         message = client.messages.create(
             body=message_body,
             from_=settings.TWILIO_FROM_NUMBER,
@@ -257,6 +276,19 @@ def send_sms(phone_number, message_body):
         return False, plain_error
 
 
+def _get_twilio_client():
+    """Create a Twilio REST client. Raises ImportError if twilio is missing."""
+    from twilio.rest import Client as TwilioClient
+
+    return TwilioClient(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+
+
+def _mask_email(to_email):
+    if "@" not in to_email:
+        return "***"
+    return to_email.split("@")[0][:2] + "***@" + to_email.split("@")[1]
+
+
 def send_email_message(to_email, subject, body_text, body_html=None):
     """Send an email using Django's configured SMTP backend.
 
@@ -274,8 +306,7 @@ def send_email_message(to_email, subject, body_text, body_html=None):
         SystemHealthCheck.record_success("email")
         return True, None
     except Exception as e:
-        masked = to_email.split("@")[0][:2] + "***@" + to_email.split("@")[1] if "@" in to_email else "***"
-        logger.warning("Email send failed to %s: %s", masked, str(e))
+        logger.warning("Email send failed to %s: %s", _mask_email(to_email), str(e))
         error_msg = _("Email could not be delivered — check the email address with the client")
         SystemHealthCheck.record_failure("email", str(e)[:255])
         return False, error_msg
@@ -536,6 +567,328 @@ def translate_error(error):
     return _("Text could not be delivered — try confirming the phone number with the client")
 
 
+# ---------------------------------------------------------------------------
+# Batched reminder dispatch (send_reminders cron job)
+# ---------------------------------------------------------------------------
+
+def _prepare_reminder(meeting, instance_settings, flags):
+    """Decide how to remind one meeting, without sending anything.
+
+    Mirrors send_reminder() for automated sends. Returns either
+    ("skip", status, status_reason, returned_reason) when no message should
+    go out, or ("sms" | "email", recipient, subject, body).
+    """
+    client_file = meeting.event.client_file
+    channel = getattr(client_file, "preferred_contact_method", "none")
+
+    if channel == "none":
+        return ("skip", "no_consent", _("Client has not consented to reminders"), "No consent")
+
+    send_channel = "sms" if channel in ("sms", "both") else "email"
+    allowed, block_reason = can_send(
+        client_file, send_channel, method="automated",
+        instance_settings=instance_settings, flags=flags,
+    )
+    if not allowed and channel == "both":
+        alt_channel = "email" if send_channel == "sms" else "sms"
+        allowed, block_reason = can_send(
+            client_file, alt_channel, method="automated",
+            instance_settings=instance_settings, flags=flags,
+        )
+        if allowed:
+            send_channel = alt_channel
+    if not allowed:
+        lowered = block_reason.lower()
+        status = "blocked" if "set up" in lowered or "record-keeping" in lowered else "no_consent"
+        return ("skip", status, block_reason, block_reason)
+
+    if send_channel == "sms":
+        # Contact info is read at send time, never cached
+        body = render_message_template(
+            "reminder_sms", client_file, meeting, instance_settings=instance_settings,
+        )
+        return ("sms", client_file.phone, "Appointment reminder", body)
+
+    lang = getattr(client_file, "preferred_language", "en")
+    subject_key = f"reminder_email_subject_{lang}"
+    subject = (
+        instance_settings.get(subject_key, "")
+        or DEFAULT_TEMPLATES.get(subject_key, DEFAULT_TEMPLATES["reminder_email_subject_en"])
+    )
+    body = render_message_template(
+        "reminder_email_body", client_file, meeting, instance_settings=instance_settings,
+    )
+    unsubscribe_url = generate_unsubscribe_url(client_file, "email")
+    body += f"\n\n---\n{_('To stop receiving these messages')}: {unsubscribe_url}"
+    return ("email", client_file.email, subject, body)
+
+
+def _dispatch_sms(twilio_client, phone_number, body):
+    """Send one SMS on a shared Twilio client. Runs in a worker thread.
+
+    Returns (success, sid_or_plain_error, health_reason).
+    """
+    try:
+        message = twilio_client.messages.create(
+            body=body,
+            from_=settings.TWILIO_FROM_NUMBER,
+            to=phone_number,
+        )
+        return True, message.sid, ""
+    except Exception as e:
+        logger.warning("SMS send failed: %s", str(e))
+        plain_error = translate_error(e)
+        return False, plain_error, plain_error
+
+
+def _dispatch_emails(connection, jobs):
+    """Send reminder emails over the batch's backend connection. Runs in a worker thread.
+
+    SMTP connections are not thread-safe, so emails go out sequentially on a
+    single connection while SMS sends proceed in parallel. The connection is
+    opened on first use and stays open for later chunks; the caller closes it.
+
+    Returns a list of (success, plain_error, health_reason), one per job.
+    """
+    results = []
+    try:
+        connection.open()
+        for to_email, subject, body in jobs:
+            message = EmailMessage(
+                subject=subject,
+                body=body,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[to_email],
+            )
+            try:
+                connection.send_messages([message])
+                results.append((True, "", ""))
+            except Exception as e:
+                logger.warning("Email send failed to %s: %s", _mask_email(to_email), str(e))
+                results.append((
+                    False,
+                    _("Email could not be delivered — check the email address with the client"),
+                    str(e)[:255],
+                ))
+    except Exception as e:
+        # Could not connect at all — fail the remaining jobs, and drop the
+        # connection so the next chunk tries a fresh one
+        logger.warning("Email connection failed: %s", str(e))
+        error = _("Email could not be delivered — check the email address with the client")
+        results.extend((False, error, str(e)[:255]) for _job in jobs[len(results):])
+        _close_quietly(connection)
+    return results
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+def _record_channel_health(channel, outcomes):
+    """Apply a batch of send outcomes to SystemHealthCheck in one write.
+
+    Equivalent to calling record_success()/record_failure() once per send,
+    in order: failures after the last success count as consecutive.
+    """
+    if not outcomes:
+        return
+    any_success = False
+    trailing_failures = 0
+    last_reason = ""
+    for ok, reason in outcomes:
+        if ok:
+            any_success = True
+            trailing_failures = 0
+        else:
+            trailing_failures += 1
+            last_reason = reason
+
+    now = timezone.now()
+    obj, _created = SystemHealthCheck.objects.get_or_create(channel=channel)
+    if any_success:
+        obj.last_success_at = now
+        obj.consecutive_failures = trailing_failures
+    else:
+        obj.consecutive_failures += trailing_failures
+    if trailing_failures:
+        obj.last_failure_at = now
+        obj.last_failure_reason = last_reason[:255]
+    obj.save(update_fields=[
+        "last_success_at", "last_failure_at",
+        "consecutive_failures", "last_failure_reason",
+    ])
+
+
+def _save_reminder_results(meetings, indices, outcomes, communications, health):
+    """Record one chunk of reminder outcomes in a single transaction."""
+    from apps.events.models import Meeting
+
+    to_update = []
+    for i in indices:
+        _ok, _reason, status, status_reason = outcomes[i]
+        if status is None:
+            continue
+        meeting = meetings[i]
+        meeting.reminder_status = status
+        meeting.reminder_status_reason = status_reason
+        if status == "sent":
+            # Only set reminder_sent on actual success — the cron job retries the rest
+            meeting.reminder_sent = True
+        to_update.append(meeting)
+
+    with transaction.atomic():
+        Communication.objects.bulk_create(communications, batch_size=500)
+        # bulk_create skips the activity summary signals
+        refresh_activity({comm.client_file_id for comm in communications})
+        if to_update:
+            Meeting.objects.bulk_update(
+                to_update,
+                ["reminder_status", "reminder_status_reason", "reminder_sent"],
+                batch_size=500,
+            )
+        for channel, channel_outcomes in health.items():
+            _record_channel_health(channel, channel_outcomes)
+
+
+def send_reminders_batch(
+    meetings, max_workers=DEFAULT_REMINDER_WORKERS, twilio_client=None,
+    chunk_size=REMINDER_CHUNK_SIZE,
+):
+    """Send automated reminders for many meetings at once.
+
+    Same business rules as send_reminder(), arranged for the cron job:
+    - Instance settings and feature toggles are loaded once, not per client.
+    - All SMS share one Twilio client; all email shares one backend
+      connection from get_connection(), kept open across chunks.
+    - Sends run on a bounded thread pool. Worker threads only talk to
+      Twilio/SMTP — every database read and write stays on this thread.
+    - Sends go out in chunks of chunk_size meetings. Each chunk's
+      Communication rows, meeting reminder statuses and channel health are
+      written in bulk, in one transaction, before the next chunk is sent —
+      so a crash or timeout mid-batch loses at most one chunk's records,
+      and the next run doesn't resend reminders that already went out.
+
+    Args:
+        meetings: Meetings with event and event.client_file loaded
+            (select_related), e.g. the send_reminders queryset.
+        max_workers: Size of the send thread pool.
+        twilio_client: Optional Twilio client to reuse (tests pass a stub).
+        chunk_size: Meetings sent between database writes.
+
+    Returns:
+        List of (meeting, success, reason) in input order — success and
+        reason have the same meaning as send_reminder()'s return value.
+    """
+    from apps.admin_settings.models import FeatureToggle, InstanceSetting
+
+    meetings = list(meetings)
+    if not meetings:
+        return []
+    instance_settings = InstanceSetting.get_all()
+    flags = FeatureToggle.get_all_flags()
+
+    # meeting index → (success, reason, status, status_reason)
+    outcomes = {}
+    send_jobs = []
+    for i, meeting in enumerate(meetings):
+        try:
+            plan = _prepare_reminder(meeting, instance_settings, flags)
+        except Exception:
+            logger.exception("Unexpected error preparing reminder for meeting %s", meeting.pk)
+            outcomes[i] = (False, "Unexpected error", None, "")
+            continue
+        if plan[0] == "skip":
+            _kind, status, status_reason, returned = plan
+            outcomes[i] = (False, returned, status, status_reason)
+        else:
+            send_jobs.append((i, plan))
+
+    # Reminders that won't be sent (no consent, no contact details) first
+    if outcomes:
+        _save_reminder_results(meetings, list(outcomes), outcomes, [], {})
+
+    sms_unavailable = ""
+    if any(plan[0] == "sms" for _i, plan in send_jobs):
+        if not getattr(settings, "SMS_ENABLED", False):
+            sms_unavailable = _("SMS is not configured")
+        elif twilio_client is None:
+            try:
+                twilio_client = _get_twilio_client()
+            except ImportError:
+                logger.error("twilio package not installed")
+                sms_unavailable = _("SMS service not available — twilio package not installed")
+
+    email_connection = None
+    if any(plan[0] == "email" for _i, plan in send_jobs):
+        email_connection = get_connection(fail_silently=False)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            for start in range(0, len(send_jobs), max(1, chunk_size)):
+                chunk = send_jobs[start:start + max(1, chunk_size)]
+                sms_jobs = [job for job in chunk if job[1][0] == "sms"]
+                email_jobs = [job for job in chunk if job[1][0] == "email"]
+
+                sms_results, email_results = [], []
+                email_future = None
+                if email_jobs:
+                    email_future = pool.submit(
+                        _dispatch_emails, email_connection, [plan[1:] for _i, plan in email_jobs],
+                    )
+                if sms_jobs and not sms_unavailable:
+                    sms_results = list(pool.map(
+                        lambda job: _dispatch_sms(twilio_client, job[1][1], job[1][3]),
+                        sms_jobs,
+                    ))
+                if email_future is not None:
+                    email_results = email_future.result()
+                if sms_unavailable:
+                    sms_results = [(False, sms_unavailable, None)] * len(sms_jobs)
+
+                communications = []
+                health = {"sms": [], "email": []}
+                for channel, jobs, results in (
+                    ("sms", sms_jobs, sms_results),
+                    ("email", email_jobs, email_results),
+                ):
+                    for (i, plan), (ok, detail, health_reason) in zip(jobs, results):
+                        meeting = meetings[i]
+                        _kind, _recipient, subject, body = plan
+                        comm = Communication(
+                            client_file=meeting.event.client_file,
+                            direction="outbound",
+                            channel=channel,
+                            method="system_sent",
+                            subject=subject,
+                            delivery_status="sent" if ok else "failed",
+                            delivery_status_display="" if ok else detail,
+                            external_id=detail if ok and channel == "sms" else "",
+                            author_program_id=meeting.event.author_program_id,
+                        )
+                        if ok and channel == "sms":
+                            comm.content = body
+                        communications.append(comm)
+                        if health_reason is not None:
+                            health[channel].append((ok, health_reason))
+                        if ok:
+                            sent_by = _("Reminder sent by text") if channel == "sms" else _("Reminder sent by email")
+                            outcomes[i] = (True, "Sent", "sent", sent_by)
+                        else:
+                            outcomes[i] = (False, detail, "failed", detail)
+
+                _save_reminder_results(
+                    meetings, [i for i, _plan in chunk], outcomes, communications, health,
+                )
+    finally:
+        if email_connection is not None:
+            _close_quietly(email_connection)
+
+    return [(meeting, outcomes[i][0], outcomes[i][1]) for i, meeting in enumerate(meetings)]
+
+
 # ---------------------------------------------------------------------------
 # System health alerts
 # ---------------------------------------------------------------------------
@@ -0,0 +1,235 @@
+"""Delta entity sync for ODK Central (``sync_odk --delta``).
+
+A full push sends every participant and group entity on every run, one HTTP
+request each. Delta sync keeps a content hash per pushed entity
+(EntitySyncState) and only sends entities whose label or properties changed:
+new entities go through ODK Central's bulk create endpoint, changed ones are
+patched in place.
+
+The work is split so that only HTTP runs in worker threads:
+
+  build_plan()     — database reads, main thread
+  execute_plan()   — ODK Central calls only, safe to run concurrently
+  record_results() — database writes, main thread
+
+Plans for different programs are independent, so run_plans() executes them
+over a bounded thread pool sharing one ODKCentralClient (and its
+connection pool).
+"""
+
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EntitySyncState
+from .odk_client import ODKCentralError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+
+
+def content_hash(entity):
+    """Stable SHA-256 of an entity's label and properties."""
+    payload = json.dumps(
+        {"label": entity["label"], "data": entity["data"]},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class EntityPushPlan:
+    """Entities of one dataset in one program that need pushing."""
+
+    config_id: int
+    program_name: str
+    project_id: int
+    dataset_name: str
+    properties: list
+    # Changed or new entities: dicts with uuid, label, data, hash
+    entities: list
+    total: int
+    # False on the first delta run for this dataset — existing ODK entities
+    # are unknown, so execute_plan() lists them once to avoid duplicates.
+    seeded: bool
+    known_uuids: set = field(default_factory=set)
+
+
+@dataclass
+class EntityPushResult:
+    plan: EntityPushPlan
+    created: int = 0
+    updated: int = 0
+    # uuid → hash for every entity ODK Central accepted
+    pushed: dict = field(default_factory=dict)
+    error: str = ""
+
+    @property
+    def unchanged(self):
+        return self.plan.total - len(self.plan.entities)
+
+
+def build_plan(config, dataset_name, properties, entities):
+    """Compare current entities with the last pushed hashes.
+
+    Args:
+        config: ProgramFieldConfig with an odk_project_id.
+        dataset_name: ODK entity list name ("Participants", "Groups").
+        properties: Property names for the entity list if it must be created.
+        entities: Current entities — dicts with "uuid", "label" and "data".
+    """
+    known = dict(
+        EntitySyncState.objects.filter(
+            config=config, dataset_name=dataset_name,
+        ).values_list("entity_uuid", "content_hash")
+    )
+    changed = []
+    for entity in entities:
+        digest = content_hash(entity)
+        if known.get(entity["uuid"]) != digest:
+            changed.append({**entity, "hash": digest})
+
+    return EntityPushPlan(
+        config_id=config.pk,
+        program_name=config.program.name,
+        project_id=config.odk_project_id,
+        dataset_name=dataset_name,
+        properties=properties,
+        entities=changed,
+        total=len(entities),
+        seeded=bool(known),
+        known_uuids=set(known),
+    )
+
+
+def _create_one_by_one(client, plan, entities, result):
+    """Fallback when bulk create is unavailable or rejected."""
+    for entity in entities:
+        try:
+            client.create_entity(
+                plan.project_id, plan.dataset_name,
+                label=entity["label"], data=entity["data"], uuid=entity["uuid"],
+            )
+            result.created += 1
+        except ODKCentralError as e:
+            if e.status_code != 409:
+                raise
+            # Already exists in ODK Central — overwrite it
+            client.update_entity(
+                plan.project_id, plan.dataset_name, entity["uuid"],
+                data=entity["data"], label=entity["label"], force=True,
+            )
+            result.updated += 1
+        result.pushed[entity["uuid"]] = entity["hash"]
+
+
+def execute_plan(client, plan):
+    """Push a plan's changed entities to ODK Central. No database access."""
+    result = EntityPushResult(plan=plan)
+    if not plan.entities:
+        return result
+
+    project_id, dataset_name = plan.project_id, plan.dataset_name
+    try:
+        dataset_names = {d["name"] for d in client.list_entity_lists(project_id)}
+        if dataset_name not in dataset_names:
+            client.create_entity_list(
+                project_id, dataset_name,
+                properties=[{"name": p} for p in plan.properties],
+            )
+            existing = set()
+        elif plan.seeded:
+            existing = plan.known_uuids
+        else:
+            existing = {e["uuid"] for e in client.list_entities(project_id, dataset_name)}
+
+        creates = [e for e in plan.entities if e["uuid"] not in existing]
+        updates = [e for e in plan.entities if e["uuid"] in existing]
+
+        if creates:
+            try:
+                client.create_entities_bulk(project_id, dataset_name, creates)
+                result.created += len(creates)
+                result.pushed.update((e["uuid"], e["hash"]) for e in creates)
+            except ODKCentralError as e:
+                if e.status_code is None or e.status_code >= 500:
+                    raise
+                # Older Central without the bulk endpoint, or an entity
+                # already exists (bulk create is all-or-nothing).
+                logger.info(
+                    "Bulk create failed for %s/%s (%s); creating one at a time",
+                    plan.program_name, dataset_name, e,
+                )
+                _create_one_by_one(client, plan, creates, result)
+
+        for entity in updates:
+            try:
+                client.update_entity(
+                    project_id, dataset_name, entity["uuid"],
+                    data=entity["data"], label=entity["label"], force=True,
+                )
+                result.updated += 1
+                result.pushed[entity["uuid"]] = entity["hash"]
+            except ODKCentralError as e:
+                if e.status_code != 404:
+                    raise
+                # Deleted on the ODK side since our last push — recreate it
+                _create_one_by_one(client, plan, [entity], result)
+
+    except ODKCentralError as e:
+        result.error = f"Error pushing {dataset_name} for {plan.program_name}: {e}"
+        logger.error(result.error)
+    return result
+
+
+def run_plans(client, plans, max_workers=DEFAULT_WORKERS):
+    """Execute plans concurrently; results are returned in plan order."""
+    if max_workers <= 1 or len(plans) <= 1:
+        return [execute_plan(client, plan) for plan in plans]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda plan: execute_plan(client, plan), plans))
+
+
+def record_results(results):
+    """Store the hashes of everything ODK Central accepted."""
+    now = timezone.now()
+    with transaction.atomic():
+        for result in results:
+            if not result.pushed:
+                continue
+            plan = result.plan
+            existing = {
+                state.entity_uuid: state
+                for state in EntitySyncState.objects.filter(
+                    config_id=plan.config_id,
+                    dataset_name=plan.dataset_name,
+                )
+            }
+            to_update, to_create = [], []
+            for entity_uuid, digest in result.pushed.items():
+                state = existing.get(entity_uuid)
+                if state is not None:
+                    state.content_hash = digest
+                    # bulk_update() does not apply auto_now
+                    state.pushed_at = now
+                    to_update.append(state)
+                else:
+                    to_create.append(EntitySyncState(
+                        config_id=plan.config_id,
+                        dataset_name=plan.dataset_name,
+                        entity_uuid=entity_uuid,
+                        content_hash=digest,
+                    ))
+            if to_update:
+                EntitySyncState.objects.bulk_update(
+                    to_update, ["content_hash", "pushed_at"], batch_size=500,
+                )
+            if to_create:
+                EntitySyncState.objects.bulk_create(to_create, batch_size=500)
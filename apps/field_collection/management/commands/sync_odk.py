@@ -9,6 +9,8 @@ Usage:
     python manage.py sync_odk --direction=pull   # Pull only
     python manage.py sync_odk --program=5        # Single program
     python manage.py sync_odk --dry-run          # Preview without changes
+    python manage.py sync_odk --delta            # Push only changed entities
+    python manage.py sync_odk --delta --workers=8
 """
 
 import logging
@@ -19,10 +21,20 @@ from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
 from apps.auth_app.constants import ROLE_PROGRAM_MANAGER, ROLE_STAFF
+from apps.field_collection.entity_sync import DEFAULT_WORKERS
 
 logger = logging.getLogger(__name__)
 
 
+class PartialImportError(Exception):
+    """An import stopped partway, after some batches had committed."""
+
+    def __init__(self, message, created, skipped):
+        super().__init__(message)
+        self.created = created
+        self.skipped = skipped
+
+
 class Command(BaseCommand):
     help = "Sync data between KoNote and ODK Central"
 
@@ -53,6 +65,20 @@ class Command(BaseCommand):
             action="store_true",
             help="Preview what would be synced without making changes.",
         )
+        parser.add_argument(
+            "--delta",
+            action="store_true",
+            help=(
+                "Push only entities that changed since the last push, using "
+                "bulk create, with programs pushed concurrently."
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_WORKERS,
+            help=f"Concurrent program pushes in --delta mode (default: {DEFAULT_WORKERS}).",
+        )
 
     def handle(self, *args, **options):
         from apps.field_collection.models import ProgramFieldConfig, SyncRun
@@ -61,6 +87,7 @@ class Command(BaseCommand):
         direction = options["direction"]
         program_id = options.get("program")
         dry_run = options["dry_run"]
+        delta = options.get("delta", False)
 
         # Read ODK Central credentials from environment at sync time
         odk_url = os.environ.get("ODK_CENTRAL_URL", "")
@@ -109,6 +136,8 @@ class Command(BaseCommand):
             return
 
         errors = []
+        failed_programs = set()
+        delta_plans = []
 
         for config in configs:
             program = config.program
@@ -120,22 +149,37 @@ class Command(BaseCommand):
                     config = self._ensure_odk_project(client, config)
 
                 if direction in ("push", "both"):
-                    self._push_entities(client, config, sync_run, dry_run)
+                    if delta:
+                        # Entity pushes run after the loop, concurrently
+                        delta_plans.extend(
+                            self._plan_delta_push(client, config, sync_run, dry_run)
+                        )
+                    else:
+                        self._push_entities(client, config, sync_run, dry_run)
 
                 if direction in ("pull", "both"):
-                    self._pull_submissions(client, config, sync_run, dry_run)
+                    self._pull_submissions(client, config, sync_run, dry_run, errors)
 
             except ODKCentralError as e:
                 msg = f"Error syncing {program.name}: {e}"
                 errors.append(msg)
+                failed_programs.add(program.pk)
                 self.stderr.write(self.style.ERROR(msg))
                 logger.error(msg, exc_info=True)
 
+        if delta_plans:
+            program_by_config = {c.pk: c.program_id for c in configs}
+            for config_id, msg in self._execute_delta_push(
+                client, delta_plans, sync_run, options["workers"],
+            ):
+                errors.append(msg)
+                failed_programs.add(program_by_config[config_id])
+
         # Finalise sync run
         if not dry_run:
             sync_run.error_count = len(errors)
             sync_run.error_details = "\n".join(errors)
-            sync_run.status = "failed" if len(errors) == len(configs) else (
+            sync_run.status = "failed" if len(failed_programs) == len(configs) else (
                 "partial" if errors else "success"
             )
             sync_run.finished_at = timezone.now()
@@ -204,6 +248,89 @@ class Command(BaseCommand):
             self._sync_app_users(client, project_id, config, staff_roles)
             sync_run.app_users_synced += staff_roles.count()
 
+    def _plan_delta_push(self, client, config, sync_run, dry_run):
+        """Work out which entities changed since the last push (--delta).
+
+        Database reads only; the returned plans are pushed concurrently by
+        _execute_delta_push. App users are synced here as in a full push.
+        """
+        from apps.field_collection.entity_sync import build_plan
+        from apps.programs.models import UserProgramRole
+
+        plans = []
+
+        if "visit_note" in config.enabled_forms or "circle_observation" in config.enabled_forms:
+            participants = self._get_participants_for_push(config)
+            properties = ["konote_id"] + [f for f in config.entity_fields_for_tier if f != "id"]
+            plans.append(build_plan(config, "Participants", properties, participants))
+
+        if "session_attendance" in config.enabled_forms:
+            groups = [
+                {
+                    "label": g["name"],
+                    "data": {
+                        "konote_group_id": str(g["group_id"]),
+                        "member_count": str(len(g["members"])),
+                    },
+                    "uuid": f"konote-group-{g['group_id']}",
+                }
+                for g in self._get_groups_for_push(config.program)
+            ]
+            plans.append(build_plan(
+                config, "Groups", ["konote_group_id", "member_count"], groups,
+            ))
+
+        for plan in plans:
+            self.stdout.write(
+                f"  {plan.dataset_name} changed since last push: "
+                f"{len(plan.entities)} of {plan.total}"
+            )
+
+        staff_roles = UserProgramRole.objects.filter(
+            program=config.program,
+            status="active",
+            role__in=[ROLE_STAFF, ROLE_PROGRAM_MANAGER],
+        ).select_related("user")
+        self.stdout.write(f"  Staff to sync as app users: {staff_roles.count()}")
+
+        if dry_run:
+            return []
+
+        self._sync_app_users(client, config.odk_project_id, config, staff_roles)
+        sync_run.app_users_synced += staff_roles.count()
+        return [plan for plan in plans if plan.entities]
+
+    def _execute_delta_push(self, client, plans, sync_run, workers):
+        """Push delta plans over a thread pool and record the new hashes.
+
+        Returns a list of (config_id, error message) for failed plans.
+        """
+        from apps.field_collection.entity_sync import record_results, run_plans
+
+        self.stdout.write(
+            f"\nPushing {len(plans)} changed entity list(s) with {max(workers, 1)} worker(s)"
+        )
+        results = run_plans(client, plans, max_workers=workers)
+        record_results(results)
+
+        failures = []
+        for result in results:
+            plan = result.plan
+            self.stdout.write(
+                f"  {plan.program_name} — {plan.dataset_name}: "
+                f"{result.created} created, {result.updated} updated, "
+                f"{result.unchanged} unchanged"
+            )
+            pushed = result.created + result.updated
+            if plan.dataset_name == "Participants":
+                sync_run.participants_pushed += pushed
+            else:
+                sync_run.groups_pushed += pushed
+            if result.error:
+                self.stderr.write(self.style.ERROR(f"  {result.error}"))
+                failures.append((plan.config_id, result.error))
+        return failures
+
     def _get_participants_for_push(self, config):
         """Get participant data to push, filtered by tier and scope."""
         from apps.clients.models import ClientFile
@@ -350,8 +477,11 @@ class Command(BaseCommand):
                     except ODKCentralError as e:
                         logger.warning("Could not assign app user to form %s: %s", form_id, e)
 
-    def _pull_submissions(self, client, config, sync_run, dry_run):
-        """Pull new submissions from ODK Central and create KoNote records."""
+    def _pull_submissions(self, client, config, sync_run, dry_run, errors=None):
+        """Pull new submissions from ODK Central and create KoNote records.
+
+        Partial imports are appended to errors so the run ends as "partial".
+        """
         from apps.field_collection.models import SyncRun as SyncRunModel
         from apps.field_collection.odk_client import ODKCentralError
 
@@ -377,6 +507,12 @@ class Command(BaseCommand):
                     created, skipped = self._import_attendance(submissions, config)
                     sync_run.attendance_records_created += created
                     sync_run.submissions_skipped += skipped
+            except PartialImportError as e:
+                sync_run.attendance_records_created += e.created
+                sync_run.submissions_skipped += e.skipped
+                sync_run.error_count += 1
+                if errors is not None:
+                    errors.append(f"{config.program.name}: {e}")
             except ODKCentralError as e:
                 self.stderr.write(f"  Error pulling attendance: {e}")
                 logger.error("Error pulling attendance for %s: %s", config.program.name, e)
@@ -397,11 +533,22 @@ class Command(BaseCommand):
                 sync_run.error_count += 1
 
     def _import_attendance(self, submissions, config):
-        """Import attendance submissions as GroupSession + GroupSessionAttendance records."""
-        from apps.groups.models import Group, GroupMembership, GroupSession, GroupSessionAttendance
+        """Import attendance submissions as GroupSession + GroupSessionAttendance records.
+
+        Submissions are parsed first, then written in batches by
+        BulkAttendanceWriter (one transaction per batch, bulk inserts, and an
+        in-memory set of existing group + date sessions for dedup).
+
+        If a batch fails, sessions from the batches before it stay committed:
+        they are reported and counted, and PartialImportError is raised with
+        the counts so the run is marked partial rather than failed.
+        """
+        from apps.groups.services import (
+            AttendanceEntry, AttendanceWriteResult, BulkAttendanceWriter,
+        )
 
-        created = 0
         skipped = 0
+        entries = []
 
         for sub in submissions:
             try:
@@ -411,46 +558,51 @@ class Command(BaseCommand):
                     skipped += 1
                     continue
 
-                session_date = date.fromisoformat(session_date_str)
-
-                # Dedup: skip if session already exists for this group + date
-                if GroupSession.objects.filter(group_id=group_id, session_date=session_date).exists():
-                    self.stdout.write(f"    Skipped: session already exists for group {group_id} on {session_date}")
-                    skipped += 1
-                    continue
+                present_ids = set()
+                for token in sub.get("members_present", "").split():
+                    try:
+                        present_ids.add(int(token))
+                    except ValueError:
+                        pass
 
-                # Create session
-                session = GroupSession.objects.create(
+                entries.append(AttendanceEntry(
                     group_id=group_id,
-                    session_date=session_date,
-                )
-                session_notes = sub.get("session_notes", "")
-                if session_notes:
-                    session.notes = session_notes
-                    session.save()
-
-                # Create attendance records
-                members_present = sub.get("members_present", "").split()
-                all_memberships = GroupMembership.objects.filter(
-                    group_id=group_id, status="active"
-                )
-                for membership in all_memberships:
-                    present = str(membership.pk) in members_present
-                    GroupSessionAttendance.objects.create(
-                        group_session=session,
-                        membership=membership,
-                        present=present,
-                    )
-
-                created += 1
-                self.stdout.write(f"    Created session for group {group_id} on {session_date}")
-
+                    session_date=date.fromisoformat(session_date_str),
+                    present_membership_ids=present_ids,
+                    notes=sub.get("session_notes", ""),
+                ))
             except Exception as e:
                 self.stderr.write(f"    Error importing attendance: {e}")
                 logger.error("Error importing attendance submission: %s", e, exc_info=True)
                 skipped += 1
 
-        return created, skipped
+        result = AttendanceWriteResult()
+        error = None
+        try:
+            BulkAttendanceWriter().write(entries, result=result)
+        except Exception as e:
+            error = e
+            logger.error("Error importing attendance batch: %s", e, exc_info=True)
+
+        for entry, reason in result.skipped:
+            self.stdout.write(
+                f"    Skipped: {reason} for group {entry.group_id} on {entry.session_date}"
+            )
+        for entry, _session in result.created:
+            self.stdout.write(f"    Created session for group {entry.group_id} on {entry.session_date}")
+
+        created = len(result.created)
+        skipped += len(result.skipped)
+        if error is None:
+            return created, skipped
+
+        not_written = len(entries) - created - len(result.skipped)
+        msg = (
+            f"Attendance import stopped partway: {created} sessions committed, "
+            f"{not_written} submissions not written ({error})"
+        )
+        self.stderr.write(f"    {msg}")
+        raise PartialImportError(msg, created, skipped)
 
     def _import_visit_notes(self, submissions, config):
         """Import visit note submissions as ProgressNote records."""
@@ -543,3 +695,5 @@ class Command(BaseCommand):
         self.stdout.write(f"  Submissions skipped: {sync_run.submissions_skipped}")
         if sync_run.error_count:
             self.stdout.write(self.style.ERROR(f"  Errors: {sync_run.error_count}"))
+            for line in sync_run.error_details.splitlines():
+                self.stdout.write(f"    {line}")
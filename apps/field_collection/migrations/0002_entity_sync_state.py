@@ -0,0 +1,29 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('field_collection', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntitySyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dataset_name', models.CharField(max_length=100)),
+                ('entity_uuid', models.CharField(max_length=100)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('pushed_at', models.DateTimeField(auto_now=True)),
+                ('config', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entity_sync_states', to='field_collection.programfieldconfig')),
+            ],
+            options={
+                'db_table': 'field_collection_entity_sync_states',
+                'constraints': [models.UniqueConstraint(fields=('config', 'dataset_name', 'entity_uuid'), name='unique_entity_sync_state')],
+            },
+        ),
+    ]
@@ -202,3 +202,35 @@ class SyncRun(models.Model):
 
     def __str__(self):
         return f"Sync {self.direction} — {self.started_at:%Y-%m-%d %H:%M} — {self.status}"
+
+
+class EntitySyncState(models.Model):
+    """Content hash of the last entity version pushed to ODK Central.
+
+    Used by ``sync_odk --delta`` to send only entities whose label or
+    properties changed since the previous push. Stores a SHA-256 of the
+    pushed payload, never the payload itself.
+    """
+
+    config = models.ForeignKey(
+        ProgramFieldConfig,
+        on_delete=models.CASCADE,
+        related_name="entity_sync_states",
+    )
+    dataset_name = models.CharField(max_length=100)
+    entity_uuid = models.CharField(max_length=100)
+    content_hash = models.CharField(max_length=64)
+    pushed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = "field_collection"
+        db_table = "field_collection_entity_sync_states"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["config", "dataset_name", "entity_uuid"],
+                name="unique_entity_sync_state",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.dataset_name}/{self.entity_uuid}"
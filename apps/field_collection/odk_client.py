@@ -7,8 +7,11 @@ ODK Central API docs: https://docs.getodk.org/central-api/
 """
 
 import logging
+import threading
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -34,13 +37,36 @@ class ODKCentralClient:
         projects = client.list_projects()
     """
 
-    def __init__(self, base_url, email, password, timeout=30):
+    # Transient failures worth retrying. Connection errors are retried for
+    # every method (the request never reached the server); status-based
+    # retries only apply to idempotent methods.
+    RETRY_STATUSES = (429, 502, 503, 504)
+
+    def __init__(self, base_url, email, password, timeout=30,
+                 max_retries=3, backoff_factor=0.5, pool_size=10):
         self.base_url = base_url.rstrip("/")
         self.email = email
         self.password = password
         self.timeout = timeout
         self._session = requests.Session()
+        # One keep-alive pool shared by every call, sized so concurrent
+        # program pushes (sync_odk --workers) don't open a connection each.
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=max_retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=self.RETRY_STATUSES,
+                allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         self._token = None
+        self._auth_lock = threading.Lock()
 
     def _authenticate(self):
         """Obtain a session token from ODK Central."""
@@ -58,18 +84,30 @@ class ODKCentralClient:
         self._token = resp.json()["token"]
         self._session.headers["Authorization"] = f"Bearer {self._token}"
 
+    def _ensure_token(self, stale_token=None):
+        """Authenticate once, even when several threads need a token at once.
+
+        stale_token: the token a request was rejected with. If another thread
+        has already replaced it, the new token is reused instead of logging in
+        again.
+        """
+        with self._auth_lock:
+            if not self._token or self._token == stale_token:
+                self._authenticate()
+
     def _request(self, method, path, **kwargs):
         """Make an authenticated API request, auto-authenticating if needed."""
         if not self._token:
-            self._authenticate()
+            self._ensure_token()
 
         kwargs.setdefault("timeout", self.timeout)
         url = f"{self.base_url}/v1{path}"
+        token = self._token
         resp = self._session.request(method, url, **kwargs)
 
         # Re-authenticate on 401 (token expired) and retry once
         if resp.status_code == 401:
-            self._authenticate()
+            self._ensure_token(stale_token=token)
             resp = self._session.request(method, url, **kwargs)
 
         if resp.status_code >= 400:
@@ -188,22 +226,33 @@ class ODKCentralClient:
             json=payload,
         ).json()
 
-    def update_entity(self, project_id, dataset_name, entity_uuid, data, label=None):
-        """Update an existing entity's properties."""
-        # Get current version first for conflict detection
-        entity = self._request(
-            "GET",
-            f"/projects/{project_id}/datasets/{dataset_name}/entities/{entity_uuid}",
-        ).json()
+    def update_entity(self, project_id, dataset_name, entity_uuid, data, label=None,
+                      force=False):
+        """Update an existing entity's properties.
 
+        By default the current version is fetched first so ODK Central can
+        detect conflicting edits. force=True skips that round trip and
+        overwrites unconditionally — used by delta sync, where KoNote is the
+        source of truth for pushed entities.
+        """
         payload = {"data": data}
         if label:
             payload["label"] = label
 
+        if force:
+            params = {"force": "true"}
+        else:
+            # Get current version first for conflict detection
+            entity = self._request(
+                "GET",
+                f"/projects/{project_id}/datasets/{dataset_name}/entities/{entity_uuid}",
+            ).json()
+            params = {"baseVersion": entity["currentVersion"]["version"]}
+
         return self._request(
             "PATCH",
             f"/projects/{project_id}/datasets/{dataset_name}/entities/{entity_uuid}",
-            params={"baseVersion": entity["currentVersion"]["version"]},
+            params=params,
             json=payload,
         ).json()
 
@@ -214,12 +263,36 @@ class ODKCentralClient:
             f"/projects/{project_id}/datasets/{dataset_name}/entities/{entity_uuid}",
         )
 
+    def create_entities_bulk(self, project_id, dataset_name, entities,
+                             source_name="konote-sync", chunk_size=500):
+        """Create many entities with ODK Central's bulk entity endpoint.
+
+        Requires ODK Central 2024.3 or later. Entities are sent in chunks of
+        chunk_size per request.
+
+        Args:
+            entities: List of dicts with "label", "data" and optional "uuid".
+        """
+        for start in range(0, len(entities), chunk_size):
+            chunk = entities[start:start + chunk_size]
+            self._request(
+                "POST",
+                f"/projects/{project_id}/datasets/{dataset_name}/entities",
+                json={
+                    "entities": [
+                        {k: e[k] for k in ("uuid", "label", "data") if e.get(k)}
+                        for e in chunk
+                    ],
+                    "source": {"name": source_name, "size": len(chunk)},
+                },
+            )
+
     def create_entities_sequential(self, project_id, dataset_name, entities):
         """Create multiple entities one at a time.
 
-        ODK Central does not have a bulk create endpoint (as of 2025),
-        so each entity requires a separate HTTP request. For large lists
-        (500+ participants) this may take several minutes.
+        Fallback for ODK Central servers older than 2024.3, which have no
+        bulk create endpoint — each entity requires a separate HTTP request.
+        For large lists (500+ participants) this may take several minutes.
 
         Args:
             entities: List of dicts with "label" and "data" keys.
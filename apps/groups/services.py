@@ -0,0 +1,166 @@
+"""Group services — bulk attendance recording.
+
+Session logging (web) and ODK Central attendance imports both write one
+attendance row per active member. Drop-in groups can have 80+ members, so
+rows are written with bulk_create instead of one INSERT per member.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.db import transaction
+
+from .models import (
+    Group,
+    GroupMembership,
+    GroupSession,
+    GroupSessionAttendance,
+    GroupSessionHighlight,
+)
+
+# Submissions written per transaction in BulkAttendanceWriter.
+DEFAULT_BATCH_SIZE = 200
+
+
+def record_session_attendance(session, attendance_data):
+    """Write attendance and highlights for a saved session in two INSERTs.
+
+    Args:
+        session: A saved GroupSession.
+        attendance_data: Iterable of (membership, present, highlight_notes)
+            tuples, as returned by SessionAttendanceForm.get_attendance_data().
+
+    Returns:
+        The list of created GroupSessionAttendance rows.
+    """
+    attendance_rows = []
+    highlights = []
+    for membership, present, highlight_notes in attendance_data:
+        attendance_rows.append(GroupSessionAttendance(
+            group_session=session,
+            membership=membership,
+            present=present,
+        ))
+        if highlight_notes:
+            highlight = GroupSessionHighlight(
+                group_session=session,
+                membership=membership,
+            )
+            highlight.notes = highlight_notes
+            highlights.append(highlight)
+
+    created = GroupSessionAttendance.objects.bulk_create(attendance_rows)
+    if highlights:
+        GroupSessionHighlight.objects.bulk_create(highlights)
+    return created
+
+
+@dataclass
+class AttendanceEntry:
+    """One session to import: a group, a date, and who was present."""
+
+    group_id: int
+    session_date: date
+    present_membership_ids: set = field(default_factory=set)
+    notes: str = ""
+    facilitator: object = None
+    # Caller-defined reference (e.g. the ODK submission) echoed in results
+    source: object = None
+
+
+@dataclass
+class AttendanceWriteResult:
+    created: list = field(default_factory=list)  # (entry, GroupSession)
+    skipped: list = field(default_factory=list)  # (entry, reason)
+
+
+class BulkAttendanceWriter:
+    """Create sessions with full attendance for many entries at once.
+
+    Existing (group, date) sessions are loaded once per batch into an
+    in-memory set, replacing a per-entry .exists() probe. The set also
+    catches duplicates within the input, and persists across write() calls
+    on the same writer. Each batch of sessions and its attendance rows are
+    written in a single transaction.
+
+    Every active member of the group gets an attendance row; members not in
+    present_membership_ids are recorded as absent.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._seen = set()
+
+    def write(self, entries, result=None):
+        """Import entries, returning an AttendanceWriteResult.
+
+        Pass your own result to keep the outcome of batches that committed
+        before a later batch raised.
+        """
+        entries = list(entries)
+        if result is None:
+            result = AttendanceWriteResult()
+        for start in range(0, len(entries), self.batch_size):
+            self._write_batch(entries[start:start + self.batch_size], result)
+        return result
+
+    def _write_batch(self, entries, result):
+        group_ids = {e.group_id for e in entries}
+        known_groups = set(
+            Group.objects.filter(pk__in=group_ids).values_list("pk", flat=True)
+        )
+        self._seen.update(
+            GroupSession.objects.filter(
+                group_id__in=known_groups,
+                session_date__in={e.session_date for e in entries},
+            ).values_list("group_id", "session_date")
+        )
+        members_by_group = defaultdict(list)
+        for membership_id, group_id in GroupMembership.objects.filter(
+            group_id__in=known_groups, status="active",
+        ).values_list("pk", "group_id"):
+            members_by_group[group_id].append(membership_id)
+
+        pending = []
+        batch_keys = set()
+        for entry in entries:
+            key = (entry.group_id, entry.session_date)
+            if entry.group_id not in known_groups:
+                result.skipped.append((entry, "unknown group"))
+                continue
+            if key in self._seen or key in batch_keys:
+                result.skipped.append((entry, "session already exists"))
+                continue
+            batch_keys.add(key)
+
+            session = GroupSession(
+                group_id=entry.group_id,
+                session_date=entry.session_date,
+                facilitator=entry.facilitator,
+            )
+            if entry.notes:
+                session.notes = entry.notes
+            pending.append((entry, session))
+
+        if not pending:
+            return
+
+        with transaction.atomic():
+            sessions = GroupSession.objects.bulk_create([s for _, s in pending])
+            attendance_rows = [
+                GroupSessionAttendance(
+                    group_session=session,
+                    membership_id=membership_id,
+                    present=membership_id in entry.present_membership_ids,
+                )
+                for (entry, _), session in zip(pending, sessions)
+                for membership_id in members_by_group[entry.group_id]
+            ]
+            GroupSessionAttendance.objects.bulk_create(
+                attendance_rows, batch_size=1000,
+            )
+
+        self._seen.update(batch_keys)
+        result.created.extend(
+            (entry, session) for (entry, _), session in zip(pending, sessions)
+        )
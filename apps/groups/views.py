@@ -36,10 +36,10 @@ from .models import (
     GroupMembership,
     GroupSession,
     GroupSessionAttendance,
-    GroupSessionHighlight,
     ProjectMilestone,
     ProjectOutcome,
 )
+from .services import record_session_attendance
 
 
 # ---------------------------------------------------------------------------
@@ -384,19 +384,9 @@ def session_log(request, group_id):
                 session.save()
 
                 # 2. Record attendance and highlights for each member
-                for member, present, highlight_notes in attendance_form.get_attendance_data():
-                    GroupSessionAttendance.objects.create(
-                        group_session=session,
-                        membership=member,
-                        present=present,
-                    )
-                    if highlight_notes:
-                        highlight = GroupSessionHighlight(
-                            group_session=session,
-                            membership=member,
-                        )
-                        highlight.notes = highlight_notes
-                        highlight.save()
+                record_session_attendance(
+                    session, attendance_form.get_attendance_data(),
+                )
 
             messages.success(request, _("Session logged."))
             return redirect("groups:group_detail", group_id=group.pk)
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:22
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0002_encrypt_member_name'),
+        ('clients', '0043_report_filter_indexes'),
+        ('notes', '0030_fhir_episode_link'),
+        ('plans', '0029_alter_plantarget_goal_source_method'),
+        ('programs', '0012_program_default_goal_review_days'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='metricvalue',
+            index=models.Index(fields=['metric_def', 'progress_note_target'], name='idx_metric_value_def_target'),
+        ),
+        migrations.AddIndex(
+            model_name='progressnote',
+            index=models.Index(models.F('client_file'), models.F('status'), django.db.models.functions.comparison.Coalesce('backdate', 'created_at'), name='idx_note_client_status_eff'),
+        ),
+        migrations.AddIndex(
+            model_name='progressnote',
+            index=models.Index(django.db.models.functions.comparison.Coalesce('backdate', 'created_at'), condition=models.Q(('status', 'default')), name='idx_note_effective_date'),
+        ),
+    ]
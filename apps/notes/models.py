@@ -1,7 +1,7 @@
 """Progress notes and metric value recording."""
 from django.conf import settings
 from django.db import models
-from django.db.models.functions import Lower
+from django.db.models.functions import Coalesce, Lower
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
@@ -376,6 +376,22 @@ class ProgressNote(models.Model):
         app_label = "notes"
         db_table = "progress_notes"
         ordering = ["-created_at"]
+        # Reports and insights filter on the effective date,
+        # COALESCE(backdate, created_at) — see effective_date_filter() in
+        # apps/reports/utils.py, which keeps those filters index-friendly.
+        indexes = [
+            # Per-client timelines and report lookups by client list
+            models.Index(
+                "client_file", "status", Coalesce("backdate", "created_at"),
+                name="idx_note_client_status_eff",
+            ),
+            # Program-wide date ranges (reports join through enrolments)
+            models.Index(
+                Coalesce("backdate", "created_at"),
+                name="idx_note_effective_date",
+                condition=models.Q(status="default"),
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         # Auto-fill author_role from UserProgramRole on first save
@@ -501,6 +517,10 @@ class MetricValue(models.Model):
     class Meta:
         app_label = "notes"
         db_table = "metric_values"
+        indexes = [
+            # Metric reports: metric_def IN (...) joined to note targets
+            models.Index(fields=["metric_def", "progress_note_target"], name="idx_metric_value_def_target"),
+        ]
 
 
 # ── Suggestion Tracking (UX-INSIGHT6) ────────────────────────────────
@@ -1,10 +1,12 @@
 """Signals for the notes app.
 
-Triggers achievement status recomputation when progress data is recorded.
+Triggers achievement status recomputation when progress data is recorded,
+and invalidates cached Outcome Insights blocks when notes change.
 """
 import logging
 import os
 
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -55,3 +57,17 @@ def recompute_achievement_on_metric_value(sender, instance, **kwargs):
                 "Failed to update achievement status for PlanTarget %s",
                 pnt.plan_target_id,
             )
+
+
+@receiver(post_save, sender="notes.ProgressNote")
+def invalidate_insights_on_note_save(sender, instance, **kwargs):
+    """Bump the insights data version for the note's client and programs.
+
+    Deferred to commit so targets and metric values saved in the same
+    transaction are visible to the next insights computation.
+    """
+    from apps.reports.insights_cache import bump_for_client
+
+    client_file_id = instance.client_file_id
+    program_ids = [instance.author_program_id] if instance.author_program_id else []
+    transaction.on_commit(lambda: bump_for_client(client_file_id, program_ids))
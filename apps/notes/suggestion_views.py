@@ -23,7 +23,7 @@ from apps.auth_app.decorators import requires_permission
 from apps.auth_app.models import User
 from apps.programs.access import get_accessible_programs
 from apps.programs.models import Program, UserProgramRole
-from apps.reports.pii_scrub import scrub_pii
+from apps.reports.pii_scrub import PiiScrubber
 from apps.utils.dates import parse_date_safely
 from konote.ai_views import ai_rate_limited_response
 from konote.ai import generate_focused_analysis
@@ -543,11 +543,13 @@ def focused_analysis_view(request):
             "error": _("No suggestions found for this program."),
         })
 
-    scrubbed_question = scrub_pii(question, known_names)
+    scrubber = PiiScrubber(known_names)
+    scrubbed_question = scrubber.scrub(question)
+    scrubbed_texts = scrubber.scrub_many(item.get("text", "") for item in suggestion_items)
     scrubbed_suggestions = []
-    for item in suggestion_items:
+    for item, scrubbed_text in zip(suggestion_items, scrubbed_texts):
         scrubbed_item = dict(item)
-        scrubbed_item["text"] = scrub_pii(item.get("text", ""), known_names)
+        scrubbed_item["text"] = scrubbed_text
         scrubbed_suggestions.append(scrubbed_item)
 
     result = generate_focused_analysis(scrubbed_question, scrubbed_suggestions, program.name)
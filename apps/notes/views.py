@@ -24,6 +24,7 @@ from django.db.models import Q
 
 from apps.auth_app.constants import ROLE_PROGRAM_MANAGER, ROLE_RANK, ROLE_STAFF
 from apps.auth_app.decorators import program_role_required, requires_permission
+from apps.clients.activity import refresh_activity
 from apps.clients.models import ClientFile
 from apps.plans.models import PlanTarget, PlanTargetMetric
 from apps.programs.access import (
@@ -38,12 +39,14 @@ from apps.programs.access import (
     _resolve_viewing_program,
 )
 from apps.programs.models import UserProgramRole
+from apps.reports.utils import effective_date_filter
 from .forms import FullNoteForm, MetricValueForm, NoteCancelForm, QuickNoteForm, TargetNoteForm
 from .models import (
     ALLIANCE_PROMPT_SETS,
     MetricValue, PlausibilityOverrideLog, ProgressNote, ProgressNoteTarget,
     ProgressNoteTemplate,
 )
+from konote.instrumentation import perf_budget
 
 
 # Use shared access helpers from apps.programs.access
@@ -70,6 +73,25 @@ def _portal_access_reminder(request, client):
         )
 
 
+def _complete_follow_ups(client, user, exclude_note=None):
+    """Mark the user's pending follow-ups for this client as done.
+
+    A queryset update skips model signals, so the client's activity
+    summary (open follow-ups) is refreshed here.
+    """
+    pending = ProgressNote.objects.filter(
+        client_file=client,
+        author=user,
+        follow_up_date__isnull=False,
+        follow_up_completed_at__isnull=True,
+        status="default",
+    )
+    if exclude_note is not None:
+        pending = pending.exclude(pk=exclude_note.pk)
+    if pending.update(follow_up_completed_at=timezone.now()):
+        refresh_activity([client.pk])
+
+
 def _get_program_from_note(request, note_id, **kwargs):
     """Extract program from note_id in URL kwargs.
 
@@ -350,6 +372,7 @@ def alliance_repair_guide(request):
 
 @login_required
 @requires_permission("note.view", _get_program_from_client)
+@perf_budget(queries=60)
 def note_list(request, client_id):
     """Notes timeline for a client with filtering and pagination."""
     client = _get_client_or_403(request, client_id)
@@ -399,12 +422,16 @@ def note_list(request, client_id):
         notes = notes.filter(interaction_type=interaction_filter)
     if date_from:
         try:
-            notes = notes.filter(_effective_date__date__gte=datetime.date.fromisoformat(date_from))
+            notes = notes.filter(**effective_date_filter(
+                "_effective_date", date_from=datetime.date.fromisoformat(date_from),
+            ))
         except ValueError:
             pass
     if date_to:
         try:
-            notes = notes.filter(_effective_date__date__lte=datetime.date.fromisoformat(date_to))
+            notes = notes.filter(**effective_date_filter(
+                "_effective_date", date_to=datetime.date.fromisoformat(date_to),
+            ))
         except ValueError:
             pass
     if author_filter == "mine":
@@ -521,13 +548,7 @@ def quick_note_create(request, client_id):
                 note.save()
 
                 # Auto-complete any pending follow-ups from this author for this client
-                ProgressNote.objects.filter(
-                    client_file=client,
-                    author=request.user,
-                    follow_up_date__isnull=False,
-                    follow_up_completed_at__isnull=True,
-                    status="default",
-                ).update(follow_up_completed_at=timezone.now())
+                _complete_follow_ups(client, request.user)
 
             messages.success(request, _("Quick note saved."))
             _portal_access_reminder(request, client)
@@ -597,13 +618,7 @@ def quick_note_inline(request, client_id):
                 note.save()
 
                 # Auto-complete pending follow-ups
-                ProgressNote.objects.filter(
-                    client_file=client,
-                    author=request.user,
-                    follow_up_date__isnull=False,
-                    follow_up_completed_at__isnull=True,
-                    status="default",
-                ).update(follow_up_completed_at=timezone.now())
+                _complete_follow_ups(client, request.user)
 
             response = render(request, "notes/_quick_note_inline_buttons.html", {
                 "client": client,
@@ -816,13 +831,7 @@ def note_create(request, client_id):
                                     )
 
                 # Auto-complete any pending follow-ups from this author for this client
-                ProgressNote.objects.filter(
-                    client_file=client,
-                    author=request.user,
-                    follow_up_date__isnull=False,
-                    follow_up_completed_at__isnull=True,
-                    status="default",
-                ).exclude(pk=note.pk).update(follow_up_completed_at=timezone.now())
+                _complete_follow_ups(client, request.user, exclude_note=note)
 
             # Tier 1: Auto-link suggestion to existing themes (non-blocking).
             if note.participant_suggestion and note.suggestion_priority:
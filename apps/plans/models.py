@@ -507,18 +507,8 @@ class PlanTarget(models.Model):
     def save(self, *args, **kwargs):
         is_new = self.pk is None
 
-        # Auto-classify goal source from field population patterns
-        if is_new and not self.goal_source:
-            has_description = bool(self._description_encrypted and self._description_encrypted != b"")
-            has_client_goal = bool(self._client_goal_encrypted and self._client_goal_encrypted != b"")
-            if has_client_goal and has_description:
-                self.goal_source = "joint"
-            elif has_client_goal:
-                self.goal_source = "participant"
-            elif has_description:
-                self.goal_source = "worker"
-            if self.goal_source:
-                self.goal_source_method = "heuristic"
+        if is_new:
+            self.classify_goal_source()
 
         # Auto-set target_date from program default
         if is_new and not self.target_date and self.plan_section_id:
@@ -533,6 +523,25 @@ class PlanTarget(models.Model):
 
         super().save(*args, **kwargs)
 
+    def classify_goal_source(self):
+        """Auto-classify goal source from field population patterns.
+
+        Called by save() for new targets; bulk inserts call it directly.
+        Leaves an explicitly set goal_source alone.
+        """
+        if self.goal_source:
+            return
+        has_description = bool(self._description_encrypted and self._description_encrypted != b"")
+        has_client_goal = bool(self._client_goal_encrypted and self._client_goal_encrypted != b"")
+        if has_client_goal and has_description:
+            self.goal_source = "joint"
+        elif has_client_goal:
+            self.goal_source = "participant"
+        elif has_description:
+            self.goal_source = "worker"
+        if self.goal_source:
+            self.goal_source_method = "heuristic"
+
     @property
     def name(self):
         try:
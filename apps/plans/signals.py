@@ -1,10 +1,12 @@
 """Signals for the plans app.
 
-Handles auto-updating of achievement status and default CIDS metadata.
+Handles auto-updating of achievement status and default CIDS metadata,
+and invalidates cached Outcome Insights blocks when goals change.
 """
 import logging
 
-from django.db.models.signals import post_init, post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 
 from .cids import apply_metric_cids_defaults, apply_target_cids_defaults
@@ -114,3 +116,37 @@ def ensure_metric_cids_defaults(sender, instance, **kwargs):
         sender.objects.filter(pk=instance.pk).update(
             **{field: getattr(instance, field) for field in changed_fields}
         )
+
+
+@receiver(post_save, sender="plans.PlanTarget")
+@receiver(post_delete, sender="plans.PlanTarget")
+def invalidate_insights_on_target_change(sender, instance, origin=None, **kwargs):
+    """Goals and their achievement status feed the structured insights.
+
+    Covers achievement status too: update_achievement_status() saves the
+    target, and _set_achievement_status() runs inside this same post_save.
+    """
+    from apps.clients.signals import _deleting_client
+    from apps.reports.insights_cache import bump_for_client
+
+    if _deleting_client(origin):
+        return
+    client_file_id = instance.client_file_id
+    transaction.on_commit(lambda: bump_for_client(client_file_id))
+
+
+@receiver(post_save, sender="plans.PlanTargetMetric")
+@receiver(post_delete, sender="plans.PlanTargetMetric")
+def invalidate_insights_on_target_metric_change(sender, instance, origin=None, **kwargs):
+    """Which metrics a goal tracks changes the insights metric blocks."""
+    from apps.clients.signals import _deleting_client
+    from apps.plans.models import PlanTarget
+    from apps.reports.insights_cache import bump_for_client
+
+    if _deleting_client(origin):
+        return
+    client_file_id = PlanTarget.objects.filter(pk=instance.plan_target_id).values_list(
+        "client_file_id", flat=True,
+    ).first()
+    if client_file_id is not None:
+        transaction.on_commit(lambda: bump_for_client(client_file_id))
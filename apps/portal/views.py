@@ -15,7 +15,6 @@ from urllib.parse import parse_qs
 
 from django.conf import settings
 from django.contrib.auth.hashers import make_password
-from django.core.cache import cache
 from django.http import Http404, HttpResponse, HttpResponseBadRequest
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
@@ -24,7 +23,6 @@ from django.views.decorators.csrf import csrf_exempt
 from django_ratelimit.decorators import ratelimit
 from django.views.decorators.http import require_POST
 
-from apps.admin_settings.models import FeatureToggle
 from apps.clients.models import ClientDetailValue, CustomFieldGroup
 from apps.portal.forms import SelfIdForm
 
@@ -54,15 +52,9 @@ def _set_emergency_logout_token(request):
 
 def _get_feature_flags():
     """Return feature flags merged with their default enabled/disabled state."""
-    flags = cache.get("feature_toggles")
-    if flags is None:
-        from apps.admin_settings.views import DEFAULT_FEATURES, FEATURES_DEFAULT_ENABLED
-
-        db_flags = FeatureToggle.get_all_flags()
-        flags = {key: key in FEATURES_DEFAULT_ENABLED for key in DEFAULT_FEATURES}
-        flags.update(db_flags)
-        cache.set("feature_toggles", flags, 300)
-    return flags
+    from apps.admin_settings import cached
+
+    return cached.feature_flags()
 
 
 # ---------------------------------------------------------------------------
@@ -4,13 +4,200 @@ CONF9: When a user has roles in both Standard and Confidential programs,
 they must select which program context to work in. This module provides
 the session logic for storing, validating, and querying the active program.
 """
+import operator
+
+from django.utils.functional import SimpleLazyObject, cached_property, new_method_proxy
 from django.utils.translation import gettext_lazy as _
 
-from .models import Program, UserProgramRole
+from apps.auth_app.constants import ROLE_RANK
+
+from .models import UserProgramRole
 
 SESSION_KEY = "active_program_id"
 
 
+class LazyProgramIds(SimpleLazyObject):
+    """A set of program IDs computed on first use (request.active_program_ids).
+
+    SimpleLazyObject proxies iteration, len(), `in` and truthiness; this
+    adds the set operators views use on program ID sets.
+    """
+
+    __and__ = new_method_proxy(operator.and_)
+    __rand__ = new_method_proxy(lambda wrapped, other: other & wrapped)
+    __or__ = new_method_proxy(operator.or_)
+    __ror__ = new_method_proxy(lambda wrapped, other: other | wrapped)
+    __sub__ = new_method_proxy(operator.sub)
+    __rsub__ = new_method_proxy(lambda wrapped, other: other - wrapped)
+    __xor__ = new_method_proxy(operator.xor)
+    __rxor__ = new_method_proxy(lambda wrapped, other: other ^ wrapped)
+    __le__ = new_method_proxy(operator.le)
+    __ge__ = new_method_proxy(operator.ge)
+
+
+class ProgramContext:
+    """A user's program roles and CONF9 selection state, resolved on demand.
+
+    The middleware attaches one to every authenticated request as
+    request.program_context. Nothing is queried until a property is read;
+    the first read loads all of the user's active roles, with their
+    programs, in one joined query, and every property is memoized for the
+    rest of the request. Requests that never read it cost no queries.
+
+    The module-level functions below are shorthands that build a fresh
+    context, for callers without a request.
+    """
+
+    def __init__(self, user, session=None):
+        self.user = user
+        self.session = session
+
+    @cached_property
+    def roles(self):
+        """Active roles in any program, ordered by program name."""
+        return list(
+            UserProgramRole.objects.filter(user=self.user, status="active")
+            .select_related("program")
+            .order_by("program__name")
+        )
+
+    @cached_property
+    def program_roles(self):
+        """Active roles in active programs."""
+        return [r for r in self.roles if r.program.status == "active"]
+
+    @cached_property
+    def program_ids(self):
+        """IDs of the user's active programs."""
+        return {r.program_id for r in self.program_roles}
+
+    @cached_property
+    def standard_program_ids(self):
+        return {r.program_id for r in self.program_roles if not r.program.is_confidential}
+
+    @cached_property
+    def tiers(self):
+        """The user's programs grouped by tier (see get_user_program_tiers)."""
+        tiers = {"standard": [], "confidential": []}
+        for r in self.program_roles:
+            entry = {
+                "id": r.program_id,
+                "name": r.program.translated_name,
+                "role": r.role,
+                "role_display": r.get_role_display(),
+            }
+            if r.program.is_confidential:
+                tiers["confidential"].append(entry)
+            else:
+                tiers["standard"].append(entry)
+        return tiers
+
+    @cached_property
+    def needs_selector(self):
+        """2+ active programs where at least one is confidential."""
+        return len(self.program_roles) >= 2 and any(
+            r.program.is_confidential for r in self.program_roles
+        )
+
+    @property
+    def selection(self):
+        """The active program value stored in the session, if any."""
+        return self.session.get(SESSION_KEY) if self.session is not None else None
+
+    def is_valid_selection(self, value):
+        """Check if a session value is still valid for this user."""
+        if value == "all_standard":
+            # Valid if user still has at least one standard program
+            return bool(self.standard_program_ids)
+        try:
+            program_id = int(value)
+        except (ValueError, TypeError):
+            return False
+        return program_id in self.program_ids
+
+    @cached_property
+    def needs_selection(self):
+        """Selector is needed AND the user hasn't made a valid selection yet."""
+        if not self.needs_selector:
+            return False
+        value = self.selection
+        if value is None:
+            return True
+        return not self.is_valid_selection(value)
+
+    @cached_property
+    def active_program_ids(self):
+        """Set of program IDs to filter client lists by (see get_active_program_ids)."""
+        if not self.needs_selector:
+            # No selector needed — return all programs (backwards compatible)
+            return set(self.program_ids)
+
+        value = self.selection
+        if value is None:
+            return set()  # Forces selection
+        if value == "all_standard":
+            return set(self.standard_program_ids)
+        try:
+            program_id = int(value)
+        except (ValueError, TypeError):
+            return set()
+        if program_id in self.program_ids:
+            return {program_id}
+        return set()  # Invalid selection — force re-selection
+
+    @cached_property
+    def highest_role(self):
+        """The user's highest active role in any program, or None."""
+        if not self.roles:
+            return None
+        return max((r.role for r in self.roles), key=lambda role: ROLE_RANK.get(role, 0))
+
+    def role_for_program(self, program_id):
+        """The user's active role object in a program, or None."""
+        for r in self.roles:
+            if r.program_id == program_id:
+                return r
+        return None
+
+    @cached_property
+    def switcher_options(self):
+        """Dropdown options for the program switcher (see get_switcher_options)."""
+        tiers = self.tiers
+        options = []
+
+        # "All Standard Programs" option — only if 2+ standard programs
+        if len(tiers["standard"]) >= 2:
+            options.append({
+                "value": "all_standard",
+                "label": str(_("All Standard Programs")),
+            })
+
+        # Individual standard programs
+        for prog in tiers["standard"]:
+            options.append({
+                "value": str(prog["id"]),
+                "label": f"{prog['name']} — {prog['role_display']}",
+            })
+
+        # Individual confidential programs (never combined)
+        for prog in tiers["confidential"]:
+            options.append({
+                "value": str(prog["id"]),
+                "label": f"{prog['name']} — {prog['role_display']}",
+            })
+
+        return options
+
+
+def get_program_context(request):
+    """The request's ProgramContext, created on first use if the middleware didn't."""
+    context = getattr(request, "program_context", None)
+    if context is None:
+        context = ProgramContext(request.user, getattr(request, "session", None))
+        request.program_context = context
+    return context
+
+
 def get_user_program_tiers(user):
     """Return user's programs grouped by tier.
 
@@ -18,24 +205,7 @@ def get_user_program_tiers(user):
     Each entry: {'id': int, 'name': str, 'role': str, 'role_display': str}
     Only includes active roles in active programs.
     """
-    roles = (
-        UserProgramRole.objects.filter(user=user, status="active", program__status="active")
-        .select_related("program")
-        .order_by("program__name")
-    )
-    tiers = {"standard": [], "confidential": []}
-    for r in roles:
-        entry = {
-            "id": r.program_id,
-            "name": r.program.translated_name,
-            "role": r.role,
-            "role_display": r.get_role_display(),
-        }
-        if r.program.is_confidential:
-            tiers["confidential"].append(entry)
-        else:
-            tiers["standard"].append(entry)
-    return tiers
+    return ProgramContext(user).tiers
 
 
 def needs_program_selector(user):
@@ -44,32 +214,15 @@ def needs_program_selector(user):
     Trigger: user has 2+ active programs where at least one is confidential.
     Standard-only multi-program users keep the current 'see all' behaviour.
 
-    For per-request caching, the middleware stashes the result on the request
-    object and the context processor reads it from there (see CONF9c).
+    Within a request, read request.program_context.needs_selector instead,
+    which is memoized (CONF9c).
     """
-    programs = (
-        UserProgramRole.objects.filter(user=user, status="active", program__status="active")
-        .select_related("program")
-    )
-    has_confidential = False
-    total = 0
-    for r in programs:
-        total += 1
-        if r.program.is_confidential:
-            has_confidential = True
-    # Need selector if 2+ programs AND at least one is confidential
-    return total >= 2 and has_confidential
+    return ProgramContext(user).needs_selector
 
 
 def needs_program_selection(user, session):
     """Return True if selector is needed AND user hasn't made a valid selection yet."""
-    if not needs_program_selector(user):
-        return False
-    value = session.get(SESSION_KEY)
-    if value is None:
-        return True
-    # Validate that the stored selection is still valid
-    return not _is_valid_selection(user, value)
+    return ProgramContext(user, session).needs_selection
 
 
 def get_active_program_ids(user, session):
@@ -80,35 +233,7 @@ def get_active_program_ids(user, session):
     - Not set + doesn't need selector -> all user's program IDs (backwards compatible)
     - Not set + needs selector -> empty set (forces selection page)
     """
-    all_user_program_ids = set(
-        UserProgramRole.objects.filter(user=user, status="active", program__status="active")
-        .values_list("program_id", flat=True)
-    )
-
-    if not needs_program_selector(user):
-        # No selector needed — return all programs (backwards compatible)
-        return all_user_program_ids
-
-    value = session.get(SESSION_KEY)
-    if value is None:
-        return set()  # Forces selection
-
-    if value == "all_standard":
-        return set(
-            UserProgramRole.objects.filter(
-                user=user, status="active", program__status="active",
-                program__is_confidential=False,
-            ).values_list("program_id", flat=True)
-        )
-
-    try:
-        program_id = int(value)
-    except (ValueError, TypeError):
-        return set()
-
-    if program_id in all_user_program_ids:
-        return {program_id}
-    return set()  # Invalid selection — force re-selection
+    return ProgramContext(user, session).active_program_ids
 
 
 def set_active_program(session, value):
@@ -130,48 +255,4 @@ def get_switcher_options(user):
     - Never labels programs as "Confidential"
     - Never offers "All Confidential" combined option
     """
-    tiers = get_user_program_tiers(user)
-    options = []
-
-    # "All Standard Programs" option — only if 2+ standard programs
-    if len(tiers["standard"]) >= 2:
-        options.append({
-            "value": "all_standard",
-            "label": str(_("All Standard Programs")),
-        })
-
-    # Individual standard programs
-    for prog in tiers["standard"]:
-        options.append({
-            "value": str(prog["id"]),
-            "label": f"{prog['name']} — {prog['role_display']}",
-        })
-
-    # Individual confidential programs (never combined)
-    for prog in tiers["confidential"]:
-        options.append({
-            "value": str(prog["id"]),
-            "label": f"{prog['name']} — {prog['role_display']}",
-        })
-
-    return options
-
-
-def _is_valid_selection(user, value):
-    """Check if a session value is still valid for this user."""
-    if value == "all_standard":
-        # Valid if user still has at least one standard program
-        return UserProgramRole.objects.filter(
-            user=user, status="active", program__status="active",
-            program__is_confidential=False,
-        ).exists()
-
-    try:
-        program_id = int(value)
-    except (ValueError, TypeError):
-        return False
-
-    return UserProgramRole.objects.filter(
-        user=user, status="active", program_id=program_id,
-        program__status="active",
-    ).exists()
+    return ProgramContext(user).switcher_options
@@ -355,13 +355,36 @@ def get_achievement_summary(
 
         metric_client_values[metric_id][client_id].append((effective_dt, numeric_val))
 
+    return summarise_achievements(metric_client_values, metric_defs_seen, use_latest)
+
+
+def summarise_achievements(
+    metric_client_values: dict[int, dict[int, list[tuple[Any, float]]]],
+    metric_defs: dict[int, MetricDefinition],
+    use_latest: bool = True,
+) -> dict[str, Any]:
+    """
+    Build the achievement summary from metric values grouped by client.
+
+    Shared by get_achievement_summary() and the single-pass report engine
+    (report_engine.py), which collect the values differently.
+
+    Args:
+        metric_client_values: {metric_id: {client_id: [(effective_datetime, value), ...]}},
+            metrics in the order they should be listed.
+        metric_defs: {metric_id: MetricDefinition} for every metric_id above.
+        use_latest: If True, use client's latest value; if False, use average.
+
+    Returns:
+        dict with the structure documented on get_achievement_summary().
+    """
     # Calculate per-metric achievement rates
     by_metric = []
     all_clients_with_data: set[int] = set()
     clients_met_any: set[int] = set()
 
     for metric_id, client_values in metric_client_values.items():
-        metric_def = metric_defs_seen[metric_id]
+        metric_def = metric_defs[metric_id]
         target_value = metric_def.max_value
         has_target = target_value is not None
 
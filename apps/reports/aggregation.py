@@ -20,6 +20,8 @@ from django.utils.translation import gettext as _
 from apps.clients.models import ClientProgramEnrolment
 from apps.notes.models import MetricValue, ProgressNote
 
+from .crosstab import NUMPY_AVAILABLE, crosstab_template_metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -206,6 +208,35 @@ def compute_template_metrics(
         client_id = note.client_file_id
         metric_data[mv.metric_def_id][client_id].append((effective_dt, numeric_val))
 
+    return aggregate_template_metrics(report_metrics, metric_data, demographic_groups)
+
+
+def aggregate_template_metrics(
+    report_metrics,
+    metric_data: dict[int, dict[int, list[tuple[datetime, float]]]],
+    demographic_groups: dict[str, list[int]],
+) -> list[dict[str, Any]]:
+    """Aggregate collected metric values per ReportMetric × demographic group.
+
+    Shared by compute_template_metrics() and the single-pass report engine
+    (report_engine.py). Uses the NumPy cross-tab in crosstab.py when NumPy
+    is installed, and the per-group Python loop below otherwise.
+
+    Args:
+        report_metrics: ReportMetric instances, in display order.
+        metric_data: {metric_def_id: {client_id: [(effective_datetime, value)]}}.
+        demographic_groups: {"All Participants": [client_ids], ...}
+
+    Returns:
+        List of metric result dicts as documented on compute_template_metrics().
+    """
+    if NUMPY_AVAILABLE:
+        return crosstab_template_metrics(report_metrics, metric_data, demographic_groups)
+
+    group_id_sets = {
+        label: set(client_ids) for label, client_ids in demographic_groups.items()
+    }
+
     # Compute aggregation per metric × per demographic group
     results = []
     for rm in report_metrics:
@@ -217,8 +248,7 @@ def compute_template_metrics(
         )
 
         group_results = {}
-        for group_label, group_client_ids in demographic_groups.items():
-            group_ids_set = set(group_client_ids)
+        for group_label, group_ids_set in group_id_sets.items():
             # Filter to clients in this demographic group
             filtered = {
                 cid: vals
@@ -1,7 +1,14 @@
 """Server-side chart generation for PDF reports using matplotlib.
 
-Generates bar charts and line charts as base64-encoded PNG images suitable
-for embedding in HTML via data URIs.  WeasyPrint renders these in PDFs.
+Generates bar charts and line charts as base64 data URIs (SVG by default,
+or PNG) suitable for embedding in HTML.  WeasyPrint renders these in PDFs.
+
+Charts are drawn with the object-oriented Figure API, so no pyplot global
+state is shared between requests or threads.  Each rendered chart is cached
+by a hash of its inputs and style, so regenerating a report with unchanged
+data does not redraw its charts.  With REPORT_CHART_WORKERS > 0, cache
+misses are drawn in a pool of long-lived worker processes that have already
+imported matplotlib and loaded its font cache.
 
 Colour palette follows WCAG 2.2 AA contrast requirements:
 - All chart colours have at least 3:1 contrast against white backgrounds
@@ -11,8 +18,14 @@ Colour palette follows WCAG 2.2 AA contrast requirements:
 from __future__ import annotations
 
 import base64
+import hashlib
 import io
+import json
 import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -20,9 +33,7 @@ logger = logging.getLogger(__name__)
 # Attempt to import matplotlib; charts are degraded gracefully if missing
 try:
     import matplotlib
-    matplotlib.use("Agg")  # Non-interactive backend — no display needed
-    import matplotlib.pyplot as plt
-    import matplotlib.ticker as mticker
+    from matplotlib.figure import Figure
     MATPLOTLIB_AVAILABLE = True
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
@@ -58,44 +69,51 @@ def is_chart_available() -> bool:
     return MATPLOTLIB_AVAILABLE
 
 
-def _fig_to_base64(fig) -> str:
-    """Convert a matplotlib figure to a base64-encoded PNG data URI."""
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=150, bbox_inches="tight",
-                facecolor="white", edgecolor="none")
-    buf.seek(0)
-    encoded = base64.b64encode(buf.read()).decode("utf-8")
-    plt.close(fig)
-    return f"data:image/png;base64,{encoded}"
+# Bump when the chart styling changes so cached charts are redrawn
+STYLE_VERSION = 1
 
+FORMATS = {
+    "svg": "image/svg+xml",
+    "png": "image/png",
+}
 
-def generate_bar_chart(
-    labels: list[str],
-    values: list[float],
-    title: str = "",
-    ylabel: str = "",
-    value_suffix: str = "",
-) -> str | None:
-    """Generate a bar chart comparing values across categories.
+CACHE_KEY_PREFIX = "report_chart"
+DEFAULT_CACHE_TIMEOUT = 86400
 
-    Suitable for single-period demographic comparisons (e.g., metric
-    values by age group).
 
-    Args:
-        labels: Category labels (e.g., ["Age 13-17", "Age 18-24", "Age 25+"]).
-        values: Numeric values for each category.
-        title: Chart title.
-        ylabel: Y-axis label.
-        value_suffix: Suffix for value labels (e.g., "%" for percentages).
+def _fig_to_data_uri(fig, fmt: str = "svg") -> str:
+    """Convert a matplotlib figure to a base64-encoded data URI."""
+    buf = io.BytesIO()
+    options = {"format": fmt, "bbox_inches": "tight",
+               "facecolor": "white", "edgecolor": "none"}
+    if fmt == "png":
+        options["dpi"] = 150
+    else:
+        # Leave out the creation date so identical charts are identical bytes
+        options["metadata"] = {"Date": None}
+    # Fixed salt for SVG element ids, for the same reason
+    with matplotlib.rc_context({"svg.hashsalt": "konote"}):
+        fig.savefig(buf, **options)
+    encoded = base64.b64encode(buf.getvalue()).decode("utf-8")
+    return f"data:{FORMATS[fmt]};base64,{encoded}"
+
+
+def _style_axes(ax, title: str, ylabel: str) -> None:
+    if title:
+        ax.set_title(title, fontsize=12, color=CHART_TEXT_COLOUR,
+                     fontweight="bold", pad=10)
+    if ylabel:
+        ax.set_ylabel(ylabel, fontsize=10, color=CHART_TEXT_COLOUR)
 
-    Returns:
-        Base64 data URI string, or None if chart generation unavailable.
-    """
-    if not MATPLOTLIB_AVAILABLE or not labels or not values:
-        return None
+    ax.tick_params(axis="x", labelsize=9, labelcolor=CHART_TEXT_COLOUR)
+    ax.tick_params(axis="y", labelsize=9, labelcolor=CHART_TEXT_COLOUR)
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.spines["left"].set_color("#d1d5db")
+    ax.spines["bottom"].set_color("#d1d5db")
 
-    fig, ax = plt.subplots(figsize=(CHART_WIDTH, CHART_HEIGHT))
 
+def _draw_bar_chart(ax, labels, values, title="", ylabel="", value_suffix=""):
     colours = [CHART_COLOURS[i % len(CHART_COLOURS)] for i in range(len(labels))]
     hatches = [HATCH_PATTERNS[i % len(HATCH_PATTERNS)] for i in range(len(labels))]
 
@@ -117,18 +135,7 @@ def generate_bar_chart(
             fontsize=9, color=CHART_TEXT_COLOUR, fontweight="bold",
         )
 
-    if title:
-        ax.set_title(title, fontsize=12, color=CHART_TEXT_COLOUR,
-                      fontweight="bold", pad=10)
-    if ylabel:
-        ax.set_ylabel(ylabel, fontsize=10, color=CHART_TEXT_COLOUR)
-
-    ax.tick_params(axis="x", labelsize=9, labelcolor=CHART_TEXT_COLOUR)
-    ax.tick_params(axis="y", labelsize=9, labelcolor=CHART_TEXT_COLOUR)
-    ax.spines["top"].set_visible(False)
-    ax.spines["right"].set_visible(False)
-    ax.spines["left"].set_color("#d1d5db")
-    ax.spines["bottom"].set_color("#d1d5db")
+    _style_axes(ax, title, ylabel)
 
     # Ensure y-axis starts at 0
     ax.set_ylim(bottom=0)
@@ -137,38 +144,8 @@ def generate_bar_chart(
     if values and max(values) > 0:
         ax.set_ylim(top=max(values) * 1.15)
 
-    fig.tight_layout()
-    return _fig_to_base64(fig)
-
-
-def generate_line_chart(
-    period_labels: list[str],
-    series: list[dict[str, Any]],
-    title: str = "",
-    ylabel: str = "",
-    value_suffix: str = "",
-) -> str | None:
-    """Generate a line chart showing trends over multiple periods.
-
-    Suitable for multi-period trend visualisation (e.g., metric values
-    over the last 4 quarters).
-
-    Args:
-        period_labels: Time period labels (e.g., ["Q1", "Q2", "Q3", "Q4"]).
-        series: List of series dicts:
-            [{"label": "All Participants", "values": [3.2, 3.5, 3.8, 4.0]}, ...]
-        title: Chart title.
-        ylabel: Y-axis label.
-        value_suffix: Suffix for value labels (e.g., "%" for percentages).
-
-    Returns:
-        Base64 data URI string, or None if chart generation unavailable.
-    """
-    if not MATPLOTLIB_AVAILABLE or not period_labels or not series:
-        return None
-
-    fig, ax = plt.subplots(figsize=(CHART_WIDTH, CHART_HEIGHT))
 
+def _draw_line_chart(ax, period_labels, series, title="", ylabel="", value_suffix=""):
     markers = ["o", "s", "D", "^", "v", "P", "X", "*"]
 
     for i, s in enumerate(series):
@@ -196,25 +173,210 @@ def generate_line_chart(
                     fontweight="bold",
                 )
 
-    if title:
-        ax.set_title(title, fontsize=12, color=CHART_TEXT_COLOUR,
-                      fontweight="bold", pad=10)
-    if ylabel:
-        ax.set_ylabel(ylabel, fontsize=10, color=CHART_TEXT_COLOUR)
-
-    ax.tick_params(axis="x", labelsize=9, labelcolor=CHART_TEXT_COLOUR)
-    ax.tick_params(axis="y", labelsize=9, labelcolor=CHART_TEXT_COLOUR)
-    ax.spines["top"].set_visible(False)
-    ax.spines["right"].set_visible(False)
-    ax.spines["left"].set_color("#d1d5db")
-    ax.spines["bottom"].set_color("#d1d5db")
+    _style_axes(ax, title, ylabel)
     ax.grid(axis="y", alpha=0.3, color="#d1d5db")
 
     if len(series) > 1:
         ax.legend(fontsize=9, framealpha=0.9)
 
+
+_DRAWERS = {
+    "bar": _draw_bar_chart,
+    "line": _draw_line_chart,
+}
+
+
+def render_chart(kind: str, params: dict, fmt: str = "svg") -> str:
+    """Draw one chart and return its data URI.
+
+    Pure function of its arguments (no Django access), so it can run in a
+    worker process.
+    """
+    fig = Figure(figsize=(CHART_WIDTH, CHART_HEIGHT))
+    _DRAWERS[kind](fig.subplots(), **params)
     fig.tight_layout()
-    return _fig_to_base64(fig)
+    return _fig_to_data_uri(fig, fmt)
+
+
+# ── Worker pool ────────────────────────────────────────────────────────
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _warm_worker() -> None:
+    """Worker initialiser: load fonts and the renderers before the first chart."""
+    for fmt in FORMATS:
+        render_chart("bar", {"labels": ["a"], "values": [1.0], "title": "warm"}, fmt)
+
+
+def _get_pool(workers: int):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the parent may hold DB connections and threads
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+        return _pool
+
+
+def shutdown_chart_pool() -> None:
+    """Stop the chart worker processes (they are restarted on next use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _render_many(jobs: list[tuple[str, dict, str]]) -> list[str]:
+    from django.conf import settings
+
+    workers = getattr(settings, "REPORT_CHART_WORKERS", 0)
+    if workers > 0 and len(jobs) > 1:
+        try:
+            pool = _get_pool(workers)
+            return list(pool.map(render_chart, *zip(*jobs)))
+        except BrokenProcessPool:
+            logger.exception("Chart worker pool failed; rendering in-process")
+            shutdown_chart_pool()
+    return [render_chart(*job) for job in jobs]
+
+
+# ── Cache ──────────────────────────────────────────────────────────────
+
+def _cache_timeout() -> int:
+    from django.conf import settings
+
+    return getattr(settings, "REPORT_CHART_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT)
+
+
+def _default_format() -> str:
+    from django.conf import settings
+
+    return getattr(settings, "REPORT_CHART_FORMAT", "svg")
+
+
+def chart_cache_key(kind: str, params: dict, fmt: str) -> str:
+    """Cache key for a chart: a hash of everything that affects its pixels.
+
+    Keys are content hashes, so they need no tenant prefix or invalidation:
+    different data always gives a different key.
+    """
+    payload = json.dumps(
+        [STYLE_VERSION, CHART_WIDTH, CHART_HEIGHT, kind, fmt, params],
+        sort_keys=True, default=str,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{CACHE_KEY_PREFIX}:{digest}"
+
+
+def render_charts(specs: list[tuple[str, dict]], fmt: str | None = None) -> list[str]:
+    """Render several charts, using the cache and the worker pool.
+
+    Args:
+        specs: List of (kind, params) — kind is "bar" or "line", params the
+            keyword arguments of the matching generate_*_chart function.
+        fmt: "svg" or "png" (default: REPORT_CHART_FORMAT).
+
+    Returns:
+        Data URIs in the same order as specs.
+    """
+    from django.core.cache import cache
+
+    fmt = fmt or _default_format()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported chart format: {fmt}")
+
+    timeout = _cache_timeout()
+    keys = [chart_cache_key(kind, params, fmt) for kind, params in specs]
+    cached = cache.get_many(keys) if timeout > 0 else {}
+
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    if missing:
+        rendered = _render_many([(*specs[i], fmt) for i in missing])
+        fresh = {keys[i]: uri for i, uri in zip(missing, rendered)}
+        if timeout > 0:
+            cache.set_many(fresh, timeout)
+        cached.update(fresh)
+
+    return [cached[key] for key in keys]
+
+
+def generate_bar_chart(
+    labels: list[str],
+    values: list[float],
+    title: str = "",
+    ylabel: str = "",
+    value_suffix: str = "",
+    fmt: str | None = None,
+) -> str | None:
+    """Generate a bar chart comparing values across categories.
+
+    Suitable for single-period demographic comparisons (e.g., metric
+    values by age group).
+
+    Args:
+        labels: Category labels (e.g., ["Age 13-17", "Age 18-24", "Age 25+"]).
+        values: Numeric values for each category.
+        title: Chart title.
+        ylabel: Y-axis label.
+        value_suffix: Suffix for value labels (e.g., "%" for percentages).
+        fmt: "svg" or "png" (default: REPORT_CHART_FORMAT).
+
+    Returns:
+        Base64 data URI string, or None if chart generation unavailable.
+    """
+    if not MATPLOTLIB_AVAILABLE or not labels or not values:
+        return None
+
+    return render_charts([("bar", {
+        "labels": list(labels),
+        "values": list(values),
+        "title": title,
+        "ylabel": ylabel,
+        "value_suffix": value_suffix,
+    })], fmt)[0]
+
+
+def generate_line_chart(
+    period_labels: list[str],
+    series: list[dict[str, Any]],
+    title: str = "",
+    ylabel: str = "",
+    value_suffix: str = "",
+    fmt: str | None = None,
+) -> str | None:
+    """Generate a line chart showing trends over multiple periods.
+
+    Suitable for multi-period trend visualisation (e.g., metric values
+    over the last 4 quarters).
+
+    Args:
+        period_labels: Time period labels (e.g., ["Q1", "Q2", "Q3", "Q4"]).
+        series: List of series dicts:
+            [{"label": "All Participants", "values": [3.2, 3.5, 3.8, 4.0]}, ...]
+        title: Chart title.
+        ylabel: Y-axis label.
+        value_suffix: Suffix for value labels (e.g., "%" for percentages).
+        fmt: "svg" or "png" (default: REPORT_CHART_FORMAT).
+
+    Returns:
+        Base64 data URI string, or None if chart generation unavailable.
+    """
+    if not MATPLOTLIB_AVAILABLE or not period_labels or not series:
+        return None
+
+    return render_charts([("line", {
+        "period_labels": list(period_labels),
+        "series": [{"label": s["label"], "values": list(s["values"])} for s in series],
+        "title": title,
+        "ylabel": ylabel,
+        "value_suffix": value_suffix,
+    })], fmt)[0]
 
 
 def generate_metric_charts(metric_results: list[dict], section_title: str = "") -> list[dict]:
@@ -235,12 +397,12 @@ def generate_metric_charts(metric_results: list[dict], section_title: str = "")
         section_title: Optional section title for chart grouping.
 
     Returns:
-        List of dicts: [{"label": "Metric Name", "chart_data_uri": "data:image/png;..."}]
+        List of dicts: [{"label": "Metric Name", "chart_data_uri": "data:image/svg+xml;..."}]
     """
     if not MATPLOTLIB_AVAILABLE or not metric_results:
         return []
 
-    charts = []
+    specs = []
     for mr in metric_results:
         label = mr["label"]
         aggregation = mr["aggregation"]
@@ -277,18 +439,16 @@ def generate_metric_charts(metric_results: list[dict], section_title: str = "")
             value_suffix = ""
             ylabel = label
 
-        chart_uri = generate_bar_chart(
-            labels=group_labels,
-            values=group_values,
-            title=label,
-            ylabel=ylabel,
-            value_suffix=value_suffix,
-        )
-
-        if chart_uri:
-            charts.append({
-                "label": label,
-                "chart_data_uri": chart_uri,
-            })
-
-    return charts
+        specs.append(("bar", {
+            "labels": group_labels,
+            "values": group_values,
+            "title": label,
+            "ylabel": ylabel,
+            "value_suffix": value_suffix,
+        }))
+
+    # One call for the whole report, so cache misses render in parallel
+    return [
+        {"label": params["title"], "chart_data_uri": uri}
+        for (_kind, params), uri in zip(specs, render_charts(specs))
+    ]
@@ -7,6 +7,7 @@ Provides functions to group clients by demographics:
 These functions work with encrypted data by loading records into Python
 and filtering in memory. This approach is acceptable for up to ~2,000 clients.
 """
+import json
 from collections import defaultdict
 from datetime import date
 from typing import Any
@@ -62,18 +63,10 @@ def group_clients_by_age(
         Dict mapping age range labels to lists of client IDs.
         Example: {"25-34": [1, 2], "35-44": [3], "Unknown": [4]}
     """
-    groups: dict[str, list[int]] = defaultdict(list)
-
     # Convert queryset to list if needed
     if hasattr(client_ids, "values_list"):
         client_ids = list(client_ids)
 
-    # Use custom bins if provided, otherwise default
-    if custom_bins:
-        bins = [(b["min"], b["max"], b["label"]) for b in custom_bins]
-    else:
-        bins = AGE_RANGES
-
     # Load clients — encrypted birth_date requires Python access.
     # Only fetch pk and encrypted birth_date to avoid loading other
     # encrypted PII fields (names, phone) unnecessarily.
@@ -81,9 +74,40 @@ def group_clients_by_age(
         "pk", "_birth_date_encrypted",
     )
 
-    for client in clients:
-        age_range = _find_age_bin(client.birth_date, as_of_date, bins)
-        groups[age_range].append(client.pk)
+    return bin_birth_dates(
+        ((client.pk, client.birth_date) for client in clients),
+        as_of_date, custom_bins,
+    )
+
+
+def bin_birth_dates(
+    birth_dates,
+    as_of_date: date | None = None,
+    custom_bins: list[dict] | None = None,
+) -> dict[str, list[int]]:
+    """
+    Group already-decrypted birth dates into age range bins.
+
+    Args:
+        birth_dates: Iterable of (client_id, birth_date) pairs.
+        as_of_date: Calculate ages as of this date (default: today).
+        custom_bins: Optional funder-specific bins, as for group_clients_by_age().
+
+    Returns:
+        Dict mapping age range labels to lists of client IDs, labels in
+        order of first appearance.
+    """
+    groups: dict[str, list[int]] = defaultdict(list)
+
+    # Use custom bins if provided, otherwise default
+    if custom_bins:
+        bins = [(b["min"], b["max"], b["label"]) for b in custom_bins]
+    else:
+        bins = AGE_RANGES
+
+    for client_id, birth_date in birth_dates:
+        age_range = _find_age_bin(birth_date, as_of_date, bins)
+        groups[age_range].append(client_id)
 
     return dict(groups)
 
@@ -137,12 +161,44 @@ def group_clients_by_custom_field(
         For dropdown fields, uses option labels (not raw values).
         Clients without a value are grouped under "Unknown".
     """
-    groups: dict[str, list[int]] = defaultdict(list)
-
     # Convert queryset to list if needed
     if hasattr(client_ids, "values_list"):
         client_ids = list(client_ids)
 
+    # Get all values for this field for the given clients
+    values = ClientDetailValue.objects.filter(
+        client_file_id__in=client_ids,
+        field_def=field_definition,
+    ).select_related("field_def")
+
+    # get_value() handles decryption if sensitive
+    return group_field_values(
+        ((cv.client_file_id, cv.get_value()) for cv in values),
+        client_ids, field_definition, merge_categories,
+    )
+
+
+def group_field_values(
+    values,
+    client_ids: list[int],
+    field_definition: CustomFieldDefinition,
+    merge_categories: dict[str, list[str]] | None = None,
+) -> dict[str, list[int]]:
+    """
+    Group already-loaded custom field values, as group_clients_by_custom_field().
+
+    Args:
+        values: Iterable of (client_id, raw_value) pairs for field_definition.
+        client_ids: All client IDs being grouped; those without a value
+                    go to "Unknown".
+        field_definition: The CustomFieldDefinition the values belong to.
+        merge_categories: Optional funder category merge map.
+
+    Returns:
+        Dict mapping field values to lists of client IDs.
+    """
+    groups: dict[str, list[int]] = defaultdict(list)
+
     # Build lookup for dropdown options (value -> label)
     option_labels = {}
     if field_definition.input_type == "select" and field_definition.options_json:
@@ -153,19 +209,10 @@ def group_clients_by_custom_field(
                 # Simple list of strings
                 option_labels[option] = option
 
-    # Get all values for this field for the given clients
-    values = ClientDetailValue.objects.filter(
-        client_file_id__in=client_ids,
-        field_def=field_definition,
-    ).select_related("field_def")
-
     # Track which clients have values
     clients_with_values = set()
 
-    for cv in values:
-        client_id = cv.client_file_id
-        raw_value = cv.get_value()  # Handles decryption if sensitive
-
+    for client_id, raw_value in values:
         if not raw_value:
             groups[_("Unknown")].append(client_id)
         else:
@@ -229,11 +276,147 @@ def _apply_category_merge(
     return result
 
 
+class DemographicResolver:
+    """Report-scoped cache of demographic values and group assignments.
+
+    A report groups the same clients by the same fields several times —
+    once per program, per report section and per metric. The module-level
+    functions above reload and decrypt the values every time; a resolver
+    loads each client's birth date and each (field, client) value once for
+    the life of a report, and remembers every client's group as an integer
+    code into a per-field label list.
+
+    Dropdown fields using bucket codes (report_bucket_codes on, never
+    sensitive) are read from ClientDetailValue.bucket_code in SQL; rows
+    with no stored code (saved before the setting was turned on, or not
+    one of the options) fall back to reading the value.
+
+    Results are the same as group_clients_by_age() and
+    group_clients_by_custom_field() for the same clients.
+    """
+
+    def __init__(self, as_of_date: date | None = None):
+        self.as_of_date = as_of_date
+        self._birth_dates: dict[int, Any] = {}
+        # field_def pk -> {client_id: raw value}; clients without a row are
+        # recorded in _loaded but not in the value dict
+        self._values: dict[int, dict[int, str]] = defaultdict(dict)
+        self._loaded: dict[int, set[int]] = defaultdict(set)
+        # (grouping key) -> (labels, {client_id: code})
+        self._codes: dict[Any, tuple[list[str], dict[int, int]]] = {}
+
+    # ── Loading ──────────────────────────────────────────────────────
+
+    def birth_dates(self, client_ids) -> list[tuple[int, Any]]:
+        """(client_id, birth_date) pairs, decrypting only clients not seen before."""
+        client_ids = list(client_ids)
+        missing = [cid for cid in client_ids if cid not in self._birth_dates]
+        if missing:
+            self._birth_dates.update(dict.fromkeys(missing))
+            clients = ClientFile.objects.filter(pk__in=missing).only(
+                "pk", "_birth_date_encrypted",
+            )
+            for client in clients:
+                self._birth_dates[client.pk] = client.birth_date
+        return [(cid, self._birth_dates[cid]) for cid in client_ids]
+
+    def field_values(self, field_definition: CustomFieldDefinition, client_ids) -> list[tuple[int, str]]:
+        """(client_id, raw_value) for clients with a value row, in load order."""
+        client_ids = list(client_ids)
+        field_id = field_definition.pk
+        loaded = self._loaded[field_id]
+        missing = [cid for cid in client_ids if cid not in loaded]
+        if missing:
+            self._load_field(field_definition, missing)
+            loaded.update(missing)
+        wanted = set(client_ids)
+        return [
+            (cid, value) for cid, value in self._values[field_id].items()
+            if cid in wanted
+        ]
+
+    def _load_field(self, field_definition, client_ids):
+        values = self._values[field_definition.pk]
+        rows = ClientDetailValue.objects.filter(
+            client_file_id__in=client_ids, field_def=field_definition,
+        )
+        if field_definition.uses_bucket_codes:
+            options = field_definition.option_values()
+            coded = rows.filter(bucket_code__isnull=False, bucket_code__lte=len(options))
+            for client_id, code in coded.values_list("client_file_id", "bucket_code"):
+                values[client_id] = options[code - 1] if code else ""
+            rows = rows.exclude(pk__in=coded.values("pk"))
+        # get_value() handles decryption if sensitive
+        for cv in rows.select_related("field_def"):
+            values[cv.client_file_id] = cv.get_value()
+
+    # ── Group assignments ────────────────────────────────────────────
+
+    def age_codes(self, client_ids, custom_bins: list[dict] | None = None):
+        """(labels, {client_id: code}) for age bins; see field_codes()."""
+        key = ("age", _bins_key(custom_bins))
+        return self._assign(key, client_ids, lambda ids: bin_birth_dates(
+            self.birth_dates(ids), self.as_of_date, custom_bins,
+        ))
+
+    def field_codes(self, field_definition, client_ids, merge_categories=None):
+        """(labels, {client_id: code}) for a custom field.
+
+        Codes index into labels and stay the same for the life of the
+        resolver, so assignments can be compared across programs and
+        report sections. The mapping covers every client resolved so far.
+        """
+        key = ("field", field_definition.pk, _bins_key(merge_categories))
+        return self._assign(key, client_ids, lambda ids: group_field_values(
+            self.field_values(field_definition, ids), ids, field_definition,
+            merge_categories,
+        ))
+
+    def _assign(self, key, client_ids, group):
+        client_ids = list(client_ids)
+        labels, codes = self._codes.setdefault(key, ([], {}))
+        missing = [cid for cid in dict.fromkeys(client_ids) if cid not in codes]
+        if missing:
+            for label, ids in group(missing).items():
+                if label not in labels:
+                    labels.append(label)
+                code = labels.index(label)
+                for cid in ids:
+                    codes[cid] = code
+        return labels, codes
+
+    def _groups(self, labels, codes, client_ids) -> dict[str, list[int]]:
+        by_code: dict[int, list[int]] = defaultdict(list)
+        for cid in client_ids:
+            by_code[codes[cid]].append(cid)
+        return {labels[code]: ids for code, ids in by_code.items()}
+
+    def age_groups(self, client_ids, custom_bins: list[dict] | None = None) -> dict[str, list[int]]:
+        """As group_clients_by_age(client_ids, as_of_date, custom_bins)."""
+        client_ids = list(client_ids)
+        labels, codes = self.age_codes(client_ids, custom_bins)
+        return self._groups(labels, codes, client_ids)
+
+    def field_groups(self, field_definition, client_ids, merge_categories=None) -> dict[str, list[int]]:
+        """As group_clients_by_custom_field(client_ids, field_definition, merge_categories)."""
+        client_ids = list(client_ids)
+        labels, codes = self.field_codes(field_definition, client_ids, merge_categories)
+        return self._groups(labels, codes, client_ids)
+
+
+def _bins_key(config):
+    """Hashable key for a bins or merge-categories JSON value."""
+    if not config:
+        return None
+    return json.dumps(config, sort_keys=True, default=str)
+
+
 def aggregate_by_demographic(
     metric_values_qs: QuerySet[MetricValue],
     grouping_type: str,
     grouping_field: CustomFieldDefinition | None = None,
     as_of_date: date | None = None,
+    resolver: DemographicResolver | None = None,
 ) -> dict[str, dict[str, Any]]:
     """
     Aggregate metric values by demographic grouping.
@@ -243,6 +426,8 @@ def aggregate_by_demographic(
         grouping_type: One of "age_range", "custom_field", or "none".
         grouping_field: Required if grouping_type is "custom_field".
         as_of_date: For age calculations, use this date (default: today).
+        resolver: Optional DemographicResolver shared across calls in one
+                  report, so each client's values are decrypted once.
 
     Returns:
         Dict mapping demographic group labels to stats dicts.
@@ -273,10 +458,12 @@ def aggregate_by_demographic(
         client_metric_map[client_id].append(mv)
 
     # Group clients by demographic
+    if resolver is None:
+        resolver = DemographicResolver(as_of_date)
     if grouping_type == "age_range":
-        client_groups = group_clients_by_age(list(all_client_ids), as_of_date)
+        client_groups = resolver.age_groups(all_client_ids)
     elif grouping_type == "custom_field" and grouping_field:
-        client_groups = group_clients_by_custom_field(list(all_client_ids), grouping_field)
+        client_groups = resolver.field_groups(grouping_field, all_client_ids)
     else:
         # Invalid grouping — return ungrouped
         stats = _stats_from_list(list(metric_values_qs))
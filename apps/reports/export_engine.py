@@ -1,12 +1,13 @@
 """Template-driven report generation engine.
 
 Orchestrates data collection and output formatting for template-driven
-reports.  Delegates to generate_funder_report_data() for the heavy
-lifting and applies suppression / formatting on top.
+reports.  Loads the period's data for all of the partner's programs in one
+pass (report_engine.ReportDataset) and applies suppression / formatting on
+top.
 
 When the template has ReportMetric records with aggregation rules,
-uses compute_template_metrics() for the metric-rows × demographic-columns
-format specified in the DRR.  Falls back to legacy CSV format when no
+computes the metric-rows × demographic-columns format specified in the
+DRR from the same dataset.  Falls back to legacy CSV format when no
 ReportMetric records exist.
 
 Separation from funder_report.py ensures the template pipeline cannot
@@ -23,71 +24,22 @@ from datetime import date, datetime, time
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
-from apps.clients.models import ClientProgramEnrolment
-from apps.notes.models import ProgressNote
-
-from .aggregation import compute_template_metrics
 from .cids_jsonld import build_cids_jsonld_document
 from .csv_utils import sanitise_csv_row, sanitise_filename
-from .funder_report import (
-    generate_funder_report_csv_rows,
-    generate_funder_report_data,
-    get_demographic_groups,
-)
+from .funder_report import generate_funder_report_csv_rows
 from .models import ReportMetric, ReportSection
 from .pdf_utils import is_pdf_available
+from .report_engine import ReportDataset
 from .suppression import (
     SMALL_CELL_THRESHOLD,
     apply_secondary_suppression,
+    apply_secondary_suppression_rows,
     suppress_small_cell,
 )
 
 logger = logging.getLogger(__name__)
 
 
-def _get_active_client_ids(program, date_from, date_to, user=None):
-    """Get IDs of clients with activity in the reporting period.
-
-    Mirrors the logic in generate_funder_report_data() (lines 221–277)
-    but returns just the IDs for use by get_demographic_groups().
-    """
-    from apps.clients.models import ClientFile
-    from django.db.models import Q
-
-    enrolled_client_ids = list(
-        ClientProgramEnrolment.objects.filter(
-            program=program, status="active",
-        ).values_list("client_file_id", flat=True)
-    )
-
-    if user is not None:
-        if user.is_demo:
-            accessible_ids = set(
-                ClientFile.objects.demo().values_list("pk", flat=True)
-            )
-        else:
-            accessible_ids = set(
-                ClientFile.objects.real().values_list("pk", flat=True)
-            )
-        enrolled_client_ids = [
-            cid for cid in enrolled_client_ids if cid in accessible_ids
-        ]
-
-    date_from_dt = timezone.make_aware(datetime.combine(date_from, time.min))
-    date_to_dt = timezone.make_aware(datetime.combine(date_to, time.max))
-
-    active_client_ids = list(
-        ProgressNote.objects.filter(
-            client_file_id__in=enrolled_client_ids,
-            status="default",
-        ).filter(
-            Q(backdate__range=(date_from_dt, date_to_dt))
-            | Q(backdate__isnull=True, created_at__range=(date_from_dt, date_to_dt))
-        ).values_list("client_file_id", flat=True).distinct()
-    )
-    return active_client_ids
-
-
 def generate_template_csv_rows(
     template,
     report_data,
@@ -165,7 +117,19 @@ def generate_template_csv_rows(
         header = [_("Metric")] + demographic_labels
         rows.append(header)
 
-        for mr in metric_results:
+        # Suppress on the per-cell n values, for the whole table at once
+        suppressed_rows = apply_secondary_suppression_rows(
+            [
+                [
+                    (group_label, mr["values"].get(group_label, {}).get("n", 0))
+                    for group_label in demographic_labels
+                ]
+                for mr in metric_results
+            ],
+            threshold,
+        )
+
+        for mr, suppressed_cells in zip(metric_results, suppressed_rows):
             label = mr["label"]
             suffix = ""
             for group_label in demographic_labels:
@@ -174,14 +138,6 @@ def generate_template_csv_rows(
                     suffix = f" {group_data['label_suffix']}"
                     break
 
-            # Build value row with per-cell n values for suppression check
-            raw_cells = []
-            for group_label in demographic_labels:
-                group_data = mr["values"].get(group_label, {})
-                raw_cells.append((group_label, group_data.get("n", 0)))
-
-            # Apply secondary suppression to the n-values
-            suppressed_cells = apply_secondary_suppression(raw_cells, threshold)
             suppressed_map = dict(suppressed_cells)
 
             row = [f"{label}{suffix}"]
@@ -246,19 +202,21 @@ def generate_template_report(template, date_from, date_to, period_label,
     )
     has_aggregation = bool(report_metrics)
 
+    # Read the period's enrolments, notes, metric values and demographics
+    # for every program at once; each program's figures are cut from that.
+    dataset = ReportDataset.load(
+        programs, date_from, date_to, user=user, report_template=template,
+    )
+
     # Generate data per program
     all_report_data = []
     all_metric_results = []
     all_demographic_labels = []
 
     for program in programs:
-        report_data = generate_funder_report_data(
+        report_data = dataset.funder_report_data(
             program,
-            date_from=date_from,
-            date_to=date_to,
             fiscal_year_label=period_label,
-            user=user,
-            report_template=template,
             taxonomy_lens=taxonomy_lens,
         )
 
@@ -299,11 +257,9 @@ def generate_template_report(template, date_from, date_to, period_label,
 
         # Compute aggregated metrics per demographic group
         if has_aggregation and export_format != "cids_json":
-            active_ids = _get_active_client_ids(program, date_from, date_to, user)
-            demo_groups = get_demographic_groups(active_ids, date_to, template)
-            metric_results = compute_template_metrics(
-                program, date_from, date_to,
-                report_metrics, demo_groups, user,
+            demo_groups = dataset.demographic_groups(program)
+            metric_results = dataset.template_metrics(
+                program, report_metrics, demo_groups,
             )
             all_metric_results.append(metric_results)
             # Preserve demographic label order from the first program
@@ -465,15 +421,18 @@ def _render_multi_program(
         }
 
         if export_format == "pdf":
+            content = None
             if is_pdf_available():
-                from weasyprint import HTML as WeasyHTML
+                from .pdf_service import PDFRenderTimeout, render_pdf_bytes
                 html_str = render_html_string(
                     "reports/html_report_multi_program.html", html_context,
                 )
-                pdf_bytes = WeasyHTML(string=html_str).write_pdf()
-                content = pdf_bytes
-                filename = f"Report_{safe_partner}_{safe_period}.pdf"
-            else:
+                try:
+                    content = render_pdf_bytes(html_str)
+                    filename = f"Report_{safe_partner}_{safe_period}.pdf"
+                except PDFRenderTimeout:
+                    logger.warning("Multi-program PDF timed out; exported as HTML.")
+            if content is None:
                 # WeasyPrint not available — fall back to HTML with correct extension
                 content = render_html_string(
                     "reports/html_report_multi_program.html", html_context,
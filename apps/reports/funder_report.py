@@ -17,17 +17,12 @@ Canadian spelling conventions used throughout (organisation, colour).
 from datetime import date
 from typing import Any
 
-from django.db.models import Q
-from django.utils import timezone
 from django.utils.translation import gettext as _
 
-from apps.admin_settings.models import InstanceSetting
 from apps.clients.models import ClientFile, ClientProgramEnrolment
-from apps.notes.models import MetricValue, ProgressNote
+from apps.notes.models import MetricValue
 
-from .achievements import get_achievement_summary
-from .aggregations import count_clients_by_program, count_contacts_by_outcome, count_notes_by_program
-from .demographics import get_age_range, group_clients_by_age, group_clients_by_custom_field
+from .demographics import DemographicResolver, get_age_range
 from .utils import get_fiscal_year_range
 
 
@@ -104,10 +99,32 @@ def group_clients_by_age_buckets(
         return counts
 
     # Load clients to access encrypted birth_date
-    clients = ClientFile.objects.filter(pk__in=client_ids)
+    clients = ClientFile.objects.filter(pk__in=client_ids).only("pk", "_birth_date_encrypted")
 
-    for client in clients:
-        age_group = get_age_group_label(client.birth_date, as_of_date)
+    return count_birth_dates_by_age_bucket(
+        ((client.pk, client.birth_date) for client in clients), as_of_date,
+    )
+
+
+def count_birth_dates_by_age_bucket(
+    birth_dates,
+    as_of_date: date | None = None,
+) -> dict[str, int]:
+    """
+    Count already-decrypted birth dates per age category.
+
+    Args:
+        birth_dates: Iterable of (client_id, birth_date) pairs.
+        as_of_date: Calculate ages as of this date (default: today).
+
+    Returns:
+        Dict mapping age group labels to counts, every label present.
+    """
+    counts = {label: 0 for _, _, label in DEFAULT_AGE_GROUPS}
+    counts[_("Unknown")] = 0
+
+    for _client_id, birth_date in birth_dates:
+        age_group = get_age_group_label(birth_date, as_of_date)
         counts[age_group] = counts.get(age_group, 0) + 1
 
     return counts
@@ -177,6 +194,7 @@ def get_demographic_groups(
     active_client_ids: list[int],
     date_to: date,
     report_template=None,
+    resolver: DemographicResolver | None = None,
 ) -> dict[str, list[int]]:
     """Build demographic groups as {label: [client_ids]} for metric aggregation.
 
@@ -188,10 +206,14 @@ def get_demographic_groups(
         active_client_ids: Client IDs with activity in the reporting period.
         date_to: Calculate ages as of this date.
         report_template: Optional ReportTemplate with DemographicBreakdown records.
+        resolver: Optional DemographicResolver (as of date_to) shared across
+            programs, so each client's values are decrypted once per report.
 
     Returns:
         OrderedDict-like dict: {"All Participants": [...], "Age 13-17": [...], ...}
     """
+    if resolver is None:
+        resolver = DemographicResolver(date_to)
     groups: dict[str, list[int]] = {_("All Participants"): list(active_client_ids)}
 
     if report_template:
@@ -202,27 +224,17 @@ def get_demographic_groups(
 
         for bd in breakdowns:
             if bd.source_type == "age":
-                custom_bins = bd.bins_json or None
-                if custom_bins:
-                    age_groups = group_clients_by_age(
-                        active_client_ids, date_to, custom_bins=custom_bins,
-                    )
-                else:
-                    age_groups = group_clients_by_age(active_client_ids, date_to)
-                for label, ids in age_groups.items():
-                    groups[label] = ids
+                groups.update(resolver.age_groups(
+                    active_client_ids, custom_bins=bd.bins_json or None,
+                ))
             elif bd.source_type == "custom_field" and bd.custom_field:
-                cf_groups = group_clients_by_custom_field(
-                    active_client_ids, bd.custom_field,
+                groups.update(resolver.field_groups(
+                    bd.custom_field, active_client_ids,
                     merge_categories=bd.merge_categories_json or None,
-                )
-                for label, ids in cf_groups.items():
-                    groups[label] = ids
+                ))
     else:
         # Default: standard age bins
-        age_groups = group_clients_by_age(active_client_ids, date_to)
-        for label, ids in age_groups.items():
-            groups[label] = ids
+        groups.update(resolver.age_groups(active_client_ids))
 
     return groups
 
@@ -260,214 +272,19 @@ def generate_funder_report_data(
 
     Returns:
         Dict with report data structure ready for rendering.
-    """
-    # Determine fiscal year label if not provided
-    if not fiscal_year_label:
-        # Infer from date_from (assumes April start)
-        if date_from.month == 4 and date_from.day == 1:
-            fiscal_year_label = format_fiscal_year_label(date_from.year)
-        else:
-            # Custom date range - show actual dates
-            fiscal_year_label = f"{date_from} to {date_to}"
-
-    # Get organisation name from instance settings
-    organisation_name = InstanceSetting.get("organisation_name", "")
-    if not organisation_name:
-        organisation_name = InstanceSetting.get("agency_name", "Organisation Name")
-
-    # Get enrolled client IDs for the program
-    enrolled_client_ids = list(
-        ClientProgramEnrolment.objects.filter(
-            program=program,
-            status="active",
-        ).values_list("client_file_id", flat=True)
-    )
-
-    # Security: Filter by user's demo status if user is provided
-    # Demo users can only see demo clients; real users only real clients
-    if user is not None:
-        if user.is_demo:
-            accessible_ids = set(ClientFile.objects.demo().values_list("pk", flat=True))
-        else:
-            accessible_ids = set(ClientFile.objects.real().values_list("pk", flat=True))
-        enrolled_client_ids = [cid for cid in enrolled_client_ids if cid in accessible_ids]
-
-    # Count unique clients with activity in the period
-    total_individuals_served = count_clients_by_program(
-        program,
-        date_from=date_from,
-        date_to=date_to,
-        active_only=True,
-    )
 
-    # Count new clients enrolled in the period
-    new_clients = get_new_clients_count(program, date_from, date_to)
-
-    # Count total progress notes (contacts) in the period
-    total_contacts = count_notes_by_program(
-        program,
-        date_from=date_from,
-        date_to=date_to,
-    )
+    Reports covering several programs should load a ReportDataset for all
+    of them once instead of calling this per program.
+    """
+    from .report_engine import ReportDataset
 
-    # Contact attempt breakdown (phone/sms/email notes by outcome)
-    contact_breakdown = count_contacts_by_outcome(
-        program,
-        date_from=date_from,
-        date_to=date_to,
+    dataset = ReportDataset.load(
+        [program], date_from, date_to, user=user, report_template=report_template,
     )
-
-    # Get clients who had activity in the period for demographics
-    # (use same logic as count_clients_by_program but get IDs)
-    from datetime import datetime, time
-    date_from_dt = timezone.make_aware(datetime.combine(date_from, time.min))
-    date_to_dt = timezone.make_aware(datetime.combine(date_to, time.max))
-
-    active_client_ids = list(
-        ProgressNote.objects.filter(
-            client_file_id__in=enrolled_client_ids,
-            status="default",
-        ).filter(
-            Q(backdate__range=(date_from_dt, date_to_dt))
-            | Q(backdate__isnull=True, created_at__range=(date_from_dt, date_to_dt))
-        ).values_list("client_file_id", flat=True).distinct()
+    return dataset.funder_report_data(
+        program, fiscal_year_label=fiscal_year_label, taxonomy_lens=taxonomy_lens,
     )
 
-    # Age demographics
-    age_demographics = group_clients_by_age_buckets(active_client_ids, date_to)
-
-    # If a report template is provided, use its breakdowns instead of defaults
-    custom_demographic_sections = []
-    if report_template:
-        from .models import DemographicBreakdown
-        breakdowns = DemographicBreakdown.objects.filter(
-            report_template=report_template,
-        ).select_related("custom_field").order_by("sort_order")
-
-        for bd in breakdowns:
-            if bd.source_type == "age":
-                # Override default age demographics with funder-specific bins
-                custom_bins = bd.bins_json or None
-                if custom_bins:
-                    age_groups = group_clients_by_age(
-                        active_client_ids, date_to, custom_bins=custom_bins,
-                    )
-                    # Convert from {label: [ids]} to {label: count}
-                    age_demographics = {
-                        label: len(ids) for label, ids in age_groups.items()
-                    }
-                    # Ensure all bin labels present even if count is 0
-                    for b in custom_bins:
-                        if b["label"] not in age_demographics:
-                            age_demographics[b["label"]] = 0
-            elif bd.source_type == "custom_field" and bd.custom_field:
-                # Additional demographic breakdown by custom field
-                cf_groups = group_clients_by_custom_field(
-                    active_client_ids, bd.custom_field,
-                    merge_categories=bd.merge_categories_json or None,
-                )
-                cf_counts = {
-                    label: len(ids) for label, ids in cf_groups.items()
-                }
-                custom_demographic_sections.append({
-                    "label": bd.label,
-                    "data": cf_counts,
-                    "total": sum(cf_counts.values()),
-                })
-
-    # If a report template defines specific metrics, use only those;
-    # otherwise include all metrics with data (backwards-compatible default).
-    template_metric_defs = None
-    template_label_overrides = {}
-    if report_template:
-        from .models import ReportMetric
-        template_metrics = list(
-            ReportMetric.objects.filter(
-                report_template=report_template,
-            ).select_related("metric_definition").order_by("sort_order")
-        )
-        if template_metrics:
-            template_metric_defs = [rm.metric_definition for rm in template_metrics]
-            template_label_overrides = {
-                rm.metric_definition_id: rm.translated_label
-                for rm in template_metrics
-                if rm.display_label
-            }
-
-    achievement_summary = get_achievement_summary(
-        program,
-        date_from=date_from,
-        date_to=date_to,
-        metric_defs=template_metric_defs,
-        use_latest=True,
-    )
-
-    # Apply display_label overrides from template metrics
-    if template_label_overrides:
-        for metric_data in achievement_summary.get("by_metric", []):
-            override = template_label_overrides.get(metric_data["metric_id"])
-            if override:
-                metric_data["metric_name"] = override
-
-    # Build primary outcome (first metric with a target, if any)
-    primary_outcome = None
-    secondary_outcomes = []
-
-    for metric_data in achievement_summary.get("by_metric", []):
-        if metric_data["has_target"]:
-            outcome_data = {
-                "name": metric_data["metric_name"],
-                "target_value": metric_data["target_value"],
-                "clients_measured": metric_data["total_clients"],
-                "clients_achieved": metric_data["clients_met_target"],
-                "achievement_rate": metric_data["achievement_rate"],
-            }
-            if primary_outcome is None:
-                primary_outcome = outcome_data
-            else:
-                secondary_outcomes.append(outcome_data)
-
-    # CIDS standards alignment data
-    from apps.reports.cids_enrichment import get_standards_alignment_data
-    cids_alignment = get_standards_alignment_data(program, taxonomy_lens=taxonomy_lens)
-
-    return {
-        # Report metadata
-        "generated_at": timezone.now(),
-        "reporting_period": fiscal_year_label,
-        "date_from": date_from,
-        "date_to": date_to,
-
-        # Organisation information
-        "organisation_name": organisation_name,
-        "program_name": program.translated_name,
-        "program_description": program.description or "",
-
-        # Service statistics
-        "total_individuals_served": total_individuals_served,
-        "new_clients_this_period": new_clients,
-        "total_contacts": total_contacts,
-        "contact_breakdown": contact_breakdown,
-
-        # Demographics
-        "age_demographics": age_demographics,
-        "age_demographics_total": sum(age_demographics.values()),
-        "custom_demographic_sections": custom_demographic_sections,
-        "report_template_name": report_template.name if report_template else None,
-
-        # Outcomes
-        "primary_outcome": primary_outcome,
-        "secondary_outcomes": secondary_outcomes,
-        "achievement_summary": achievement_summary,
-
-        # CIDS standards alignment
-        "cids_alignment": cids_alignment,
-
-        # Raw data for detailed views
-        "active_client_count": len(active_client_ids),
-        "enrolled_client_count": len(enrolled_client_ids),
-    }
-
 
 def generate_funder_report_csv_rows(report_data: dict[str, Any]) -> list[list[str]]:
     """
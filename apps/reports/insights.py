@@ -22,6 +22,7 @@ from django.db.models.functions import Coalesce, TruncMonth
 
 from apps.clients.models import ClientProgramEnrolment
 from apps.notes.models import ProgressNote, ProgressNoteTarget
+from apps.reports.utils import effective_date_filter
 
 logger = logging.getLogger(__name__)
 
@@ -68,10 +69,7 @@ def get_structured_insights(program=None, client_file=None, date_from=None, date
             client_file__enrolments__program=program,
             client_file__enrolments__status="active",
         )
-    if date_from:
-        notes_qs = notes_qs.filter(_effective_date__date__gte=date_from)
-    if date_to:
-        notes_qs = notes_qs.filter(_effective_date__date__lte=date_to)
+    notes_qs = notes_qs.filter(**effective_date_filter("_effective_date", date_from, date_to))
 
     # Basic counts
     note_count = notes_qs.count()
@@ -248,10 +246,7 @@ def collect_quotes(program=None, client_file=None, date_from=None, date_to=None,
             progress_note__client_file__enrolments__program=program,
             progress_note__client_file__enrolments__status="active",
         )
-    if date_from:
-        targets_qs = targets_qs.filter(_effective_date__date__gte=date_from)
-    if date_to:
-        targets_qs = targets_qs.filter(_effective_date__date__lte=date_to)
+    targets_qs = targets_qs.filter(**effective_date_filter("_effective_date", date_from, date_to))
 
     # Order by most recent first
     targets_qs = targets_qs.order_by("-_effective_date")
@@ -313,10 +308,7 @@ def collect_quotes(program=None, client_file=None, date_from=None, date_to=None,
                 client_file__enrolments__program=program,
                 client_file__enrolments__status="active",
             )
-        if date_from:
-            notes_qs = notes_qs.filter(_effective_date__date__gte=date_from)
-        if date_to:
-            notes_qs = notes_qs.filter(_effective_date__date__lte=date_to)
+        notes_qs = notes_qs.filter(**effective_date_filter("_effective_date", date_from, date_to))
 
         notes_qs = notes_qs.order_by("-_effective_date")
 
@@ -0,0 +1,229 @@
+"""Result cache for Outcome Insights computed blocks.
+
+Program and client insights pages recompute the same SQL aggregations and
+decrypt the same quotes on every view. This module caches those blocks in
+Django's cache, keyed by a *data version* per program and per client.
+
+Invalidation is version-based rather than key-based: saving a progress note
+replaces the version token for the note's client and every program the client
+is actively enrolled in (see apps/notes/signals.py). Enrolment changes do the
+same (apps/clients/signals.py), and code that bypasses model signals — erasure,
+merge, bulk transfer and discharge — calls bump_for_clients_on_commit(). Old
+entries are never read again and simply expire.
+
+Decrypted quote text is never written to the cache in plaintext — the quote
+block is Fernet-encrypted as a single blob, so a cache hit costs one
+decryption instead of up to max_quotes * 5.
+
+Set INSIGHTS_CACHE_TIMEOUT to 0 to disable caching (the test settings do).
+"""
+import hashlib
+import json
+import logging
+import uuid
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from konote.encryption import DecryptionError, decrypt_field, encrypt_field
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 3600
+
+# Separate prefix from InsightSummary.cache_key values ("insights:...")
+KEY_PREFIX = "insights_cache"
+
+
+def _timeout():
+    return getattr(settings, "INSIGHTS_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+
+
+def _schema():
+    # Cache entries are shared across tenants, and program/client PKs are not
+    # unique across schemas.
+    return getattr(connection, "schema_name", "public") or "public"
+
+
+def _version_key(scope, pk):
+    return f"{KEY_PREFIX}:{_schema()}:version:{scope}:{pk}"
+
+
+def get_data_version(scope, pk):
+    """Return the current data version token for a program or client.
+
+    Args:
+        scope: "program" or "client".
+        pk: Primary key of the program or client file.
+    """
+    key = _version_key(scope, pk)
+    version = cache.get(key)
+    if version is None:
+        # A random token (not a counter) so an evicted version key can never
+        # collide with entries computed under an earlier version.
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key) or version
+    return version
+
+
+def bump_data_version(scope, pk):
+    """Invalidate all cached insight blocks for a program or client."""
+    cache.set(_version_key(scope, pk), uuid.uuid4().hex, None)
+
+
+def bump_for_client(client_file_id, program_ids=()):
+    """Invalidate insight blocks affected by a change to one client's notes.
+
+    Program-level insights include every client actively enrolled in the
+    program, so all of the client's active programs are bumped too.
+    """
+    bump_for_clients([client_file_id], program_ids)
+
+
+def _active_program_ids(client_file_ids):
+    from apps.clients.models import ClientProgramEnrolment
+
+    return set(
+        ClientProgramEnrolment.objects.filter(
+            client_file_id__in=client_file_ids, status="active",
+        ).values_list("program_id", flat=True)
+    )
+
+
+def bump_for_clients(client_file_ids, program_ids=()):
+    """Batch form of bump_for_client()."""
+    if _timeout() <= 0:
+        return
+    client_file_ids = [pk for pk in client_file_ids if pk]
+    affected = set(program_ids) | _active_program_ids(client_file_ids)
+    for client_file_id in client_file_ids:
+        bump_data_version("client", client_file_id)
+    for program_id in affected:
+        if program_id:
+            bump_data_version("program", program_id)
+
+
+def bump_for_clients_on_commit(client_file_ids, program_ids=()):
+    """Bump the clients' versions once the current transaction commits.
+
+    For code that rewrites notes or enrolments with queryset.update() or
+    deletes (erasure, merge, bulk transfer and discharge), which the note
+    signal never sees. The clients' active programs are read now, before
+    the change, so programs a client is about to leave are bumped too.
+    """
+    if _timeout() <= 0:
+        return
+    client_file_ids = list(client_file_ids)
+    affected = set(program_ids) | _active_program_ids(client_file_ids)
+    transaction.on_commit(lambda: bump_for_clients(client_file_ids, affected))
+
+
+def _block_key(name, scope, pk, params):
+    digest = hashlib.sha256(repr(params).encode("utf-8")).hexdigest()[:24]
+    version = get_data_version(scope, pk)
+    return f"{KEY_PREFIX}:{_schema()}:{name}:{scope}:{pk}:{version}:{digest}"
+
+
+def cached_block(name, scope, pk, params, compute):
+    """Return compute() from cache, computing and storing it on a miss.
+
+    Args:
+        name: Block name, e.g. "program_metrics".
+        scope: "program" or "client" — which data version invalidates it.
+        pk: Primary key for the scope.
+        params: Hashable description of the inputs (date range, filters).
+        compute: Zero-argument callable producing a picklable result.
+    """
+    timeout = _timeout()
+    if timeout <= 0:
+        return compute()
+
+    key = _block_key(name, scope, pk, params)
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result, timeout)
+    return result
+
+
+def _encode_quotes(quotes):
+    payload = []
+    for q in quotes:
+        item = dict(q)
+        if isinstance(item.get("date"), datetime):
+            item["date"] = item["date"].isoformat()
+        payload.append(item)
+    return encrypt_field(json.dumps(payload))
+
+
+def _decode_quotes(blob):
+    quotes = json.loads(decrypt_field(blob))
+    for q in quotes:
+        if q.get("date"):
+            q["date"] = datetime.fromisoformat(q["date"])
+    return quotes
+
+
+def cached_quotes(scope, pk, params, compute):
+    """Like cached_block(), but stores the quote list encrypted."""
+    timeout = _timeout()
+    if timeout <= 0:
+        return compute()
+
+    key = _block_key("quotes", scope, pk, params)
+    blob = cache.get(key)
+    if blob is not None:
+        try:
+            return _decode_quotes(blob)
+        except (DecryptionError, ValueError):
+            # Key rotated or entry corrupted — recompute below.
+            logger.warning("Discarding unreadable cached insight quotes")
+
+    quotes = compute()
+    cache.set(key, _encode_quotes(quotes), timeout)
+    return quotes
+
+
+# ── InsightSummary memo ─────────────────────────────────────────────────────
+
+def _summary_key(summary_cache_key):
+    return f"{KEY_PREFIX}:{_schema()}:summary:{summary_cache_key}"
+
+
+def get_insight_summary(summary_cache_key):
+    """Return (summary_json, generated_at) for an InsightSummary, or None.
+
+    Memoizes the database lookup. remember_insight_summary() must be called
+    whenever the row is written so regenerated summaries show immediately.
+    """
+    from .models import InsightSummary
+
+    timeout = _timeout()
+    if timeout > 0:
+        memo = cache.get(_summary_key(summary_cache_key))
+        if memo is not None:
+            return memo
+
+    try:
+        row = InsightSummary.objects.get(cache_key=summary_cache_key)
+    except InsightSummary.DoesNotExist:
+        return None
+
+    memo = (row.summary_json, row.generated_at)
+    if timeout > 0:
+        cache.set(_summary_key(summary_cache_key), memo, timeout)
+    return memo
+
+
+def remember_insight_summary(summary):
+    """Refresh the memo after an InsightSummary row is created or updated."""
+    if _timeout() <= 0:
+        return
+    cache.set(
+        _summary_key(summary.cache_key),
+        (summary.summary_json, summary.generated_at),
+        _timeout(),
+    )
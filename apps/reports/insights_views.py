@@ -20,6 +20,7 @@ from apps.notes.models import (
 )
 from apps.plans.models import PlanTarget
 from .insights import get_structured_insights, collect_quotes, MIN_PARTICIPANTS_FOR_QUOTES
+from .insights_cache import cached_block, cached_quotes
 from .insights_forms import InsightsFilterForm
 from .interpretations import (
     interpret_progress_trend,
@@ -40,6 +41,7 @@ from .insights_fhir import (
     get_goal_source_distribution,
     get_practice_health,
 )
+from konote.instrumentation import perf_budget
 
 # Map DB values to human-readable labels for suggestion priorities
 _PRIORITY_LABELS = dict(ProgressNote.SUGGESTION_PRIORITY_CHOICES)
@@ -153,6 +155,29 @@ def _build_outcomes_summary(achievement_rates):
     return " · ".join(parts)
 
 
+def _compute_program_metric_blocks(program, date_from, date_to, structured):
+    """Compute the metric and FHIR metadata blocks for program insights."""
+    metric_distributions = get_metric_distributions(program, date_from, date_to)
+    data_completeness = get_data_completeness(program, date_from, date_to)
+    goal_source_dist = get_goal_source_distribution(program, date_from, date_to)
+    return {
+        "metric_distributions": metric_distributions,
+        "achievement_rates": get_achievement_rates(program, date_from, date_to),
+        "metric_trends": get_metric_trends(program, date_from, date_to),
+        "data_completeness": data_completeness,
+        "instrument_aggregates": get_instrument_aggregates(program, date_from, date_to),
+        "two_lenses": get_two_lenses(program, date_from, date_to,
+                                     structured=structured,
+                                     distributions=metric_distributions),
+        "goal_source_dist": goal_source_dist,
+        "practice_health": get_practice_health(
+            program, date_from, date_to,
+            goal_source_dist=goal_source_dist,
+            data_completeness=data_completeness,
+        ),
+    }
+
+
 def _get_data_tier(note_count, month_count):
     """Determine which features to show based on data volume.
 
@@ -170,6 +195,7 @@ def _get_data_tier(note_count, month_count):
 
 @login_required
 @requires_permission("insights.view")
+@perf_budget(queries=80)
 def program_insights(request):
     """Program-level Outcome Insights page.
 
@@ -203,11 +229,18 @@ def program_insights(request):
         date_from = form.cleaned_data["date_from"]
         date_to = form.cleaned_data["date_to"]
 
+        # Computed blocks are cached per program data version, which is
+        # replaced whenever a note for an enrolled participant is saved.
+        cache_params = (date_from, date_to)
+
         # Layer 1: SQL aggregation (instant, no ceiling)
-        structured = get_structured_insights(
-            program=program,
-            date_from=date_from,
-            date_to=date_to,
+        structured = cached_block(
+            "structured", "program", program.pk, cache_params,
+            lambda: get_structured_insights(
+                program=program,
+                date_from=date_from,
+                date_to=date_to,
+            ),
         )
 
         data_tier = _get_data_tier(structured["note_count"], structured["month_count"])
@@ -218,11 +251,14 @@ def program_insights(request):
         # executive-only users because note.view is DENY for them.
         quotes = []
         if data_tier != "sparse":
-            quotes = collect_quotes(
-                program=program,
-                date_from=date_from,
-                date_to=date_to,
-                include_dates=False,  # Privacy: no dates at program level
+            quotes = cached_quotes(
+                "program", program.pk, cache_params,
+                lambda: collect_quotes(
+                    program=program,
+                    date_from=date_from,
+                    date_to=date_to,
+                    include_dates=False,  # Privacy: no dates at program level
+                ),
             )
 
         # Separate suggestions from other quotes so they display under their own heading
@@ -279,23 +315,21 @@ def program_insights(request):
                 ),
             }
 
-        # ── Metric distribution data (Layers 1 & 2) ──
-        metric_distributions = get_metric_distributions(program, date_from, date_to)
-        achievement_rates_data = get_achievement_rates(program, date_from, date_to)
-        metric_trends = get_metric_trends(program, date_from, date_to)
-        data_completeness = get_data_completeness(program, date_from, date_to)
-        instrument_aggregates = get_instrument_aggregates(program, date_from, date_to)
-        two_lenses = get_two_lenses(program, date_from, date_to,
-                                    structured=structured,
-                                    distributions=metric_distributions)
-
-        # ── FHIR metadata features ──
-        goal_source_dist = get_goal_source_distribution(program, date_from, date_to)
-        practice_health = get_practice_health(
-            program, date_from, date_to,
-            goal_source_dist=goal_source_dist,
-            data_completeness=data_completeness,
+        # ── Metric distribution data (Layers 1 & 2) + FHIR metadata ──
+        metric_blocks = cached_block(
+            "metrics", "program", program.pk, cache_params,
+            lambda: _compute_program_metric_blocks(
+                program, date_from, date_to, structured,
+            ),
         )
+        metric_distributions = metric_blocks["metric_distributions"]
+        achievement_rates_data = metric_blocks["achievement_rates"]
+        metric_trends = metric_blocks["metric_trends"]
+        data_completeness = metric_blocks["data_completeness"]
+        instrument_aggregates = metric_blocks["instrument_aggregates"]
+        two_lenses = metric_blocks["two_lenses"]
+        goal_source_dist = metric_blocks["goal_source_dist"]
+        practice_health = metric_blocks["practice_health"]
 
         # Enrich achievement rates with not-achieved count and journey context
         for metric_id, ach in achievement_rates_data.items():
@@ -430,10 +464,13 @@ def client_insights_partial(request, client_id):
         except ValueError:
             pass
 
-    structured = get_structured_insights(
-        client_file=client,
-        date_from=date_from,
-        date_to=date_to,
+    structured = cached_block(
+        "structured", "client", client.pk, (date_from, date_to),
+        lambda: get_structured_insights(
+            client_file=client,
+            date_from=date_from,
+            date_to=date_to,
+        ),
     )
 
     data_tier = _get_data_tier(structured["note_count"], structured["month_count"])
@@ -506,12 +543,15 @@ def client_insights_partial(request, client_id):
 
     # Client-level: no participant threshold, dates included
     # Restrict quotes to programs the user has access to
-    quotes = collect_quotes(
-        client_file=client,
-        date_from=date_from,
-        date_to=date_to,
-        include_dates=True,
-        program_ids=user_program_ids,
+    quotes = cached_quotes(
+        "client", client.pk, (date_from, date_to, tuple(sorted(user_program_ids))),
+        lambda: collect_quotes(
+            client_file=client,
+            date_from=date_from,
+            date_to=date_to,
+            include_dates=True,
+            program_ids=user_program_ids,
+        ),
     )
 
     # Check AI availability
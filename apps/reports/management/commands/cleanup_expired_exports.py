@@ -10,14 +10,20 @@ directory tidy and remove database records for links that are well past expiry.
 """
 
 import os
+import time
 from datetime import timedelta
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
+from apps.audit.export import PARTIAL_SUFFIX, STALE_JOB_MINUTES
 from apps.reports.models import SecureExportLink
 
+# In-progress export files ("<path>.part") are left alone until they are
+# older than any export job can run (see run_audit_exports).
+PARTIAL_FILE_GRACE_SECONDS = STALE_JOB_MINUTES * 60 * 2
+
 
 class Command(BaseCommand):
     help = (
@@ -126,6 +132,12 @@ class Command(BaseCommand):
                 # Normalise path for comparison (consistent slashes, etc.)
                 normalised = os.path.normpath(full_path)
 
+                # An export job may still be writing this file
+                if filename.endswith(PARTIAL_SUFFIX):
+                    age = time.time() - os.path.getmtime(full_path)
+                    if age < PARTIAL_FILE_GRACE_SECONDS:
+                        continue
+
                 if normalised not in active_normalised:
                     if dry_run:
                         self.stdout.write(
@@ -17,6 +17,7 @@ from django.db.models.functions import Coalesce, TruncMonth
 from apps.clients.models import ClientProgramEnrolment
 from apps.notes.models import MetricValue, ProgressNote, ProgressNoteTarget
 from apps.plans.models import MetricDefinition
+from apps.reports.utils import effective_date_filter
 
 # Privacy thresholds
 MIN_N_FOR_DISTRIBUTION = 10
@@ -41,11 +42,7 @@ def _base_metric_values_qs(program, date_from, date_to):
     ).annotate(
         _effective_date=_effective_date_annotation(),
     )
-    if date_from:
-        qs = qs.filter(_effective_date__date__gte=date_from)
-    if date_to:
-        qs = qs.filter(_effective_date__date__lte=date_to)
-    return qs
+    return qs.filter(**effective_date_filter("_effective_date", date_from, date_to))
 
 
 def _classify_band(value, threshold_low, threshold_high, higher_is_better):
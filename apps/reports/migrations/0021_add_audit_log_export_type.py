@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 23:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0020_reporttemplate_taxonomy_system'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='secureexportlink',
+            name='export_type',
+            field=models.CharField(choices=[('client_data', 'Participant Data'), ('metrics', 'Metric Report'), ('standard_report', 'Standard Report'), ('individual_client', 'Individual Client Export'), ('session_report', 'Session Report'), ('audit_log', 'Audit Log')], max_length=50),
+        ),
+    ]
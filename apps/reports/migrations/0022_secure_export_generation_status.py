@@ -0,0 +1,28 @@
+# Generated by Django 5.1.15 on 2026-10-19 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0021_add_audit_log_export_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='secureexportlink',
+            name='generation_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='secureexportlink',
+            name='generation_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='secureexportlink',
+            name='generation_status',
+            field=models.CharField(choices=[('ready', 'Ready'), ('queued', 'Queued'), ('running', 'Being prepared'), ('failed', 'Failed')], default='ready', max_length=10),
+        ),
+    ]
@@ -476,6 +476,7 @@ class SecureExportLink(models.Model):
         ("standard_report", _("Standard Report")),
         ("individual_client", _("Individual Client Export")),
         ("session_report", _("Session Report")),
+        ("audit_log", _("Audit Log")),
     ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -533,6 +534,21 @@ class SecureExportLink(models.Model):
     # File location (not web-accessible)
     file_path = models.CharField(max_length=500)
 
+    # Background generation — large audit log exports are written by the
+    # run_audit_exports job after the link is created. Other exports are
+    # written before their link exists and are "ready" from the start.
+    GENERATION_STATUS_CHOICES = [
+        ("ready", _("Ready")),
+        ("queued", _("Queued")),
+        ("running", _("Being prepared")),
+        ("failed", _("Failed")),
+    ]
+    generation_status = models.CharField(
+        max_length=10, choices=GENERATION_STATUS_CHOICES, default="ready",
+    )
+    generation_started_at = models.DateTimeField(null=True, blank=True)
+    generation_error = models.TextField(blank=True, default="")
+
     # Report approval workflow (RPT-APPROVE1)
     agency_notes = models.TextField(
         blank=True,
@@ -585,6 +601,11 @@ class SecureExportLink(models.Model):
         delay = getattr(settings, "ELEVATED_EXPORT_DELAY_MINUTES", 10)
         return self.created_at + timedelta(minutes=delay)
 
+    @property
+    def is_being_prepared(self):
+        """True while the export job has yet to finish writing the file."""
+        return self.generation_status in ("queued", "running")
+
     @property
     def file_exists(self):
         """Check if the export file is still on disk."""
@@ -597,6 +618,10 @@ class SecureExportLink(models.Model):
             return "Revoked"
         if timezone.now() > self.expires_at:
             return "Expired"
+        if self.is_being_prepared:
+            return "Preparing"
+        if self.generation_status == "failed":
+            return "Failed"
         if not self.file_exists:
             return "File Missing"
         if self.is_elevated and not self.is_available:
@@ -103,6 +103,7 @@ def oversight_report_approve(request, report_id):
 @admin_required
 def oversight_report_pdf(request, report_id):
     """Generate PDF of the oversight report."""
+    from .pdf_service import PDFRenderTimeout
     from .pdf_utils import is_pdf_available, render_pdf
 
     snapshot = get_object_or_404(OversightReportSnapshot, pk=report_id)
@@ -116,7 +117,12 @@ def oversight_report_pdf(request, report_id):
     context = get_oversight_context(snapshot, is_external=is_external)
 
     filename = f"safety-oversight-{snapshot.period_label.replace(' ', '-')}.pdf"
-    return render_pdf("reports/pdf_oversight_report.html", context, filename)
+    try:
+        return render_pdf("reports/pdf_oversight_report.html", context, filename)
+    except PDFRenderTimeout:
+        from django.contrib import messages
+        messages.error(request, "The PDF took too long to generate. Please try again later.")
+        return redirect("reports:oversight_detail", report_id=snapshot.pk)
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,255 @@
+"""PDF rendering service: WeasyPrint in long-lived worker processes.
+
+Building a PDF used to start from scratch on every request: a new
+weasyprint.HTML, a new font configuration (fontconfig scans the system
+fonts) and a fresh parse of every linked stylesheet. This module keeps that
+state between renders:
+
+- one FontConfiguration per process, created once;
+- parsed PDF_STYLESHEETS (paths under STATIC_ROOT), re-parsed only when the
+  file changes on disk.
+
+With PDF_RENDER_WORKERS > 0, renders are queued to a pool of spawned worker
+processes that import WeasyPrint and load fonts and stylesheets at start-up.
+Each job has a timeout (PDF_RENDER_TIMEOUT seconds); a job that overruns
+raises PDFRenderTimeout and its pool is replaced: new renders go to fresh
+workers, other renders already in the old pool are allowed to finish, and
+then the old workers (including the stuck one) are killed. One
+pathological document cannot hold a worker forever or fail other users'
+renders. With 0 workers (the default, and in tests),
+renders run in the calling process with the same caches and no timeout.
+
+Jobs either return the PDF bytes or write the file themselves
+(render_pdf_to_file), so large exports go straight to SECURE_EXPORT_DIR
+without being copied back through the parent process.
+
+The worker functions take only plain strings and paths — no Django — so
+the pool can be spawned without setting Django up.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import wait as futures_wait
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 120
+
+PARTIAL_SUFFIX = ".part"
+
+
+class PDFRenderTimeout(RuntimeError):
+    """A PDF render ran past PDF_RENDER_TIMEOUT and was stopped."""
+
+
+# ── Per-process renderer state ────────────────────────────────────────
+
+_local = threading.local()
+
+
+def _font_config():
+    from weasyprint.text.fonts import FontConfiguration
+
+    if getattr(_local, "font_config", None) is None:
+        _local.font_config = FontConfiguration()
+    return _local.font_config
+
+
+def _stylesheet(path):
+    """Parsed CSS for path, re-parsed only when the file changes."""
+    from weasyprint import CSS
+
+    cache = getattr(_local, "stylesheets", None)
+    if cache is None:
+        cache = _local.stylesheets = {}
+    mtime = os.path.getmtime(path)
+    cached = cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, CSS(filename=path, font_config=_font_config()))
+        cache[path] = cached
+    return cached[1]
+
+
+def _render(html_string, base_url, stylesheets, file_path=None):
+    """Render one document; return the bytes, or the size written to file_path."""
+    from weasyprint import HTML
+
+    document = HTML(string=html_string, base_url=base_url)
+    options = {
+        "stylesheets": [_stylesheet(path) for path in stylesheets],
+        "font_config": _font_config(),
+    }
+    if file_path is None:
+        return document.write_pdf(**options)
+
+    partial_path = file_path + PARTIAL_SUFFIX
+    try:
+        document.write_pdf(partial_path, **options)
+        os.replace(partial_path, file_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    return os.path.getsize(file_path)
+
+
+def _warm_worker(stylesheets):
+    """Worker initialiser: load WeasyPrint, fonts and stylesheets up front."""
+    _render("<p>warm</p>", None, stylesheets)
+
+
+# ── Pool ──────────────────────────────────────────────────────────────
+
+class _Pool:
+    """A worker pool plus the jobs currently submitted to it."""
+
+    def __init__(self, workers, stylesheets):
+        # spawn, not fork: the parent may hold DB connections and threads
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+            initargs=(stylesheets,),
+        )
+        self.in_flight = set()
+        self.lock = threading.Lock()
+
+    def submit(self, *args):
+        future = self.executor.submit(_render, *args)
+        with self.lock:
+            self.in_flight.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self.lock:
+            self.in_flight.discard(future)
+
+    def others(self, future):
+        with self.lock:
+            return [f for f in self.in_flight if f is not future]
+
+    def terminate(self):
+        # ProcessPoolExecutor has no public way to stop a running job
+        for process in list((self.executor._processes or {}).values()):
+            process.terminate()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _settings():
+    from django.conf import settings
+
+    static_root = getattr(settings, "STATIC_ROOT", None)
+    stylesheets = [
+        os.path.join(static_root or ".", name)
+        for name in getattr(settings, "PDF_STYLESHEETS", [])
+    ]
+    return {
+        # STATIC_ROOT as base_url so WeasyPrint can resolve {% static %} paths
+        "base_url": static_root or ".",
+        "stylesheets": stylesheets,
+        "workers": getattr(settings, "PDF_RENDER_WORKERS", 0),
+        "timeout": getattr(settings, "PDF_RENDER_TIMEOUT", DEFAULT_TIMEOUT),
+    }
+
+
+def _get_pool(workers, stylesheets):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _Pool(workers, stylesheets)
+        return _pool
+
+
+def _discard_pool(pool):
+    """Stop handing new jobs to pool; jobs already submitted keep running."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.executor.shutdown(wait=False, cancel_futures=False)
+
+
+def _retire_pool(pool, stuck, grace, partial_path=None):
+    """Replace a pool holding a stuck job without failing anyone else's render.
+
+    New renders go to a fresh pool straight away. The old pool stops taking
+    jobs; its other jobs get up to `grace` seconds to finish (killing any
+    worker process breaks every job in a ProcessPoolExecutor), then its
+    remaining workers — including the stuck one — are terminated and the
+    stuck job's partial file, if any, is removed.
+    """
+    _discard_pool(pool)
+
+    def reap():
+        others = pool.others(stuck)
+        if others:
+            futures_wait(others, timeout=grace)
+        pool.terminate()
+        if partial_path and os.path.exists(partial_path):
+            os.remove(partial_path)
+
+    threading.Thread(target=reap, name="pdf-pool-reaper", daemon=True).start()
+
+
+def shutdown_pdf_pool():
+    """Stop the worker processes (they are restarted on next use).
+
+    Queued jobs are cancelled; jobs already running are left to finish.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _run(html_string, file_path=None, base_url=None):
+    config = _settings()
+    args = (html_string, base_url or config["base_url"], config["stylesheets"], file_path)
+    if config["workers"] <= 0:
+        return _render(*args)
+
+    pool = _get_pool(config["workers"], config["stylesheets"])
+    try:
+        future = pool.submit(*args)
+        return future.result(timeout=config["timeout"])
+    except FutureTimeoutError:
+        logger.error("PDF render exceeded %ss; replacing PDF workers", config["timeout"])
+        _retire_pool(
+            pool, future, grace=config["timeout"],
+            partial_path=file_path + PARTIAL_SUFFIX if file_path else None,
+        )
+        raise PDFRenderTimeout(
+            f"PDF generation took longer than {config['timeout']} seconds."
+        )
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); render this one in-process
+        logger.exception("PDF worker pool failed; rendering in-process")
+        _discard_pool(pool)
+        return _render(*args)
+
+
+def render_pdf_bytes(html_string, base_url=None):
+    """Render HTML to PDF bytes.
+
+    Raises PDFRenderTimeout if a pooled render exceeds PDF_RENDER_TIMEOUT.
+    """
+    return _run(html_string, base_url=base_url)
+
+
+def render_pdf_to_file(html_string, file_path, base_url=None):
+    """Render HTML to a PDF file at file_path; returns the file size.
+
+    The file only appears once complete (written as "<path>.part" and
+    renamed). Raises PDFRenderTimeout like render_pdf_bytes().
+    """
+    return _run(html_string, file_path=file_path, base_url=base_url)
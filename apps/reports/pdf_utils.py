@@ -4,7 +4,6 @@ WeasyPrint requires native GTK libraries. If not installed, PDF features
 will be disabled but the rest of the application will work normally.
 See docs/pdf-setup.md for installation instructions.
 """
-from django.conf import settings
 from django.http import HttpResponse
 from django.template.loader import render_to_string
 from django.utils import timezone
@@ -13,7 +12,7 @@ from apps.audit.models import AuditLog
 
 # Conditional import: WeasyPrint requires GTK libraries that may not be available
 try:
-    from weasyprint import HTML
+    import weasyprint  # noqa: F401
     WEASYPRINT_AVAILABLE = True
 except (ImportError, OSError) as e:
     WEASYPRINT_AVAILABLE = False
@@ -35,7 +34,9 @@ def get_pdf_unavailable_reason():
 def render_pdf(template_name, context, filename="report.pdf"):
     """Render a Django template to a PDF HttpResponse.
 
-    Raises RuntimeError if WeasyPrint is not available.
+    Rendering goes through pdf_service (worker pool, cached fonts and
+    stylesheets, per-job timeout). Raises RuntimeError if WeasyPrint is not
+    available, or PDFRenderTimeout if the render takes too long.
     """
     if not WEASYPRINT_AVAILABLE:
         raise RuntimeError(
@@ -43,10 +44,10 @@ def render_pdf(template_name, context, filename="report.pdf"):
             f"Error: {_WEASYPRINT_ERROR}"
         )
 
+    from .pdf_service import render_pdf_bytes
+
     html_string = render_to_string(template_name, context)
-    # Use STATIC_ROOT as base_url so WeasyPrint can resolve {% static %} paths
-    base_url = getattr(settings, "STATIC_ROOT", None) or "."
-    pdf_bytes = HTML(string=html_string, base_url=base_url).write_pdf()
+    pdf_bytes = render_pdf_bytes(html_string)
     response = HttpResponse(pdf_bytes, content_type="application/pdf")
     response["Content-Disposition"] = f'attachment; filename="{filename}"'
     return response
@@ -25,21 +25,35 @@ from .pdf_utils import (
     is_pdf_available,
     render_pdf,
 )
+from .pdf_service import PDFRenderTimeout
 from .views import _get_client_ip, _get_client_or_403, _save_export_and_create_link
 
 
-def _pdf_unavailable_response(request):
-    """Return a user-friendly response when PDF generation is unavailable."""
+def _pdf_unavailable_response(request, timed_out=False):
+    """Return a user-friendly response when PDF generation is unavailable.
+
+    timed_out=True explains that this document took too long to render,
+    rather than that PDF support is missing.
+    """
     return render(
         request,
         "reports/pdf_unavailable.html",
         {
-            "reason": get_pdf_unavailable_reason(),
+            "reason": None if timed_out else get_pdf_unavailable_reason(),
+            "timed_out": timed_out,
         },
         status=503,
     )
 
 
+def _render_pdf_response(request, template_name, context, filename):
+    """render_pdf(), showing the unavailable page if the render times out."""
+    try:
+        return render_pdf(template_name, context, filename)
+    except PDFRenderTimeout:
+        return _pdf_unavailable_response(request, timed_out=True)
+
+
 @login_required
 @requires_permission("metric.view_individual")
 def client_progress_pdf(request, client_id):
@@ -146,7 +160,7 @@ def client_progress_pdf(request, client_id):
         "format": "pdf",
     })
 
-    return render_pdf("reports/pdf_client_progress.html", context, filename)
+    return _render_pdf_response(request, "reports/pdf_client_progress.html", context, filename)
 
 
 def generate_outcome_report_pdf(
@@ -240,7 +254,7 @@ def generate_outcome_report_pdf(
         from .pdf_utils import render_html
         html_filename = filename.replace(".pdf", ".html")
         return render_html("reports/html_outcome_report.html", context, html_filename)
-    return render_pdf("reports/pdf_funder_report.html", context, filename)
+    return _render_pdf_response(request, "reports/pdf_funder_report.html", context, filename)
 
 
 def generate_funder_report_pdf(request, report_data, sections=None,
@@ -294,7 +308,7 @@ def generate_funder_report_pdf(request, report_data, sections=None,
         "format": "pdf",
     })
 
-    return render_pdf("reports/pdf_funder_outcome_report.html", context, filename)
+    return _render_pdf_response(request, "reports/pdf_funder_outcome_report.html", context, filename)
 
 
 def _collect_client_data(client, include_plans, include_notes, include_metrics, include_events, include_custom_fields, user_program_ids=None, user=None):
@@ -712,7 +726,8 @@ def client_export(request, client_id):
                 if not is_pdf_available():
                     return _pdf_unavailable_response(request)
                 from django.template.loader import render_to_string
-                from weasyprint import HTML
+
+                from .pdf_service import render_pdf_to_file
                 pdf_context = {
                     "client": client,
                     "enrolments": data["enrolments"],
@@ -728,32 +743,36 @@ def client_export(request, client_id):
                     "generated_at": timezone.now(),
                     "generated_by": request.user.display_name,
                 }
-                from django.conf import settings as django_settings
                 html_string = render_to_string("reports/pdf_client_data_export.html", pdf_context)
-                base_url = getattr(django_settings, "STATIC_ROOT", None) or "."
-                content = HTML(string=html_string, base_url=base_url).write_pdf()
+
+                # Rendered straight into SECURE_EXPORT_DIR by the PDF service
+                def content(file_path):
+                    render_pdf_to_file(html_string, file_path)
                 filename = f"client_export_{safe_name}_{date_str}.pdf"
 
             # Save to file and create SecureExportLink
-            link = _save_export_and_create_link(
-                request,
-                content=content,
-                filename=filename,
-                export_type="individual_client",
-                client_count=1,
-                includes_notes=include_notes,
-                recipient=recipient,
-                filters_dict={
-                    "client_id": client.pk,
-                    "format": export_format,
-                    "include_plans": include_plans,
-                    "include_notes": include_notes,
-                    "include_metrics": include_metrics,
-                    "include_events": include_events,
-                    "include_custom_fields": include_custom_fields,
-                },
-                contains_pii=True,
-            )
+            try:
+                link = _save_export_and_create_link(
+                    request,
+                    content=content,
+                    filename=filename,
+                    export_type="individual_client",
+                    client_count=1,
+                    includes_notes=include_notes,
+                    recipient=recipient,
+                    filters_dict={
+                        "client_id": client.pk,
+                        "format": export_format,
+                        "include_plans": include_plans,
+                        "include_notes": include_notes,
+                        "include_metrics": include_metrics,
+                        "include_events": include_events,
+                        "include_custom_fields": include_custom_fields,
+                    },
+                    contains_pii=True,
+                )
+            except PDFRenderTimeout:
+                return _pdf_unavailable_response(request, timed_out=True)
 
             # Audit log
             AuditLog.objects.using("audit").create(
@@ -9,8 +9,15 @@ Two-pass approach:
   1. Regex patterns for structured PII (phones, emails, postal codes, SINs, addresses)
      — run FIRST so names embedded in emails aren't corrupted
   2. Known names (client + staff) replaced with [NAME] using word-boundary matching
+
+For bulk work (Outcome Insights scrubs hundreds of quotes against thousands of
+names), build a PiiScrubber once and call scrub_many() — the name matcher is
+compiled once per distinct name set and shared across calls.
 """
+import hashlib
 import re
+import threading
+from collections import OrderedDict
 
 
 # ── Regex patterns for Canadian PII ──────────────────────────────────────────
@@ -63,26 +70,68 @@ _RECORD_ID_RE = re.compile(
 )
 
 
-def scrub_pii(text, known_names=None):
-    """Remove PII from text before sending to an external AI service.
+# ── Compiled name matchers ───────────────────────────────────────────────────
 
-    Args:
-        text: The text to scrub.
-        known_names: Optional list/set of names to replace (client first/last/preferred
-                     names and staff display names). Names are matched using word
-                     boundaries to avoid corrupting common words (Hope, Grace, Faith).
+# Compiling an alternation of thousands of names costs far more than running
+# it, so compiled patterns are kept per name set (keyed by a digest of the
+# normalised names) and reused across requests in the same process.
+_NAME_PATTERN_CACHE_SIZE = 32
+_name_pattern_cache = OrderedDict()
+_name_pattern_lock = threading.Lock()
+
+# Joins texts for scrub_many(). NUL never appears in note text and none of the
+# patterns above can match across it, so each pattern runs once over the batch.
+_BATCH_SEPARATOR = "\x00"
 
-    Returns:
-        The scrubbed text with PII replaced by placeholders.
-    """
-    if not text:
-        return text
 
-    result = text
+def _normalise_names(known_names):
+    """Return usable names, longest first (so "Mary-Jane" wins over "Mary")."""
+    if not known_names:
+        return []
+    unique = {n for n in known_names if n and len(n) >= 2}
+    return sorted(unique, key=lambda n: (-len(n), n))
 
-    # Pass 1: Structured PII with specific patterns (run FIRST so names
-    # embedded in emails like john@example.com aren't corrupted)
-    result = _EMAIL_RE.sub("[EMAIL]", result)
+
+def _name_set_key(sorted_names):
+    digest = hashlib.sha256()
+    for name in sorted_names:
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _get_name_pattern(known_names):
+    """Return a compiled word-boundary pattern for known_names, or None."""
+    sorted_names = _normalise_names(known_names)
+    if not sorted_names:
+        return None
+
+    key = _name_set_key(sorted_names)
+    with _name_pattern_lock:
+        pattern = _name_pattern_cache.get(key)
+        if pattern is not None:
+            _name_pattern_cache.move_to_end(key)
+            return pattern
+
+    # Build a single combined alternation pattern instead of one regex per name
+    combined = "|".join(re.escape(n) for n in sorted_names)
+    pattern = re.compile(rf"\b(?:{combined})(?:'s)?\b", re.IGNORECASE)
+
+    with _name_pattern_lock:
+        _name_pattern_cache[key] = pattern
+        _name_pattern_cache.move_to_end(key)
+        while len(_name_pattern_cache) > _NAME_PATTERN_CACHE_SIZE:
+            _name_pattern_cache.popitem(last=False)
+    return pattern
+
+
+def _scrub_structured(text):
+    """Pass 1: structured PII with specific patterns.
+
+    Runs FIRST so names embedded in emails like john@example.com aren't
+    corrupted by the name pass.
+    """
+    result = _EMAIL_RE.sub("[EMAIL]", text)
     result = _POSTAL_RE.sub("[POSTAL CODE]", result)
     result = _SIN_RE.sub("[SIN]", result)
     result = _ADDRESS_RE.sub("[ADDRESS]", result)
@@ -91,21 +140,63 @@ def scrub_pii(text, known_names=None):
     result = _DATE_SLASH_RE.sub("[DATE]", result)
     result = _DATE_TEXTUAL_RE.sub("[DATE]", result)
     result = _RECORD_ID_RE.sub("[RECORD ID]", result)
+    return result
 
-    # Pass 2: Replace known names (longest first to avoid partial matches)
-    if known_names:
-        sorted_names = sorted(
-            (n for n in known_names if n and len(n) >= 2),
-            key=len,
-            reverse=True,
-        )
-        if sorted_names:
-            # Build a single combined alternation pattern instead of one regex per name
-            combined = "|".join(re.escape(n) for n in sorted_names)
-            name_pattern = re.compile(
-                rf"\b(?:{combined})(?:'s)?\b",
-                re.IGNORECASE,
-            )
-            result = name_pattern.sub("[NAME]", result)
 
-    return result
+class PiiScrubber:
+    """Reusable scrubber bound to one set of known names.
+
+    Usage:
+        scrubber = PiiScrubber(known_names)
+        scrubbed = scrubber.scrub_many(q["text"] for q in quotes)
+
+    Produces exactly the same output as calling scrub_pii() on each text.
+    """
+
+    def __init__(self, known_names=None):
+        self._name_pattern = _get_name_pattern(known_names)
+
+    def scrub(self, text):
+        """Scrub a single text. Empty/None text is returned unchanged."""
+        if not text:
+            return text
+        result = _scrub_structured(text)
+        if self._name_pattern is not None:
+            result = self._name_pattern.sub("[NAME]", result)
+        return result
+
+    def scrub_many(self, texts):
+        """Scrub a batch of texts in one pass, preserving order.
+
+        Returns a list the same length as texts. Empty/None entries are
+        returned unchanged.
+        """
+        texts = list(texts)
+        batch_positions = [i for i, t in enumerate(texts) if t]
+        if not batch_positions:
+            return texts
+        if any(_BATCH_SEPARATOR in texts[i] for i in batch_positions):
+            return [self.scrub(t) for t in texts]
+
+        joined = _BATCH_SEPARATOR.join(texts[i] for i in batch_positions)
+        scrubbed = self.scrub(joined).split(_BATCH_SEPARATOR)
+
+        results = list(texts)
+        for position, value in zip(batch_positions, scrubbed):
+            results[position] = value
+        return results
+
+
+def scrub_pii(text, known_names=None):
+    """Remove PII from text before sending to an external AI service.
+
+    Args:
+        text: The text to scrub.
+        known_names: Optional list/set of names to replace (client first/last/preferred
+                     names and staff display names). Names are matched using word
+                     boundaries to avoid corrupting common words (Hope, Grace, Faith).
+
+    Returns:
+        The scrubbed text with PII replaced by placeholders.
+    """
+    return PiiScrubber(known_names).scrub(text)
@@ -31,9 +31,8 @@ from apps.notes.models import MetricValue, ProgressNote
 from .achievements import get_achievement_summary
 from .aggregations import aggregate_metrics, _stats_from_list
 from .demographics import (
+    DemographicResolver,
     aggregate_by_demographic,
-    group_clients_by_age,
-    group_clients_by_custom_field,
     parse_grouping_choice,
 )
 from .forms import MetricExportForm, TemplateExportForm, build_period_choices
@@ -84,10 +83,8 @@ def template_report_preview(request):
     GET requests redirect to the generation form.
     """
     from .export_engine import generate_template_report
-    from .funder_report import generate_funder_report_data, get_demographic_groups
-    from .aggregation import compute_template_metrics
-    from .export_engine import _get_active_client_ids
     from .models import ReportMetric, ReportSection
+    from .report_engine import ReportDataset
 
     if request.method != "POST":
         from django.shortcuts import redirect
@@ -120,13 +117,12 @@ def template_report_preview(request):
         })
 
     try:
-        report_data = generate_funder_report_data(
+        dataset = ReportDataset.load(
+            [program], date_from, date_to, user=request.user, report_template=template,
+        )
+        report_data = dataset.funder_report_data(
             program,
-            date_from=date_from,
-            date_to=date_to,
             fiscal_year_label=period_label,
-            user=request.user,
-            report_template=template,
             taxonomy_lens=taxonomy_lens,
         )
     except Exception:
@@ -161,12 +157,8 @@ def template_report_preview(request):
     demographic_labels = []
 
     if has_aggregation:
-        active_ids = _get_active_client_ids(program, date_from, date_to, request.user)
-        demo_groups = get_demographic_groups(active_ids, date_to, template)
-        metric_results = compute_template_metrics(
-            program, date_from, date_to,
-            report_metrics, demo_groups, request.user,
-        )
+        demo_groups = dataset.demographic_groups(program)
+        metric_results = dataset.template_metrics(program, report_metrics, demo_groups)
         demographic_labels = list(demo_groups.keys())
 
     # Apply suppression to metric results for preview
@@ -399,7 +391,9 @@ def adhoc_report_preview(request):
             "max": stats.get("max", "N/A"),
         })
 
-    # Demographic breakdown
+    # Demographic breakdown — one resolver for every section, so each
+    # client's values are decrypted once
+    demographic_resolver = DemographicResolver(date_to)
     demographic_rows = []
     grouping_label = ""
     if grouping_type != "none":
@@ -410,6 +404,7 @@ def adhoc_report_preview(request):
                 continue
             demo_agg = aggregate_by_demographic(
                 metric_specific_mvs, grouping_type, grouping_field, date_to,
+                resolver=demographic_resolver,
             )
             for group_label, stats in demo_agg.items():
                 client_count = len(stats.get("client_ids", set()))
@@ -443,6 +438,7 @@ def adhoc_report_preview(request):
                     custom_bins = bd.bins_json or None
                     demo_agg = aggregate_by_demographic(
                         metric_specific_mvs, "age_range", None, date_to,
+                        resolver=demographic_resolver,
                     )
                     if custom_bins:
                         all_ids = set()
@@ -451,8 +447,8 @@ def adhoc_report_preview(request):
                             cid = mv.progress_note_target.progress_note.client_file_id
                             all_ids.add(cid)
                             client_mv_map[cid].append(mv)
-                        client_groups = group_clients_by_age(
-                            list(all_ids), date_to, custom_bins=custom_bins,
+                        client_groups = demographic_resolver.age_groups(
+                            all_ids, custom_bins=custom_bins,
                         )
                         demo_agg = {}
                         for gl, cids in client_groups.items():
@@ -472,6 +468,7 @@ def adhoc_report_preview(request):
                 elif bd.source_type == "custom_field" and bd.custom_field:
                     demo_agg = aggregate_by_demographic(
                         metric_specific_mvs, "custom_field", bd.custom_field, date_to,
+                        resolver=demographic_resolver,
                     )
                     if bd.merge_categories_json:
                         all_ids = set()
@@ -480,8 +477,8 @@ def adhoc_report_preview(request):
                             cid = mv.progress_note_target.progress_note.client_file_id
                             all_ids.add(cid)
                             client_mv_map[cid].append(mv)
-                        client_groups = group_clients_by_custom_field(
-                            list(all_ids), bd.custom_field,
+                        client_groups = demographic_resolver.field_groups(
+                            bd.custom_field, all_ids,
                             merge_categories=bd.merge_categories_json,
                         )
                         demo_agg = {}
@@ -0,0 +1,425 @@
+"""Single-pass data loading for funder and template reports.
+
+A funder report used to be built one program at a time, and each step —
+service counts, contact breakdown, demographics, achievement summary,
+template metrics — ran its own queries over the same enrolments, notes and
+metric values. A report over all of a partner's programs repeated those
+scans for every program.
+
+ReportDataset.load() reads a reporting period once for any number of
+programs:
+
+- active enrolments (program, client, enrolled date);
+- the period's progress notes for every enrolled client;
+- the numeric metric values recorded on those notes;
+- decrypted birth dates and demographic field values, on first use,
+  through a DemographicResolver shared by every program.
+
+Notes and metric values are held as parallel columns (array.array for the
+numeric ones) with a per-client row index, so each program's figures come
+from a slice of the same arrays. The calculations themselves are the
+shared helpers used by the per-program functions
+(summarise_achievements, aggregate_template_metrics, DemographicResolver),
+so both paths give the same results.
+
+Scoping matches the per-program functions: service counts and the
+achievement summary use every actively enrolled client, while demographic
+groups and template metrics are limited to the requesting user's demo or
+real clients.
+
+Usage:
+    dataset = ReportDataset.load(programs, date_from, date_to, user=user,
+                                 report_template=template)
+    for program in programs:
+        report_data = dataset.funder_report_data(program, period_label)
+        groups = dataset.demographic_groups(program)
+        metric_results = dataset.template_metrics(program, report_metrics, groups)
+"""
+from __future__ import annotations
+
+from array import array
+from collections import defaultdict
+from datetime import date, datetime, time
+from typing import Any
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from apps.admin_settings.models import InstanceSetting
+from apps.clients.models import ClientFile, ClientProgramEnrolment
+from apps.notes.models import MetricValue, ProgressNote
+from apps.plans.models import MetricDefinition
+
+from .achievements import summarise_achievements
+from .aggregation import _to_float, aggregate_template_metrics
+from .demographics import DemographicResolver
+
+CONTACT_INTERACTIONS = ("phone", "sms", "email")
+ATTEMPT_OUTCOMES = ("no_answer", "left_message")
+
+
+class ReportDataset:
+    """One reporting period's notes, metric values and demographics for many programs."""
+
+    def __init__(self, programs, date_from: date, date_to: date, user=None, report_template=None):
+        self.programs = list(programs)
+        self.date_from = date_from
+        self.date_to = date_to
+        self.user = user
+        self.report_template = report_template
+
+        # Per program: enrolled client ids (one per active enrolment row),
+        # and the subset visible to the user (demo/real)
+        self.enrolled: dict[int, list[int]] = {}
+        self.visible: dict[int, list[int]] = {}
+        self.new_enrolments: dict[int, int] = {}
+
+        # Note columns
+        self.note_client = array("q")
+        self.note_effective: list[datetime] = []
+        self.note_interaction: list[str] = []
+        self.note_outcome: list[str] = []
+        self.notes_by_client: dict[int, list[int]] = defaultdict(list)
+
+        # Metric value columns (numeric values only)
+        self.value_metric = array("q")
+        self.value_note = array("q")
+        self.value_number = array("d")
+        self.values_by_client: dict[int, list[int]] = defaultdict(list)
+        self.metric_defs: dict[int, MetricDefinition] = {}
+
+        # Template configuration, loaded once
+        self.breakdowns: list = []
+        self.template_metrics_list: list = []
+
+        # Filled in on first use
+        self.demographics = DemographicResolver(date_to)
+        self._demographics_loaded = False
+        self._organisation_name: str | None = None
+
+    # ── Loading ────────────────────────────────────────────────────────
+
+    @classmethod
+    def load(cls, programs, date_from: date, date_to: date, user=None, report_template=None):
+        """Read the period's data for all programs in a fixed number of queries."""
+        dataset = cls(programs, date_from, date_to, user, report_template)
+        dataset._load_template()
+        dataset._load_enrolments()
+        dataset._load_notes_and_values()
+        return dataset
+
+    def _load_template(self):
+        if not self.report_template:
+            return
+        from .models import DemographicBreakdown, ReportMetric
+
+        self.breakdowns = list(
+            DemographicBreakdown.objects.filter(
+                report_template=self.report_template,
+            ).select_related("custom_field").order_by("sort_order")
+        )
+        self.template_metrics_list = list(
+            ReportMetric.objects.filter(
+                report_template=self.report_template,
+            ).select_related("metric_definition").order_by("sort_order")
+        )
+
+    def _enrolments(self):
+        return ClientProgramEnrolment.objects.filter(
+            program__in=self.programs, status="active",
+        )
+
+    def _load_enrolments(self):
+        for program in self.programs:
+            self.enrolled[program.pk] = []
+            self.new_enrolments[program.pk] = 0
+
+        for program_id, client_id, enrolled_at in self._enrolments().values_list(
+            "program_id", "client_file_id", "enrolled_at",
+        ):
+            self.enrolled[program_id].append(client_id)
+            # Same date the enrolled_at__date lookup compares
+            if timezone.is_aware(enrolled_at):
+                enrolled_at = timezone.localtime(enrolled_at)
+            if self.date_from <= enrolled_at.date() <= self.date_to:
+                self.new_enrolments[program_id] += 1
+
+        # Security: demo users only see demo clients; real users only real clients
+        if self.user is not None:
+            all_ids = {cid for ids in self.enrolled.values() for cid in ids}
+            clients = ClientFile.objects.demo() if self.user.is_demo else ClientFile.objects.real()
+            accessible = set(clients.filter(pk__in=all_ids).values_list("pk", flat=True))
+            for program_id, ids in self.enrolled.items():
+                self.visible[program_id] = [cid for cid in ids if cid in accessible]
+        else:
+            self.visible = {program_id: list(ids) for program_id, ids in self.enrolled.items()}
+
+    def _period_notes(self):
+        date_from_dt = timezone.make_aware(datetime.combine(self.date_from, time.min))
+        date_to_dt = timezone.make_aware(datetime.combine(self.date_to, time.max))
+        return ProgressNote.objects.filter(
+            client_file_id__in=self._enrolments().values("client_file_id"),
+            status="default",
+        ).filter(
+            Q(backdate__range=(date_from_dt, date_to_dt))
+            | Q(backdate__isnull=True, created_at__range=(date_from_dt, date_to_dt))
+        )
+
+    def _load_notes_and_values(self):
+        notes = self._period_notes()
+        row_of_note = {}
+        columns = notes.order_by().values_list(
+            "pk", "client_file_id", "backdate", "created_at", "interaction_type", "outcome",
+        )
+        for note_id, client_id, backdate, created_at, interaction, outcome in columns:
+            row = len(self.note_client)
+            row_of_note[note_id] = row
+            self.note_client.append(client_id)
+            self.note_effective.append(backdate or created_at)
+            self.note_interaction.append(interaction)
+            self.note_outcome.append(outcome)
+            self.notes_by_client[client_id].append(row)
+
+        # Template metrics if the template lists any, otherwise every metric
+        values = MetricValue.objects.filter(progress_note_target__progress_note__in=notes)
+        if self.template_metrics_list:
+            values = values.filter(
+                metric_def_id__in=[rm.metric_definition_id for rm in self.template_metrics_list],
+            )
+        for metric_id, note_id, raw in values.values_list(
+            "metric_def_id", "progress_note_target__progress_note_id", "value",
+        ):
+            number = _to_float(raw)
+            if number is None:
+                continue
+            row = row_of_note[note_id]
+            self.values_by_client[self.note_client[row]].append(len(self.value_metric))
+            self.value_metric.append(metric_id)
+            self.value_note.append(row)
+            self.value_number.append(number)
+
+        self.metric_defs = MetricDefinition.objects.in_bulk(set(self.value_metric))
+
+    def _load_demographics(self):
+        """Decrypt birth dates and breakdown field values for all active clients, once."""
+        self._demographics_loaded = True
+        active = set()
+        for program in self.programs:
+            active.update(self.active_client_ids(program))
+
+        self.demographics.birth_dates(active)
+        for bd in self.breakdowns:
+            if bd.source_type == "custom_field" and bd.custom_field:
+                self.demographics.field_values(bd.custom_field, active)
+
+    # ── Per-program slices ─────────────────────────────────────────────
+
+    def _note_rows(self, client_ids):
+        rows = []
+        for client_id in set(client_ids):
+            rows.extend(self.notes_by_client.get(client_id, ()))
+        return rows
+
+    def _value_rows(self, client_ids):
+        rows = []
+        for client_id in set(client_ids):
+            rows.extend(self.values_by_client.get(client_id, ()))
+        # Back to query order, so ties between equal dates resolve as before
+        rows.sort()
+        return rows
+
+    def _values_by_metric(self, client_ids):
+        """{metric_id: {client_id: [(effective_datetime, value)]}} for these clients."""
+        grouped: dict[int, dict[int, list]] = {}
+        for row in self._value_rows(client_ids):
+            note_row = self.value_note[row]
+            by_client = grouped.setdefault(self.value_metric[row], {})
+            by_client.setdefault(self.note_client[note_row], []).append(
+                (self.note_effective[note_row], self.value_number[row]),
+            )
+        return grouped
+
+    def active_client_ids(self, program) -> list[int]:
+        """The user's clients in the program with a note in the period."""
+        return [
+            client_id for client_id in dict.fromkeys(self.visible[program.pk])
+            if client_id in self.notes_by_client
+        ]
+
+    def _resolver(self):
+        if not self._demographics_loaded:
+            self._load_demographics()
+        return self.demographics
+
+    # ── Report sections ────────────────────────────────────────────────
+
+    def service_statistics(self, program) -> dict[str, Any]:
+        """Clients served, new enrolments, contacts and contact outcomes."""
+        rows = self._note_rows(self.enrolled[program.pk])
+        served = {self.note_client[row] for row in rows}
+        contacts = successful = attempts = 0
+        for row in rows:
+            if self.note_interaction[row] in CONTACT_INTERACTIONS:
+                contacts += 1
+                outcome = self.note_outcome[row]
+                if outcome == "reached":
+                    successful += 1
+                elif outcome in ATTEMPT_OUTCOMES:
+                    attempts += 1
+        return {
+            "total_individuals_served": len(served),
+            "new_clients_this_period": self.new_enrolments[program.pk],
+            "total_contacts": len(rows),
+            "contact_breakdown": {
+                "total_contacts": contacts,
+                "successful_contacts": successful,
+                "contact_attempts": attempts,
+            },
+        }
+
+    def achievement_summary(self, program, use_latest: bool = True) -> dict[str, Any]:
+        """Same result as get_achievement_summary() for the program and period."""
+        grouped = self._values_by_metric(self.enrolled[program.pk])
+        return summarise_achievements(grouped, self.metric_defs, use_latest)
+
+    def demographic_groups(self, program) -> dict[str, list[int]]:
+        """Same result as get_demographic_groups() for the program's active clients."""
+        active = self.active_client_ids(program)
+        groups: dict[str, list[int]] = {_("All Participants"): list(active)}
+        resolver = self._resolver()
+        if not self.report_template:
+            groups.update(resolver.age_groups(active))
+            return groups
+
+        for bd in self.breakdowns:
+            if bd.source_type == "age":
+                groups.update(resolver.age_groups(active, custom_bins=bd.bins_json or None))
+            elif bd.source_type == "custom_field" and bd.custom_field:
+                groups.update(self._field_groups(bd, active))
+        return groups
+
+    def _field_groups(self, breakdown, client_ids):
+        return self._resolver().field_groups(
+            breakdown.custom_field, client_ids,
+            merge_categories=breakdown.merge_categories_json or None,
+        )
+
+    def template_metrics(self, program, report_metrics, demographic_groups) -> list[dict[str, Any]]:
+        """Same result as compute_template_metrics() for the program and period."""
+        metric_data = self._values_by_metric(self.visible[program.pk])
+        return aggregate_template_metrics(report_metrics, metric_data, demographic_groups)
+
+    def funder_report_data(self, program, fiscal_year_label: str | None = None,
+                           taxonomy_lens: str = "") -> dict[str, Any]:
+        """The generate_funder_report_data() structure for one program."""
+        from .cids_enrichment import get_standards_alignment_data
+        from .funder_report import count_birth_dates_by_age_bucket, format_fiscal_year_label
+
+        date_from, date_to = self.date_from, self.date_to
+        if not fiscal_year_label:
+            # Infer from date_from (assumes April start)
+            if date_from.month == 4 and date_from.day == 1:
+                fiscal_year_label = format_fiscal_year_label(date_from.year)
+            else:
+                # Custom date range - show actual dates
+                fiscal_year_label = f"{date_from} to {date_to}"
+
+        if self._organisation_name is None:
+            self._organisation_name = (
+                InstanceSetting.get("organisation_name", "")
+                or InstanceSetting.get("agency_name", "Organisation Name")
+            )
+
+        stats = self.service_statistics(program)
+        active = self.active_client_ids(program)
+
+        age_demographics = count_birth_dates_by_age_bucket(
+            self._resolver().birth_dates(active), date_to,
+        )
+        custom_demographic_sections = []
+        for bd in self.breakdowns:
+            if bd.source_type == "age":
+                # Override default age demographics with funder-specific bins
+                custom_bins = bd.bins_json or None
+                if custom_bins:
+                    age_groups = self._resolver().age_groups(active, custom_bins=custom_bins)
+                    age_demographics = {label: len(ids) for label, ids in age_groups.items()}
+                    # Ensure all bin labels present even if count is 0
+                    for b in custom_bins:
+                        if b["label"] not in age_demographics:
+                            age_demographics[b["label"]] = 0
+            elif bd.source_type == "custom_field" and bd.custom_field:
+                cf_counts = {
+                    label: len(ids) for label, ids in self._field_groups(bd, active).items()
+                }
+                custom_demographic_sections.append({
+                    "label": bd.label,
+                    "data": cf_counts,
+                    "total": sum(cf_counts.values()),
+                })
+
+        achievement_summary = self.achievement_summary(program)
+
+        # Apply display_label overrides from template metrics
+        label_overrides = {
+            rm.metric_definition_id: rm.translated_label
+            for rm in self.template_metrics_list
+            if rm.display_label
+        }
+        if label_overrides:
+            for metric_data in achievement_summary.get("by_metric", []):
+                override = label_overrides.get(metric_data["metric_id"])
+                if override:
+                    metric_data["metric_name"] = override
+
+        # Build primary outcome (first metric with a target, if any)
+        primary_outcome = None
+        secondary_outcomes = []
+        for metric_data in achievement_summary.get("by_metric", []):
+            if metric_data["has_target"]:
+                outcome_data = {
+                    "name": metric_data["metric_name"],
+                    "target_value": metric_data["target_value"],
+                    "clients_measured": metric_data["total_clients"],
+                    "clients_achieved": metric_data["clients_met_target"],
+                    "achievement_rate": metric_data["achievement_rate"],
+                }
+                if primary_outcome is None:
+                    primary_outcome = outcome_data
+                else:
+                    secondary_outcomes.append(outcome_data)
+
+        return {
+            # Report metadata
+            "generated_at": timezone.now(),
+            "reporting_period": fiscal_year_label,
+            "date_from": date_from,
+            "date_to": date_to,
+
+            # Organisation information
+            "organisation_name": self._organisation_name,
+            "program_name": program.translated_name,
+            "program_description": program.description or "",
+
+            # Service statistics
+            **stats,
+
+            # Demographics
+            "age_demographics": age_demographics,
+            "age_demographics_total": sum(age_demographics.values()),
+            "custom_demographic_sections": custom_demographic_sections,
+            "report_template_name": self.report_template.name if self.report_template else None,
+
+            # Outcomes
+            "primary_outcome": primary_outcome,
+            "secondary_outcomes": secondary_outcomes,
+            "achievement_summary": achievement_summary,
+
+            # CIDS standards alignment
+            "cids_alignment": get_standards_alignment_data(program, taxonomy_lens=taxonomy_lens),
+
+            # Raw data for detailed views
+            "active_client_count": len(active),
+            "enrolled_client_count": len(self.visible[program.pk]),
+        }
@@ -31,7 +31,7 @@ def _effective_date_filter(date_from, date_to):
     """Build a Q filter for notes within the given date range.
 
     Uses backdate if set, otherwise created_at — matching the pattern
-    in export_engine._get_active_client_ids().
+    in report_engine.ReportDataset.
     """
     date_from_dt = timezone.make_aware(datetime.combine(date_from, time.min))
     date_to_dt = timezone.make_aware(datetime.combine(date_to, time.max))
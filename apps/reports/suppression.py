@@ -9,6 +9,7 @@ Secondary (complementary) suppression is applied automatically: when
 one cell in a row is suppressed, at least one additional cell is also
 suppressed to prevent derivation by subtraction from the row total.
 """
+from .crosstab import NUMPY_AVAILABLE, secondary_suppression_mask
 
 SMALL_CELL_THRESHOLD = 5
 
@@ -134,3 +135,39 @@ def apply_secondary_suppression(row_values, threshold=SMALL_CELL_THRESHOLD):
             result.append((label, val))
 
     return result
+
+
+def apply_secondary_suppression_rows(rows, threshold=SMALL_CELL_THRESHOLD):
+    """Apply apply_secondary_suppression() to many rows with the same labels.
+
+    Used for metric tables, where every row has one cell per demographic
+    group. When NumPy is installed and every cell is a raw int count, the
+    whole table is suppressed in one pass (crosstab.secondary_suppression_mask);
+    otherwise each row goes through apply_secondary_suppression().
+
+    Args:
+        rows: List of rows, each a list of (label, count_or_value) tuples
+            as accepted by apply_secondary_suppression().
+        threshold: The suppression threshold to use.
+
+    Returns:
+        List of rows with suppression applied.
+    """
+    widths = {len(row) for row in rows}
+    all_counts = all(
+        type(val) is int for row in rows for _label, val in row
+    )
+    if not (NUMPY_AVAILABLE and rows and len(widths) == 1 and all_counts):
+        return [apply_secondary_suppression(row, threshold) for row in rows]
+
+    mask = secondary_suppression_mask(
+        [[val for _label, val in row] for row in rows], threshold,
+    )
+    suppressed_label = f"< {threshold}"
+    return [
+        [
+            (label, suppressed_label if suppressed else val)
+            for (label, val), suppressed in zip(row, row_mask.tolist())
+        ]
+        for row, row_mask in zip(rows, mask)
+    ]
@@ -1,14 +1,38 @@
 """Utility functions for the reports app — fiscal year calculations and permissions."""
 import calendar
-from datetime import date
+from datetime import date, datetime, time, timedelta
 from typing import List, Tuple
 
+from django.utils import timezone
 from django.utils.formats import date_format
 from django.utils.translation import gettext_lazy as _
 
 from apps.auth_app.constants import MANAGEMENT_ROLES, ROLE_PROGRAM_MANAGER
 
 
+def effective_date_filter(field, date_from=None, date_to=None):
+    """Filter kwargs selecting rows whose datetime ``field`` falls in a date range.
+
+    Equivalent to ``field__date__gte=date_from, field__date__lte=date_to``
+    (both inclusive, in the current time zone), but compares the datetime
+    itself against local-midnight bounds. A ``__date`` lookup wraps the
+    column in a time zone conversion and cast, which stops PostgreSQL from
+    using the COALESCE(backdate, created_at) expression indexes on
+    progress_notes.
+
+    Usage:
+        qs.filter(**effective_date_filter("_effective_date", date_from, date_to))
+    """
+    bounds = {}
+    if date_from:
+        bounds[f"{field}__gte"] = timezone.make_aware(datetime.combine(date_from, time.min))
+    if date_to:
+        bounds[f"{field}__lt"] = timezone.make_aware(
+            datetime.combine(date_to + timedelta(days=1), time.min)
+        )
+    return bounds
+
+
 def is_aggregate_only_user(user):
     """Check if this user should only receive aggregate (non-individual) export data.
 
@@ -32,11 +32,12 @@ from apps.plans.models import PlanTarget, PlanTargetMetric
 from apps.programs.models import UserProgramRole
 from .achievements import get_achievement_summary, format_achievement_summary
 from .funder_report import generate_funder_report_data, generate_funder_report_csv_rows
+from .report_engine import ReportDataset
 from .cids_jsonld import build_cids_jsonld_document
 from .csv_utils import sanitise_csv_row, sanitise_filename
 from .demographics import (
-    aggregate_by_demographic, get_age_range, group_clients_by_age,
-    group_clients_by_custom_field, parse_grouping_choice,
+    DemographicResolver, aggregate_by_demographic, get_age_range,
+    parse_grouping_choice,
 )
 from .models import DemographicBreakdown, ReportTemplate, SecureExportLink
 from .suppression import suppress_small_cell
@@ -172,7 +173,9 @@ def _save_export_and_create_link(request, content, filename, export_type,
 
     Args:
         request: The HTTP request (for user info).
-        content: File content — str for CSV, bytes for PDF.
+        content: File content — str for CSV, bytes for PDF — or a callable
+            that writes the file itself, given its path (used to render PDFs
+            straight to disk).
         filename: Display filename for downloads (e.g., "export_2026-02-05.csv").
         export_type: One of "metrics", "standard_report".
         client_count: Number of clients in the export.
@@ -196,10 +199,13 @@ def _save_export_and_create_link(request, content, filename, export_type,
     file_path = os.path.join(export_dir, safe_filename)
 
     # Write content to file
-    mode = "wb" if isinstance(content, bytes) else "w"
-    encoding = None if isinstance(content, bytes) else "utf-8"
-    with open(file_path, mode, encoding=encoding) as f:
-        f.write(content)
+    if callable(content):
+        content(file_path)
+    else:
+        mode = "wb" if isinstance(content, bytes) else "w"
+        encoding = None if isinstance(content, bytes) else "utf-8"
+        with open(file_path, mode, encoding=encoding) as f:
+            f.write(content)
 
     expiry_hours = getattr(settings, "SECURE_EXPORT_LINK_EXPIRY_HOURS", 24)
     # PM individual exports are ALWAYS elevated (delay + admin notification)
@@ -610,7 +616,9 @@ def export_form(request):
                 "max": stats.get("max", "N/A"),
             })
 
-        # Build demographic breakdown if grouping is enabled
+        # Build demographic breakdown if grouping is enabled. One resolver
+        # serves every section, so each client's values are decrypted once.
+        demographic_resolver = DemographicResolver(date_to)
         demographic_aggregate_rows = []
         if grouping_type != "none":
             for mv_metric_def in selected_metrics:
@@ -620,6 +628,7 @@ def export_form(request):
                     continue
                 demo_agg = aggregate_by_demographic(
                     metric_specific_mvs, grouping_type, grouping_field, date_to,
+                    resolver=demographic_resolver,
                 )
                 for group_label, stats in demo_agg.items():
                     client_count = len(stats.get("client_ids", set()))
@@ -651,6 +660,7 @@ def export_form(request):
                         custom_bins = bd.bins_json or None
                         demo_agg = aggregate_by_demographic(
                             metric_specific_mvs, "age_range", None, date_to,
+                            resolver=demographic_resolver,
                         )
                         # Re-aggregate with custom bins if provided
                         if custom_bins:
@@ -660,8 +670,8 @@ def export_form(request):
                                 cid = mv.progress_note_target.progress_note.client_file_id
                                 all_ids.add(cid)
                                 client_mv_map[cid].append(mv)
-                            client_groups = group_clients_by_age(
-                                list(all_ids), date_to, custom_bins=custom_bins,
+                            client_groups = demographic_resolver.age_groups(
+                                all_ids, custom_bins=custom_bins,
                             )
                             demo_agg = {}
                             for gl, cids in client_groups.items():
@@ -677,6 +687,7 @@ def export_form(request):
                     elif bd.source_type == "custom_field" and bd.custom_field:
                         demo_agg = aggregate_by_demographic(
                             metric_specific_mvs, "custom_field", bd.custom_field, date_to,
+                            resolver=demographic_resolver,
                         )
                         # Apply merge categories if provided
                         if bd.merge_categories_json:
@@ -686,8 +697,8 @@ def export_form(request):
                                 cid = mv.progress_note_target.progress_note.client_file_id
                                 all_ids.add(cid)
                                 client_mv_map[cid].append(mv)
-                            client_groups = group_clients_by_custom_field(
-                                list(all_ids), bd.custom_field,
+                            client_groups = demographic_resolver.field_groups(
+                                bd.custom_field, all_ids,
                                 merge_categories=bd.merge_categories_json,
                             )
                             demo_agg = {}
@@ -1273,14 +1284,17 @@ def _generate_funder_preview_data(session_params, user):
     taxonomy_lens = report_template.taxonomy_system if report_template else session_params.get("taxonomy_lens", "")
 
     if all_programs_mode:
-        accessible_programs = get_manageable_programs(user)
+        accessible_programs = list(get_manageable_programs(user))
         all_report_sections = []
         total_raw_client_count = 0
+        # One pass over the period's data for every program
+        dataset = ReportDataset.load(
+            accessible_programs, date_from, date_to,
+            user=user, report_template=report_template,
+        )
         for ap in accessible_programs:
-            rd = generate_funder_report_data(
-                ap, date_from=date_from, date_to=date_to,
-                fiscal_year_label=fiscal_year_label,
-                user=user, report_template=report_template,
+            rd = dataset.funder_report_data(
+                ap, fiscal_year_label=fiscal_year_label,
                 taxonomy_lens=taxonomy_lens,
             )
             total_raw_client_count += rd.get("total_individuals_served", 0)
@@ -1930,6 +1944,16 @@ def download_export(request, link_id):
             "delay_minutes": getattr(settings, "ELEVATED_EXPORT_DELAY_MINUTES", 10),
         })
 
+    # Large audit log exports are written by a background job
+    if link.is_being_prepared:
+        return render(request, "reports/export_link_preparing.html", {
+            "link": link,
+        })
+    if link.generation_status == "failed":
+        return render(request, "reports/export_link_expired.html", {
+            "reason": "failed",
+        })
+
     # Check file exists separately (ephemeral storage may lose files)
     if not link.file_exists:
         return render(request, "reports/export_link_expired.html", {
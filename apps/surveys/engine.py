@@ -24,17 +24,10 @@ MAX_PENDING_SURVEYS = 5
 
 def is_surveys_enabled():
     """Check if the surveys feature toggle is enabled."""
-    from django.core.cache import cache
-
-    flags = cache.get("feature_toggles")
-    if flags is not None:
-        return flags.get("surveys", False)
-
-    from apps.admin_settings.models import FeatureToggle
+    from apps.admin_settings import cached
 
     try:
-        toggle = FeatureToggle.objects.filter(feature_key="surveys").first()
-        return toggle.is_enabled if toggle else False
+        return cached.feature_flags().get("surveys", False)
     except Exception:
         return False
 
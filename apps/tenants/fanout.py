@@ -0,0 +1,153 @@
+"""Run a management command across tenant schemas in parallel.
+
+Scheduled commands (send_reminders, execute_pending_erasures,
+cleanup_expired_exports, ...) work on one schema at a time. Running them
+back to back for every agency makes the nightly cron chain grow linearly
+with the number of tenants.
+
+run_across_tenants() runs one child process per tenant —
+``manage.py tenant_command <command> --schema <schema>`` — with at most
+``workers`` children alive at once. Separate processes give each tenant its
+own database connection and tenant encryption key cache, let a hung tenant
+be killed at its timeout, and keep one tenant's crash from affecting the
+others. Each tenant produces a TenantRunResult; the caller decides what a
+failure means.
+"""
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from django.conf import settings
+
+OK = "ok"
+FAILED = "failed"
+TIMED_OUT = "timeout"
+
+# Characters of child output kept per tenant (the end, where errors are)
+OUTPUT_TAIL = 4000
+
+
+@dataclass
+class TenantRunResult:
+    schema_name: str
+    status: str
+    returncode: int | None
+    seconds: float
+    output: str = ""
+
+    @property
+    def ok(self):
+        return self.status == OK
+
+    def as_dict(self):
+        data = asdict(self)
+        data["seconds"] = round(self.seconds, 2)
+        return data
+
+
+def active_tenant_schemas():
+    """Schema names of all active agencies, in a stable order."""
+    from apps.tenants.models import Agency
+
+    return list(
+        Agency.objects.filter(is_active=True)
+        .order_by("schema_name")
+        .values_list("schema_name", flat=True)
+    )
+
+
+def tenant_command_argv(command_name, command_args, schema_name):
+    """The child process command line for one tenant."""
+    manage_py = Path(settings.BASE_DIR) / "manage.py"
+    return [
+        sys.executable, str(manage_py), "tenant_command",
+        command_name, *command_args, f"--schema={schema_name}",
+    ]
+
+
+def run_subprocess(schema_name, argv, timeout):
+    """Run argv to completion or timeout and describe the outcome.
+
+    Never raises for a failing child: non-zero exits, timeouts and failures
+    to start are all reported in the result.
+    """
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run(
+            argv,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired as exc:
+        output = exc.output or ""
+        if isinstance(output, bytes):
+            output = output.decode(errors="replace")
+        return TenantRunResult(
+            schema_name, TIMED_OUT, None, time.perf_counter() - start,
+            output[-OUTPUT_TAIL:],
+        )
+    except OSError as exc:
+        return TenantRunResult(
+            schema_name, FAILED, None, time.perf_counter() - start, str(exc),
+        )
+
+    return TenantRunResult(
+        schema_name,
+        OK if completed.returncode == 0 else FAILED,
+        completed.returncode,
+        time.perf_counter() - start,
+        completed.stdout[-OUTPUT_TAIL:],
+    )
+
+
+def run_for_tenant(schema_name, command_name, command_args, timeout):
+    """Run one management command for one tenant in a child process."""
+    argv = tenant_command_argv(command_name, command_args, schema_name)
+    return run_subprocess(schema_name, argv, timeout)
+
+
+def run_across_tenants(command_name, command_args=(), schemas=None, workers=4,
+                       timeout=900, runner=None, on_result=None):
+    """Run a management command for each tenant schema, ``workers`` at a time.
+
+    Args:
+        command_name: Management command to run, e.g. "send_reminders".
+        command_args: Extra arguments passed through to the command.
+        schemas: Schema names to run for (default: all active agencies).
+        workers: Most tenants processed at once.
+        timeout: Seconds before a tenant's run is killed and reported as timed out.
+        runner: Callable (schema_name, command_name, command_args, timeout)
+            returning a TenantRunResult (default: run_for_tenant).
+        on_result: Optional callback for each result as it completes.
+
+    Returns:
+        List of TenantRunResult in schema order.
+    """
+    if schemas is None:
+        schemas = active_tenant_schemas()
+    command_args = list(command_args)
+    runner = runner or run_for_tenant
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(runner, schema, command_name, command_args, timeout): schema
+            for schema in schemas
+        }
+        for future in as_completed(futures):
+            schema = futures[future]
+            try:
+                result = future.result()
+            except Exception as exc:
+                # A broken runner for one tenant must not stop the others
+                result = TenantRunResult(schema, FAILED, None, 0.0, repr(exc))
+            results[schema] = result
+            if on_result:
+                on_result(result)
+
+    return [results[schema] for schema in schemas]
@@ -0,0 +1,113 @@
+"""Run a management command for every active agency, several at a time.
+
+Replaces one cron line per tenant with one line per command. Each tenant
+runs in its own process (see apps/tenants/fanout.py); a tenant that fails
+or times out is reported and the rest carry on.
+
+Usage:
+    python manage.py run_across_tenants send_reminders
+    python manage.py run_across_tenants --workers 8 --timeout 600 execute_pending_erasures
+    python manage.py run_across_tenants --schema youth_services send_reminders --dry-run
+    python manage.py run_across_tenants --json cleanup_expired_exports
+
+Options for run_across_tenants go before the command name; everything after
+it is passed to the command unchanged.
+"""
+import argparse
+import json
+
+from django.core.management import get_commands
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tenants.fanout import active_tenant_schemas, run_across_tenants
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a management command for each active agency schema in parallel, "
+        "with a per-tenant timeout and a summary of results."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=4,
+            help="Most tenants to run at once (default: 4).",
+        )
+        parser.add_argument(
+            "--timeout", type=int, default=900,
+            help="Seconds before a tenant's run is stopped (default: 900).",
+        )
+        parser.add_argument(
+            "--schema", action="append", dest="schemas", default=[],
+            help="Only run for this schema. Repeat for several.",
+        )
+        parser.add_argument(
+            "--json", action="store_true", dest="as_json",
+            help="Print the results as JSON.",
+        )
+        parser.add_argument("command_name", help="Management command to run.")
+        parser.add_argument(
+            "command_args", nargs=argparse.REMAINDER,
+            help="Arguments passed through to the command.",
+        )
+
+    def handle(self, *args, **options):
+        command_name = options["command_name"]
+        if command_name not in get_commands():
+            raise CommandError(f"Unknown command: {command_name}")
+        if options["workers"] < 1:
+            raise CommandError("--workers must be at least 1.")
+
+        schemas = active_tenant_schemas()
+        if options["schemas"]:
+            unknown = sorted(set(options["schemas"]) - set(schemas))
+            if unknown:
+                raise CommandError(f"Not an active agency schema: {', '.join(unknown)}")
+            schemas = [schema for schema in schemas if schema in options["schemas"]]
+        if not schemas:
+            self.stdout.write(self.style.WARNING("No active agencies — nothing to run."))
+            return
+
+        as_json = options["as_json"]
+        if not as_json:
+            self.stdout.write(
+                f"Running {command_name} for {len(schemas)} tenant(s), "
+                f"{options['workers']} at a time..."
+            )
+
+        results = run_across_tenants(
+            command_name,
+            options["command_args"],
+            schemas=schemas,
+            workers=options["workers"],
+            timeout=options["timeout"],
+            on_result=None if as_json else self._report,
+        )
+        failed = [result for result in results if not result.ok]
+
+        if as_json:
+            self.stdout.write(json.dumps({
+                "command": command_name,
+                "tenants": len(results),
+                "failed": len(failed),
+                "results": [result.as_dict() for result in results],
+            }, indent=2))
+        else:
+            self.stdout.write(
+                f"\n{len(results) - len(failed)} succeeded, {len(failed)} failed."
+            )
+
+        if failed:
+            raise CommandError(
+                f"{command_name} failed for: "
+                + ", ".join(f"{result.schema_name} ({result.status})" for result in failed)
+            )
+
+    def _report(self, result):
+        line = f"  {result.schema_name}: {result.status} in {result.seconds:.1f}s"
+        if result.ok:
+            self.stdout.write(self.style.SUCCESS(line))
+            return
+        self.stdout.write(self.style.ERROR(line))
+        for output_line in result.output.strip().splitlines()[-10:]:
+            self.stdout.write(f"      {output_line}")
@@ -15,11 +15,41 @@ import django
 import pytest
 
 
-def pytest_configure():
+def pytest_addoption(parser):
+    """Options for the opt-in performance benchmarks in tests/benchmarks/."""
+    group = parser.getgroup("benchmark", "KoNote performance benchmarks")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run the performance benchmarks (skipped otherwise). Use with -n 0.",
+    )
+    group.addoption(
+        "--benchmark-scale",
+        default="small",
+        help="Synthetic agency size: small or agency (default: small).",
+    )
+    group.addoption(
+        "--benchmark-update-baseline",
+        action="store_true",
+        default=False,
+        help="Write the measured results to tests/benchmarks/baseline.json.",
+    )
+
+
+def pytest_configure(config):
     """Set up Django settings before any test collection."""
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "konote.settings.test")
     django.setup()
 
+    # Benchmark tests are unittest classes and cannot take fixtures in
+    # setUpTestData, so the options travel as environment variables.
+    if config.getoption("--benchmark"):
+        os.environ["KONOTE_BENCHMARK"] = "1"
+        os.environ["KONOTE_BENCHMARK_SCALE"] = config.getoption("--benchmark-scale")
+        if config.getoption("--benchmark-update-baseline"):
+            os.environ["KONOTE_BENCHMARK_UPDATE"] = "1"
+
 
 @pytest.fixture(scope="session")
 def django_db_setup(django_db_blocker):
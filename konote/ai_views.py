@@ -14,7 +14,7 @@ from django.views.decorators.http import require_POST
 from django_ratelimit.decorators import ratelimit
 
 from apps.admin_settings.models import FeatureToggle
-from apps.reports.pii_scrub import scrub_pii
+from apps.reports.pii_scrub import PiiScrubber, scrub_pii
 from konote import ai
 from konote.forms import (
     GenerateNarrativeForm,
@@ -387,7 +387,9 @@ def outcome_insights_view(request):
 
     from apps.programs.models import Program, UserProgramRole
     from apps.reports.insights import get_structured_insights, collect_quotes
-
+    from apps.reports.insights_cache import (
+        cached_block, cached_quotes, get_insight_summary, remember_insight_summary,
+    )
     from apps.reports.models import InsightSummary
 
     program_id = request.POST.get("program_id")
@@ -423,23 +425,28 @@ def outcome_insights_view(request):
         # Check cache first (unless regenerating)
         cache_key = f"insights:{program_id}:{dt_from}:{dt_to}"
         if not regenerate:
-            try:
-                cached = InsightSummary.objects.get(cache_key=cache_key)
+            cached = get_insight_summary(cache_key)
+            if cached is not None:
+                summary_json, generated_at = cached
                 return render(request, "reports/_insights_ai.html", {
-                    "summary": cached.summary_json,
+                    "summary": summary_json,
                     "program_id": program_id,
                     "date_from": date_from_str,
                     "date_to": date_to_str,
-                    "generated_at": cached.generated_at,
+                    "generated_at": generated_at,
                 })
-            except InsightSummary.DoesNotExist:
-                pass
 
         # Collect data
-        structured = get_structured_insights(program=program, date_from=dt_from, date_to=dt_to)
-        quotes = collect_quotes(
-            program=program, date_from=dt_from, date_to=dt_to,
-            max_quotes=30, include_dates=False,
+        structured = cached_block(
+            "structured", "program", program.pk, (dt_from, dt_to),
+            lambda: get_structured_insights(program=program, date_from=dt_from, date_to=dt_to),
+        )
+        quotes = cached_quotes(
+            "program", program.pk, (dt_from, dt_to, 30),
+            lambda: collect_quotes(
+                program=program, date_from=dt_from, date_to=dt_to,
+                max_quotes=30, include_dates=False,
+            ),
         )
 
         if not quotes and structured["note_count"] < 20:
@@ -450,16 +457,18 @@ def outcome_insights_view(request):
         # PII-scrub quotes before sending to AI
         known_names = get_program_known_names(program)
 
+        scrubber = PiiScrubber(known_names)
+        scrubbed_texts = scrubber.scrub_many(q["text"] for q in quotes)
+
         scrubbed_quotes = []
         # Build ephemeral quote_source_map: scrubbed_text → note_id.
         # This map is NEVER persisted and NEVER sent to the AI.
         # It exists only to reconnect AI-identified themes back to source notes.
         quote_source_map = {}
-        for q in quotes:
+        for q, scrubbed_text in zip(quotes, scrubbed_texts):
             # Data minimization: only send scrubbed text and target name to AI.
             # note_id is deliberately excluded — internal IDs should not reach
             # external services (prevents correlation if AI provider is breached).
-            scrubbed_text = scrub_pii(q["text"], known_names)
             scrubbed_quotes.append({
                 "text": scrubbed_text,
                 "target_name": q.get("target_name", ""),
@@ -487,13 +496,14 @@ def outcome_insights_view(request):
             })
 
         # Cache the validated result
-        InsightSummary.objects.update_or_create(
+        summary, _created = InsightSummary.objects.update_or_create(
             cache_key=cache_key,
             defaults={
                 "summary_json": result,
                 "generated_by": request.user,
             },
         )
+        remember_insight_summary(summary)
 
         # Persist AI-identified suggestion themes as database records.
         if result.get("suggestion_themes"):
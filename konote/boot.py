@@ -0,0 +1,508 @@
+"""Container start-up phases, run in one process by ``manage.py boot``.
+
+entrypoint.sh used to run each start-up step as its own ``python manage.py``
+invocation, paying the interpreter start and Django/app import cost about
+ten times per container start. The boot command runs the same steps in one
+process:
+
+- Steps whose inputs have not changed since their last successful run are
+  skipped. Each step can declare a *fingerprint* — a hash of its inputs
+  (migration files on disk and applied in each schema, seed data and the
+  rows it created, translation catalogs). Fingerprints are saved in
+  InstanceSetting after each successful run, in the database the step
+  acted on, so a restored backup re-runs everything it needs.
+- The final read-only checks (translations, security, encryption) run
+  concurrently.
+- Every step reports its outcome and duration in a summary table. Output
+  is printed for failures, for warnings (including any "[WARN]" line from
+  a command that exited 0), and always for the migration, security and
+  encryption steps.
+
+Failure handling mirrors the old script: some steps stop the boot, some only
+in production (KONOTE_MODE), and the rest log a warning and continue.
+"""
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import DatabaseError, connections
+
+OK = "ok"
+SKIPPED = "skipped"
+DISABLED = "disabled"
+WARNING = "warning"
+FAILED = "failed"
+
+# InstanceSetting key holding the fingerprint of each step's last good run
+STATE_KEY = "boot_state"
+
+# Output marker for a warning from a command that otherwise succeeded
+WARN_MARKER = "[WARN]"
+
+# Failure policies
+FATAL = "fatal"
+FATAL_IN_PRODUCTION = "fatal_in_production"
+WARN = "warn"
+
+
+class PhaseError(Exception):
+    """A boot step did not complete."""
+
+
+@dataclass
+class Phase:
+    name: str
+    run: Callable
+    on_failure: str = FATAL
+    # Returns a string describing the step's inputs; None means always run
+    fingerprint: Callable | None = None
+    # Returns a reason string when the step should not run at all
+    disabled: Callable | None = None
+    # Steps sharing a group run concurrently, after all earlier steps
+    group: str | None = None
+    # Print the step's output even when it succeeds (security and
+    # migration output the old entrypoint always showed)
+    always_show_output: bool = False
+
+
+@dataclass
+class PhaseResult:
+    name: str
+    status: str
+    seconds: float = 0.0
+    output: str = ""
+    detail: str = ""
+    show_output: bool = False
+
+
+@dataclass
+class BootReport:
+    results: list = field(default_factory=list)
+    stopped_by: str | None = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return self.stopped_by is None
+
+
+def konote_mode():
+    return os.environ.get("KONOTE_MODE", "production").lower()
+
+
+def run_command(name, stdout, *args, **options):
+    """call_command(), treating SystemExit like a command-line exit status."""
+    try:
+        call_command(name, *args, stdout=stdout, stderr=stdout, **options)
+    except SystemExit as exc:
+        if exc.code not in (0, None):
+            raise PhaseError(f"{name} exited with status {exc.code}") from None
+
+
+# ── Saved fingerprints ─────────────────────────────────────────────────
+
+def load_state():
+    from apps.admin_settings.models import InstanceSetting
+
+    try:
+        raw = InstanceSetting.objects.filter(setting_key=STATE_KEY).values_list(
+            "setting_value", flat=True,
+        ).first()
+    except DatabaseError:
+        # Fresh database: the settings table does not exist yet
+        return {}
+    try:
+        return json.loads(raw) if raw else {}
+    except ValueError:
+        return {}
+
+
+def save_state(state):
+    from apps.admin_settings.models import InstanceSetting
+
+    try:
+        InstanceSetting.objects.update_or_create(
+            setting_key=STATE_KEY, defaults={"setting_value": json.dumps(state)},
+        )
+    except DatabaseError:
+        pass
+
+
+# ── Fingerprints ───────────────────────────────────────────────────────
+
+def _digest(*parts):
+    return hashlib.sha256(
+        json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def migrations_on_disk():
+    """Every migration Django would apply, as sorted "app.name" strings."""
+    from django.db.migrations.loader import MigrationLoader
+
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    return sorted(f"{app}.{name}" for app, name in loader.disk_migrations)
+
+
+def applied_migration_count(alias):
+    from django.db.migrations.recorder import MigrationRecorder
+
+    try:
+        return MigrationRecorder(connections[alias]).migration_qs.count()
+    except DatabaseError:
+        return None
+
+
+def migration_fingerprint(alias="default", extra=()):
+    """Migration files on disk plus what the database has recorded.
+
+    Including the applied count catches a database restored from an older
+    backup, or migrations rolled back by hand.
+    """
+    return _digest(migrations_on_disk(), applied_migration_count(alias), list(extra))
+
+
+def tenant_schemas():
+    from apps.tenants.models import Agency
+
+    try:
+        return sorted(Agency.objects.values_list("schema_name", flat=True))
+    except DatabaseError:
+        return []
+
+
+def tenant_migration_state(alias="default"):
+    """(schema, applied migration count) for every tenant schema.
+
+    Each schema has its own django_migrations table, so a tenant restored
+    from an older backup or left behind by a failed run changes this even
+    when the public schema is up to date.
+    """
+    connection = connections[alias]
+    quote = connection.ops.quote_name
+    state = []
+    for schema in tenant_schemas():
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT COUNT(*) FROM {quote(schema)}.{quote('django_migrations')}")
+                state.append((schema, cursor.fetchone()[0]))
+        except DatabaseError:
+            state.append((schema, None))
+    return state
+
+
+def files_fingerprint(*paths, pattern="*"):
+    """Name, size and mtime of every file under the given paths."""
+    entries = []
+    for base in paths:
+        base = Path(base)
+        files = [base] if base.is_file() else sorted(base.rglob(pattern)) if base.exists() else []
+        for path in files:
+            if path.is_file():
+                stat = path.stat()
+                entries.append((str(path), stat.st_size, stat.st_mtime_ns))
+    return _digest(entries)
+
+
+def seeded_rows():
+    """Cheap counts of what the seed creates, as found in the database.
+
+    A restored backup or a table emptied by hand changes these, so the seed
+    runs again even though its files and settings have not changed.
+    """
+    from apps.admin_settings.models import FeatureToggle
+    from apps.auth_app.models import User
+    from apps.clients.models import ClientFile
+    from apps.events.models import EventType
+    from apps.notes.models import ProgressNoteTemplate
+    from apps.plans.models import MetricDefinition
+
+    try:
+        counts = [
+            MetricDefinition.objects.filter(is_library=True).count(),
+            FeatureToggle.objects.count(),
+            EventType.objects.exists(),
+            ProgressNoteTemplate.objects.exists(),
+        ]
+        if getattr(settings, "DEMO_MODE", False):
+            counts += [
+                User.objects.filter(is_demo=True).exists(),
+                ClientFile.objects.filter(is_demo=True).exists(),
+            ]
+    except DatabaseError:
+        return None
+    return counts
+
+
+def seed_fingerprint():
+    base = Path(settings.BASE_DIR)
+    return _digest(
+        files_fingerprint(base / "seeds"),
+        files_fingerprint(base / "apps" / "admin_settings" / "management" / "commands", pattern="seed*.py"),
+        files_fingerprint(base / "apps" / "admin_settings" / "demo_engine.py"),
+        bool(getattr(settings, "DEMO_MODE", False)),
+        # Environment the seed command reads directly
+        os.environ.get("DEMO_DATA_PROFILE", ""),
+        os.environ.get("DEMO_EMAIL_BASE", ""),
+        seeded_rows(),
+    )
+
+
+def translations_fingerprint():
+    base = Path(settings.BASE_DIR)
+    return _digest(
+        files_fingerprint(base / "locale", pattern="django.*"),
+        files_fingerprint(base / "templates", pattern="*.html"),
+    )
+
+
+# ── Runner ─────────────────────────────────────────────────────────────
+
+def _is_fatal(phase):
+    if phase.on_failure == FATAL:
+        return True
+    return phase.on_failure == FATAL_IN_PRODUCTION and konote_mode() == "production"
+
+
+def _run_phase(phase, state, force):
+    """Run one phase; never raises."""
+    start = time.perf_counter()
+    if phase.disabled:
+        reason = phase.disabled()
+        if reason:
+            return PhaseResult(phase.name, DISABLED, detail=reason), None
+
+    fingerprint = None
+    if phase.fingerprint:
+        try:
+            fingerprint = phase.fingerprint()
+        except Exception as exc:
+            fingerprint = None
+            detail = f"could not fingerprint inputs ({exc}); running"
+        else:
+            detail = ""
+        if not force and fingerprint and state.get(phase.name) == fingerprint:
+            return PhaseResult(
+                phase.name, SKIPPED, time.perf_counter() - start, detail="inputs unchanged",
+            ), None
+    else:
+        detail = ""
+
+    out = io.StringIO()
+    try:
+        phase.run(out)
+    except Exception as exc:
+        status = FAILED if _is_fatal(phase) else WARNING
+        return PhaseResult(
+            phase.name, status, time.perf_counter() - start, out.getvalue(), str(exc),
+            show_output=phase.always_show_output,
+        ), None
+    output = out.getvalue()
+    status = OK
+    if WARN_MARKER in output:
+        # Commands like startup_check report warnings and still exit 0
+        status = WARNING
+        detail = detail or "reported warnings"
+    return PhaseResult(
+        phase.name, status, time.perf_counter() - start, output, detail,
+        show_output=phase.always_show_output,
+    ), fingerprint
+
+
+def _run_concurrently(phases, state, force):
+    def run(phase):
+        try:
+            return _run_phase(phase, state, force)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=len(phases)) as pool:
+        return list(pool.map(run, phases))
+
+
+def run_boot(phases, force=False, skip=(), on_result=None):
+    """Run phases in order, groups concurrently; stop at the first fatal failure.
+
+    Args:
+        phases: Phase list, in run order.
+        force: Run every phase even if its inputs are unchanged.
+        skip: Phase names not to run.
+        on_result: Optional callback for each PhaseResult as it completes.
+    """
+    start = time.perf_counter()
+    report = BootReport()
+    state = load_state()
+
+    index = 0
+    while index < len(phases):
+        batch = [phases[index]]
+        if phases[index].group:
+            while index + len(batch) < len(phases) and phases[index + len(batch)].group == phases[index].group:
+                batch.append(phases[index + len(batch)])
+        index += len(batch)
+
+        runnable = []
+        for phase in batch:
+            if phase.name in skip:
+                result = PhaseResult(phase.name, DISABLED, detail="skipped by --skip")
+                report.results.append(result)
+                if on_result:
+                    on_result(result)
+            else:
+                runnable.append(phase)
+        if not runnable:
+            continue
+
+        if len(runnable) > 1:
+            outcomes = _run_concurrently(runnable, state, force)
+        else:
+            outcomes = [_run_phase(runnable[0], state, force)]
+
+        for result, fingerprint in outcomes:
+            report.results.append(result)
+            if on_result:
+                on_result(result)
+            # Completed steps (including ones that only reported warnings)
+            # return a fingerprint; failed ones return None
+            if fingerprint:
+                # Re-read: earlier phases may have just created the table
+                state = load_state()
+                state[result.name] = fingerprint
+                save_state(state)
+            if result.status == FAILED and report.stopped_by is None:
+                report.stopped_by = result.name
+        if report.stopped_by:
+            break
+
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+# ── KoNote's phases ────────────────────────────────────────────────────
+
+def _skip_seed_reason():
+    value = os.environ.get("KONOTE_SKIP_SEED", "").strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return "KONOTE_SKIP_SEED is enabled"
+    return None
+
+
+def verify_encrypted_fields(stdout, full=False):
+    """Check that stored client and respondent names decrypt with the current key.
+
+    Samples rows added since the last verified boot; see
+    apps/audit/encryption_check.py.
+    """
+    from apps.audit import encryption_check
+
+    outcomes = encryption_check.verify(
+        full=full,
+        sample_size=getattr(settings, "ENCRYPTION_CHECK_SAMPLE_SIZE", 200),
+        workers=getattr(settings, "ENCRYPTION_CHECK_WORKERS", 1),
+    )
+    bad_total = 0
+    for outcome in outcomes:
+        if outcome.failed:
+            stdout.write(
+                f"FAIL: {len(outcome.failed)}/{outcome.checked} {outcome.description} "
+                "cannot be decrypted.\n"
+            )
+        elif not outcome.total:
+            stdout.write(f"OK: No encrypted {outcome.description} to verify.\n")
+        elif outcome.mode == "full":
+            stdout.write(f"OK: {outcome.checked} encrypted {outcome.description} verified.\n")
+        else:
+            stdout.write(
+                f"OK: {outcome.checked} of {outcome.total} encrypted "
+                f"{outcome.description} verified (sample).\n"
+            )
+        bad_total += len(outcome.failed)
+
+    if bad_total:
+        raise PhaseError(
+            f"{bad_total} encrypted record(s) failed decryption. "
+            "The FIELD_ENCRYPTION_KEY may not match the key used during migration."
+        )
+
+
+def default_phases(full_encryption_check=False):
+    """The start-up steps entrypoint.sh used to run, in the same order.
+
+    full_encryption_check decrypts every stored name instead of a sample.
+    """
+    return [
+        # Public schema, including tenant-app migrations (see migrate_default)
+        Phase(
+            "migrate_default",
+            lambda out: run_command("migrate_default", out, interactive=False),
+            fingerprint=lambda: migration_fingerprint("default"),
+            always_show_output=True,
+        ),
+        # Per-tenant schemas for existing agencies
+        Phase(
+            "migrate_tenants",
+            lambda out: run_command("migrate", out, interactive=False),
+            fingerprint=lambda: migration_fingerprint("default", tenant_migration_state()),
+            always_show_output=True,
+        ),
+        # Register the domain for single-tenant deployments (idempotent, cheap)
+        Phase(
+            "setup_public_tenant",
+            lambda out: run_command("setup_public_tenant", out),
+            on_failure=FATAL_IN_PRODUCTION,
+        ),
+        Phase(
+            "migrate_audit",
+            lambda out: run_command("migrate_audit", out, interactive=False),
+            fingerprint=lambda: migration_fingerprint("audit"),
+            always_show_output=True,
+        ),
+        Phase(
+            "lockdown_audit_db",
+            lambda out: run_command("lockdown_audit_db", out),
+            on_failure=WARN,
+        ),
+        Phase(
+            "seed",
+            lambda out: run_command("seed", out),
+            on_failure=WARN,
+            fingerprint=seed_fingerprint,
+            disabled=_skip_seed_reason,
+        ),
+        # TODO: Remove together with the unique constraint from
+        # migration 0016_unique_theme_per_program once verified.
+        Phase(
+            "merge_duplicate_themes",
+            lambda out: run_command("merge_duplicate_themes", out),
+            on_failure=WARN,
+        ),
+        # Read-only checks, run concurrently
+        Phase(
+            "check_translations",
+            lambda out: run_command("check_translations", out),
+            on_failure=WARN,
+            fingerprint=translations_fingerprint,
+            group="checks",
+        ),
+        Phase(
+            "startup_check",
+            lambda out: run_command("startup_check", out),
+            group="checks",
+            always_show_output=True,
+        ),
+        Phase(
+            "verify_encryption",
+            lambda out: verify_encrypted_fields(out, full=full_encryption_check),
+            on_failure=FATAL_IN_PRODUCTION,
+            group="checks",
+            always_show_output=True,
+        ),
+    ]
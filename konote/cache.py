@@ -0,0 +1,87 @@
+"""Tenant-aware cache keys and versioned invalidation.
+
+Every agency has its own schema, but Django's cache is shared by all of
+them. make_key() (the CACHES KEY_FUNCTION) puts the current schema into
+every key, so "feature_toggles" for one agency can never be served to
+another, and code calling cache.get()/set() needs no prefix of its own.
+
+Settings-type data that every page reads (feature toggles, instance
+settings, terminology, organization profile) is cached per *group* under a
+version token. Saving or deleting one of the source rows replaces the
+group's token (see apps/admin_settings/signals.py); old entries are never
+read again and simply expire. Because the cache backend is shared between
+worker processes (see CACHES in settings), a change is visible to every
+worker on the same host on its next request. Other hosts have their own
+cache and pick the change up when their entries expire, which is why
+SETTINGS_CACHE_TIMEOUT defaults to a few minutes.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+DEFAULT_TIMEOUT = 300
+
+
+def current_schema():
+    """Schema of the current tenant ("public" outside a tenant request)."""
+    return getattr(connection, "schema_name", None) or "public"
+
+
+def make_key(key, key_prefix, version):
+    """CACHES KEY_FUNCTION: prefix every key with the tenant schema."""
+    return f"{key_prefix}:{version}:{current_schema()}:{key}"
+
+
+def _timeout():
+    return getattr(settings, "SETTINGS_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+
+
+def _version_key(group):
+    return f"version:{group}"
+
+
+def get_version(group):
+    """Return the current version token for a cache group."""
+    key = _version_key(group)
+    version = cache.get(key)
+    if version is None:
+        # A random token (not a counter) so an evicted version key can never
+        # collide with entries cached under an earlier version.
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key) or version
+    return version
+
+
+def _replace_versions(groups):
+    cache.set_many({_version_key(group): uuid.uuid4().hex for group in groups}, None)
+
+
+def bump_version(*groups):
+    """Invalidate everything cached for the given groups (current tenant).
+
+    Bumped immediately and again when the surrounding transaction commits:
+    a request in another worker could otherwise re-cache the old rows
+    between the save and the commit.
+    """
+    _replace_versions(groups)
+    transaction.on_commit(lambda: _replace_versions(groups))
+
+
+def get_or_set_versioned(group, key, loader, timeout=None):
+    """Return loader() from the cache, computing and storing it on a miss.
+
+    Args:
+        group: Version group that invalidates the entry, e.g. "feature_toggles".
+        key: Key within the group, e.g. a language code ("" if none).
+        loader: Zero-argument callable producing a picklable, non-None value.
+        timeout: Seconds to keep the entry (default SETTINGS_CACHE_TIMEOUT).
+    """
+    versioned_key = f"{group}:{get_version(group)}:{key}"
+    value = cache.get(versioned_key)
+    if value is None:
+        value = loader()
+        cache.set(versioned_key, value, _timeout() if timeout is None else timeout)
+    return value
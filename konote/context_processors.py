@@ -63,7 +63,7 @@ def terminology(request):
     in that language. Falls back to English if French translation
     is not available or if any error occurs.
     """
-    from apps.admin_settings.models import TerminologyOverride
+    from apps.admin_settings import cached
 
     try:
         # Get current language (returns 'en', 'fr', etc.)
@@ -73,13 +73,7 @@ def terminology(request):
         # If translation system fails, default to English
         lang_prefix = "en"
 
-    cache_key = f"terminology_overrides_{lang_prefix}"
-
-    terms = cache.get(cache_key)
-    if terms is None:
-        terms = TerminologyOverride.get_all_terms(lang=lang_prefix)
-        cache.set(cache_key, terms, 300)  # 5 min cache
-    return {"term": terms}
+    return {"term": cached.terminology(lang_prefix)}
 
 
 def features(request):
@@ -88,27 +82,16 @@ def features(request):
     Merges database flags with defaults so that features not yet stored
     in the database still get their default enabled/disabled state.
     """
-    from apps.admin_settings.models import FeatureToggle
-    from apps.admin_settings.views import DEFAULT_FEATURES, FEATURES_DEFAULT_ENABLED
+    from apps.admin_settings import cached
 
-    flags = cache.get("feature_toggles")
-    if flags is None:
-        db_flags = FeatureToggle.get_all_flags()
-        # Start with defaults, then override with whatever is in the database
-        flags = {key: key in FEATURES_DEFAULT_ENABLED for key in DEFAULT_FEATURES}
-        flags.update(db_flags)
-        cache.set("feature_toggles", flags, 300)
-    return {"features": flags}
+    return {"features": cached.feature_flags()}
 
 
 def instance_settings(request):
     """Inject instance settings (branding, formats) into all templates."""
-    from apps.admin_settings.models import InstanceSetting
+    from apps.admin_settings import cached
 
-    settings_dict = cache.get("instance_settings")
-    if settings_dict is None:
-        settings_dict = InstanceSetting.get_all()
-        cache.set("instance_settings", settings_dict, 300)
+    settings_dict = cached.instance_settings()
 
     # Resolve bilingual organization name based on current language
     lang = get_language() or "en"
@@ -288,17 +271,9 @@ def pending_recommendations(request):
 
 def organization_profile(request):
     """Inject organization profile (name, website) into all templates."""
-    from apps.admin_settings.models import OrganizationProfile
-
-    profile = cache.get("organization_profile_ctx")
-    if profile is None:
-        org = OrganizationProfile.get_solo()
-        profile = {
-            "operating_name": org.operating_name,
-            "website": org.website,
-        }
-        cache.set("organization_profile_ctx", profile, 300)
-    return {"org": profile}
+    from apps.admin_settings import cached
+
+    return {"org": cached.organization_profile()}
 
 
 def portal_context(request):
@@ -433,26 +408,19 @@ def active_program_context(request):
             "active_program_role_display": "",
         }
 
-    from apps.programs.context import (
-        SESSION_KEY,
-        get_switcher_options,
-        needs_program_selector,
-    )
-    from apps.programs.models import Program, UserProgramRole
+    from apps.programs.context import get_program_context
+    from apps.programs.models import Program
 
-    # Use cached result from middleware when available (CONF9c).
-    selector_needed = getattr(request, "_needs_program_selector", None)
-    if selector_needed is None:
-        selector_needed = needs_program_selector(request.user)
+    # The request's program context is memoized, so the middleware's
+    # selection check and this processor share one roles query (CONF9c).
+    context = get_program_context(request)
 
-    if not selector_needed:
+    if not context.needs_selector:
         # Check if user has exactly one program — use its service model + role
         single_program_sm = None
         single_role = ""
         single_role_display = ""
-        user_roles = UserProgramRole.objects.filter(
-            user=request.user, status="active", program__status="active",
-        ).select_related("program")[:2]
+        user_roles = context.program_roles
         if len(user_roles) == 1:
             single_program_sm = user_roles[0].program.service_model
             single_role = user_roles[0].role
@@ -467,8 +435,8 @@ def active_program_context(request):
             "active_program_role_display": single_role_display,
         }
 
-    options = get_switcher_options(request.user)
-    value = request.session.get(SESSION_KEY)
+    options = context.switcher_options
+    value = context.selection
 
     # Determine display name, service model, and role for the active selection
     active_name = ""
@@ -480,11 +448,8 @@ def active_program_context(request):
 
         active_name = _("All Standard Programs")
         # For "all standard", show the user's highest role across standard programs
-        from apps.programs.context import get_user_program_tiers
-        tiers = get_user_program_tiers(request.user)
-    
         best = None
-        for prog in tiers["standard"]:
+        for prog in context.tiers["standard"]:
             if best is None or ROLE_RANK.get(prog["role"], 0) > ROLE_RANK.get(
                 best["role"], 0
             ):
@@ -494,12 +459,10 @@ def active_program_context(request):
             active_role_display = best["role_display"]
     elif value is not None:
         try:
-            program = Program.objects.get(pk=int(value))
+            role_obj = context.role_for_program(int(value))
+            program = role_obj.program if role_obj else Program.objects.get(pk=int(value))
             active_name = program.translated_name
             active_service_model = program.service_model
-            role_obj = UserProgramRole.objects.filter(
-                user=request.user, program=program, status="active",
-            ).first()
             if role_obj:
                 active_role = role_obj.role
                 active_role_display = role_obj.get_role_display()
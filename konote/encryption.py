@@ -29,8 +29,11 @@ Usage in models:
         def name(self, value):
             self._name_encrypted = encrypt_field(value)
 """
+import contextvars
 import logging
 import threading
+import time
+from contextlib import contextmanager
 
 from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from django.conf import settings
@@ -46,6 +49,10 @@ _fernet = None
 # Thread-local cache of per-tenant Fernet instances (keyed by schema_name)
 _tenant_fernet_cache = threading.local()
 
+# Decrypt counters for the current request, set by track_decrypts() when
+# performance instrumentation is on. None (the default) costs one lookup.
+_decrypt_stats = contextvars.ContextVar("konote_decrypt_stats", default=None)
+
 
 class DecryptionError(Exception):
     """Raised when a field cannot be decrypted.
@@ -163,10 +170,48 @@ def encrypt_field(plaintext):
     return f.encrypt(plaintext.encode("utf-8"))
 
 
+class DecryptStats:
+    """Number of decrypt_field() calls and the time they took."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+@contextmanager
+def track_decrypts():
+    """Count decrypt_field() calls made inside the block.
+
+    Yields a DecryptStats that is updated as decrypts happen. Used by the
+    performance instrumentation middleware; nesting is allowed and each
+    block sees only its own calls.
+    """
+    stats = DecryptStats()
+    token = _decrypt_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _decrypt_stats.reset(token)
+
+
 def decrypt_field(ciphertext):
     """Decrypt a BinaryField value back to string."""
     if not ciphertext:
         return ""
+    stats = _decrypt_stats.get()
+    if stats is None:
+        return _decrypt(ciphertext)
+    start = time.perf_counter()
+    try:
+        return _decrypt(ciphertext)
+    finally:
+        stats.count += 1
+        stats.seconds += time.perf_counter() - start
+
+
+def _decrypt(ciphertext):
     f = _get_fernet()
     try:
         if isinstance(ciphertext, memoryview):
@@ -0,0 +1,220 @@
+"""
+Opt-in per-request performance instrumentation.
+
+When PERF_INSTRUMENTATION is on, PerformanceInstrumentationMiddleware
+(konote/middleware/instrumentation.py) records for every request:
+
+- the number of SQL statements and total database time, on every
+  connection (default and audit), via connection.execute_wrapper;
+- the slowest statements, with literal values redacted — query
+  parameters are never recorded, so no PII reaches the log;
+- the number of Fernet decrypts and the time they took
+  (konote.encryption.track_decrypts);
+- time spent rendering templates. Queries and decrypts triggered from
+  inside a template are counted in both the template and database totals.
+
+Each profile is written to the "konote.performance" logger as one JSON
+line and kept in a small in-process buffer for the admin Performance page.
+
+Views can declare a budget:
+
+    @login_required
+    @perf_budget(queries=40, decrypts=500)
+    def client_list(request):
+        ...
+
+A request over budget logs a warning. With PERF_BUDGET_ENFORCE on (the
+test settings), it raises BudgetExceeded instead, so the test that made the
+request fails. Budgets cover the whole request, middleware included.
+"""
+import functools
+import heapq
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+logger = logging.getLogger("konote.performance")
+
+SLOWEST_STATEMENTS = 5
+RECENT_PROFILES = 200
+
+BUDGET_METRICS = ("queries", "db_ms", "decrypts", "total_ms")
+
+_current_profile = ContextVar("konote_request_profile", default=None)
+_recent = deque(maxlen=RECENT_PROFILES)
+_recent_lock = threading.Lock()
+_template_timer_installed = False
+
+# Quoted strings and standalone numbers
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class BudgetExceeded(AssertionError):
+    """A view used more than its declared perf_budget (PERF_BUDGET_ENFORCE only)."""
+
+
+def redact_sql(sql):
+    """Return sql with literal values replaced by ? and whitespace collapsed."""
+    return _WHITESPACE_RE.sub(" ", _LITERAL_RE.sub("?", sql)).strip()
+
+
+def perf_budget(**limits):
+    """Declare the most a view may use per request.
+
+    Accepts queries, db_ms, decrypts and total_ms. Works above or below
+    other view decorators.
+    """
+    unknown = set(limits) - set(BUDGET_METRICS)
+    if unknown:
+        raise TypeError(f"Unknown budget metric(s): {', '.join(sorted(unknown))}")
+
+    def decorator(view_func):
+        view_func.perf_budget = dict(limits)
+        return view_func
+    return decorator
+
+
+@dataclass
+class RequestProfile:
+    method: str
+    path: str
+    view: str = ""
+    status: int = 0
+    total_ms: float = 0.0
+    queries: int = 0
+    db_ms: float = 0.0
+    decrypts: int = 0
+    decrypt_ms: float = 0.0
+    template_ms: float = 0.0
+    budget: dict = field(default_factory=dict)
+    over_budget: list = field(default_factory=list)
+    # Min-heap of (seconds, sql) holding the slowest statements
+    _slowest: list = field(default_factory=list, repr=False)
+    _template_depth: int = field(default=0, repr=False)
+
+    def record_query(self, sql, seconds):
+        self.queries += 1
+        self.db_ms += seconds * 1000
+        entry = (seconds, sql)
+        if len(self._slowest) < SLOWEST_STATEMENTS:
+            heapq.heappush(self._slowest, entry)
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    @property
+    def slowest(self):
+        """Slowest statements as [(ms, redacted sql)], slowest first."""
+        return [
+            (round(seconds * 1000, 2), redact_sql(sql))
+            for seconds, sql in sorted(self._slowest, reverse=True)
+        ]
+
+    def check_budget(self):
+        """Fill over_budget with a message per exceeded limit and return it."""
+        self.over_budget = [
+            f"{metric} {getattr(self, metric):g} > {limit:g}"
+            for metric, limit in self.budget.items()
+            if getattr(self, metric) > limit
+        ]
+        return self.over_budget
+
+    def as_dict(self):
+        return {
+            "method": self.method,
+            "path": self.path,
+            "view": self.view,
+            "status": self.status,
+            "total_ms": round(self.total_ms, 2),
+            "queries": self.queries,
+            "db_ms": round(self.db_ms, 2),
+            "decrypts": self.decrypts,
+            "decrypt_ms": round(self.decrypt_ms, 2),
+            "template_ms": round(self.template_ms, 2),
+            "slowest": self.slowest,
+            "budget": self.budget,
+            "over_budget": self.over_budget,
+        }
+
+
+class QueryRecorder:
+    """connection.execute_wrapper that times each statement into a profile."""
+
+    def __init__(self, profile):
+        self.profile = profile
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.profile.record_query(sql, time.perf_counter() - start)
+
+
+def activate(profile):
+    """Make profile the current request's profile; returns a reset token."""
+    return _current_profile.set(profile)
+
+
+def deactivate(token):
+    _current_profile.reset(token)
+
+
+def install_template_timer():
+    """Wrap django.template.base.Template.render to time top-level renders.
+
+    Installed once, by the middleware, only when instrumentation is on.
+    Renders outside an instrumented request pass straight through.
+    """
+    global _template_timer_installed
+    if _template_timer_installed:
+        return
+    from django.template.base import Template
+
+    original = Template.render
+
+    @functools.wraps(original)
+    def timed_render(self, context):
+        profile = _current_profile.get()
+        if profile is None:
+            return original(self, context)
+        # {% include %} and {% extends %} render nested templates; only the
+        # outermost render is added so time is not counted twice.
+        profile._template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            profile._template_depth -= 1
+            if not profile._template_depth:
+                profile.template_ms += (time.perf_counter() - start) * 1000
+
+    Template.render = timed_render
+    _template_timer_installed = True
+
+
+def record(profile):
+    """Log a finished profile and keep it for the admin Performance page."""
+    data = profile.as_dict()
+    if profile.over_budget:
+        logger.warning("request_profile %s", json.dumps(data))
+    else:
+        logger.info("request_profile %s", json.dumps(data))
+    with _recent_lock:
+        _recent.append(data)
+
+
+def recent_profiles():
+    """Profiles recorded by this process, newest first."""
+    with _recent_lock:
+        return list(reversed(_recent))
+
+
+def clear_recent_profiles():
+    with _recent_lock:
+        _recent.clear()
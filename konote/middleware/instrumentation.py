@@ -0,0 +1,64 @@
+"""Per-request performance instrumentation (opt-in, see konote/instrumentation.py).
+
+Disabled unless PERF_INSTRUMENTATION is on — Django then drops the
+middleware at startup and requests pay nothing for it.
+"""
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from konote import instrumentation
+from konote.encryption import track_decrypts
+
+
+class PerformanceInstrumentationMiddleware:
+    """Record queries, decrypts and render time for each request.
+
+    Placed near the top of MIDDLEWARE so the queries other middleware make
+    (session, user, program access) are counted too. Streaming responses are
+    only measured up to the point the view returns.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PERF_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrumentation.install_template_timer()
+
+    def __call__(self, request):
+        profile = instrumentation.RequestProfile(method=request.method, path=request.path)
+        request._perf_profile = profile
+        token = instrumentation.activate(profile)
+        recorder = instrumentation.QueryRecorder(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(recorder))
+                decrypts = stack.enter_context(track_decrypts())
+                response = self.get_response(request)
+        finally:
+            instrumentation.deactivate(token)
+
+        profile.total_ms = (time.perf_counter() - start) * 1000
+        profile.decrypts = decrypts.count
+        profile.decrypt_ms = decrypts.seconds * 1000
+        profile.status = response.status_code
+        profile.check_budget()
+        instrumentation.record(profile)
+
+        if profile.over_budget and getattr(settings, "PERF_BUDGET_ENFORCE", False):
+            raise instrumentation.BudgetExceeded(
+                f"{profile.view or profile.path} exceeded its performance budget: "
+                + "; ".join(profile.over_budget)
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = request._perf_profile
+        profile.view = f"{view_func.__module__}.{getattr(view_func, '__name__', type(view_func).__name__)}"
+        profile.budget = getattr(view_func, "perf_budget", {})
+        return None
@@ -6,6 +6,7 @@ from django.template.response import TemplateResponse
 
 from apps.auth_app.constants import ROLE_RANK
 from apps.auth_app.permissions import DENY, can_access
+from apps.programs.context import LazyProgramIds, ProgramContext
 
 
 # URL patterns that require program-level access checks
@@ -67,11 +68,15 @@ class ProgramAccessMiddleware:
 
         path = request.path
 
-        # CONF9: Stash active program IDs on request for views to use.
+        # CONF9: Attach the user's program context. It loads the user's
+        # roles with one query on first use, so requests that never read it
+        # (or request.active_program_ids) make no role queries at all.
         # Guard against missing session (e.g., RequestFactory in tests).
-        if hasattr(request, "session"):
-            from apps.programs.context import get_active_program_ids
-            request.active_program_ids = get_active_program_ids(request.user, request.session)
+        has_session = hasattr(request, "session")
+        context = ProgramContext(request.user, request.session if has_session else None)
+        request.program_context = context
+        if has_session:
+            request.active_program_ids = LazyProgramIds(lambda: context.active_program_ids)
         else:
             request.active_program_ids = None
 
@@ -87,33 +92,17 @@ class ProgramAccessMiddleware:
 
         # CONF9: Force program selection for mixed-tier users without a selection.
         # Placed after admin-only check so admin routes aren't affected.
-        # Stash needs_program_selector result on request for context processor (CONF9c).
-        if hasattr(request, "session"):
-            from apps.programs.context import needs_program_selection, needs_program_selector
-            request._needs_program_selector = needs_program_selector(request.user)
-            if request._needs_program_selector and needs_program_selection(request.user, request.session):
-                if not any(path.startswith(p) for p in self.SELECTION_EXEMPT_PREFIXES):
-                    return redirect("programs:select_program")
+        if has_session and not any(path.startswith(p) for p in self.SELECTION_EXEMPT_PREFIXES):
+            if context.needs_selection:
+                return redirect("programs:select_program")
 
         # Redirect users whose role has no individual client-data permissions
         # to the executive dashboard. Reads from the permissions matrix so
         # changes there take effect automatically (e.g. granting an executive
-        # client.view_name: ALLOW would stop the redirect).
-        from apps.programs.models import UserProgramRole
-
-        if self._all_client_permissions_denied(request.user):
-            for pattern, _ in CLIENT_URL_PATTERNS:
-                if pattern.match(path):
-                    return redirect("clients:executive_dashboard")
-            for pattern in NOTE_URL_PATTERNS:
-                if pattern.match(path):
-                    return redirect("clients:executive_dashboard")
-            # Block access to group views (contain individual member names)
-            if path.startswith("/groups/"):
-                return redirect("clients:executive_dashboard")
-            # Redirect from client list (home page handles executives inline)
-            if path in ("/participants/", "/participants"):
-                return redirect("clients:executive_dashboard")
+        # client.view_name: ALLOW would stop the redirect). Only checked on
+        # the paths it affects.
+        if self._is_client_data_path(path) and self._all_client_permissions_denied(request.user, context):
+            return redirect("clients:executive_dashboard")
 
         # Client-scoped routes — check program overlap (admins are NOT exempt)
         for pattern, id_param in CLIENT_URL_PATTERNS:
@@ -130,7 +119,7 @@ class ProgramAccessMiddleware:
                         request.user, client_id,
                     )
                     break
-                access = self._user_can_access_client(request.user, client_id)
+                access = self._user_can_access_client(request.user, client_id, context)
                 if access is None:
                     # Client doesn't exist — let the view's get_object_or_404 handle it
                     break
@@ -158,7 +147,7 @@ class ProgramAccessMiddleware:
                 note_id = match.group("note_id")
                 client_id = self._get_client_id_from_note(note_id)
                 if client_id:
-                    access = self._user_can_access_client(request.user, client_id)
+                    access = self._user_can_access_client(request.user, client_id, context)
                     if access is None:
                         break  # Client doesn't exist — let the view handle 404
                     if not access:
@@ -194,30 +183,35 @@ class ProgramAccessMiddleware:
         "intake.view", "intake.edit",
     )
 
-    def _all_client_permissions_denied(self, user):
+    def _is_client_data_path(self, path):
+        """Paths that show individual client data (redirected for executives)."""
+        for pattern, _ in CLIENT_URL_PATTERNS:
+            if pattern.match(path):
+                return True
+        for pattern in NOTE_URL_PATTERNS:
+            if pattern.match(path):
+                return True
+        # Group views contain individual member names; the client list
+        # redirects too (the home page handles executives inline)
+        return path.startswith("/groups/") or path in ("/participants/", "/participants")
+
+    def _all_client_permissions_denied(self, user, context=None):
         """Check if the user's highest role has DENY for all client-scoped resources.
 
         Returns True only for users with program roles where every individual
         client-data permission is DENY (e.g. executive-only users by default).
         Users with no program roles return False (handled by admin-only check).
         """
-        from apps.programs.models import UserProgramRole
-
-        roles = set(
-            UserProgramRole.objects.filter(
-                user=user, status="active",
-            ).values_list("role", flat=True)
-        )
-        if not roles:
+        highest_role = (context or ProgramContext(user)).highest_role
+        if highest_role is None:
             return False
 
-        highest_role = max(roles, key=lambda r: ROLE_RANK.get(r, 0))
         return all(
             can_access(highest_role, key) == DENY
             for key in self._CLIENT_SCOPED_KEYS
         )
 
-    def _user_can_access_client(self, user, client_id):
+    def _user_can_access_client(self, user, client_id, context=None):
         """Check if user shares at least one program with the client.
 
         Returns:
@@ -226,7 +220,6 @@ class ProgramAccessMiddleware:
             None  — client does not exist (caller should 404, not 403)
         """
         from apps.clients.models import ClientFile, ClientProgramEnrolment, ServiceEpisode
-        from apps.programs.models import UserProgramRole
 
         # Check client exists before checking program overlap.
         # Without this, a non-existent client_id produces an empty
@@ -234,9 +227,7 @@ class ProgramAccessMiddleware:
         if not ClientFile.objects.filter(pk=client_id).exists():
             return None
 
-        user_program_ids = set(
-            UserProgramRole.objects.filter(user=user, status="active").values_list("program_id", flat=True)
-        )
+        user_program_ids = {r.program_id for r in (context or ProgramContext(user)).roles}
         if not user_program_ids:
             return False
 
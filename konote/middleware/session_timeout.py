@@ -8,8 +8,6 @@ Without this middleware, ``SESSION_COOKIE_AGE`` in settings.py is the
 only timeout — and it ignores the admin setting entirely.
 """
 
-from django.core.cache import cache
-
 
 class SessionTimeoutMiddleware:
     """Set per-request session expiry from the admin-configurable timeout."""
@@ -26,18 +24,10 @@ class SessionTimeoutMiddleware:
     @staticmethod
     def _get_timeout_minutes():
         """Return timeout in minutes from InstanceSetting (cached)."""
-        cached = cache.get("instance_settings")
-        if cached and "session_timeout_minutes" in cached:
-            try:
-                return int(cached["session_timeout_minutes"])
-            except (ValueError, TypeError):
-                pass
-
-        # Cache miss — read from DB (same pattern as context_processors)
         try:
-            from apps.admin_settings.models import InstanceSetting
+            from apps.admin_settings import cached
 
-            value = InstanceSetting.get_all().get("session_timeout_minutes", "30")
+            value = cached.instance_settings().get("session_timeout_minutes", "30")
             return int(value)
         except Exception:
             return 30
@@ -1,5 +1,4 @@
 """Terminology middleware — makes term overrides available on request."""
-from django.core.cache import cache
 from django.utils.translation import get_language
 
 
@@ -31,16 +30,11 @@ class TerminologyMiddleware:
         Returns:
             The customised term in the appropriate language.
         """
-        from apps.admin_settings.models import TerminologyOverride
+        from apps.admin_settings import cached
 
         # Determine language
         if lang is None:
             lang = get_language() or "en"
         lang_prefix = "fr" if lang.startswith("fr") else "en"
-        cache_key = f"terminology_overrides_{lang_prefix}"
-
-        terms = cache.get(cache_key)
-        if terms is None:
-            terms = TerminologyOverride.get_all_terms(lang=lang_prefix)
-            cache.set(cache_key, terms, 300)
+        terms = cached.terminology(lang_prefix)
         return terms.get(key, default or key)
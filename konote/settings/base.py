@@ -101,6 +101,9 @@ MIDDLEWARE = [
     "konote.middleware.health_check.HealthCheckMiddleware",
     # SecurityMiddleware MUST be second for security headers
     "django.middleware.security.SecurityMiddleware",
+    # Opt-in query/decrypt/render profiling (PERF_INSTRUMENTATION). Early so
+    # it counts the queries made by the session, auth and program middleware.
+    "konote.middleware.instrumentation.PerformanceInstrumentationMiddleware",
     # EmbedFramingMiddleware MUST be early (before Session/CSRF) so its
     # response handler runs AFTER those middlewares set their cookies,
     # allowing it to patch SameSite=None for cross-origin embeds.
@@ -215,6 +218,41 @@ AUTH_PASSWORD_VALIDATORS = [
 
 # Sessions — server-side in database
 SESSION_ENGINE = "django.contrib.sessions.backends.db"
+
+# Cache — keys are prefixed with the tenant schema (konote/cache.py).
+# "file" (default) is shared by every worker process on the host and needs
+# no external service; "locmem" is per process (development only).
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "file")
+_CACHE_BACKENDS = {
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get(
+            "CACHE_LOCATION", os.path.join(tempfile.gettempdir(), "konote_cache"),
+        ),
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    },
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+if CACHE_BACKEND not in _CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"CACHE_BACKEND must be one of: {', '.join(_CACHE_BACKENDS)}"
+    )
+CACHES = {
+    "default": {
+        **_CACHE_BACKENDS[CACHE_BACKEND],
+        "KEY_FUNCTION": "konote.cache.make_key",
+    },
+}
+# Lifetime of cached feature toggles, instance settings, terminology and
+# organization profile. Saving any of them invalidates the cache at once,
+# but only in the cache that request used: the "file" cache is local to
+# each host, so with more than one app instance the others keep serving
+# the old values until their entries expire. Keep this short (5 minutes)
+# unless every instance shares one cache (e.g. CACHE_LOCATION on a volume
+# mounted by all of them).
+SETTINGS_CACHE_TIMEOUT = int(os.environ.get("SETTINGS_CACHE_TIMEOUT", "300"))
 SESSION_COOKIE_AGE = 1800  # 30 minutes
 SESSION_SAVE_EVERY_REQUEST = True  # Reset timeout on activity
 SESSION_COOKIE_HTTPONLY = True
@@ -360,6 +398,11 @@ SECURE_EXPORT_DIR = os.environ.get(
 # Secure export link expiry (hours)
 SECURE_EXPORT_LINK_EXPIRY_HOURS = int(os.environ.get("SECURE_EXPORT_LINK_EXPIRY_HOURS", "24"))
 
+# Audit log CSV exports matching more rows than this are queued for the
+# run_audit_exports cron job and served through a secure export link
+# instead of streamed.
+AUDIT_EXPORT_BACKGROUND_ROWS = int(os.environ.get("AUDIT_EXPORT_BACKGROUND_ROWS", "250000"))
+
 # Elevated export delay (minutes) — exports with 100+ clients or notes
 # During this delay, admins are notified and can revoke the export
 ELEVATED_EXPORT_DELAY_MINUTES = int(os.environ.get("ELEVATED_EXPORT_DELAY_MINUTES", "10"))
@@ -416,6 +459,40 @@ INSIGHTS_ALLOWED_HOSTS = [
     if host.strip()
 ]
 
+# Outcome Insights result cache (seconds). Entries are also invalidated
+# whenever a progress note is saved; 0 disables the cache.
+INSIGHTS_CACHE_TIMEOUT = int(os.environ.get("INSIGHTS_CACHE_TIMEOUT", "3600"))
+
+# PDF report charts (apps/reports/chart_utils.py): image format ("svg" or
+# "png"), cache lifetime in seconds (0 disables), and worker processes that
+# draw charts in parallel (0 draws them in the request process).
+REPORT_CHART_FORMAT = os.environ.get("REPORT_CHART_FORMAT", "svg")
+REPORT_CHART_CACHE_TIMEOUT = int(os.environ.get("REPORT_CHART_CACHE_TIMEOUT", "86400"))
+REPORT_CHART_WORKERS = int(os.environ.get("REPORT_CHART_WORKERS", "0"))
+
+# PDF rendering (apps/reports/pdf_service.py): WeasyPrint worker processes
+# (0 renders in the request process), seconds before a render is stopped,
+# and stylesheets under STATIC_ROOT applied to every PDF (parsed once per
+# worker).
+PDF_RENDER_WORKERS = int(os.environ.get("PDF_RENDER_WORKERS", "0"))
+PDF_RENDER_TIMEOUT = int(os.environ.get("PDF_RENDER_TIMEOUT", "120"))
+PDF_STYLESHEETS = []
+
+# Start-up encryption check (apps/audit/encryption_check.py): rows sampled
+# per table from those added since the last verified boot, and worker
+# processes for full scans (run when a sample fails, or with
+# `manage.py boot --full-encryption-check`).
+ENCRYPTION_CHECK_SAMPLE_SIZE = int(os.environ.get("ENCRYPTION_CHECK_SAMPLE_SIZE", "200"))
+ENCRYPTION_CHECK_WORKERS = int(os.environ.get("ENCRYPTION_CHECK_WORKERS", "2"))
+
+# Per-request performance instrumentation (konote/instrumentation.py).
+# Off by default; when on, every request logs its query count, DB time,
+# decrypts and template time to the "konote.performance" logger, and
+# admins can see recent requests under Settings > Performance.
+PERF_INSTRUMENTATION = os.environ.get("PERF_INSTRUMENTATION", "").lower() in ("1", "true", "yes")
+# Raise instead of logging a warning when a view exceeds its @perf_budget.
+PERF_BUDGET_ENFORCE = False
+
 # Logging — errors to stderr so they appear in Docker / container logs
 LOGGING = {
     "version": 1,
@@ -447,5 +524,10 @@ LOGGING = {
             "level": "ERROR",
             "propagate": False,
         },
+        "konote.performance": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
@@ -78,5 +78,24 @@ STORAGES = {
     },
 }
 
+# Per-process cache, so parallel test workers never share entries
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "KEY_FUNCTION": "konote.cache.make_key",
+    },
+}
+
+# Disable the Outcome Insights result cache — LocMemCache outlives each test's
+# database, so reused PKs could otherwise hit a previous test's results.
+# tests/test_insights.py re-enables it where caching itself is under test.
+INSIGHTS_CACHE_TIMEOUT = 0
+
+# Profile every test request so @perf_budget declarations are checked;
+# a view over budget raises and fails the test that requested it.
+PERF_INSTRUMENTATION = True
+PERF_BUDGET_ENFORCE = True
+LOGGING["loggers"]["konote.performance"]["level"] = "WARNING"  # noqa: F405
+
 # Scenario-based QA holdout directory (set via env var)
 SCENARIO_HOLDOUT_DIR = os.environ.get("SCENARIO_HOLDOUT_DIR", "")
@@ -0,0 +1,154 @@
+"""Synthetic agency fixtures for the performance benchmarks.
+
+build_agency() creates a parameterised agency — programs, clients with
+encrypted names, one plan target per client tracking every metric, and a
+series of progress notes with a value for each metric — using bulk inserts,
+so an agency-scale dataset seeds in seconds rather than minutes.
+
+The data is deterministic for a given scale: the same rows, names and
+dates every run, so query counts are comparable against the baseline.
+"""
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.utils import timezone
+
+from apps.auth_app.constants import ROLE_PROGRAM_MANAGER
+from apps.auth_app.models import User
+from apps.clients.models import ClientFile, ClientProgramEnrolment
+from apps.notes.models import MetricValue, ProgressNote, ProgressNoteTarget
+from apps.plans.models import MetricDefinition, PlanSection, PlanTarget, PlanTargetMetric
+from apps.programs.models import Program, UserProgramRole
+
+BENCHMARK_PASSWORD = "benchmark-pass-123"
+
+FIRST_NAMES = [
+    "Amara", "Benoit", "Chloe", "Dmitri", "Elena", "Farah", "Gabriel", "Hana",
+    "Isaac", "Jasmine", "Kwame", "Leila", "Mateo", "Nadia", "Omar", "Priya",
+]
+LAST_NAMES = [
+    "Anderson", "Bouchard", "Chen", "Diallo", "Esposito", "Fraser", "Gagnon",
+    "Haddad", "Ibrahim", "Johnson", "Kaur", "Lavoie", "Martin", "Nguyen",
+]
+
+
+@dataclass(frozen=True)
+class AgencyScale:
+    """Size of a synthetic agency."""
+
+    name: str
+    programs: int
+    clients: int
+    notes_per_client: int
+    metrics: int
+
+    @property
+    def notes(self):
+        return self.clients * self.notes_per_client
+
+
+SCALES = {
+    # Fast enough for a pre-commit check on SQLite.
+    "small": AgencyScale("small", programs=3, clients=120, notes_per_client=6, metrics=3),
+    # Roughly a mid-sized agency after a few years of use.
+    "agency": AgencyScale("agency", programs=8, clients=2000, notes_per_client=25, metrics=5),
+}
+
+
+@dataclass
+class SyntheticAgency:
+    scale: AgencyScale
+    manager: User
+    programs: list
+    clients: list
+    metrics: list
+
+
+def build_agency(scale):
+    """Create a synthetic agency of the given AgencyScale and return it."""
+    rng = random.Random(f"konote-benchmark-{scale.name}")
+    now = timezone.now()
+
+    manager = User.objects.create_user(
+        username="benchmark-manager", password=BENCHMARK_PASSWORD,
+        display_name="Benchmark Manager",
+    )
+    programs = Program.objects.bulk_create([
+        Program(name=f"Benchmark Program {i + 1}", status="active")
+        for i in range(scale.programs)
+    ])
+    UserProgramRole.objects.bulk_create([
+        UserProgramRole(user=manager, program=program, role=ROLE_PROGRAM_MANAGER)
+        for program in programs
+    ])
+    metrics = MetricDefinition.objects.bulk_create([
+        MetricDefinition(
+            name=f"Benchmark Metric {i + 1}", category="general",
+            metric_type="scale", min_value=1, max_value=5,
+            threshold_low=2, threshold_high=4, higher_is_better=True,
+        )
+        for i in range(scale.metrics)
+    ])
+
+    clients = []
+    for i in range(scale.clients):
+        client = ClientFile(record_id=f"BENCH-{i + 1:05d}")
+        client.first_name = FIRST_NAMES[i % len(FIRST_NAMES)]
+        client.last_name = LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        client.birth_date = date(1960, 1, 1) + timedelta(days=rng.randrange(15000))
+        clients.append(client)
+    clients = ClientFile.objects.bulk_create(clients)
+    client_program = {client.pk: programs[i % len(programs)] for i, client in enumerate(clients)}
+
+    # bulk_create skips ServiceEpisode.save(), so set started_at here (aware).
+    ClientProgramEnrolment.objects.bulk_create([
+        ClientProgramEnrolment(
+            client_file=client, program=client_program[client.pk], started_at=now,
+        )
+        for client in clients
+    ])
+    sections = PlanSection.objects.bulk_create([
+        PlanSection(client_file=client, name="Goals", program=client_program[client.pk])
+        for client in clients
+    ])
+    targets = []
+    for section, client in zip(sections, clients):
+        target = PlanTarget(plan_section=section, client_file=client)
+        target.name = "Find stable housing"
+        targets.append(target)
+    targets = PlanTarget.objects.bulk_create(targets)
+    PlanTargetMetric.objects.bulk_create([
+        PlanTargetMetric(plan_target=target, metric_def=metric)
+        for target in targets for metric in metrics
+    ])
+
+    # Notes are spread over the past year; half are backdated.
+    notes = []
+    for client in clients:
+        program = client_program[client.pk]
+        for n in range(scale.notes_per_client):
+            note = ProgressNote(
+                client_file=client, note_type="full" if n % 3 else "quick",
+                author=manager, author_program=program,
+                interaction_type="session",
+                backdate=now - timedelta(days=rng.randrange(365)) if n % 2 else None,
+            )
+            note.notes_text = "Met to review progress on goals."
+            notes.append(note)
+    notes = ProgressNote.objects.bulk_create(notes, batch_size=1000)
+
+    target_by_client = {target.client_file_id: target for target in targets}
+    note_targets = ProgressNoteTarget.objects.bulk_create([
+        ProgressNoteTarget(progress_note=note, plan_target=target_by_client[note.client_file_id])
+        for note in notes
+    ], batch_size=1000)
+    MetricValue.objects.bulk_create([
+        MetricValue(progress_note_target=entry, metric_def=metric, value=str(rng.randint(1, 5)))
+        for entry in note_targets for metric in metrics
+    ], batch_size=1000)
+
+    return SyntheticAgency(
+        scale=scale, manager=manager, programs=programs,
+        clients=clients, metrics=metrics,
+    )
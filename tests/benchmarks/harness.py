@@ -0,0 +1,112 @@
+"""Measurement and baseline comparison for the performance benchmarks.
+
+Each entry point is measured three ways:
+
+- queries: statements executed on every database during one cold-cache call
+  (the number that grows when an N+1 slips in);
+- seconds: the fastest of several calls, without tracing overhead;
+- peak_kib: peak Python memory allocated during one call (tracemalloc).
+
+Results are compared against baseline.json, keyed by database vendor and
+scale. Query counts are deterministic and get a small fixed allowance;
+timings and memory vary between machines, so they get a relative
+tolerance plus an absolute floor that keeps very fast entry points from
+flapping.
+"""
+import json
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# metric: (relative tolerance, absolute allowance)
+TOLERANCES = {
+    "queries": (0.0, 2),
+    "seconds": (1.0, 0.05),
+    "peak_kib": (0.5, 512),
+}
+
+
+@dataclass
+class Measurement:
+    queries: int
+    seconds: float
+    peak_kib: int
+
+
+def measure(fn, repeat=3, databases=("default", "audit")):
+    """Call fn repeatedly and return a Measurement.
+
+    The first call warms template, translation and import caches and is
+    not counted. The cache is cleared before every call so cached reports
+    do not hide the work being measured.
+    """
+    cache.clear()
+    fn()
+
+    cache.clear()
+    with ExitStack() as stack:
+        contexts = [
+            stack.enter_context(CaptureQueriesContext(connections[alias]))
+            for alias in databases
+        ]
+        fn()
+    queries = sum(len(ctx.captured_queries) for ctx in contexts)
+
+    timings = []
+    for _ in range(repeat):
+        cache.clear()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    cache.clear()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(queries=queries, seconds=round(min(timings), 4), peak_kib=peak // 1024)
+
+
+def baseline_key(vendor, scale_name):
+    return f"{vendor}/{scale_name}"
+
+
+def load_baseline(key, path=BASELINE_PATH):
+    """Return {entry_point: Measurement} stored for key, or {} if none."""
+    if not path.exists():
+        return {}
+    stored = json.loads(path.read_text(encoding="utf-8")).get(key, {})
+    return {name: Measurement(**values) for name, values in stored.items()}
+
+
+def save_baseline(key, results, path=BASELINE_PATH):
+    """Replace the stored results for key, keeping other vendors and scales."""
+    data = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+    data[key] = {name: asdict(results[name]) for name in sorted(results)}
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def regressions(measured, baseline, tolerances=TOLERANCES):
+    """Return human-readable descriptions of every metric over its budget."""
+    problems = []
+    for metric, (relative, absolute) in tolerances.items():
+        expected = getattr(baseline, metric)
+        actual = getattr(measured, metric)
+        budget = expected * (1 + relative) + absolute
+        if actual > budget:
+            problems.append(
+                f"{metric}: {actual} exceeds baseline {expected} "
+                f"(budget {budget:g})"
+            )
+    return problems
@@ -0,0 +1,159 @@
+"""Performance benchmarks for the entry points that slow down first at scale.
+
+Skipped unless pytest is run with --benchmark. Run single-process so
+timings are not skewed by other workers:
+
+    pytest tests/benchmarks --benchmark -n 0 -s
+    pytest tests/benchmarks --benchmark --benchmark-scale agency -n 0 -s
+
+Each entry point is measured against a synthetic agency (see agency.py)
+and compared with baseline.json (see harness.py). A query count, time or
+peak memory over budget fails the test with the numbers. After an
+intentional change, re-record the baseline and commit it:
+
+    pytest tests/benchmarks --benchmark --benchmark-update-baseline -n 0
+"""
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+
+from cryptography.fernet import Fernet
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+import konote.encryption as enc_module
+from apps.reports.cids_jsonld import build_cids_jsonld_document
+from apps.reports.funder_report import generate_funder_report_data
+
+from .agency import SCALES, build_agency
+from .harness import baseline_key, load_baseline, measure, regressions, save_baseline
+
+TEST_KEY = Fernet.generate_key().decode()
+
+
+@skipUnless(os.environ.get("KONOTE_BENCHMARK"), "Benchmarks run only with pytest --benchmark")
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class EntryPointBenchmarkTest(TestCase):
+    databases = {"default", "audit"}
+
+    @classmethod
+    def setUpClass(cls):
+        scale_name = os.environ.get("KONOTE_BENCHMARK_SCALE", "small")
+        if scale_name not in SCALES:
+            raise ValueError(
+                f"Unknown benchmark scale {scale_name!r}; choose from {', '.join(SCALES)}."
+            )
+        cls.scale = SCALES[scale_name]
+        cls.key = baseline_key(connection.vendor, scale_name)
+        cls.update_baseline = bool(os.environ.get("KONOTE_BENCHMARK_UPDATE"))
+        cls.baseline = load_baseline(cls.key)
+        cls.results = {}
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        enc_module._fernet = None
+        cls.agency = build_agency(cls.scale)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if not cls.results:
+            return
+        print(f"\nBenchmark results ({cls.key}):")
+        for name, result in sorted(cls.results.items()):
+            print(
+                f"  {name:<28} {result.queries:>6} queries "
+                f"{result.seconds:>9.4f}s {result.peak_kib:>9} KiB"
+            )
+        if cls.update_baseline:
+            save_baseline(cls.key, cls.results)
+            print("Baseline updated.")
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.http = Client()
+        self.http.force_login(self.agency.manager)
+        self.program = self.agency.programs[0]
+        self.date_to = timezone.localdate()
+        self.date_from = self.date_to - timedelta(days=365)
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def assertWithinBaseline(self, name, fn):
+        result = measure(fn)
+        self.results[name] = result
+        if self.update_baseline:
+            return
+        if name not in self.baseline:
+            self.fail(
+                f"No baseline for {name} at {self.key}. Record one with "
+                f"pytest tests/benchmarks --benchmark --benchmark-update-baseline -n 0"
+            )
+        problems = regressions(result, self.baseline[name])
+        self.assertFalse(
+            problems,
+            f"{name} regressed at {self.key}:\n  " + "\n  ".join(problems),
+        )
+
+    def _get(self, url, data=None, **headers):
+        def request():
+            response = self.http.get(url, data, headers=headers)
+            self.assertEqual(response.status_code, 200, url)
+        return request
+
+    # -- Views -------------------------------------------------------------
+
+    def test_client_list(self):
+        self.assertWithinBaseline("client_list", self._get(reverse("clients:client_list")))
+
+    def test_client_search(self):
+        self.assertWithinBaseline("client_search", self._get(
+            reverse("clients:client_search"), {"q": "an"}, HX_Request="true",
+        ))
+
+    def test_note_list(self):
+        client_file = self.agency.clients[0]
+        self.assertWithinBaseline("note_list", self._get(
+            reverse("notes:note_list", args=[client_file.pk]),
+        ))
+
+    def test_program_insights(self):
+        self.assertWithinBaseline("program_insights", self._get(
+            reverse("reports:program_insights"),
+            {"program": self.program.pk, "time_period": "12m"},
+        ))
+
+    def test_executive_dashboard(self):
+        self.assertWithinBaseline("executive_dashboard", self._get(
+            reverse("clients:executive_dashboard"),
+        ))
+
+    # -- Reports and exports -----------------------------------------------
+
+    def test_generate_funder_report_data(self):
+        self.assertWithinBaseline("generate_funder_report_data", lambda: generate_funder_report_data(
+            self.program, self.date_from, self.date_to, user=self.agency.manager,
+        ))
+
+    def test_build_cids_jsonld_document(self):
+        self.assertWithinBaseline("build_cids_jsonld_document", lambda: build_cids_jsonld_document(
+            self.agency.programs, date_from=self.date_from, date_to=self.date_to,
+        ))
+
+    def test_export_agency_data(self):
+        def export():
+            # The command refuses to overwrite, so each call gets a fresh file.
+            with tempfile.TemporaryDirectory() as tmp:
+                call_command(
+                    "export_agency_data", plaintext=True, yes=True,
+                    output=os.path.join(tmp, "export.zip"),
+                    authorized_by="benchmark", stdout=StringIO(),
+                )
+        self.assertWithinBaseline("export_agency_data", export)
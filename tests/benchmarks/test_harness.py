@@ -0,0 +1,37 @@
+"""Tests for the benchmark baseline comparison (these always run)."""
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from .harness import Measurement, load_baseline, regressions, save_baseline
+
+
+class BenchmarkHarnessTest(SimpleTestCase):
+
+    def test_within_budget_is_not_a_regression(self):
+        baseline = Measurement(queries=10, seconds=0.2, peak_kib=1000)
+        measured = Measurement(queries=12, seconds=0.4, peak_kib=2000)
+        self.assertEqual(regressions(measured, baseline), [])
+
+    def test_extra_queries_fail(self):
+        baseline = Measurement(queries=10, seconds=0.2, peak_kib=1000)
+        measured = Measurement(queries=13, seconds=0.2, peak_kib=1000)
+        problems = regressions(measured, baseline)
+        self.assertEqual(len(problems), 1)
+        self.assertIn("queries: 13 exceeds baseline 10", problems[0])
+
+    def test_slow_and_memory_hungry_fail(self):
+        baseline = Measurement(queries=10, seconds=0.2, peak_kib=1000)
+        measured = Measurement(queries=10, seconds=1.0, peak_kib=5000)
+        problems = regressions(measured, baseline)
+        self.assertEqual([p.split(":")[0] for p in problems], ["seconds", "peak_kib"])
+
+    def test_save_keeps_other_keys(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "baseline.json"
+            save_baseline("sqlite/small", {"a": Measurement(1, 0.1, 10)}, path=path)
+            save_baseline("postgresql/small", {"a": Measurement(2, 0.2, 20)}, path=path)
+            self.assertEqual(load_baseline("sqlite/small", path=path)["a"].queries, 1)
+            self.assertEqual(load_baseline("postgresql/small", path=path)["a"].queries, 2)
+            self.assertEqual(load_baseline("postgresql/agency", path=path), {})
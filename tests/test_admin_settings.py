@@ -419,8 +419,8 @@ class InstanceSettingsTest(TestCase):
 
         # French — should return French name
         activate("fr")
-        from django.core.cache import cache
-        cache.delete("instance_settings")
+        from apps.admin_settings.cached import INSTANCE_SETTINGS, invalidate
+        invalidate(INSTANCE_SETTINGS)
         result = instance_settings(request)
         self.assertEqual(result["site"]["organization_name"], "MonAgence")
         deactivate()
@@ -1,8 +1,16 @@
 """Tests for audit log views: list, export, and program-scoped audit log."""
+import gzip
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
 from django.test import TestCase, Client, override_settings
 from django.utils import timezone
 from cryptography.fernet import Fernet
 
+from apps.audit import export as audit_export
 from apps.audit.models import AuditLog
 from apps.auth_app.models import User
 from apps.clients.models import ClientFile, ClientProgramEnrolment
@@ -176,11 +184,71 @@ class AuditLogListTests(TestCase):
         self.assertEqual(len(page.object_list), 50)
         self.assertTrue(page.has_next())
 
-        resp2 = self.client.get("/manage/audit/", {"page": "2"})
+        resp2 = self.client.get("/manage/audit/", {"after": page.next_cursor})
         page2 = resp2.context["page"]
         self.assertEqual(len(page2.object_list), 5)
         self.assertFalse(page2.has_next())
 
+    def test_keyset_pagination_handles_identical_timestamps(self):
+        """Entries sharing a timestamp are split across pages by id, never skipped or repeated."""
+        same_time = timezone.now()
+        created = [
+            _create_audit_entry(event_timestamp=same_time, user_display=f"User {i}")
+            for i in range(120)
+        ]
+        self.client.login(username="admin", password="testpass123")
+
+        seen = []
+        params = {}
+        while True:
+            page = self.client.get("/manage/audit/", params).context["page"]
+            seen.extend(e.pk for e in page.object_list)
+            if not page.has_next():
+                break
+            params = {"after": page.next_cursor}
+
+        self.assertEqual(seen, sorted((e.pk for e in created), reverse=True))
+
+    def test_previous_link_returns_newer_entries(self):
+        base = timezone.now()
+        for i in range(60):
+            _create_audit_entry(
+                event_timestamp=base - timezone.timedelta(minutes=i),
+                user_display=f"User {i}",
+            )
+        self.client.login(username="admin", password="testpass123")
+
+        first = self.client.get("/manage/audit/").context["page"]
+        second = self.client.get("/manage/audit/", {"after": first.next_cursor}).context["page"]
+        self.assertTrue(second.has_previous())
+
+        back = self.client.get("/manage/audit/", {"before": second.previous_cursor})
+        back_page = back.context["page"]
+        self.assertEqual(
+            [e.pk for e in back_page.object_list],
+            [e.pk for e in first.object_list],
+        )
+        self.assertFalse(back_page.has_previous())
+        self.assertContains(back, "after=")
+
+    def test_cursor_links_keep_filters(self):
+        for i in range(55):
+            _create_audit_entry(action="login", user_display=f"User {i}")
+        self.client.login(username="admin", password="testpass123")
+
+        resp = self.client.get("/manage/audit/", {"action": "login"})
+        self.assertContains(resp, "action=login")
+        self.assertContains(resp, f"after={resp.context['page'].next_cursor}")
+
+    def test_malformed_cursor_returns_first_page(self):
+        _create_audit_entry(user_display="Only entry")
+        self.client.login(username="admin", password="testpass123")
+
+        resp = self.client.get("/manage/audit/", {"after": "not-a-cursor"})
+        self.assertEqual(resp.status_code, 200)
+        displays = [e.user_display for e in resp.context["page"].object_list]
+        self.assertEqual(displays, ["Only entry"])
+
 
 # ── audit_log_export view (/manage/audit/export/) ────────────────
 
@@ -226,7 +294,7 @@ class AuditLogExportTests(TestCase):
     def test_csv_contains_header_row(self):
         self.client.login(username="admin", password="testpass123")
         resp = self.client.get("/manage/audit/export/")
-        content = resp.content.decode("utf-8")
+        content = b"".join(resp.streaming_content).decode("utf-8")
         # Header row should contain these column names
         self.assertIn("Timestamp", content)
         self.assertIn("User", content)
@@ -241,7 +309,7 @@ class AuditLogExportTests(TestCase):
         )
         self.client.login(username="admin", password="testpass123")
         resp = self.client.get("/manage/audit/export/")
-        content = resp.content.decode("utf-8")
+        content = b"".join(resp.streaming_content).decode("utf-8")
         self.assertIn("TestExportUser", content)
         self.assertIn("create", content)
 
@@ -277,10 +345,148 @@ class AuditLogExportTests(TestCase):
         _create_audit_entry(action="create", user_display="CreateUser")
         self.client.login(username="admin", password="testpass123")
         resp = self.client.get("/manage/audit/export/", {"action": "login"})
-        content = resp.content.decode("utf-8")
+        content = b"".join(resp.streaming_content).decode("utf-8")
         self.assertIn("LoginUser", content)
         self.assertNotIn("CreateUser", content)
 
+    # ── Streaming, compression and background exports ────────────
+
+    def test_export_is_streamed(self):
+        self.client.login(username="admin", password="testpass123")
+        resp = self.client.get("/manage/audit/export/")
+        self.assertTrue(resp.streaming)
+
+    def test_gzip_export(self):
+        _create_audit_entry(user_display="GzipUser")
+        self.client.login(username="admin", password="testpass123")
+        resp = self.client.get("/manage/audit/export/", {"compress": "gzip"})
+        self.assertEqual(resp["Content-Type"], "application/gzip")
+        self.assertIn(".csv.gz", resp["Content-Disposition"])
+        content = gzip.decompress(b"".join(resp.streaming_content)).decode("utf-8")
+        self.assertIn("Timestamp", content)
+        self.assertIn("GzipUser", content)
+
+    def test_csv_spans_several_chunks(self):
+        for i in range(5):
+            _create_audit_entry(user_display=f"ChunkUser{i}")
+        qs = AuditLog.objects.using("audit").all()
+        chunks = list(audit_export.csv_chunks(qs, chunk_rows=2))
+        # Header, then rows in chunks of two
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual("".join(chunks).count("ChunkUser"), 5)
+
+    def test_large_export_is_written_in_background(self):
+        from apps.reports.models import SecureExportLink
+
+        for i in range(3):
+            _create_audit_entry(user_display=f"BigExport{i}")
+        self.client.login(username="admin", password="testpass123")
+        with tempfile.TemporaryDirectory() as export_dir, override_settings(
+            SECURE_EXPORT_DIR=export_dir, AUDIT_EXPORT_BACKGROUND_ROWS=2,
+        ):
+            resp = self.client.get("/manage/audit/export/", {"user_display": "BigExport"})
+            self.assertEqual(resp.status_code, 200)
+            self.assertTemplateUsed(resp, "reports/export_link_preparing.html")
+
+            link = SecureExportLink.objects.get(export_type="audit_log")
+            self.assertTrue(link.filename.endswith(".csv.gz"))
+            self.assertEqual(link.generation_status, "queued")
+            # Staff names, usernames and IPs: same PII handling as other exports
+            self.assertTrue(link.contains_pii)
+            self.assertFalse(link.is_elevated)
+            download = self.client.get(f"/reports/download/{link.pk}/")
+            self.assertTemplateUsed(download, "reports/export_link_preparing.html")
+
+            _create_audit_entry(user_display="Unrelated")
+            out = StringIO()
+            call_command("run_audit_exports", stdout=out)
+            self.assertIn("Wrote 1", out.getvalue())
+            link.refresh_from_db()
+            self.assertEqual(link.generation_status, "ready")
+            with open(link.file_path, "rb") as handle:
+                content = gzip.decompress(handle.read()).decode("utf-8")
+            # The saved filters are replayed
+            self.assertEqual(content.count("BigExport"), 3)
+            self.assertNotIn("Unrelated", content)
+
+            download = self.client.get(f"/reports/download/{link.pk}/")
+            self.assertEqual(download.status_code, 200)
+            download.close()
+
+        entry = AuditLog.objects.using("audit").filter(
+            action="export", resource_type="audit_log"
+        ).latest("event_timestamp")
+        self.assertTrue(entry.metadata["background"])
+        self.assertEqual(entry.metadata["rows"], 3)
+
+    def _audit_link(self, export_dir, **kwargs):
+        from datetime import timedelta
+
+        from apps.reports.models import SecureExportLink
+
+        return SecureExportLink.objects.create(
+            created_by=self.admin,
+            expires_at=timezone.now() + timedelta(hours=1),
+            export_type="audit_log",
+            client_count=0,
+            recipient="Audit log export",
+            filename="audit_log.csv.gz",
+            file_path=os.path.join(export_dir, "audit_log.csv.gz"),
+            **kwargs,
+        )
+
+    def test_download_while_background_export_is_running(self):
+        with tempfile.TemporaryDirectory() as export_dir, override_settings(
+            SECURE_EXPORT_DIR=export_dir,
+        ):
+            link = self._audit_link(export_dir, generation_status="running")
+            self.client.login(username="admin", password="testpass123")
+            resp = self.client.get(f"/reports/download/{link.pk}/")
+            self.assertTemplateUsed(resp, "reports/export_link_preparing.html")
+
+    def test_failed_job_is_recorded_on_link(self):
+        with tempfile.TemporaryDirectory() as export_dir, override_settings(
+            SECURE_EXPORT_DIR=export_dir,
+        ):
+            link = self._audit_link(export_dir, generation_status="queued")
+            with patch.object(
+                audit_export, "write_export_file", side_effect=OSError("disk full"),
+            ):
+                call_command("run_audit_exports", stdout=StringIO())
+            link.refresh_from_db()
+            self.assertEqual(link.generation_status, "failed")
+            self.assertIn("disk full", link.generation_error)
+
+            self.client.login(username="admin", password="testpass123")
+            resp = self.client.get(f"/reports/download/{link.pk}/")
+            self.assertTemplateUsed(resp, "reports/export_link_expired.html")
+            self.assertEqual(resp.context["reason"], "failed")
+
+    def test_interrupted_job_is_marked_failed(self):
+        from datetime import timedelta
+
+        with tempfile.TemporaryDirectory() as export_dir:
+            link = self._audit_link(
+                export_dir, generation_status="running",
+                generation_started_at=timezone.now() - timedelta(hours=2),
+            )
+            open(link.file_path + audit_export.PARTIAL_SUFFIX, "wb").close()
+            call_command("run_audit_exports", stdout=StringIO())
+            link.refresh_from_db()
+            self.assertEqual(link.generation_status, "failed")
+            self.assertEqual(os.listdir(export_dir), [])
+
+    def test_failed_background_write_leaves_no_partial_file(self):
+        class Broken:
+            def values_list(self, *args):
+                raise RuntimeError("database went away")
+
+        with tempfile.TemporaryDirectory() as export_dir:
+            file_path = os.path.join(export_dir, "audit.csv.gz")
+            with self.assertRaises(RuntimeError):
+                audit_export.write_export_file(Broken(), file_path)
+            self.assertEqual(os.listdir(export_dir), [])
+
 
 # ── program_audit_log view (/audit/program/<id>/) ───────────────
 
@@ -478,7 +684,7 @@ class ProgramAuditLogTests(TestCase):
         self.client.login(username="manager", password="testpass123")
         resp = self.client.get("/manage/audit/export/")
         self.assertEqual(resp.status_code, 200)
-        content = resp.content.decode("utf-8")
+        content = b"".join(resp.streaming_content).decode("utf-8")
         self.assertIn("OwnExportEntry", content)
         self.assertNotIn("OtherExportEntry", content)
 
@@ -672,3 +878,61 @@ class ComplianceSummaryPermissionTests(TestCase):
         # total_events should count only non-demo entries (the one from setUp + the one above)
         self.assertGreaterEqual(resp.context["total_events"], 1)
         # The demo entry should NOT be counted
+
+
+# ── Audit partition maintenance ─────────────────────────────────
+
+
+class AuditPartitionHelpersTests(TestCase):
+    databases = ["default", "audit"]
+
+    def test_month_arithmetic_crosses_year_boundaries(self):
+        from datetime import datetime, timezone as dt_timezone
+
+        from apps.audit import partitions
+
+        start = partitions.month_start(datetime(2026, 11, 17, 9, 30, tzinfo=dt_timezone.utc))
+        self.assertEqual(start, datetime(2026, 11, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(partitions.add_months(start, 3), datetime(2027, 2, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(partitions.add_months(start, -11), datetime(2025, 12, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(partitions.partition_name(start), "audit_log_y2026m11")
+
+    def test_expired_partitions_only_returns_fully_expired_months(self):
+        from datetime import datetime, timezone as dt_timezone
+        from unittest.mock import patch
+
+        from apps.audit import partitions
+
+        def utc(year, month):
+            return datetime(year, month, 1, tzinfo=dt_timezone.utc)
+
+        existing = [
+            partitions.Partition("audit_log_legacy", None, utc(2019, 2)),
+            partitions.Partition("audit_log_y2019m02", utc(2019, 2), utc(2019, 3)),
+            partitions.Partition("audit_log_y2019m03", utc(2019, 3), utc(2019, 4)),
+            partitions.Partition("audit_log_default", None, None, is_default=True),
+        ]
+        with patch.object(partitions, "list_partitions", return_value=existing):
+            expired = partitions.expired_partitions(utc(2019, 3))
+
+        self.assertEqual(
+            [p.name for p in expired],
+            ["audit_log_legacy", "audit_log_y2019m02"],
+        )
+
+    def test_command_is_a_no_op_without_postgresql_partitioning(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command("audit_partitions", "--retain-months", "84", stdout=out)
+        self.assertIn("not partitioned", out.getvalue())
+
+    def test_cursor_round_trip(self):
+        from apps.audit.pagination import decode_cursor, encode_cursor
+
+        entry = _create_audit_entry()
+        self.assertEqual(decode_cursor(encode_cursor(entry)), (entry.event_timestamp, entry.pk))
+        self.assertIsNone(decode_cursor("12.ab"))
+        self.assertIsNone(decode_cursor(""))
@@ -0,0 +1,211 @@
+"""Tests for the single-process start-up runner (konote/boot.py, manage.py boot)."""
+import threading
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from apps.admin_settings.models import InstanceSetting
+from apps.plans.models import MetricDefinition
+from konote import boot
+
+
+class RunBootTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        self.calls = []
+
+    def _phase(self, name, fingerprint=None, fail=False, **kwargs):
+        def run(out):
+            self.calls.append(name)
+            out.write(f"{name} ran\n")
+            if fail:
+                raise boot.PhaseError(f"{name} broke")
+        return boot.Phase(
+            name, run,
+            fingerprint=(lambda: fingerprint) if fingerprint else None,
+            **kwargs,
+        )
+
+    def test_unchanged_inputs_are_skipped_on_next_boot(self):
+        phases = [self._phase("migrate", fingerprint="v1"), self._phase("always")]
+        boot.run_boot(phases)
+        report = boot.run_boot(phases)
+
+        self.assertEqual(self.calls, ["migrate", "always", "always"])
+        self.assertEqual(
+            [r.status for r in report.results], [boot.SKIPPED, boot.OK],
+        )
+        self.assertEqual(boot.load_state(), {"migrate": "v1"})
+
+    def test_changed_inputs_and_force_rerun(self):
+        boot.run_boot([self._phase("migrate", fingerprint="v1")])
+        boot.run_boot([self._phase("migrate", fingerprint="v2")])
+        boot.run_boot([self._phase("migrate", fingerprint="v2")], force=True)
+        self.assertEqual(self.calls, ["migrate", "migrate", "migrate"])
+
+    def test_failed_phase_is_not_recorded_as_done(self):
+        boot.run_boot([self._phase("seed", fingerprint="v1", fail=True, on_failure=boot.WARN)])
+        boot.run_boot([self._phase("seed", fingerprint="v1", on_failure=boot.WARN)])
+        self.assertEqual(self.calls, ["seed", "seed"])
+
+    def test_fatal_failure_stops_later_phases(self):
+        report = boot.run_boot([
+            self._phase("migrate", fail=True),
+            self._phase("seed"),
+        ])
+        self.assertFalse(report.ok)
+        self.assertEqual(report.stopped_by, "migrate")
+        self.assertEqual(self.calls, ["migrate"])
+        self.assertIn("migrate ran", report.results[0].output)
+
+    def test_warning_failure_continues(self):
+        report = boot.run_boot([
+            self._phase("lockdown", fail=True, on_failure=boot.WARN),
+            self._phase("seed"),
+        ])
+        self.assertTrue(report.ok)
+        self.assertEqual([r.status for r in report.results], [boot.WARNING, boot.OK])
+
+    def test_fatal_in_production_depends_on_mode(self):
+        phases = [self._phase("verify", fail=True, on_failure=boot.FATAL_IN_PRODUCTION)]
+        with patch.dict("os.environ", {"KONOTE_MODE": "demo"}):
+            self.assertTrue(boot.run_boot(phases).ok)
+        with patch.dict("os.environ", {"KONOTE_MODE": "production"}):
+            self.assertFalse(boot.run_boot(phases).ok)
+
+    def test_grouped_phases_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def waits(out):
+            # Both phases must be running at once to pass the barrier
+            barrier.wait()
+
+        report = boot.run_boot([
+            boot.Phase("check_a", waits, group="checks"),
+            boot.Phase("check_b", waits, group="checks"),
+        ])
+        self.assertEqual([r.status for r in report.results], [boot.OK, boot.OK])
+
+    def test_skip_and_disabled_phases_do_not_run(self):
+        report = boot.run_boot(
+            [
+                self._phase("seed", disabled=lambda: "KONOTE_SKIP_SEED is enabled"),
+                self._phase("merge"),
+            ],
+            skip=["merge"],
+        )
+        self.assertEqual(self.calls, [])
+        self.assertEqual([r.status for r in report.results], [boot.DISABLED, boot.DISABLED])
+
+    def test_warn_output_marks_step_as_warning(self):
+        def warns(out):
+            out.write("  [WARN] DEBUG is on\n")
+
+        report = boot.run_boot([boot.Phase("startup_check", warns, fingerprint=lambda: "v1")])
+        self.assertTrue(report.ok)
+        self.assertEqual(report.results[0].status, boot.WARNING)
+        # The step completed, so unchanged inputs are still skipped next time
+        self.assertEqual(boot.load_state(), {"startup_check": "v1"})
+
+    def test_command_exit_status_zero_is_success(self):
+        with patch("konote.boot.call_command", side_effect=SystemExit(0)):
+            boot.run_command("check_translations", StringIO())
+        with patch("konote.boot.call_command", side_effect=SystemExit(1)):
+            with self.assertRaises(boot.PhaseError):
+                boot.run_command("check_translations", StringIO())
+
+
+class BootFingerprintTest(TestCase):
+    databases = {"default", "audit"}
+
+    def test_migration_fingerprint_is_stable(self):
+        self.assertEqual(boot.migration_fingerprint(), boot.migration_fingerprint())
+
+    def test_migration_fingerprint_changes_with_applied_migrations(self):
+        first = boot.migration_fingerprint()
+        with patch("konote.boot.applied_migration_count", return_value=-1):
+            self.assertNotEqual(boot.migration_fingerprint(), first)
+
+    def test_seed_fingerprint_follows_demo_mode(self):
+        with self.settings(DEMO_MODE=False):
+            off = boot.seed_fingerprint()
+        with self.settings(DEMO_MODE=True):
+            self.assertNotEqual(boot.seed_fingerprint(), off)
+
+    def test_seed_fingerprint_follows_demo_environment(self):
+        first = boot.seed_fingerprint()
+        with patch.dict("os.environ", {"DEMO_DATA_PROFILE": "/profiles/youth.json"}):
+            self.assertNotEqual(boot.seed_fingerprint(), first)
+        with patch.dict("os.environ", {"DEMO_EMAIL_BASE": "demo@example.org"}):
+            self.assertNotEqual(boot.seed_fingerprint(), first)
+
+    def test_seed_fingerprint_changes_when_seeded_rows_are_missing(self):
+        MetricDefinition.objects.create(name="PHQ-9", definition="Depression score", is_library=True)
+        seeded = boot.seed_fingerprint()
+        MetricDefinition.objects.filter(is_library=True).delete()
+        self.assertNotEqual(boot.seed_fingerprint(), seeded)
+
+    def test_tenant_migrations_fingerprint_follows_each_schema(self):
+        with patch("konote.boot.tenant_migration_state", return_value=[("agency_a", 120)]):
+            current = boot.migration_fingerprint("default", boot.tenant_migration_state())
+        with patch("konote.boot.tenant_migration_state", return_value=[("agency_a", 118)]):
+            behind = boot.migration_fingerprint("default", boot.tenant_migration_state())
+        self.assertNotEqual(current, behind)
+
+    def test_tenant_migration_state_reports_unreadable_schemas(self):
+        with patch("konote.boot.tenant_schemas", return_value=["missing_schema"]):
+            self.assertEqual(boot.tenant_migration_state(), [("missing_schema", None)])
+
+
+class BootCommandTest(TestCase):
+    databases = {"default", "audit"}
+
+    def test_unknown_skip_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command("boot", skip=["nonexistent"], stdout=StringIO())
+
+    def test_prints_per_step_timings(self):
+        phases = [
+            boot.Phase("migrate_default", lambda out: None, fingerprint=lambda: "v1"),
+            boot.Phase("startup_check", lambda out: None),
+        ]
+        InstanceSetting.objects.create(
+            setting_key=boot.STATE_KEY, setting_value='{"migrate_default": "v1"}',
+        )
+        out = StringIO()
+        with patch("konote.boot.default_phases", return_value=phases):
+            call_command("boot", stdout=out)
+        output = out.getvalue()
+        self.assertIn("[SKIP] migrate_default", output)
+        self.assertIn("[  OK] startup_check", output)
+        self.assertIn("Start-up steps: 1 ok, 1 skip", output)
+
+    def test_prints_security_output_and_warnings(self):
+        phases = [
+            boot.Phase("quiet", lambda out: out.write("seeded\n")),
+            boot.Phase(
+                "verify_encryption", lambda out: out.write("OK: 3 names verified.\n"),
+                always_show_output=True,
+            ),
+            boot.Phase("startup_check", lambda out: out.write("  [WARN] DEBUG is on\n")),
+        ]
+        out = StringIO()
+        with patch("konote.boot.default_phases", return_value=phases):
+            call_command("boot", stdout=out)
+        output = out.getvalue()
+        self.assertNotIn("seeded", output)
+        self.assertIn("OK: 3 names verified.", output)
+        self.assertIn("[WARN] startup_check", output)
+        self.assertIn("[WARN] DEBUG is on", output)
+
+    def test_fatal_failure_raises(self):
+        def fails(out):
+            raise boot.PhaseError("no")
+
+        with patch("konote.boot.default_phases", return_value=[boot.Phase("migrate_default", fails)]):
+            with self.assertRaises(CommandError):
+                call_command("boot", stdout=StringIO())
@@ -246,3 +246,114 @@ class BulkDischargeWizardTest(TestCase):
             metadata__bulk_discharge=True
         )
         self.assertEqual(logs.count(), 2)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class BulkEnrolmentServiceTest(TestCase):
+    """Set-based transfer and discharge (apps/clients/bulk_enrolment.py)."""
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.pm = User.objects.create_user(username="pm", password="testpass123")
+        self.prog_a = Program.objects.create(name="Program A", colour_hex="#10B981")
+        self.prog_b = Program.objects.create(name="Program B", colour_hex="#3B82F6")
+
+    def _clients(self, count, programs=()):
+        clients = []
+        for index in range(count):
+            cf = ClientFile()
+            cf.first_name = f"Client{index}"
+            cf.last_name = "Test"
+            cf.save()
+            for program in programs:
+                ClientProgramEnrolment.objects.create(client_file=cf, program=program)
+            clients.append(cf)
+        return clients
+
+    def _transfer_queries(self, clients):
+        from django.db import connections
+        from django.test.utils import CaptureQueriesContext
+
+        from apps.clients.bulk_enrolment import transfer_clients
+
+        with CaptureQueriesContext(connections["default"]) as ctx:
+            transfer_clients(clients, self.prog_b, self.pm, source_program_id=self.prog_a.pk)
+        return len(ctx.captured_queries)
+
+    def test_transfer_query_count_does_not_grow_with_selection(self):
+        few = self._transfer_queries(self._clients(2, [self.prog_a]))
+        many = self._transfer_queries(self._clients(25, [self.prog_a]))
+        self.assertEqual(few, many)
+
+    def test_transfer_records_history_and_episode_types(self):
+        from apps.clients.bulk_enrolment import transfer_clients
+        from apps.clients.models import ServiceEpisodeStatusChange
+
+        moved, returning = self._clients(2, [self.prog_a])
+        old = ClientProgramEnrolment.objects.create(
+            client_file=returning, program=self.prog_b, status="finished",
+        )
+
+        count = transfer_clients(
+            [moved, returning], self.prog_b, self.pm, source_program_id=self.prog_a.pk,
+        )
+        self.assertEqual(count, 2)
+
+        new_episode = ClientProgramEnrolment.objects.get(client_file=moved, program=self.prog_b)
+        self.assertEqual(new_episode.status, "active")
+        self.assertEqual(new_episode.episode_type, "transfer_in")
+        self.assertIsNotNone(new_episode.started_at)
+        old.refresh_from_db()
+        self.assertEqual(old.status, "active")
+        self.assertEqual(
+            list(ClientProgramEnrolment.objects.filter(program=self.prog_a)
+                 .values_list("status", "end_reason").distinct()),
+            [("finished", "transferred")],
+        )
+        self.assertEqual(
+            sorted(ServiceEpisodeStatusChange.objects.values_list("status", "reason")),
+            [
+                ("active", "Enrolled via bulk transfer"),
+                ("finished", "Bulk transfer to another program"),
+                ("finished", "Bulk transfer to another program"),
+            ],
+        )
+
+    def test_new_episodes_send_post_save(self):
+        from django.db.models.signals import post_save
+
+        from apps.clients.bulk_enrolment import transfer_clients
+
+        received = []
+
+        def receiver(sender, instance, created, **kwargs):
+            received.append((instance.client_file_id, instance.pk, created))
+
+        post_save.connect(receiver, sender=ClientProgramEnrolment)
+        self.addCleanup(post_save.disconnect, receiver, sender=ClientProgramEnrolment)
+        [client] = self._clients(1)
+        transfer_clients([client], self.prog_b, self.pm)
+        episode = ClientProgramEnrolment.objects.get(client_file=client)
+        self.assertEqual(received, [(client.pk, episode.pk, True)])
+
+    def test_discharge_finishes_active_episodes_only(self):
+        from apps.audit.models import AuditLog
+        from apps.clients.bulk_enrolment import discharge_clients
+
+        clients = self._clients(3, [self.prog_a])
+        ClientProgramEnrolment.objects.filter(client_file=clients[2]).update(status="on_hold")
+
+        count = discharge_clients(clients, self.prog_a, self.pm, "completed", "Year end")
+        self.assertEqual(count, 2)
+        finished = ClientProgramEnrolment.objects.filter(status="finished")
+        self.assertEqual(
+            set(finished.values_list("end_reason", "status_reason")), {("completed", "Year end")},
+        )
+        self.assertEqual(
+            set(finished.values_list("status_changes__reason", flat=True)),
+            {"Bulk discharge: Completed"},
+        )
+        self.assertEqual(
+            AuditLog.objects.using("audit").filter(metadata__bulk_discharge=True).count(), 3,
+        )
@@ -0,0 +1,74 @@
+"""Tests for cached, pooled PDF chart rendering (apps/reports/chart_utils.py)."""
+import base64
+import sys
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from apps.reports import chart_utils
+
+METRIC_RESULTS = [
+    {"label": "Housing stability", "aggregation": "percentage",
+     "values": {"All": {"value": 62.5}, "Youth": {"value": 48}}},
+    {"label": "Sessions", "aggregation": "count",
+     "values": {"All": {"value": 120}, "Youth": {"value": "n/a"}}},
+]
+
+
+class ChartRenderingTest(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        chart_utils.shutdown_chart_pool()
+
+    def test_svg_is_the_default_format(self):
+        uri = chart_utils.generate_bar_chart(["A", "B"], [1.0, 2.0], title="Test")
+        self.assertTrue(uri.startswith("data:image/svg+xml;base64,"))
+        svg = base64.b64decode(uri.split(",", 1)[1])
+        self.assertIn(b"<svg", svg)
+
+    def test_png_option(self):
+        uri = chart_utils.generate_line_chart(
+            ["Q1", "Q2"], [{"label": "All", "values": [3.2, 3.5]}], fmt="png",
+        )
+        self.assertTrue(uri.startswith("data:image/png;base64,"))
+
+    def test_unknown_format_rejected(self):
+        with self.assertRaises(ValueError):
+            chart_utils.generate_bar_chart(["A"], [1.0], fmt="gif")
+
+    def test_repeat_render_is_served_from_cache(self):
+        first = chart_utils.generate_metric_charts(METRIC_RESULTS)
+        with patch.object(chart_utils, "render_chart") as render:
+            second = chart_utils.generate_metric_charts(METRIC_RESULTS)
+        render.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual([c["label"] for c in second], ["Housing stability", "Sessions"])
+
+    def test_cache_key_changes_with_data_and_format(self):
+        params = {"labels": ["A"], "values": [1.0]}
+        key = chart_utils.chart_cache_key("bar", params, "svg")
+        self.assertNotEqual(key, chart_utils.chart_cache_key("bar", {"labels": ["A"], "values": [2.0]}, "svg"))
+        self.assertNotEqual(key, chart_utils.chart_cache_key("bar", params, "png"))
+
+    @override_settings(REPORT_CHART_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self):
+        chart_utils.generate_bar_chart(["A"], [1.0])
+        with patch.object(chart_utils, "render_chart", return_value="uri") as render:
+            chart_utils.generate_bar_chart(["A"], [1.0])
+        render.assert_called_once()
+
+    @override_settings(REPORT_CHART_WORKERS=2)
+    def test_worker_pool_renders_same_charts_as_in_process(self):
+        pooled = chart_utils.generate_metric_charts(METRIC_RESULTS)
+        cache.clear()
+        with override_settings(REPORT_CHART_WORKERS=0):
+            inline = chart_utils.generate_metric_charts(METRIC_RESULTS)
+        self.assertEqual(pooled, inline)
+
+    def test_pyplot_is_not_used(self):
+        chart_utils.generate_bar_chart(["A"], [1.0])
+        self.assertNotIn("matplotlib.pyplot", sys.modules)
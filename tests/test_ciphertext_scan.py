@@ -0,0 +1,155 @@
+"""Tests for the security_audit ENC003 ciphertext scan (apps/audit/ciphertext_scan.py)."""
+import io
+import json
+import random
+from datetime import timedelta
+
+from cryptography.fernet import Fernet
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+import konote.encryption as enc_module
+from apps.audit import ciphertext_scan
+from apps.audit.ciphertext_scan import SCAN_TARGETS, full_scan, load_state, sample_scan
+from apps.clients.models import ClientDetailValue, ClientFile, CustomFieldDefinition, CustomFieldGroup
+
+TEST_KEY = Fernet.generate_key().decode()
+CLIENT_TARGET = SCAN_TARGETS[0]
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class CiphertextScanTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.clients = []
+        for first in ("Ana", "Ben", "Cai", "Dee"):
+            client = ClientFile()
+            client.first_name = first
+            client.last_name = "Test"
+            client.save()
+            self.clients.append(client)
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _store_plaintext(self, client, value=b"Plain Name"):
+        ClientFile.objects.filter(pk=client.pk).update(_first_name_encrypted=value)
+
+    def test_sql_check_flags_plaintext_and_short_values(self):
+        self._store_plaintext(self.clients[1])
+        self._store_plaintext(self.clients[2], b"gAAAAAshort")
+        outcome = full_scan(CLIENT_TARGET, {})
+        self.assertEqual(outcome.scanned, 4)
+        self.assertEqual(
+            sorted(outcome.issues),
+            sorted([
+                (self.clients[1].pk, "_first_name_encrypted"),
+                (self.clients[2].pk, "_first_name_encrypted"),
+            ]),
+        )
+
+    def test_repeat_scan_checks_only_new_changed_and_previously_invalid_rows(self):
+        self._store_plaintext(self.clients[0])
+        state = {}
+        full_scan(CLIENT_TARGET, state)
+        self.assertEqual(load_state()["ClientFile"]["invalid"], [self.clients[0].pk])
+
+        # Fix the bad row, add one row, and backdate the saved scan so one
+        # old row counts as updated since.
+        self.clients[0].first_name = "Ana"
+        self.clients[0].save()
+        new_client = ClientFile()
+        new_client.first_name = "Eve"
+        new_client.save()
+        ClientFile.objects.filter(pk=self.clients[3].pk).update(
+            _first_name_encrypted=b"updated plaintext",
+            updated_at=timezone.now() + timedelta(minutes=5),
+        )
+
+        outcome = full_scan(CLIENT_TARGET, load_state())
+        # clients[0] (previously invalid; also updated), clients[3] (updated), new_client
+        self.assertEqual(outcome.scanned, 3)
+        self.assertEqual(outcome.skipped, 2)
+        self.assertEqual(outcome.issues, [(self.clients[3].pk, "_first_name_encrypted")])
+
+    def test_interrupted_scan_resumes_after_last_finished_chunk(self):
+        self._store_plaintext(self.clients[3])
+
+        def stop_after_first_chunk(label, done, total):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            full_scan(CLIENT_TARGET, {}, chunk_size=1, progress=stop_after_first_chunk)
+        first_pk = ClientFile.objects.order_by("pk").first().pk
+        self.assertEqual(load_state()["ClientFile"]["max_pk"], first_pk)
+
+        outcome = full_scan(CLIENT_TARGET, load_state(), chunk_size=1)
+        self.assertEqual(outcome.scanned, 3)
+        self.assertEqual(outcome.issues, [(self.clients[3].pk, "_first_name_encrypted")])
+
+    def test_sample_scan_uses_python_decoder(self):
+        # Right prefix and length, but not base64: only the decoder catches it
+        self._store_plaintext(self.clients[0], b"g" + b"!" * 99)
+        outcome = sample_scan(CLIENT_TARGET, sample_size=10, rng=random.Random(1))
+        self.assertEqual(outcome.scanned, 4)
+        self.assertEqual(outcome.issues, [(self.clients[0].pk, "_first_name_encrypted")])
+        self.assertEqual(full_scan(CLIENT_TARGET, {}).issues, [])
+
+    def test_sample_scan_draws_at_most_sample_size(self):
+        outcome = sample_scan(CLIENT_TARGET, sample_size=2, rng=random.Random(1))
+        self.assertLessEqual(outcome.scanned, 2)
+        self.assertEqual(outcome.scanned + outcome.skipped, 4)
+
+    def test_invalid_rate_upper_bound(self):
+        self.assertAlmostEqual(ciphertext_scan.invalid_rate_upper_bound(1000, 0), 0.003, places=3)
+        self.assertEqual(ciphertext_scan.invalid_rate_upper_bound(0, 0), 1.0)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class SecurityAuditEncryptionScanTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.client_file = ClientFile()
+        self.client_file.first_name = "Jane"
+        self.client_file.save()
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _results(self, *args):
+        out = io.StringIO()
+        try:
+            call_command("security_audit", "--category=ENC", "--json", *args, stdout=out)
+        except SystemExit:
+            pass
+        return {r["check_id"]: r for r in json.loads(out.getvalue())["results"]}
+
+    def test_plaintext_fails_enc003_in_both_modes(self):
+        ClientFile.objects.filter(pk=self.client_file.pk).update(_last_name_encrypted=b"Doe")
+        for mode in ("full", "sample"):
+            with self.subTest(mode=mode):
+                result = self._results(f"--enc-scan={mode}")["ENC003"]
+                self.assertEqual(result["status"], "FAIL")
+
+    def test_repeat_full_scan_reports_unchanged_rows(self):
+        self._results()
+        result = self._results()["ENC003"]
+        self.assertEqual(result["status"], "PASS")
+        self.assertIn("unchanged since last scan", result["detail"])
+
+    def test_enc004_counts_unencrypted_sensitive_values(self):
+        group = CustomFieldGroup.objects.create(title="Health")
+        field_def = CustomFieldDefinition.objects.create(
+            group=group, name="Diagnosis", is_sensitive=True,
+        )
+        ClientDetailValue.objects.create(
+            client_file=self.client_file, field_def=field_def, value="plain",
+        )
+        result = self._results()["ENC004"]
+        self.assertEqual(result["status"], "FAIL")
+        self.assertEqual(result["detail"], "1 unencrypted sensitive values")
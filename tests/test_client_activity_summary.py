@@ -0,0 +1,100 @@
+"""Tests for the per-participant activity summary (apps/clients/activity.py)."""
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.clients.activity import compute_activity
+from apps.clients.dashboard_views import _count_overdue_followups, _count_without_notes
+from apps.clients.models import ClientActivitySummary, ClientFile
+from apps.notes.models import ProgressNote, ProgressNoteTemplate
+from apps.programs.models import Program
+
+User = get_user_model()
+
+
+class ActivitySummaryTests(TestCase):
+
+    databases = ["default", "audit"]
+
+    def setUp(self):
+        self.program = Program.objects.create(name="Test")
+        self.other_program = Program.objects.create(name="Other")
+        self.staff = User.objects.create_user(username="staff", password="pass")
+        self.client_file = ClientFile.objects.create(first_name="Alice", last_name="A")
+        self.template = ProgressNoteTemplate.objects.create(name="T", owning_program=self.program)
+        self.today = timezone.localdate()
+
+    def _note(self, client_file=None, program=None, follow_up_date=None):
+        note = ProgressNote(
+            client_file=client_file or self.client_file, template=self.template,
+            author=self.staff, author_program=program or self.program,
+            interaction_type="session", status="default",
+            follow_up_date=follow_up_date,
+        )
+        note.notes_text = "Test"
+        note.save()
+        return note
+
+    def _summary(self):
+        return ClientActivitySummary.objects.get(client_file=self.client_file)
+
+    def test_follows_notes_and_follow_ups(self):
+        first = self._note(follow_up_date=self.today - timedelta(days=2))
+        second = self._note(follow_up_date=self.today + timedelta(days=5))
+        summary = self._summary()
+        self.assertEqual(summary.note_count, 2)
+        self.assertEqual(summary.last_note_at, second.created_at)
+        self.assertEqual(summary.open_follow_ups, 2)
+        self.assertEqual(summary.next_follow_up_date, self.today - timedelta(days=2))
+
+        first.status = "cancelled"
+        first.save()
+        summary = self._summary()
+        self.assertEqual(summary.note_count, 1)
+        self.assertEqual(summary.open_follow_ups, 1)
+        self.assertEqual(summary.next_follow_up_date, self.today + timedelta(days=5))
+
+        second.follow_up_completed_at = timezone.now()
+        second.save()
+        summary = self._summary()
+        self.assertEqual(summary.open_follow_ups, 0)
+        self.assertIsNone(summary.next_follow_up_date)
+
+    def test_deleting_participant_removes_summary(self):
+        self._note()
+        self.client_file.delete()
+        self.assertFalse(ClientActivitySummary.objects.exists())
+
+    def test_rebuild_command(self):
+        self._note(follow_up_date=self.today)
+        other = ClientFile.objects.create(first_name="Bob", last_name="B")
+        ClientActivitySummary.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_client_activity", stdout=out)
+        self.assertIn("2 changed", out.getvalue())
+        summary = self._summary()
+        expected = compute_activity([self.client_file.pk])[self.client_file.pk]
+        for name, value in expected.items():
+            self.assertEqual(getattr(summary, name), value)
+        self.assertEqual(ClientActivitySummary.objects.get(client_file=other).note_count, 0)
+
+    def test_dashboard_counts_keep_program_scope(self):
+        month_start = timezone.now() - timedelta(days=10)
+        noted_elsewhere = ClientFile.objects.create(first_name="Bob", last_name="B")
+        never_noted = ClientFile.objects.create(first_name="Carol", last_name="C")
+        self._note()
+        self._note()
+        self._note(client_file=noted_elsewhere, program=self.other_program)
+        client_ids = [self.client_file.pk, noted_elsewhere.pk, never_noted.pk]
+
+        self.assertEqual(_count_without_notes(client_ids, [self.program.pk], month_start), 2)
+
+        self._note(follow_up_date=self.today - timedelta(days=1))
+        self._note(follow_up_date=self.today - timedelta(days=3))
+        self._note(client_file=noted_elsewhere, follow_up_date=self.today + timedelta(days=1))
+        self.assertEqual(_count_overdue_followups(client_ids, self.today), 2)
@@ -7,7 +7,8 @@ from django.urls import reverse
 from django.utils import timezone
 
 from apps.clients.models import ClientFile, ClientProgramEnrolment
-from apps.clients.views import _get_last_contact_dates
+from apps.clients.activity import last_contact_dates as _get_last_contact_dates
+from apps.clients.activity import refresh_activity
 from apps.communications.models import Communication
 from apps.events.models import Event, Meeting
 from apps.notes.models import ProgressNote, ProgressNoteTemplate
@@ -188,6 +189,8 @@ class ClientListLastContactTests(TestCase):
         ProgressNote.objects.filter(pk=note2.pk).update(
             created_at=timezone.now() - timedelta(days=30)
         )
+        # Queryset updates skip the signals that maintain last_contact_at
+        refresh_activity([self.client2.pk])
 
         self.test_client.login(username="staff", password="pass")
         response = self.test_client.get(reverse("clients:client_list"), {"sort": "last_contact"})
@@ -212,3 +215,76 @@ class ClientListLastContactTests(TestCase):
             {"sort": "last_contact", "status": "active"},
         )
         self.assertEqual(response.status_code, 200)
+
+
+class LastContactColumnTests(TestCase):
+    """ClientFile.last_contact_at follows notes, communications and meetings."""
+
+    databases = ["default", "audit"]
+
+    def setUp(self):
+        self.program = Program.objects.create(name="Test")
+        self.staff = User.objects.create_user(username="staff", password="pass")
+        self.client_file = ClientFile.objects.create(first_name="Alice", last_name="A")
+        self.template = ProgressNoteTemplate.objects.create(name="T", owning_program=self.program)
+
+    def _last_contact(self):
+        self.client_file.refresh_from_db()
+        return self.client_file.last_contact_at
+
+    def _note(self):
+        note = ProgressNote(
+            client_file=self.client_file, template=self.template,
+            author=self.staff, author_program=self.program,
+            interaction_type="session", status="default",
+        )
+        note.notes_text = "Test"
+        note.save()
+        return note
+
+    def test_note_save_and_cancel(self):
+        note = self._note()
+        self.assertEqual(self._last_contact(), note.created_at)
+
+        note.status = "cancelled"
+        note.save()
+        self.assertIsNone(self._last_contact())
+
+    def test_communication_and_delete(self):
+        note = self._note()
+        comm = Communication(
+            client_file=self.client_file, direction="outbound", channel="phone",
+            logged_by=self.staff, author_program=self.program,
+        )
+        comm.content = "Call"
+        comm.save()
+        self.assertEqual(self._last_contact(), comm.created_at)
+
+        comm.delete()
+        self.assertEqual(self._last_contact(), note.created_at)
+
+    def test_meeting_reschedule(self):
+        start = timezone.now() - timedelta(days=3)
+        event = Event.objects.create(
+            client_file=self.client_file, title="Test",
+            start_timestamp=start, author_program=self.program,
+        )
+        self.assertIsNone(self._last_contact())  # not a meeting
+        Meeting.objects.create(event=event, status="completed")
+        self.assertEqual(self._last_contact(), start)
+
+        event.start_timestamp = start - timedelta(days=1)
+        event.save()
+        self.assertEqual(self._last_contact(), start - timedelta(days=1))
+
+        event.meeting.delete()
+        self.assertIsNone(self._last_contact())
+
+    def test_refresh_matches_helper(self):
+        self._note()
+        ClientFile.objects.filter(pk=self.client_file.pk).update(last_contact_at=None)
+        self.assertEqual(refresh_activity([self.client_file.pk]), 1)
+        self.assertEqual(
+            self._last_contact(), _get_last_contact_dates([self.client_file.pk])[self.client_file.pk],
+        )
+        self.assertEqual(refresh_activity([self.client_file.pk]), 0)
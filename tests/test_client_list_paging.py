@@ -0,0 +1,166 @@
+"""Tests for the keyset-paginated participant list (apps/clients/paging.py)."""
+import importlib
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client as TestClient, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.auth_app.constants import ROLE_STAFF
+from apps.clients import models as client_models
+from apps.clients.models import ClientFile, ClientProgramEnrolment, name_sort_bucket
+from apps.clients.paging import PAGE_SIZE, keyset_page
+from apps.programs.models import Program, UserProgramRole
+import konote.encryption as enc_module
+
+User = get_user_model()
+
+FIRST_NAMES = ["Émilie", "zoe", "Aaron", "Bea", "42nd", "Chloé", "Dev", "Mia"]
+
+
+class NameSortBucketTests(TestCase):
+
+    def test_buckets(self):
+        self.assertEqual(name_sort_bucket("Émilie"), "E")
+        self.assertEqual(name_sort_bucket("zoe"), "Z")
+        self.assertEqual(name_sort_bucket("42nd"), "#")
+        self.assertEqual(name_sort_bucket(""), "#")
+
+    def test_set_on_save_from_display_name(self):
+        client = ClientFile.objects.create(first_name="Zed", preferred_name="Ann", last_name="Y")
+        self.assertEqual(client.name_sort_bucket, "A")
+
+
+class SortKeyBackfillTests(TestCase):
+
+    databases = ["default", "audit"]
+
+    def setUp(self):
+        self.client_file = ClientFile.objects.create(first_name="Zed", last_name="Y")
+        ClientFile.objects.filter(pk=self.client_file.pk).update(name_sort_bucket="#")
+
+    def test_migration_without_key_leaves_default_bucket(self):
+        from django.apps import apps
+
+        backfill = importlib.import_module(
+            "apps.clients.migrations.0045_client_list_sort_keys",
+        ).backfill_sort_keys
+        enc_module._fernet = None
+        try:
+            with override_settings(FIELD_ENCRYPTION_KEY=""):
+                backfill(apps, None)
+        finally:
+            enc_module._fernet = None
+        self.client_file.refresh_from_db()
+        self.assertEqual(self.client_file.name_sort_bucket, "#")
+
+        out = StringIO()
+        call_command("rebuild_client_activity", "--name-buckets", stdout=out)
+        self.assertIn("Name sort letter updated for 1.", out.getvalue())
+        self.client_file.refresh_from_db()
+        self.assertEqual(self.client_file.name_sort_bucket, "Z")
+
+
+class ClientListPagingTests(TestCase):
+
+    databases = ["default", "audit"]
+
+    def setUp(self):
+        self.program = Program.objects.create(name="Test")
+        self.other_program = Program.objects.create(name="Other")
+        self.staff = User.objects.create_user(username="staff", password="pass")
+        UserProgramRole.objects.create(user=self.staff, program=self.program, role=ROLE_STAFF, status="active")
+
+        now = timezone.now()
+        for i in range(60):
+            client = ClientFile.objects.create(
+                first_name=f"{FIRST_NAMES[i % len(FIRST_NAMES)]}{i:02d}", last_name="Test",
+                record_id=f"R{i:03d}",
+            )
+            ClientProgramEnrolment.objects.create(client_file=client, program=self.program, status="active")
+            if i % 3:
+                ClientFile.objects.filter(pk=client.pk).update(last_contact_at=now - timedelta(days=i % 7))
+        # Not in the user's programs
+        hidden = ClientFile.objects.create(first_name="Hidden", last_name="Test")
+        ClientProgramEnrolment.objects.create(client_file=hidden, program=self.other_program, status="active")
+
+        self.test_client = TestClient()
+        self.test_client.login(username="staff", password="pass")
+
+    def _walk(self, sort_by):
+        queryset = ClientFile.objects.filter(enrolments__program=self.program)
+        pages = [keyset_page(queryset, sort_by)]
+        while pages[-1].has_next():
+            pages.append(keyset_page(queryset, sort_by, after=pages[-1].next_cursor))
+        return pages
+
+    def test_pages_cover_every_row_in_order(self):
+        for sort_by, key in [
+            ("name", lambda c: (c.name_sort_bucket, c.pk)),
+            ("record_id", lambda c: (c.record_id, c.pk)),
+        ]:
+            pages = self._walk(sort_by)
+            rows = [client for page in pages for client in page]
+            self.assertEqual([len(page) for page in pages], [25, 25, 10])
+            self.assertEqual(rows, sorted(ClientFile.objects.filter(enrolments__program=self.program), key=key))
+            self.assertEqual(pages[0].count, 60)
+
+    def test_last_contact_puts_never_contacted_last(self):
+        rows = [client for page in self._walk("last_contact") for client in page]
+        dates = [c.last_contact_at for c in rows]
+        contacted = [d for d in dates if d is not None]
+        self.assertEqual(dates[:len(contacted)], sorted(contacted, reverse=True))
+        self.assertEqual(dates[len(contacted):], [None] * 20)
+        self.assertEqual(len(set(rows)), 60)
+
+    def test_previous_returns_the_same_page(self):
+        queryset = ClientFile.objects.filter(enrolments__program=self.program)
+        for sort_by in ("name", "last_contact", "created"):
+            pages = self._walk(sort_by)
+            back = keyset_page(queryset, sort_by, before=pages[2].previous_cursor)
+            self.assertEqual(list(back), list(pages[1]))
+            first = keyset_page(queryset, sort_by, before=pages[1].previous_cursor)
+            self.assertEqual(list(first), list(pages[0]))
+            self.assertFalse(first.has_previous())
+
+    def test_malformed_cursor_shows_first_page(self):
+        response = self.test_client.get(reverse("clients:client_list"), {"after": "not-a-cursor"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["page"]), PAGE_SIZE)
+        self.assertFalse(response.context["page"].has_previous())
+
+    def test_view_decrypts_only_the_page(self):
+        with mock.patch.object(
+            client_models, "decrypt_field", wraps=client_models.decrypt_field,
+        ) as decrypt:
+            response = self.test_client.get(reverse("clients:client_list"))
+        page = response.context["page"]
+        self.assertEqual(len(page), PAGE_SIZE)
+        # preferred name, first name and last name per row on screen
+        self.assertLessEqual(decrypt.call_count, 3 * PAGE_SIZE)
+        self.assertNotContains(response, "Hidden")
+        names = [item["name"] for item in page]
+        self.assertEqual(names, sorted(names, key=lambda n: (name_sort_bucket(n), n.lower())))
+
+        next_page = self.test_client.get(
+            reverse("clients:client_list"), {"after": page.next_cursor},
+        ).context["page"]
+        self.assertFalse({i["client"].pk for i in page} & {i["client"].pk for i in next_page})
+
+    def test_name_sort_is_labelled_as_grouped_by_letter(self):
+        response = self.test_client.get(reverse("clients:client_list"))
+        self.assertContains(response, "(grouped by first letter)")
+        response = self.test_client.get(reverse("clients:client_list"), {"sort": "record_id"})
+        self.assertNotContains(response, "(grouped by first letter)")
+
+    def test_filters_apply_in_sql(self):
+        ClientFile.objects.filter(record_id="R001").update(status="discharged")
+        response = self.test_client.get(reverse("clients:client_list"), {"status": "discharged"})
+        self.assertEqual([i["client"].record_id for i in response.context["page"]], ["R001"])
+
+        response = self.test_client.get(reverse("clients:client_list"), {"program": self.other_program.pk})
+        self.assertEqual(len(response.context["page"]), 0)
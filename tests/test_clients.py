@@ -1558,6 +1558,20 @@ class ExecutiveDashboardPdfExportTest(TestCase):
         self.assertIn("Content-Disposition", resp)
         self.assertIn("executive-dashboard", resp["Content-Disposition"])
 
+    def test_executive_dashboard_pdf_timeout_falls_back_to_html(self):
+        """A PDF render that times out returns the HTML version instead."""
+        from apps.reports.pdf_service import PDFRenderTimeout
+
+        self.http.login(username="exec", password="pass")
+        with mock.patch(
+            "apps.reports.pdf_service.render_pdf_bytes",
+            side_effect=PDFRenderTimeout("too slow"),
+        ):
+            resp = self.http.get("/participants/executive/pdf/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Content-Type"], "text/html")
+        self.assertIn("executive-dashboard.html", resp["Content-Disposition"])
+
     def test_executive_dashboard_pdf_with_program_filter(self):
         """PDF export accepts a program query parameter."""
         self.http.login(username="exec", password="pass")
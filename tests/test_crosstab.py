@@ -0,0 +1,113 @@
+"""Tests for the NumPy metric cross-tab (apps/reports/crosstab.py)."""
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from apps.reports import aggregation, suppression
+from apps.reports.aggregation import aggregate_template_metrics
+from apps.reports.crosstab import crosstab_template_metrics
+from apps.reports.suppression import (
+    apply_secondary_suppression,
+    apply_secondary_suppression_rows,
+)
+
+AGGREGATIONS = [
+    "count", "average", "sum", "average_change",
+    "threshold_count", "threshold_percentage", "percentage",
+]
+
+
+def _report_metric(metric_id, aggregation_type, threshold=None):
+    return SimpleNamespace(
+        metric_definition_id=metric_id,
+        aggregation=aggregation_type,
+        threshold_value=threshold,
+        translated_label=f"Metric {metric_id} {aggregation_type}",
+    )
+
+
+class CrosstabTemplateMetricsTest(SimpleTestCase):
+
+    def setUp(self):
+        rng = random.Random(7)
+        start = datetime(2026, 1, 1)
+        self.metric_data = {}
+        for metric_id in range(1, 6):
+            clients = {}
+            for client_id in rng.sample(range(1, 80), 40):
+                clients[client_id] = [
+                    (
+                        # Includes missing dates and ties
+                        None if rng.random() < 0.1
+                        else start + timedelta(days=rng.randint(0, 5)),
+                        float(rng.randint(0, 10)) + rng.choice((0, 0.5, 0.25)),
+                    )
+                    for _ in range(rng.randint(1, 4))
+                ]
+            self.metric_data[metric_id] = clients
+        self.groups = {
+            "All Participants": list(range(1, 80)),
+            "Youth": list(range(1, 30)),
+            "Adult": list(range(30, 70)),
+            "Nobody": [],
+            "Outside": [500, 501],
+        }
+        self.report_metrics = [
+            _report_metric(metric_id, aggregation_type, threshold=5)
+            for metric_id in (1, 3, 5, 9)  # 9 has no values
+            for aggregation_type in AGGREGATIONS
+        ]
+
+    def test_matches_python_loop(self):
+        with mock.patch.object(aggregation, "NUMPY_AVAILABLE", False):
+            expected = aggregate_template_metrics(
+                self.report_metrics, self.metric_data, self.groups,
+            )
+        self.assertEqual(
+            crosstab_template_metrics(self.report_metrics, self.metric_data, self.groups),
+            expected,
+        )
+
+    def test_results_are_python_numbers(self):
+        results = crosstab_template_metrics(
+            self.report_metrics, self.metric_data, self.groups,
+        )
+        for result in results:
+            for cell in result["values"].values():
+                self.assertIn(type(cell["value"]), (int, float))
+                self.assertIs(type(cell["n"]), int)
+
+    def test_unknown_aggregation_raises(self):
+        with self.assertRaises(ValueError):
+            crosstab_template_metrics(
+                [_report_metric(1, "median")], self.metric_data, self.groups,
+            )
+
+
+class SecondarySuppressionRowsTest(SimpleTestCase):
+
+    def _rows(self, rng, width, count):
+        labels = ["All"] + [f"Group {i}" for i in range(1, width)]
+        return [
+            [(label, rng.choice((0, 1, 3, 4, 5, 6, 12, 40))) for label in labels]
+            for _ in range(count)
+        ]
+
+    def test_matches_row_by_row(self):
+        rng = random.Random(11)
+        for width in (1, 2, 3, 5, 9):
+            rows = self._rows(rng, width, 60)
+            self.assertEqual(
+                apply_secondary_suppression_rows(rows, threshold=5),
+                [apply_secondary_suppression(row, threshold=5) for row in rows],
+            )
+
+    def test_falls_back_for_already_suppressed_cells(self):
+        rows = [[("All", 20), ("A", "< 5"), ("B", 12), ("C", 6)]]
+        with mock.patch.object(suppression, "secondary_suppression_mask") as mask:
+            result = apply_secondary_suppression_rows(rows, threshold=5)
+        mask.assert_not_called()
+        self.assertEqual(result, [apply_secondary_suppression(rows[0], threshold=5)])
@@ -0,0 +1,89 @@
+"""Tests for DemoDataEngine bulk mode (buffered bulk_create seeding)."""
+from cryptography.fernet import Fernet
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from apps.admin_settings.demo_engine import DemoDataEngine
+from apps.events.models import Event, EventType
+from apps.notes.models import MetricValue, ProgressNote, ProgressNoteTarget
+from apps.plans.models import (
+    MetricDefinition,
+    PlanSection,
+    PlanTarget,
+    PlanTargetMetric,
+    PlanTargetRevision,
+)
+from apps.programs.models import Program
+import konote.encryption as enc_module
+
+TEST_KEY = Fernet.generate_key().decode()
+
+SEEDED_MODELS = (
+    PlanSection, PlanTarget, PlanTargetRevision, PlanTargetMetric,
+    ProgressNote, ProgressNoteTarget, MetricValue, Event,
+)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY, DEMO_MODE=True)
+class DemoEngineBulkModeTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        for name in ("Housing Stability", "Youth Drop-In"):
+            Program.objects.create(name=name, status="active")
+        MetricDefinition.objects.create(
+            name="Confidence", unit="score", min_value=1, max_value=5,
+            is_universal=True, is_enabled=True,
+        )
+        EventType.objects.create(name="Intake")
+        EventType.objects.create(name="Follow-up")
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _seed(self, bulk):
+        DemoDataEngine(bulk=bulk).run(clients_per_program=3, days_span=60)
+        counts = {model.__name__: model.objects.count() for model in SEEDED_MODELS}
+        notes = list(ProgressNote.objects.order_by("pk").values_list(
+            "backdate", "created_at", "author_role", "suggestion_priority",
+        ))
+        targets = list(PlanTarget.objects.order_by("pk").values_list(
+            "goal_source", "achievement_status", "target_date",
+        ))
+        return counts, notes, targets
+
+    def _seed_and_roll_back(self, bulk):
+        with transaction.atomic():
+            result = self._seed(bulk)
+            transaction.set_rollback(True)
+        return result
+
+    def test_bulk_mode_matches_row_by_row(self):
+        counts, notes, targets = self._seed_and_roll_back(bulk=False)
+        bulk_counts, bulk_notes, bulk_targets = self._seed_and_roll_back(bulk=True)
+
+        self.assertGreater(counts["MetricValue"], 0)
+        self.assertEqual(bulk_counts, counts)
+        self.assertEqual(
+            [(role, priority) for _, _, role, priority in bulk_notes],
+            [(role, priority) for _, _, role, priority in notes],
+        )
+        self.assertEqual(
+            [source for source, _, _ in bulk_targets],
+            [source for source, _, _ in targets],
+        )
+        self.assertEqual(
+            [status for _, status, _ in bulk_targets],
+            [status for _, status, _ in targets],
+        )
+
+    def test_bulk_mode_applies_save_side_effects(self):
+        counts, notes, targets = self._seed(bulk=True)
+
+        # created_at backdated to match the note's backdate
+        for backdate, created_at, _, _ in notes:
+            self.assertEqual(created_at, backdate)
+        self.assertFalse(PlanTarget.objects.filter(cids_outcome_uri="").exists())
+        self.assertTrue(all(target_date for _, _, target_date in targets))
+        self.assertTrue(all(status for _, status, _ in targets))
@@ -0,0 +1,191 @@
+"""Tests for the report-scoped DemographicResolver and stored bucket codes."""
+from datetime import date
+from unittest import mock
+
+from cryptography.fernet import Fernet
+from django.test import TestCase, override_settings
+
+import konote.encryption as enc_module
+from apps.clients import models as client_models
+from apps.clients.models import (
+    ClientDetailValue,
+    ClientFile,
+    CustomFieldDefinition,
+    CustomFieldGroup,
+)
+from apps.reports.demographics import (
+    DemographicResolver,
+    group_clients_by_age,
+    group_clients_by_custom_field,
+)
+
+TEST_KEY = Fernet.generate_key().decode()
+AS_OF = date(2026, 3, 31)
+OPTIONS = [
+    {"value": "emp", "label": "Employed"},
+    {"value": "student", "label": "Student"},
+    {"value": "none", "label": "Not working"},
+]
+MERGE = {"Working or studying": ["Employed", "Student"]}
+
+
+def _sorted(groups):
+    return {label: sorted(ids) for label, ids in groups.items()}
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class DemographicResolverTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        group = CustomFieldGroup.objects.create(title="Demographics", sort_order=0)
+        self.field = CustomFieldDefinition.objects.create(
+            group=group, name="Employment", input_type="select",
+            is_sensitive=True, options_json=OPTIONS,
+        )
+        self.clients = []
+        answers = ["emp", "student", "none", "", "legacy", None]
+        births = ["2012-06-01", "1990-01-15", "", "1950-07-30", "2001-12-31", "1985-04-01"]
+        for answer, birth in zip(answers, births):
+            client = ClientFile()
+            client.first_name = "Test"
+            client.last_name = "Client"
+            client.birth_date = birth
+            client.save()
+            self.clients.append(client.pk)
+            if answer is not None:
+                self._answer(client, answer)
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _answer(self, client, answer):
+        cv = ClientDetailValue(client_file=client, field_def=self.field)
+        cv.set_value(answer)
+        cv.save()
+
+    def test_matches_module_functions(self):
+        resolver = DemographicResolver(AS_OF)
+        bins = [{"min": 0, "max": 17, "label": "Youth"}, {"min": 18, "max": 120, "label": "Adult"}]
+        self.assertEqual(
+            _sorted(resolver.age_groups(self.clients)),
+            _sorted(group_clients_by_age(self.clients, AS_OF)),
+        )
+        self.assertEqual(
+            _sorted(resolver.age_groups(self.clients, custom_bins=bins)),
+            _sorted(group_clients_by_age(self.clients, AS_OF, custom_bins=bins)),
+        )
+        for merge in (None, MERGE):
+            self.assertEqual(
+                _sorted(resolver.field_groups(self.field, self.clients, merge_categories=merge)),
+                _sorted(group_clients_by_custom_field(self.clients, self.field, merge_categories=merge)),
+            )
+
+    def test_values_are_decrypted_once_across_client_sets(self):
+        resolver = DemographicResolver(AS_OF)
+        with mock.patch.object(
+            client_models, "decrypt_field", wraps=client_models.decrypt_field,
+        ) as decrypt:
+            resolver.field_groups(self.field, self.clients[:3])
+            resolver.field_groups(self.field, self.clients, merge_categories=MERGE)
+            with self.assertNumQueries(0):
+                resolver.field_groups(self.field, self.clients[1:4])
+        self.assertEqual(decrypt.call_count, 5)
+
+    def test_codes_are_stable_across_calls(self):
+        resolver = DemographicResolver(AS_OF)
+        labels, codes = resolver.field_codes(self.field, self.clients[:2])
+        first = dict(codes)
+        labels, codes = resolver.field_codes(self.field, self.clients)
+        self.assertEqual({cid: codes[cid] for cid in first}, first)
+        self.assertEqual(labels[codes[self.clients[0]]], "Employed")
+        self.assertEqual(labels[codes[self.clients[5]]], "Unknown")
+
+    def test_sensitive_fields_never_use_bucket_codes(self):
+        self.field.report_bucket_codes = True
+        self.field.save()
+        self.assertFalse(self.field.uses_bucket_codes)
+        self.field.refresh_bucket_codes()
+        self.assertFalse(ClientDetailValue.objects.exclude(bucket_code=None).exists())
+
+        self.field.is_sensitive = False
+        self.field.is_dv_sensitive = True
+        self.assertFalse(self.field.uses_bucket_codes)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class BucketCodeTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        group = CustomFieldGroup.objects.create(title="Demographics", sort_order=0)
+        self.field = CustomFieldDefinition.objects.create(
+            group=group, name="Employment", input_type="select", options_json=OPTIONS,
+        )
+        self.clients = []
+        for answer in ["emp", "student", "none", "", "legacy", None]:
+            client = ClientFile()
+            client.first_name = "Test"
+            client.last_name = "Client"
+            client.save()
+            self.clients.append(client.pk)
+            if answer is not None:
+                cv = ClientDetailValue(client_file=client, field_def=self.field)
+                cv.set_value(answer)
+                cv.save()
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def test_bucket_codes_group_without_reading_values(self):
+        self.field.report_bucket_codes = True
+        self.field.save()
+        self.field.refresh_bucket_codes()
+        self.assertEqual(
+            dict(ClientDetailValue.objects.values_list("client_file_id", "bucket_code")),
+            dict(zip(self.clients, [1, 2, 3, 0, None])),
+        )
+
+        expected = _sorted(group_clients_by_custom_field(self.clients, self.field))
+        with mock.patch.object(
+            ClientDetailValue, "get_value", autospec=True,
+            side_effect=ClientDetailValue.get_value,
+        ) as get_value:
+            groups = DemographicResolver(AS_OF).field_groups(self.field, self.clients)
+        # Only the value that is not one of the options is read
+        self.assertEqual(get_value.call_count, 1)
+        self.assertEqual(_sorted(groups), expected)
+
+    def test_bucket_codes_follow_option_changes(self):
+        self.field.report_bucket_codes = True
+        self.field.options_json = list(reversed(OPTIONS))
+        self.field.save()
+        self.field.refresh_bucket_codes()
+        self.assertEqual(
+            ClientDetailValue.objects.get(client_file_id=self.clients[0]).bucket_code, 3,
+        )
+        self.assertEqual(
+            _sorted(DemographicResolver(AS_OF).field_groups(self.field, self.clients)),
+            _sorted(group_clients_by_custom_field(self.clients, self.field)),
+        )
+
+        self.field.report_bucket_codes = False
+        self.field.save()
+        self.field.refresh_bucket_codes()
+        self.assertFalse(ClientDetailValue.objects.exclude(bucket_code=None).exists())
+
+    def test_form_rejects_bucket_codes_for_sensitive_fields(self):
+        from apps.clients.forms import CustomFieldDefinitionForm
+
+        data = {
+            "group": self.field.group_id, "name": "Employment", "input_type": "select",
+            "front_desk_access": "none", "options_json": '["A", "B"]',
+            "report_bucket_codes": "on", "sort_order": 0, "status": "active",
+        }
+        self.assertTrue(CustomFieldDefinitionForm(data=data).is_valid())
+        for flag in ("is_sensitive", "is_dv_sensitive"):
+            form = CustomFieldDefinitionForm(data={**data, flag: "on"})
+            self.assertFalse(form.is_valid())
+            self.assertIn("report_bucket_codes", form.errors)
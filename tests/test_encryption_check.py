@@ -0,0 +1,123 @@
+"""Tests for the sampled start-up encryption check (apps/audit/encryption_check.py)."""
+import io
+import random
+
+from cryptography.fernet import Fernet
+from django.test import TestCase, override_settings
+
+import konote.encryption as enc_module
+from apps.audit import encryption_check
+from apps.audit.encryption_check import CHECK_TARGETS, load_state, verify
+from apps.clients.models import ClientFile
+from konote import boot
+
+TEST_KEY = Fernet.generate_key().decode()
+OTHER_KEY = Fernet.generate_key()
+CLIENT_TARGETS = (CHECK_TARGETS[1],)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class EncryptionCheckTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.clients = [self._client(first) for first in ("Ana", "Ben", "Cai", "Dee")]
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _client(self, first):
+        client = ClientFile()
+        client.first_name = first
+        client.last_name = "Test"
+        client.save()
+        return client
+
+    def _break(self, client):
+        """Store a name encrypted with a different key."""
+        ClientFile.objects.filter(pk=client.pk).update(
+            _last_name_encrypted=Fernet(OTHER_KEY).encrypt(b"Test"),
+        )
+
+    def test_passing_check_records_highest_verified_pk(self):
+        [outcome] = verify(CLIENT_TARGETS)
+        self.assertTrue(outcome.ok)
+        self.assertEqual(outcome.mode, "sample")
+        self.assertEqual(outcome.checked, 4)
+        self.assertEqual(load_state(), {"ClientFile": self.clients[-1].pk})
+
+    def test_later_check_samples_new_rows_and_rechecks_a_few_old(self):
+        verify(CLIENT_TARGETS)
+        for first in ("Eve", "Fay"):
+            self._client(first)
+        outcome = encryption_check.sample_check(
+            CLIENT_TARGETS[0], enc_module._get_fernet(),
+            verified_to=self.clients[-1].pk, recheck_size=1, rng=random.Random(1),
+        )
+        # Both new rows, plus one of the four already verified
+        self.assertEqual(outcome.checked, 3)
+        self.assertEqual(outcome.total, 6)
+
+    def test_sample_is_bounded_on_large_tables(self):
+        for index in range(20):
+            self._client(f"Extra{index}")
+        [outcome] = verify(CLIENT_TARGETS, sample_size=5, rng=random.Random(3))
+        self.assertTrue(outcome.ok)
+        self.assertLessEqual(outcome.checked, 5)
+        self.assertEqual(outcome.total, 24)
+
+    def test_sparse_pks_draw_a_bounded_number_of_ids(self):
+        for index in range(20):
+            self._client(f"Extra{index}")
+        far = self._client("Far")
+        ClientFile.objects.filter(pk=far.pk).update(id=10_000_000)
+        rng = random.Random(5)
+        draws = []
+        original = rng.sample
+
+        def sample(population, k):
+            draws.append(k)
+            return original(population, k)
+
+        rng.sample = sample
+        [outcome] = verify(CLIENT_TARGETS, sample_size=5, rng=rng)
+        self.assertTrue(outcome.ok)
+        # Filled (falling back to the database's random order if needed)
+        self.assertEqual(outcome.checked, 5)
+        self.assertTrue(draws)
+        self.assertLessEqual(max(draws), 5 * encryption_check.DRAW_FACTOR)
+
+    def test_failed_sample_escalates_to_full_scan(self):
+        self._break(self.clients[1])
+        self._break(self.clients[3])
+        [outcome] = verify(CLIENT_TARGETS)
+        self.assertEqual(outcome.mode, "full")
+        self.assertEqual(outcome.checked, 4)
+        self.assertEqual(sorted(outcome.failed), [self.clients[1].pk, self.clients[3].pk])
+        self.assertEqual(load_state(), {})
+
+    def test_wrong_key_is_caught_from_previously_verified_rows(self):
+        verify(CLIENT_TARGETS)
+        for client in self.clients:
+            self._break(client)
+        # No rows were added since the last check, but the recheck sample fails
+        [outcome] = verify(CLIENT_TARGETS)
+        self.assertEqual(len(outcome.failed), 4)
+
+    def test_full_check_in_worker_processes(self):
+        self._break(self.clients[2])
+        outcome = encryption_check.full_check(
+            CLIENT_TARGETS[0], enc_module._get_fernet(), chunk_size=1, workers=2,
+        )
+        self.assertEqual(outcome.checked, 4)
+        self.assertEqual(outcome.failed, [self.clients[2].pk])
+
+    def test_boot_step_fails_on_undecryptable_rows(self):
+        out = io.StringIO()
+        boot.verify_encrypted_fields(out)
+        self.assertIn("OK: 4 of 4 encrypted client names verified (sample).", out.getvalue())
+
+        self._break(self.clients[0])
+        with self.assertRaises(boot.PhaseError):
+            boot.verify_encrypted_fields(io.StringIO())
@@ -908,6 +908,25 @@ class ErasureViewWorkflowTests(TestCase):
         er.refresh_from_db()
         self.assertIsNotNone(er.receipt_downloaded_at)
 
+    @patch("apps.reports.pdf_utils.is_pdf_available", return_value=True)
+    @patch("apps.reports.pdf_utils.render_pdf")
+    def test_receipt_timeout_redirects_without_marking_downloaded(self, mock_pdf, mock_avail):
+        """A receipt render that times out shows a message and is not counted as downloaded."""
+        from apps.reports.pdf_service import PDFRenderTimeout
+        mock_pdf.side_effect = PDFRenderTimeout("too slow")
+        er = ErasureRequest.objects.create(
+            client_file=self.cf, client_pk=self.cf.pk,
+            requested_by=self.staff, requested_by_display="Staff",
+            reason_category="other", request_reason="Test",
+            programs_required=[self.prog.pk],
+        )
+        self.client.login(username="pm", password="testpass123")
+        resp = self.client.get(f"/erasure/{er.pk}/receipt/", follow=True)
+        self.assertRedirects(resp, f"/erasure/{er.pk}/")
+        self.assertContains(resp, "The PDF took too long to generate.")
+        er.refresh_from_db()
+        self.assertIsNone(er.receipt_downloaded_at)
+
     def test_detail_warns_if_receipt_not_downloaded(self):
         """Detail page includes warning when receipt hasn't been downloaded."""
         er = ErasureRequest.objects.create(
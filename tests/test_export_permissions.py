@@ -14,6 +14,7 @@ import os
 import shutil
 import tempfile
 import uuid
+from unittest.mock import patch
 
 from django.conf import settings
 from django.test import Client, TestCase, override_settings
@@ -1005,6 +1006,17 @@ class ClientProgressPdfPermissionTest(TestCase):
         # 200 if WeasyPrint available, 503 if missing (Windows)
         self.assertIn(resp.status_code, [200, 503])
 
+    def test_render_timeout_shows_unavailable_page(self):
+        """A render that times out returns the PDF unavailable page."""
+        from apps.reports.pdf_service import PDFRenderTimeout
+
+        self.http_client.login(username="staff", password="testpass123")
+        with patch("apps.reports.pdf_views.is_pdf_available", return_value=True), \
+                patch("apps.reports.pdf_views.render_pdf", side_effect=PDFRenderTimeout("too slow")):
+            resp = self.http_client.get(self._pdf_url())
+        self.assertEqual(resp.status_code, 503)
+        self.assertContains(resp, "PDF Took Too Long", status_code=503)
+
     def test_executive_cannot_download_client_pdf(self):
         """Executive must NOT be able to download client progress PDF."""
         self.http_client.login(username="exec", password="testpass123")
@@ -464,6 +464,103 @@ class ImportAttendanceTest(TestCase):
         self.assertEqual(skipped, 1)
 
 
+    def test_import_attendance_dedup_within_batch(self):
+        """Two submissions for the same group+date create one session."""
+        submissions = [
+            {"group_konote_id": str(self.group.pk), "session_date": "2026-02-24",
+             "members_present": str(self.m1.pk)},
+            {"group_konote_id": str(self.group.pk), "session_date": "2026-02-24",
+             "members_present": str(self.m2.pk)},
+        ]
+
+        from apps.field_collection.management.commands.sync_odk import Command
+        cmd = Command()
+        cmd.stdout = MagicMock()
+        cmd.stderr = MagicMock()
+        created, skipped = cmd._import_attendance(submissions, self.config)
+
+        self.assertEqual((created, skipped), (1, 1))
+        self.assertEqual(GroupSession.objects.filter(group=self.group).count(), 1)
+        self.assertEqual(GroupSessionAttendance.objects.count(), 2)
+
+    def test_import_attendance_unknown_group_skipped(self):
+        submissions = [{"group_konote_id": "999999", "session_date": "2026-02-24"}]
+
+        from apps.field_collection.management.commands.sync_odk import Command
+        cmd = Command()
+        cmd.stdout = MagicMock()
+        cmd.stderr = MagicMock()
+        created, skipped = cmd._import_attendance(submissions, self.config)
+
+        self.assertEqual((created, skipped), (0, 1))
+        self.assertFalse(GroupSession.objects.exists())
+
+    def test_import_attendance_query_count_independent_of_volume(self):
+        """A week of sessions is written with a fixed number of queries."""
+        submissions = [
+            {"group_konote_id": str(self.group.pk),
+             "session_date": f"2026-03-{day:02d}",
+             "members_present": f"{self.m1.pk} {self.m2.pk}",
+             "session_notes": "Notes"}
+            for day in range(1, 8)
+        ]
+
+        from apps.field_collection.management.commands.sync_odk import Command
+        cmd = Command()
+        cmd.stdout = MagicMock()
+        cmd.stderr = MagicMock()
+        # groups + existing sessions + memberships + session insert +
+        # attendance insert, plus savepoint bookkeeping.
+        with self.assertNumQueries(7):
+            created, skipped = cmd._import_attendance(submissions, self.config)
+
+        self.assertEqual((created, skipped), (7, 0))
+        self.assertEqual(GroupSessionAttendance.objects.filter(present=True).count(), 14)
+        self.assertEqual(GroupSession.objects.first().notes, "Notes")
+
+    def test_failed_batch_reports_committed_batches(self):
+        """A failing later batch keeps the counts of the batches before it."""
+        from apps.groups.services import BulkAttendanceWriter
+
+        class FailingSecondBatchWriter(BulkAttendanceWriter):
+            def __init__(self):
+                super().__init__(batch_size=2)
+                self.batches = 0
+
+            def _write_batch(self, entries, result):
+                self.batches += 1
+                if self.batches == 2:
+                    raise RuntimeError("connection lost")
+                super()._write_batch(entries, result)
+
+        submissions = [
+            {"group_konote_id": str(self.group.pk),
+             "session_date": f"2026-03-{day:02d}",
+             "members_present": str(self.m1.pk)}
+            for day in range(1, 5)
+        ]
+        self.config.odk_project_id = 42
+        self.config.save(update_fields=["odk_project_id"])
+        mock_client = MagicMock()
+        mock_client.get_submissions.return_value = submissions
+
+        from apps.field_collection.management.commands.sync_odk import Command
+        cmd = Command()
+        cmd.stdout = MagicMock()
+        cmd.stderr = MagicMock()
+        sync_run = SyncRun(direction="pull")
+        errors = []
+        with patch("apps.groups.services.BulkAttendanceWriter", FailingSecondBatchWriter):
+            cmd._pull_submissions(mock_client, self.config, sync_run, False, errors)
+
+        self.assertEqual(GroupSession.objects.filter(group=self.group).count(), 2)
+        self.assertEqual(sync_run.attendance_records_created, 2)
+        self.assertEqual(sync_run.submissions_skipped, 0)
+        self.assertEqual(sync_run.error_count, 1)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("2 sessions committed, 2 submissions not written", errors[0])
+
+
 @override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
 class ImportVisitNotesTest(TestCase):
     """Test visit note import from ODK submissions."""
@@ -804,3 +901,226 @@ class HandleEndToEndTest(TestCase):
         with patch.dict("os.environ", {"ODK_CENTRAL_URL": "", "ODK_CENTRAL_EMAIL": "", "ODK_CENTRAL_PASSWORD": ""}):
             with self.assertRaises(CommandError):
                 cmd.handle(direction="both", program=None, dry_run=False)
+
+
+# ------------------------------------------------------------------
+# Delta entity sync against a local ODK Central stub server
+# ------------------------------------------------------------------
+
+class _ODKStub:
+    """Minimal in-memory ODK Central API served over real HTTP.
+
+    Implements just the endpoints sync_odk uses for a push. Every request is
+    logged as (method, path, query, body) so tests can assert on traffic.
+    """
+
+    def __init__(self):
+        import json
+        import re
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs, urlparse
+
+        self.projects = {}
+        self.datasets = {}  # (project_id, name) → {uuid: {"label", "data"}}
+        self.app_users = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        routes = [
+            ("POST", r"/v1/sessions", "session"),
+            ("GET", r"/v1/projects", "list_projects"),
+            ("GET", r"/v1/projects/(\d+)", "get_project"),
+            ("GET", r"/v1/projects/(\d+)/datasets", "list_datasets"),
+            ("POST", r"/v1/projects/(\d+)/datasets", "create_dataset"),
+            ("POST", r"/v1/projects/(\d+)/datasets/(\w+)/properties", "ok"),
+            ("GET", r"/v1/projects/(\d+)/datasets/(\w+)/entities", "list_entities"),
+            ("POST", r"/v1/projects/(\d+)/datasets/(\w+)/entities", "create_entities"),
+            ("PATCH", r"/v1/projects/(\d+)/datasets/(\w+)/entities/([\w-]+)", "update_entity"),
+            ("GET", r"/v1/projects/(\d+)/app-users", "list_app_users"),
+        ]
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                with stub._lock:
+                    stub.requests.append((self.command, url.path, parse_qs(url.query), body))
+                    for method, pattern, name in routes:
+                        match = re.fullmatch(pattern, url.path)
+                        if method == self.command and match:
+                            status, payload = getattr(stub, f"_{name}")(*match.groups(), body=body)
+                            break
+                    else:
+                        status, payload = 404, {"message": "not found"}
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = _dispatch
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def entity_writes(self):
+        return [r for r in self.requests if "/entities" in r[1] and r[0] in ("POST", "PATCH")]
+
+    # -- route handlers (called with the lock held) --
+
+    def _session(self, body):
+        return 200, {"token": "stub-token"}
+
+    def _ok(self, *args, body):
+        return 200, {"success": True}
+
+    def _list_projects(self, body):
+        return 200, list(self.projects.values())
+
+    def _get_project(self, project_id, body):
+        project = self.projects.get(int(project_id))
+        return (200, project) if project else (404, {})
+
+    def _list_datasets(self, project_id, body):
+        return 200, [{"name": n} for (p, n) in self.datasets if p == int(project_id)]
+
+    def _create_dataset(self, project_id, body):
+        self.datasets[(int(project_id), body["name"])] = {}
+        return 200, {"name": body["name"]}
+
+    def _list_entities(self, project_id, name, body):
+        entities = self.datasets.get((int(project_id), name), {})
+        return 200, [{"uuid": uuid} for uuid in entities]
+
+    def _create_entities(self, project_id, name, body):
+        dataset = self.datasets[(int(project_id), name)]
+        new = body["entities"] if "entities" in body else [body]
+        if any(e["uuid"] in dataset for e in new):
+            return 409, {"message": "conflict"}
+        for e in new:
+            dataset[e["uuid"]] = {"label": e["label"], "data": e["data"]}
+        return 200, {"success": True}
+
+    def _update_entity(self, project_id, name, uuid, body):
+        dataset = self.datasets[(int(project_id), name)]
+        if uuid not in dataset:
+            return 404, {}
+        dataset[uuid] = {"label": body.get("label", dataset[uuid]["label"]), "data": body["data"]}
+        return 200, {"uuid": uuid}
+
+    def _list_app_users(self, project_id, body):
+        return 200, []
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class DeltaEntitySyncTest(TestCase):
+    """sync_odk --delta pushes only changed entities, in bulk."""
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.stub = _ODKStub()
+        self.stub.projects[7] = {"id": 7, "name": "Field Collection"}
+        self.programs = []
+        self.participants = []
+        for i in range(2):
+            program = Program.objects.create(name=f"Outreach {i}")
+            ProgramFieldConfig.objects.create(
+                program=program, enabled=True, profile="home_visiting",
+                data_tier="standard", odk_project_id=7,
+            )
+            for name in ("Maria", "James"):
+                cf = ClientFile.objects.create(status="active")
+                cf.first_name = name
+                cf.save()
+                ClientProgramEnrolment.objects.create(
+                    client_file=cf, program=program, status="active",
+                )
+                self.participants.append(cf)
+            self.programs.append(program)
+
+    def tearDown(self):
+        self.stub.close()
+        enc_module._fernet = None
+
+    def _sync(self, *args):
+        from io import StringIO
+        from django.core.management import call_command
+
+        env = {
+            "ODK_CENTRAL_URL": self.stub.url,
+            "ODK_CENTRAL_EMAIL": "admin@example.com",
+            "ODK_CENTRAL_PASSWORD": "secret",
+        }
+        with patch.dict("os.environ", env):
+            call_command(
+                "sync_odk", "--direction=push", "--delta", "--workers=2", *args,
+                stdout=StringIO(), stderr=StringIO(),
+            )
+        return SyncRun.objects.latest("started_at")
+
+    def test_first_run_bulk_creates_all_entities(self):
+        run = self._sync()
+
+        self.assertEqual(run.status, "success")
+        self.assertEqual(run.participants_pushed, 4)
+        self.assertEqual(len(self.stub.datasets[(7, "Participants")]), 4)
+        writes = self.stub.entity_writes()
+        # One bulk request per program, no per-entity requests
+        self.assertEqual(len(writes), 2)
+        self.assertTrue(all("entities" in body for _, _, _, body in writes))
+
+    def test_unchanged_entities_are_not_pushed_again(self):
+        self._sync()
+        self.stub.requests.clear()
+
+        run = self._sync()
+
+        self.assertEqual(self.stub.entity_writes(), [])
+        self.assertEqual(run.participants_pushed, 0)
+
+    def test_changed_entity_is_patched_without_version_lookup(self):
+        self._sync()
+        self.stub.requests.clear()
+
+        cf = self.participants[0]
+        cf.first_name = "Mariana"
+        cf.save()
+        self._sync()
+
+        writes = self.stub.entity_writes()
+        self.assertEqual(len(writes), 1)
+        method, path, query, body = writes[0]
+        self.assertEqual(method, "PATCH")
+        self.assertTrue(path.endswith(f"konote-participant-{cf.pk}"))
+        self.assertEqual(query, {"force": ["true"]})
+        self.assertEqual(body["data"]["first_name"], "Mariana")
+        self.assertFalse(any(
+            r[0] == "GET" and r[1].endswith(f"konote-participant-{cf.pk}")
+            for r in self.stub.requests
+        ))
+
+    def test_first_delta_run_updates_entities_pushed_by_full_sync(self):
+        """Without stored hashes, existing ODK entities are updated, not duplicated."""
+        self.stub.datasets[(7, "Participants")] = {
+            f"konote-participant-{self.participants[0].pk}": {"label": "Old", "data": {}},
+        }
+
+        run = self._sync()
+
+        self.assertEqual(run.status, "success")
+        self.assertEqual(len(self.stub.datasets[(7, "Participants")]), 4)
+        patches = [r for r in self.stub.entity_writes() if r[0] == "PATCH"]
+        self.assertEqual(len(patches), 1)
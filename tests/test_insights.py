@@ -306,3 +306,206 @@ class ClientWordsSamplesTest(SimpleTestCase):
                 word_count, 10,
                 f"Sample too short ({word_count} words): '{sample}'",
             )
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY, INSIGHTS_CACHE_TIMEOUT=60)
+class InsightsCacheTest(TestCase):
+    """Test the versioned result cache for computed insight blocks."""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        enc_module._fernet = None
+        self.program = Program.objects.create(name="Cache Program", status="active")
+        self.user = User.objects.create_user(username="worker", password="testpass123")
+        self.client_file = ClientFile.objects.create(record_id="TEST-CACHE-001")
+        ClientProgramEnrolment.objects.create(
+            client_file=self.client_file,
+            program=self.program,
+            status="active",
+        )
+
+    def _create_note(self):
+        return ProgressNote.objects.create(
+            client_file=self.client_file,
+            note_type="full",
+            author=self.user,
+            author_program=self.program,
+            engagement_observation="engaged",
+        )
+
+    def test_block_computed_once_per_version(self):
+        from apps.reports.insights_cache import cached_block
+
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"note_count": len(calls)}
+
+        first = cached_block("structured", "program", self.program.pk, ("a", "b"), compute)
+        second = cached_block("structured", "program", self.program.pk, ("a", "b"), compute)
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 1)
+
+        # Different parameters are cached separately
+        cached_block("structured", "program", self.program.pk, ("a", "c"), compute)
+        self.assertEqual(len(calls), 2)
+
+    def test_note_save_invalidates_program_and_client_blocks(self):
+        from apps.reports.insights_cache import cached_block
+
+        def structured():
+            return get_structured_insights(program=self.program)
+
+        self.assertEqual(
+            cached_block("structured", "program", self.program.pk, (), structured)["note_count"], 0,
+        )
+        client_version = cached_block(
+            "structured", "client", self.client_file.pk, (),
+            lambda: get_structured_insights(client_file=self.client_file),
+        )
+        self.assertEqual(client_version["note_count"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_note()
+
+        self.assertEqual(
+            cached_block("structured", "program", self.program.pk, (), structured)["note_count"], 1,
+        )
+        self.assertEqual(
+            cached_block(
+                "structured", "client", self.client_file.pk, (),
+                lambda: get_structured_insights(client_file=self.client_file),
+            )["note_count"],
+            1,
+        )
+
+    def test_quotes_cached_encrypted(self):
+        from django.core.cache import cache
+        from apps.reports import insights_cache
+
+        when = timezone.now()
+        quotes = [{"text": "A private participant quote", "note_id": 7, "date": when}]
+        result = insights_cache.cached_quotes("client", self.client_file.pk, (), lambda: quotes)
+        self.assertEqual(result, quotes)
+
+        key = insights_cache._block_key("quotes", "client", self.client_file.pk, ())
+        raw = cache.get(key)
+        self.assertIsInstance(raw, bytes)
+        self.assertNotIn(b"private participant", raw)
+
+        again = insights_cache.cached_quotes(
+            "client", self.client_file.pk, (), lambda: self.fail("should hit cache"),
+        )
+        self.assertEqual(again, quotes)
+
+    @override_settings(INSIGHTS_CACHE_TIMEOUT=0)
+    def test_zero_timeout_disables_cache(self):
+        from apps.reports.insights_cache import cached_block
+
+        calls = []
+        for _ in range(2):
+            cached_block("structured", "program", self.program.pk, (), lambda: calls.append(1))
+        self.assertEqual(len(calls), 2)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY, INSIGHTS_CACHE_TIMEOUT=60)
+class InsightsCacheInvalidationTest(TestCase):
+    """Writes that bypass the note signal still invalidate cached insights."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        enc_module._fernet = None
+        self.program = Program.objects.create(name="Cache Program", status="active")
+        self.admin = User.objects.create_user(username="admin", password="testpass123", is_admin=True)
+        self.client_file = ClientFile.objects.create(record_id="TEST-CACHE-002")
+        ClientProgramEnrolment.objects.create(
+            client_file=self.client_file, program=self.program, status="active",
+        )
+        ProgressNote.objects.create(
+            client_file=self.client_file, note_type="full", author=self.admin,
+            author_program=self.program,
+        )
+
+    def _fill(self, client_file):
+        from apps.reports.insights_cache import cached_block
+
+        for scope, pk in [("client", client_file.pk), ("program", self.program.pk)]:
+            cached_block("quotes", scope, pk, (), lambda: "cached")
+
+    def _assert_misses(self, client_file):
+        from apps.reports.insights_cache import cached_block
+
+        for scope, pk in [("client", client_file.pk), ("program", self.program.pk)]:
+            self.assertEqual(cached_block("quotes", scope, pk, (), lambda: "fresh"), "fresh")
+
+    def test_erasure_invalidates(self):
+        from apps.clients.erasure import execute_erasure
+        from apps.clients.models import ErasureRequest
+
+        er = ErasureRequest.objects.create(
+            client_file=self.client_file, client_pk=self.client_file.pk,
+            requested_by=self.admin, requested_by_display="Admin",
+            reason_category="other", request_reason="Test",
+            programs_required=[self.program.pk], erasure_tier="anonymise_purge",
+        )
+        self._fill(self.client_file)
+        with self.captureOnCommitCallbacks(execute=True):
+            execute_erasure(er, "127.0.0.1")
+        self._assert_misses(self.client_file)
+
+    def test_merge_invalidates(self):
+        from apps.clients.merge import execute_merge
+
+        archived = ClientFile.objects.create(record_id="TEST-CACHE-003")
+        self._fill(self.client_file)
+        self._fill(archived)
+        with self.captureOnCommitCallbacks(execute=True):
+            execute_merge(self.client_file, archived, {}, {}, self.admin, "127.0.0.1")
+        self._assert_misses(self.client_file)
+        self._assert_misses(archived)
+
+    def test_bulk_discharge_invalidates(self):
+        from apps.clients.bulk_enrolment import discharge_clients
+
+        self._fill(self.client_file)
+        with self.captureOnCommitCallbacks(execute=True):
+            discharge_clients([self.client_file], self.program, self.admin, "completed")
+        self._assert_misses(self.client_file)
+
+    def test_enrolment_change_invalidates(self):
+        enrolment = ClientProgramEnrolment.objects.get(client_file=self.client_file)
+        self._fill(self.client_file)
+        with self.captureOnCommitCallbacks(execute=True):
+            enrolment.status = "finished"
+            enrolment.save()
+        self._assert_misses(self.client_file)
+
+    def test_goal_changes_invalidate(self):
+        section = PlanSection.objects.create(
+            client_file=self.client_file, name="Goals", program=self.program,
+        )
+        target = PlanTarget.objects.create(plan_section=section, client_file=self.client_file)
+        metric = MetricDefinition.objects.create(
+            name="Cache Metric", category="general", definition="Test",
+        )
+
+        self._fill(self.client_file)
+        with self.captureOnCommitCallbacks(execute=True):
+            PlanTargetMetric.objects.create(plan_target=target, metric_def=metric)
+        self._assert_misses(self.client_file)
+
+        # Completing a goal sets its achievement status
+        self._fill(self.client_file)
+        with self.captureOnCommitCallbacks(execute=True):
+            target.status = "completed"
+            target.save()
+        self._assert_misses(self.client_file)
+        target.refresh_from_db()
+        self.assertEqual(target.achievement_status, "achieved")
@@ -0,0 +1,149 @@
+"""Tests for the opt-in performance instrumentation middleware and budgets."""
+from unittest.mock import patch
+
+from cryptography.fernet import Fernet
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+import konote.encryption as enc_module
+from apps.auth_app.constants import ROLE_STAFF
+from apps.auth_app.models import User
+from apps.clients import views as client_views
+from apps.clients.models import ClientFile, ClientProgramEnrolment
+from apps.programs.models import Program, UserProgramRole
+from konote.encryption import decrypt_field, encrypt_field, track_decrypts
+from konote.instrumentation import (
+    BudgetExceeded,
+    RequestProfile,
+    clear_recent_profiles,
+    perf_budget,
+    recent_profiles,
+    redact_sql,
+)
+
+TEST_KEY = Fernet.generate_key().decode()
+
+
+class InstrumentationHelpersTest(SimpleTestCase):
+
+    def test_redact_sql_removes_literals(self):
+        sql = "SELECT * FROM t1 WHERE name = 'O''Brien' AND id = 42 LIMIT 21"
+        self.assertEqual(
+            redact_sql(sql), "SELECT * FROM t1 WHERE name = ? AND id = ? LIMIT ?",
+        )
+
+    def test_profile_keeps_only_slowest_statements(self):
+        profile = RequestProfile(method="GET", path="/")
+        for i in range(10):
+            profile.record_query(f"SELECT {i}", seconds=i / 1000)
+        self.assertEqual(profile.queries, 10)
+        self.assertEqual([ms for ms, _ in profile.slowest], [9.0, 8.0, 7.0, 6.0, 5.0])
+
+    def test_check_budget(self):
+        profile = RequestProfile(method="GET", path="/", queries=12, decrypts=3)
+        profile.budget = {"queries": 10, "decrypts": 5}
+        self.assertEqual(profile.check_budget(), ["queries 12 > 10"])
+
+    def test_unknown_budget_metric_rejected(self):
+        with self.assertRaises(TypeError):
+            perf_budget(querys=10)
+
+    @override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+    def test_track_decrypts_counts_calls(self):
+        enc_module._fernet = None
+        try:
+            token = encrypt_field("secret")
+            decrypt_field(token)  # Outside the block — not counted
+            with track_decrypts() as stats:
+                decrypt_field(token)
+                decrypt_field(token)
+                decrypt_field(b"")  # Empty values are not decrypts
+            self.assertEqual(stats.count, 2)
+            self.assertGreater(stats.seconds, 0)
+        finally:
+            enc_module._fernet = None
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class InstrumentationMiddlewareTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        clear_recent_profiles()
+        self.user = User.objects.create_user(
+            username="staff", password="testpass123", display_name="Staff",
+        )
+        self.program = Program.objects.create(name="Program", status="active")
+        UserProgramRole.objects.create(user=self.user, program=self.program, role=ROLE_STAFF)
+        self.client_file = ClientFile()
+        self.client_file.first_name = "Jane"
+        self.client_file.last_name = "Doe"
+        self.client_file.save()
+        ClientProgramEnrolment.objects.create(client_file=self.client_file, program=self.program)
+        self.http = Client()
+        self.http.force_login(self.user)
+
+    def tearDown(self):
+        enc_module._fernet = None
+        clear_recent_profiles()
+
+    def test_request_is_profiled(self):
+        resp = self.http.get(reverse("clients:client_detail", args=[self.client_file.pk]))
+        self.assertEqual(resp.status_code, 200)
+
+        profile = recent_profiles()[0]
+        self.assertEqual(profile["view"], "apps.clients.views.client_detail")
+        self.assertEqual(profile["status"], 200)
+        self.assertGreater(profile["queries"], 0)
+        self.assertGreater(profile["decrypts"], 0)
+        self.assertGreater(profile["template_ms"], 0)
+        self.assertEqual(profile["budget"], {"queries": 60})
+        self.assertEqual(profile["over_budget"], [])
+        # No literal values (names, ids) in the recorded statements
+        for _, sql in profile["slowest"]:
+            self.assertNotIn(str(self.client_file.pk), sql.split())
+
+    def test_over_budget_fails_when_enforced(self):
+        with patch.object(client_views.client_detail, "perf_budget", {"queries": 1}):
+            with self.assertRaises(BudgetExceeded) as ctx:
+                self.http.get(reverse("clients:client_detail", args=[self.client_file.pk]))
+        self.assertIn("apps.clients.views.client_detail", str(ctx.exception))
+        self.assertIn("queries", str(ctx.exception))
+
+    @override_settings(PERF_BUDGET_ENFORCE=False)
+    def test_over_budget_logs_warning_when_not_enforced(self):
+        with patch.object(client_views.client_detail, "perf_budget", {"queries": 1}):
+            with self.assertLogs("konote.performance", level="WARNING") as logs:
+                resp = self.http.get(reverse("clients:client_detail", args=[self.client_file.pk]))
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('"over_budget": ["queries', logs.output[0])
+
+    @override_settings(PERF_INSTRUMENTATION=False)
+    def test_disabled_records_nothing(self):
+        self.http.get(reverse("clients:client_detail", args=[self.client_file.pk]))
+        self.assertEqual(recent_profiles(), [])
+
+
+class PerformancePageTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        clear_recent_profiles()
+        self.admin = User.objects.create_user(username="admin", password="testpass123", is_admin=True)
+        self.staff = User.objects.create_user(username="staff", password="testpass123")
+
+    def tearDown(self):
+        clear_recent_profiles()
+
+    def test_admin_sees_recent_requests(self):
+        self.client.login(username="admin", password="testpass123")
+        self.client.get(reverse("admin_settings:dashboard"))
+        resp = self.client.get(reverse("admin_settings:performance"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "apps.admin_settings.views.dashboard")
+
+    def test_non_admin_denied(self):
+        self.client.login(username="staff", password="testpass123")
+        resp = self.client.get(reverse("admin_settings:performance"))
+        self.assertEqual(resp.status_code, 403)
@@ -308,14 +308,7 @@ class TerminologyMiddlewareBehaviourTest(TestCase):
         # First call populates cache
         result1 = get_term("client")
 
-        # Second call should use cache — verify by checking the cache key exists
-        cache_key = "terminology_overrides_en"
-        cached_terms = cache.get(cache_key)
-        self.assertIsNotNone(
-            cached_terms,
-            "Terminology should be cached after first call to get_term",
-        )
-
-        # Second call returns the same value (from cache)
-        result2 = get_term("client")
+        # Second call returns the same value, from cache (no query)
+        with self.assertNumQueries(0):
+            result2 = get_term("client")
         self.assertEqual(result1, result2, "Cached result should match first result")
@@ -0,0 +1,140 @@
+"""Tests for the pooled WeasyPrint rendering service (apps/reports/pdf_service.py)."""
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future
+from unittest import skipUnless
+
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from apps.auth_app.models import User
+from apps.reports import pdf_service
+from apps.reports.pdf_utils import is_pdf_available
+
+HTML_DOC = "<html><body><h1>Report</h1><p>Body text</p></body></html>"
+
+
+class SavedExportContentTest(TestCase):
+    """A callable export content writes the file itself (used for PDFs)."""
+
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        self.export_dir = tempfile.mkdtemp(prefix="konote_test_exports_")
+        self.admin = User.objects.create_user(
+            username="admin", password="testpass123", is_admin=True,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.export_dir, ignore_errors=True)
+
+    def test_callable_content_writes_to_export_path(self):
+        from apps.reports.views import _save_export_and_create_link
+
+        written = []
+
+        def write(file_path):
+            written.append(file_path)
+            with open(file_path, "wb") as handle:
+                handle.write(b"%PDF-1.7 test")
+
+        request = RequestFactory().get("/reports/export/")
+        request.user = self.admin
+        with override_settings(SECURE_EXPORT_DIR=self.export_dir):
+            link = _save_export_and_create_link(
+                request=request, content=write, filename="report.pdf",
+                export_type="individual_client", client_count=1,
+                includes_notes=False, recipient="Self — for my own records",
+            )
+        self.assertEqual(written, [link.file_path])
+        self.assertTrue(link.file_path.startswith(self.export_dir))
+        with open(link.file_path, "rb") as handle:
+            self.assertEqual(handle.read(), b"%PDF-1.7 test")
+
+
+class RetirePoolTest(SimpleTestCase):
+    """A timed-out job retires its pool without failing other renders."""
+
+    class FakePool:
+        def __init__(self, others):
+            self.executor = self
+            self._others = others
+            self.terminated = threading.Event()
+
+        def shutdown(self, wait, cancel_futures):
+            self.cancelled = cancel_futures
+
+        def others(self, future):
+            return self._others
+
+        def terminate(self):
+            self.terminated.set()
+
+    def test_other_jobs_finish_before_workers_are_killed(self):
+        other = Future()
+        pool = self.FakePool([other])
+        pdf_service._pool = pool
+        pdf_service._retire_pool(pool, Future(), grace=30)
+
+        self.assertIsNone(pdf_service._pool)
+        self.assertFalse(pool.cancelled)
+        self.assertFalse(pool.terminated.wait(0.2))
+        other.set_result(b"%PDF")
+        self.assertTrue(pool.terminated.wait(5))
+
+    def test_partial_file_of_stuck_job_is_removed(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        partial = os.path.join(tmp, "out.pdf" + pdf_service.PARTIAL_SUFFIX)
+        open(partial, "wb").close()
+        pool = self.FakePool([])
+        pdf_service._retire_pool(pool, Future(), grace=30, partial_path=partial)
+
+        for thread in threading.enumerate():
+            if thread.name == "pdf-pool-reaper":
+                thread.join(5)
+        self.assertTrue(pool.terminated.is_set())
+        self.assertFalse(os.path.exists(partial))
+
+
+@skipUnless(is_pdf_available(), "WeasyPrint with GTK libraries is not installed")
+class PdfServiceTest(SimpleTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        pdf_service.shutdown_pdf_pool()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_render_bytes_in_process(self):
+        self.assertTrue(pdf_service.render_pdf_bytes(HTML_DOC).startswith(b"%PDF"))
+
+    def test_render_to_file_leaves_no_partial_file(self):
+        path = os.path.join(self.tmp, "out.pdf")
+        size = pdf_service.render_pdf_to_file(HTML_DOC, path)
+        self.assertEqual(os.listdir(self.tmp), ["out.pdf"])
+        self.assertEqual(os.path.getsize(path), size)
+
+    def test_stylesheet_parsed_once_until_changed(self):
+        css_path = os.path.join(self.tmp, "pdf.css")
+        with open(css_path, "w") as handle:
+            handle.write("h1 { color: #3176aa; }")
+        first = pdf_service._stylesheet(css_path)
+        self.assertIs(pdf_service._stylesheet(css_path), first)
+        os.utime(css_path, (0, 0))
+        self.assertIsNot(pdf_service._stylesheet(css_path), first)
+
+    @override_settings(PDF_RENDER_WORKERS=1)
+    def test_render_in_worker_pool(self):
+        path = os.path.join(self.tmp, "pooled.pdf")
+        pdf_service.render_pdf_to_file(HTML_DOC, path)
+        with open(path, "rb") as handle:
+            self.assertTrue(handle.read().startswith(b"%PDF"))
+
+    @override_settings(PDF_RENDER_WORKERS=1, PDF_RENDER_TIMEOUT=0)
+    def test_timeout_stops_the_job_and_restarts_the_pool(self):
+        with self.assertRaises(pdf_service.PDFRenderTimeout):
+            pdf_service.render_pdf_bytes(HTML_DOC)
+        self.assertIsNone(pdf_service._pool)
@@ -1,7 +1,7 @@
 """Tests for PII scrubbing — verifies name replacement and regex patterns."""
 from django.test import SimpleTestCase
 
-from apps.reports.pii_scrub import scrub_pii
+from apps.reports.pii_scrub import PiiScrubber, scrub_pii
 
 
 class PiiScrubNameReplacementTest(SimpleTestCase):
@@ -172,3 +172,49 @@ class PiiScrubCombinedTest(SimpleTestCase):
         self.assertIn("[PHONE]", result)
         self.assertIn("[POSTAL CODE]", result)
         self.assertIn("[EMAIL]", result)
+
+
+class PiiScrubberBatchTest(SimpleTestCase):
+    """Test the reusable PiiScrubber and its batch API."""
+
+    def test_scrub_many_matches_scrub_pii(self):
+        names = ["John", "Mary", "Mary-Jane", "Priya"]
+        texts = [
+            "John called from 613-555-1234.",
+            "",
+            None,
+            "Mary-Jane moved to 45 Elm Street, K1A 0B1.",
+            "Priya's email is priya@example.com",
+            "Review date is 2026-03-06. Record ID: ABC-1234",
+            "Nothing to scrub here.",
+        ]
+        scrubber = PiiScrubber(names)
+        expected = [scrub_pii(t, known_names=names) for t in texts]
+        self.assertEqual(scrubber.scrub_many(texts), expected)
+
+    def test_scrub_many_does_not_merge_across_texts(self):
+        """A pattern must never match across the boundary between two texts."""
+        scrubber = PiiScrubber()
+        result = scrubber.scrub_many(["Call 613", "555-1234 later"])
+        self.assertEqual(result, ["Call 613", "555-1234 later"])
+
+    def test_scrub_many_accepts_generator(self):
+        scrubber = PiiScrubber(["John"])
+        result = scrubber.scrub_many(t for t in ["John left", "John's bag"])
+        self.assertEqual(result, ["[NAME] left", "[NAME] bag"])
+
+    def test_scrub_many_handles_separator_in_text(self):
+        scrubber = PiiScrubber(["John"])
+        result = scrubber.scrub_many(["John\x00John", "Hi John"])
+        self.assertEqual(result, ["[NAME]\x00[NAME]", "Hi [NAME]"])
+
+    def test_same_name_set_reuses_compiled_pattern(self):
+        first = PiiScrubber(["Alice", "Bob"])
+        second = PiiScrubber({"Bob", "Alice", ""})
+        self.assertIs(first._name_pattern, second._name_pattern)
+
+    def test_different_name_sets_get_different_patterns(self):
+        first = PiiScrubber(["Alice"])
+        second = PiiScrubber(["Bob"])
+        self.assertIsNot(first._name_pattern, second._name_pattern)
+        self.assertEqual(second.scrub("Alice met Bob"), "Alice met [NAME]")
@@ -4,7 +4,8 @@ When a user has roles in both Standard and Confidential programs,
 the system forces them to select an active program context. This
 filters client lists to show only clients from the active program.
 """
-from django.test import Client, TestCase, override_settings
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
 
 from cryptography.fernet import Fernet
 
@@ -12,6 +13,8 @@ from apps.auth_app.models import User
 from apps.clients.models import ClientFile, ClientProgramEnrolment
 from apps.programs.context import (
     SESSION_KEY,
+    LazyProgramIds,
+    ProgramContext,
     clear_active_program,
     get_active_program_ids,
     get_switcher_options,
@@ -23,6 +26,7 @@ from apps.programs.context import (
 from apps.programs.models import Program, UserProgramRole
 
 import konote.encryption as enc_module
+from konote.middleware.program_access import ProgramAccessMiddleware
 from apps.auth_app.constants import ROLE_PROGRAM_MANAGER, ROLE_STAFF
 
 TEST_KEY = Fernet.generate_key().decode()
@@ -513,3 +517,67 @@ class RoleRemovedClearsSessionTest(TestCase):
 
         # Now user only has 1 active program — no selector needed
         self.assertFalse(needs_program_selector(self.user))
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class ProgramContextTest(TestCase):
+    """CONF9c: the request's program context is lazy and memoized."""
+
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.user = User.objects.create_user(username="mixed", password="testpass123")
+        self.employment = Program.objects.create(name="Employment", colour_hex="#10B981")
+        self.housing = Program.objects.create(name="Housing", colour_hex="#3B82F6")
+        self.counselling = Program.objects.create(
+            name="Counselling", colour_hex="#EF4444", is_confidential=True,
+        )
+        for program in (self.employment, self.housing, self.counselling):
+            UserProgramRole.objects.create(user=self.user, program=program, role=ROLE_STAFF)
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def test_roles_load_once(self):
+        context = ProgramContext(self.user, {SESSION_KEY: "all_standard"})
+        with self.assertNumQueries(1):
+            self.assertTrue(context.needs_selector)
+            self.assertFalse(context.needs_selection)
+            self.assertEqual(
+                context.active_program_ids, {self.employment.pk, self.housing.pk},
+            )
+            context.switcher_options
+            context.tiers
+            context.highest_role
+
+    def test_matches_module_functions(self):
+        for value in (None, "all_standard", self.counselling.pk, 99999, "junk"):
+            session = {} if value is None else {SESSION_KEY: value}
+            context = ProgramContext(self.user, session)
+            self.assertEqual(context.needs_selection, needs_program_selection(self.user, session))
+            self.assertEqual(context.active_program_ids, get_active_program_ids(self.user, session))
+        context = ProgramContext(self.user)
+        self.assertEqual(context.tiers, get_user_program_tiers(self.user))
+        self.assertEqual(context.switcher_options, get_switcher_options(self.user))
+
+    def test_lazy_program_ids_support_set_operators(self):
+        ids = LazyProgramIds(lambda: {self.employment.pk, self.housing.pk})
+        self.assertEqual(ids & {self.housing.pk, 0}, {self.housing.pk})
+        self.assertEqual({self.housing.pk, 0} & ids, {self.housing.pk})
+        self.assertEqual(ids - {self.housing.pk}, {self.employment.pk})
+        self.assertEqual(ids | {0}, {self.employment.pk, self.housing.pk, 0})
+        self.assertTrue(ids <= {self.employment.pk, self.housing.pk, 0})
+        self.assertIn(self.employment.pk, ids)
+
+    def test_middleware_defers_role_query(self):
+        """Exempt paths that never read the context make no queries for it."""
+        request = RequestFactory().get("/programs/select/")
+        request.user = self.user
+        request.session = {SESSION_KEY: self.employment.pk}
+        middleware = ProgramAccessMiddleware(lambda request: HttpResponse())
+        with self.assertNumQueries(0):
+            middleware(request)
+        with self.assertNumQueries(1):
+            self.assertEqual(request.active_program_ids, {self.employment.pk})
+            self.assertFalse(request.program_context.needs_selection)
@@ -0,0 +1,249 @@
+"""Query-plan regression tests for the hot report filters.
+
+Reports filter progress notes by (client_file, status, effective date),
+metric values by (metric_def, progress_note_target) and enrolments by
+(program, status). The indexes for these live on ProgressNote, MetricValue
+and ClientProgramEnrolment; effective_date_filter() keeps date filters in
+a form those indexes can serve.
+
+The plan tests need PostgreSQL and are skipped on SQLite. Run them with:
+
+    DATABASE_URL=postgres://... AUDIT_DATABASE_URL=postgres://... \\
+        pytest tests/test_query_plans.py
+
+They seed a small agency, capture the SQL that the real report functions
+run, and EXPLAIN each statement with sequential scans discouraged
+(enable_seqscan = off). A "Seq Scan" on a watched table that survives that
+setting means no usable index exists for the filter — the query will scan
+the whole table in production.
+"""
+import json
+from datetime import date, datetime, time, timedelta
+from unittest import skipUnless
+
+from cryptography.fernet import Fernet
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import DateTimeField
+from django.db.models.functions import Coalesce
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+import konote.encryption as enc_module
+from apps.clients.models import ClientFile, ClientProgramEnrolment
+from apps.notes.models import MetricValue, ProgressNote, ProgressNoteTarget
+from apps.plans.models import MetricDefinition, PlanSection, PlanTarget
+from apps.programs.models import Program
+from apps.reports.insights import collect_quotes, get_structured_insights
+from apps.reports.metric_insights import (
+    get_achievement_rates,
+    get_metric_distributions,
+    get_metric_trends,
+)
+from apps.reports.utils import effective_date_filter
+
+User = get_user_model()
+TEST_KEY = Fernet.generate_key().decode()
+
+# Tables that must never be scanned in full by a report query.
+WATCHED_TABLES = {
+    "progress_notes",
+    "progress_note_targets",
+    "metric_values",
+    "client_program_enrolments",
+}
+
+
+def _seq_scans(plan_node):
+    """Yield relation names of Seq Scan nodes in an EXPLAIN (FORMAT JSON) plan."""
+    if plan_node.get("Node Type") == "Seq Scan":
+        yield plan_node.get("Relation Name")
+    for child in plan_node.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+def explain_seq_scans(sql):
+    """Return watched tables that sql would scan sequentially with seq scans disabled."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql)
+        raw = cursor.fetchone()[0]
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+    return sorted(set(_seq_scans(plan[0]["Plan"])) & WATCHED_TABLES)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class EffectiveDateFilterTest(TestCase):
+    """effective_date_filter() must select exactly what __date lookups did."""
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.user = User.objects.create_user(username="writer", password="testpass123")
+        self.client_file = ClientFile.objects.create(record_id="EDF-1")
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _note_at(self, local_dt, backdated=True):
+        aware = timezone.make_aware(local_dt)
+        note = ProgressNote.objects.create(
+            client_file=self.client_file, note_type="quick", author=self.user,
+            backdate=aware if backdated else None,
+        )
+        if not backdated:
+            ProgressNote.objects.filter(pk=note.pk).update(created_at=aware)
+        return note
+
+    def test_matches_date_lookup_at_day_boundaries(self):
+        day = date(2026, 3, 10)
+        notes = [
+            self._note_at(datetime.combine(day - timedelta(days=1), time.max)),
+            self._note_at(datetime.combine(day, time.min)),
+            self._note_at(datetime.combine(day, time(12, 0)), backdated=False),
+            self._note_at(datetime.combine(day + timedelta(days=1), time.max)),
+            self._note_at(datetime.combine(day + timedelta(days=2), time.min)),
+        ]
+        qs = ProgressNote.objects.annotate(
+            _effective_date=Coalesce("backdate", "created_at", output_field=DateTimeField()),
+        )
+        date_to = day + timedelta(days=1)
+
+        expected = set(qs.filter(
+            _effective_date__date__gte=day, _effective_date__date__lte=date_to,
+        ).values_list("pk", flat=True))
+        actual = set(qs.filter(
+            **effective_date_filter("_effective_date", day, date_to),
+        ).values_list("pk", flat=True))
+
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual, {notes[1].pk, notes[2].pk, notes[3].pk})
+
+    def test_open_ended_ranges(self):
+        self.assertEqual(effective_date_filter("d"), {})
+        self.assertEqual(set(effective_date_filter("d", date_from=date(2026, 1, 1))), {"d__gte"})
+        self.assertEqual(set(effective_date_filter("d", date_to=date(2026, 1, 1))), {"d__lt"})
+
+
+@skipUnless(connection.vendor == "postgresql", "Query plans are checked on PostgreSQL only")
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class ReportQueryPlanTest(TestCase):
+    """Hot report queries must be able to use an index on every watched table."""
+
+    CLIENTS_PER_PROGRAM = 100
+    NOTES_PER_CLIENT = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        enc_module._fernet = None
+        cls.user = User.objects.create_user(username="planner", password="testpass123")
+        cls.metric = MetricDefinition.objects.create(
+            name="Goal Progress", category="general", is_universal=True,
+            metric_type="scale", min_value=1, max_value=5,
+            threshold_low=2, threshold_high=4, higher_is_better=True,
+        )
+        cls.programs = Program.objects.bulk_create(
+            [Program(name=f"Program {i}", status="active") for i in range(4)]
+        )
+        now = timezone.now()
+
+        clients, enrolments = [], []
+        for program in cls.programs:
+            for i in range(cls.CLIENTS_PER_PROGRAM):
+                clients.append(ClientFile(record_id=f"P{program.pk}-{i}"))
+        clients = ClientFile.objects.bulk_create(clients)
+        for index, client in enumerate(clients):
+            program = cls.programs[index // cls.CLIENTS_PER_PROGRAM]
+            enrolments.append(ClientProgramEnrolment(
+                client_file=client, program=program,
+                status="active" if index % 5 else "finished",
+            ))
+        ClientProgramEnrolment.objects.bulk_create(enrolments)
+
+        sections = PlanSection.objects.bulk_create([
+            PlanSection(client_file=c, name="Goals", program=e.program)
+            for c, e in zip(clients, enrolments)
+        ])
+        targets = PlanTarget.objects.bulk_create([
+            PlanTarget(plan_section=s, client_file=c, name="Goal")
+            for s, c in zip(sections, clients)
+        ])
+
+        notes = ProgressNote.objects.bulk_create([
+            ProgressNote(
+                client_file=client, note_type="full", author=cls.user,
+                author_program=enrolment.program,
+                backdate=now - timedelta(days=n * 7) if n % 2 else None,
+            )
+            for client, enrolment in zip(clients, enrolments)
+            for n in range(cls.NOTES_PER_CLIENT)
+        ])
+        target_by_client = {t.client_file_id: t for t in targets}
+        note_targets = ProgressNoteTarget.objects.bulk_create([
+            ProgressNoteTarget(progress_note=note, plan_target=target_by_client[note.client_file_id])
+            for note in notes
+        ])
+        MetricValue.objects.bulk_create([
+            MetricValue(progress_note_target=pnt, metric_def=cls.metric, value=str(i % 5 + 1))
+            for i, pnt in enumerate(note_targets)
+        ])
+
+        with connection.cursor() as cursor:
+            for table in WATCHED_TABLES:
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.program = self.programs[0]
+        self.date_from = date.today() - timedelta(days=90)
+        self.date_to = date.today()
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def assertNoSeqScans(self, report):
+        with CaptureQueriesContext(connection) as ctx:
+            report()
+        statements = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].lstrip().upper().startswith("SELECT")
+            and any(table in q["sql"] for table in WATCHED_TABLES)
+        ]
+        self.assertTrue(statements, "Report ran no queries against watched tables")
+        problems = []
+        for sql in statements:
+            scanned = explain_seq_scans(sql)
+            if scanned:
+                problems.append(f"Seq Scan on {', '.join(scanned)}:\n  {sql}")
+        self.assertFalse(problems, "\n\n".join(problems))
+
+    def test_structured_insights(self):
+        self.assertNoSeqScans(lambda: get_structured_insights(
+            program=self.program, date_from=self.date_from, date_to=self.date_to,
+        ))
+
+    def test_client_structured_insights(self):
+        client_file = ClientFile.objects.filter(enrolments__program=self.program).first()
+        self.assertNoSeqScans(lambda: get_structured_insights(
+            client_file=client_file, date_from=self.date_from, date_to=self.date_to,
+        ))
+
+    def test_quotes(self):
+        self.assertNoSeqScans(lambda: collect_quotes(
+            program=self.program, date_from=self.date_from, date_to=self.date_to,
+        ))
+
+    def test_metric_distributions(self):
+        self.assertNoSeqScans(lambda: get_metric_distributions(
+            self.program, self.date_from, self.date_to,
+        ))
+
+    def test_metric_trends(self):
+        self.assertNoSeqScans(lambda: get_metric_trends(
+            self.program, self.date_from, self.date_to,
+        ))
+
+    def test_achievement_rates(self):
+        self.assertNoSeqScans(lambda: get_achievement_rates(
+            self.program, self.date_from, self.date_to,
+        ))
@@ -0,0 +1,144 @@
+"""Tests for the single-pass report dataset (apps/reports/report_engine.py)."""
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+import konote.encryption as enc_module
+from apps.auth_app.models import User
+from apps.clients.models import ClientFile, ClientProgramEnrolment
+from apps.notes.models import MetricValue, ProgressNote, ProgressNoteTarget
+from apps.plans.models import MetricDefinition, PlanSection, PlanTarget
+from apps.programs.models import Program
+from apps.reports.achievements import get_achievement_summary
+from apps.reports.aggregation import compute_template_metrics
+from apps.reports.funder_report import get_demographic_groups
+from apps.reports.models import DemographicBreakdown, Partner, ReportMetric, ReportTemplate
+from apps.reports.report_engine import ReportDataset
+
+
+class ReportDatasetTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.user = User.objects.create_user(username="exec", password="pass", display_name="Exec")
+        self.score = MetricDefinition.objects.create(
+            name="Score", min_value=0, max_value=5, unit="pts",
+            definition="Score", category="general",
+        )
+        self.mood = MetricDefinition.objects.create(
+            name="Mood", min_value=0, unit="pts", definition="Mood", category="general",
+        )
+        self.programs = [Program.objects.create(name=f"Program {i}") for i in range(3)]
+
+        births = ["2010-05-01", "1990-01-15", "", "1950-07-30"]
+        for index, program in enumerate(self.programs):
+            for offset, birth in enumerate(births):
+                client = ClientFile()
+                client.first_name = f"C{index}{offset}"
+                client.last_name = "Test"
+                client.birth_date = birth
+                client.save()
+                ClientProgramEnrolment.objects.create(
+                    client_file=client, program=program, status="active",
+                )
+                if offset == 2:
+                    continue  # enrolled, but no notes in the period
+                self._note(client, program, score=str(offset + index), mood="x" if offset else "3",
+                           interaction_type="phone", outcome="reached" if offset else "no_answer")
+                self._note(client, program, score=str(offset + 4))
+
+        # A client enrolled in two programs counts in both
+        shared = ClientFile.objects.filter(pk__in=ClientProgramEnrolment.objects.filter(
+            program=self.programs[0]).values("client_file_id")).first()
+        ClientProgramEnrolment.objects.create(
+            client_file=shared, program=self.programs[1], status="active",
+        )
+
+        partner = Partner.objects.create(name="Funder", partner_type="funder")
+        self.template = ReportTemplate.objects.create(partner=partner, name="Quarterly")
+        DemographicBreakdown.objects.create(
+            report_template=self.template, label="Age", source_type="age", sort_order=1,
+            bins_json=[{"min": 0, "max": 17, "label": "Youth"}, {"min": 18, "max": 120, "label": "Adult"}],
+        )
+        self.report_metrics = [
+            ReportMetric.objects.create(
+                report_template=self.template, metric_definition=self.score,
+                aggregation="average", sort_order=1,
+            ),
+            ReportMetric.objects.create(
+                report_template=self.template, metric_definition=self.score,
+                aggregation="threshold_percentage", threshold_value=5, sort_order=2,
+            ),
+        ]
+        self.date_from = date.today() - timedelta(days=30)
+        self.date_to = date.today() + timedelta(days=1)
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _note(self, client, program, score, mood=None, **fields):
+        note = ProgressNote.objects.create(client_file=client, author=self.user, **fields)
+        section = PlanSection.objects.create(client_file=client, name="Goals", program=program)
+        target = PlanTarget.objects.create(plan_section=section, client_file=client, name="Goal")
+        pnt = ProgressNoteTarget.objects.create(progress_note=note, plan_target=target)
+        MetricValue.objects.create(metric_def=self.score, progress_note_target=pnt, value=score)
+        if mood is not None:
+            MetricValue.objects.create(metric_def=self.mood, progress_note_target=pnt, value=mood)
+
+    def test_matches_per_program_functions(self):
+        dataset = ReportDataset.load(
+            self.programs, self.date_from, self.date_to,
+            user=self.user, report_template=self.template,
+        )
+        for program in self.programs:
+            active_ids = dataset.active_client_ids(program)
+            self.assertEqual(len(active_ids), 3 + (program == self.programs[1]))
+
+            expected_groups = get_demographic_groups(active_ids, self.date_to, self.template)
+            groups = dataset.demographic_groups(program)
+            self.assertEqual(
+                {label: sorted(ids) for label, ids in groups.items()},
+                {label: sorted(ids) for label, ids in expected_groups.items()},
+            )
+            self.assertEqual(
+                dataset.template_metrics(program, self.report_metrics, groups),
+                compute_template_metrics(
+                    program, self.date_from, self.date_to,
+                    self.report_metrics, expected_groups, self.user,
+                ),
+            )
+
+    def test_achievement_summary_covers_all_metrics_without_template(self):
+        dataset = ReportDataset.load(self.programs, self.date_from, self.date_to)
+        for program in self.programs:
+            self.assertEqual(
+                dataset.achievement_summary(program),
+                get_achievement_summary(program, date_from=self.date_from, date_to=self.date_to),
+            )
+
+    def test_service_statistics(self):
+        dataset = ReportDataset.load(self.programs, self.date_from, self.date_to)
+        stats = dataset.service_statistics(self.programs[2])
+        self.assertEqual(stats["total_individuals_served"], 3)
+        self.assertEqual(stats["new_clients_this_period"], 4)
+        self.assertEqual(stats["total_contacts"], 6)
+        self.assertEqual(stats["contact_breakdown"], {
+            "total_contacts": 3, "successful_contacts": 2, "contact_attempts": 1,
+        })
+
+    def test_query_count_does_not_grow_with_programs(self):
+        def count_queries(programs):
+            with CaptureQueriesContext(connection) as ctx:
+                dataset = ReportDataset.load(
+                    programs, self.date_from, self.date_to,
+                    user=self.user, report_template=self.template,
+                )
+                for program in programs:
+                    groups = dataset.demographic_groups(program)
+                    dataset.template_metrics(program, self.report_metrics, groups)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(count_queries(self.programs[:1]), count_queries(self.programs))
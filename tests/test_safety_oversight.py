@@ -341,6 +341,31 @@ class OversightReportViewTest(TestCase):
         self.assertIsNotNone(snapshot.approved_by)
         self.assertIsNotNone(snapshot.approved_at)
 
+    @patch("apps.reports.pdf_utils.is_pdf_available", return_value=True)
+    @patch("apps.reports.pdf_utils.render_pdf")
+    def test_pdf_timeout_redirects_to_detail(self, mock_pdf, mock_avail):
+        from apps.reports.pdf_service import PDFRenderTimeout
+        mock_pdf.side_effect = PDFRenderTimeout("too slow")
+        snapshot = OversightReportSnapshot.objects.create(
+            period_label="Q1 2026",
+            period_start=date(2026, 1, 1),
+            period_end=date(2026, 3, 31),
+            metrics_json={
+                "alerts_raised": 0, "alerts_resolved": 0,
+                "median_resolution_days": None,
+                "active_at_quarter_end": 0,
+                "notes_recorded": 0, "active_participants": 0,
+                "active_staff": 0, "aging_alerts": 0,
+                "pending_reviews": 0, "program_breakdown": [],
+                "prev_alerts_raised": 0, "prev_notes_recorded": 0,
+            },
+            overall_status="ROUTINE",
+            generated_by=self.admin,
+        )
+        self.http.login(username="admin_view", password="testpass123")
+        resp = self.http.get(f"/reports/oversight/{snapshot.pk}/pdf/")
+        self.assertRedirects(resp, f"/reports/oversight/{snapshot.pk}/")
+
     def test_schedule_list_loads(self):
         self.http.login(username="admin_view", password="testpass123")
         resp = self.http.get("/reports/schedules/")
@@ -2,6 +2,7 @@
 import os
 import shutil
 import tempfile
+import time
 import uuid
 from datetime import timedelta
 from io import StringIO
@@ -698,6 +699,23 @@ class CleanupExpiredExportsCommandTest(TestCase):
         # Orphan file should be deleted
         self.assertFalse(os.path.exists(orphan_path))
 
+    @override_settings()
+    def test_keeps_in_progress_export_files(self):
+        """A recent .part file is an export still being written, not an orphan."""
+        settings.SECURE_EXPORT_DIR = self.export_dir
+        partial_path = os.path.join(self.export_dir, "audit_log.csv.gz.part")
+        stale_path = os.path.join(self.export_dir, "abandoned.csv.gz.part")
+        for path in (partial_path, stale_path):
+            with open(path, "wb") as f:
+                f.write(b"partial")
+        old = time.time() - 3 * 24 * 3600
+        os.utime(stale_path, (old, old))
+
+        call_command("cleanup_expired_exports", stdout=StringIO())
+
+        self.assertTrue(os.path.exists(partial_path))
+        self.assertFalse(os.path.exists(stale_path))
+
     @override_settings()
     def test_does_not_delete_files_with_active_db_records(self):
         """Orphan cleanup should not remove files that belong to active links."""
@@ -9,18 +9,23 @@ Covers:
 - Retries previously failed reminders
 - Custom --hours flag
 - Calls check_and_send_health_alert after batch
+- send_reminders_batch against stub Twilio and email transports
 """
 from datetime import timedelta
 from io import StringIO
 from unittest.mock import patch
 
 from cryptography.fernet import Fernet
+from django.core.mail.backends.base import BaseEmailBackend
 from django.core.management import call_command
 from django.test import TestCase, override_settings
 from django.utils import timezone
 
 from apps.admin_settings.models import FeatureToggle, InstanceSetting
 from apps.auth_app.models import User
+from apps.communications.models import Communication, SystemHealthCheck
+from apps.communications import services
+from apps.communications.services import send_reminders_batch
 from apps.clients.models import ClientFile, ClientProgramEnrolment
 from apps.events.models import Event, EventType, Meeting
 from apps.programs.models import Program, UserProgramRole
@@ -84,6 +89,13 @@ def _create_meeting(tc, hours_from_now=24, **kwargs):
     return meeting
 
 
+def _batch_returning(success, reason):
+    """side_effect for a patched send_reminders_batch: same result for every meeting."""
+    def fake_batch(meetings, **kwargs):
+        return [(meeting, success, reason) for meeting in meetings]
+    return fake_batch
+
+
 @override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY, SMS_ENABLED=True)
 class SendRemindersCommandTests(TestCase):
     databases = {"default", "audit"}
@@ -96,11 +108,11 @@ class SendRemindersCommandTests(TestCase):
         enc_module._fernet = None
 
     def test_dry_run_does_not_send(self):
-        """--dry-run shows meetings but doesn't call send_reminder."""
+        """--dry-run shows meetings but doesn't send anything."""
         _create_meeting(self, hours_from_now=12)
         out = StringIO()
 
-        with patch("apps.communications.management.commands.send_reminders.send_reminder") as mock_send:
+        with patch("apps.communications.management.commands.send_reminders.send_reminders_batch") as mock_send:
             call_command("send_reminders", "--dry-run", stdout=out)
             mock_send.assert_not_called()
 
@@ -113,12 +125,13 @@ class SendRemindersCommandTests(TestCase):
         meeting = _create_meeting(self, hours_from_now=12)
         out = StringIO()
 
-        with patch("apps.communications.management.commands.send_reminders.send_reminder") as mock_send:
-            mock_send.return_value = (True, "Sent")
+        with patch("apps.communications.management.commands.send_reminders.send_reminders_batch") as mock_send:
+            mock_send.side_effect = _batch_returning(True, "Sent")
             with patch("apps.communications.management.commands.send_reminders.check_and_send_health_alert"):
                 call_command("send_reminders", stdout=out)
 
-            mock_send.assert_called_once_with(meeting)
+            mock_send.assert_called_once()
+            self.assertEqual(mock_send.call_args[0][0], [meeting])
 
         output = out.getvalue()
         self.assertIn("1 sent", output)
@@ -128,7 +141,7 @@ class SendRemindersCommandTests(TestCase):
         _create_meeting(self, hours_from_now=12, reminder_sent=True, reminder_status="sent")
         out = StringIO()
 
-        with patch("apps.communications.management.commands.send_reminders.send_reminder") as mock_send:
+        with patch("apps.communications.management.commands.send_reminders.send_reminders_batch") as mock_send:
             call_command("send_reminders", stdout=out)
             mock_send.assert_not_called()
 
@@ -139,7 +152,7 @@ class SendRemindersCommandTests(TestCase):
         _create_meeting(self, hours_from_now=12, status="cancelled")
         out = StringIO()
 
-        with patch("apps.communications.management.commands.send_reminders.send_reminder") as mock_send:
+        with patch("apps.communications.management.commands.send_reminders.send_reminders_batch") as mock_send:
             call_command("send_reminders", stdout=out)
             mock_send.assert_not_called()
 
@@ -148,7 +161,7 @@ class SendRemindersCommandTests(TestCase):
         _create_meeting(self, hours_from_now=48)  # Default window is 36h
         out = StringIO()
 
-        with patch("apps.communications.management.commands.send_reminders.send_reminder") as mock_send:
+        with patch("apps.communications.management.commands.send_reminders.send_reminders_batch") as mock_send:
             call_command("send_reminders", stdout=out)
             mock_send.assert_not_called()
 
@@ -157,32 +170,34 @@ class SendRemindersCommandTests(TestCase):
         meeting = _create_meeting(self, hours_from_now=48)
         out = StringIO()
 
-        with patch("apps.communications.management.commands.send_reminders.send_reminder") as mock_send:
-            mock_send.return_value = (True, "Sent")
+        with patch("apps.communications.management.commands.send_reminders.send_reminders_batch") as mock_send:
+            mock_send.side_effect = _batch_returning(True, "Sent")
             with patch("apps.communications.management.commands.send_reminders.check_and_send_health_alert"):
                 call_command("send_reminders", "--hours", "72", stdout=out)
 
-            mock_send.assert_called_once_with(meeting)
+            mock_send.assert_called_once()
+            self.assertEqual(mock_send.call_args[0][0], [meeting])
 
     def test_retries_failed_reminders(self):
         """Meetings with reminder_status='failed' (but reminder_sent=False) are retried."""
         meeting = _create_meeting(self, hours_from_now=12, reminder_status="failed")
         out = StringIO()
 
-        with patch("apps.communications.management.commands.send_reminders.send_reminder") as mock_send:
-            mock_send.return_value = (True, "Sent")
+        with patch("apps.communications.management.commands.send_reminders.send_reminders_batch") as mock_send:
+            mock_send.side_effect = _batch_returning(True, "Sent")
             with patch("apps.communications.management.commands.send_reminders.check_and_send_health_alert"):
                 call_command("send_reminders", stdout=out)
 
-            mock_send.assert_called_once_with(meeting)
+            mock_send.assert_called_once()
+            self.assertEqual(mock_send.call_args[0][0], [meeting])
 
     def test_counts_consent_skip_separately(self):
-        """Meetings where send_reminder returns a consent reason are counted as skipped."""
+        """Meetings that come back with a consent reason are counted as skipped."""
         _create_meeting(self, hours_from_now=12)
         out = StringIO()
 
-        with patch("apps.communications.management.commands.send_reminders.send_reminder") as mock_send:
-            mock_send.return_value = (False, "Client has not consented to reminders")
+        with patch("apps.communications.management.commands.send_reminders.send_reminders_batch") as mock_send:
+            mock_send.side_effect = _batch_returning(False, "Client has not consented to reminders")
             with patch("apps.communications.management.commands.send_reminders.check_and_send_health_alert"):
                 call_command("send_reminders", stdout=out)
 
@@ -194,8 +209,8 @@ class SendRemindersCommandTests(TestCase):
         """check_and_send_health_alert is called after processing."""
         _create_meeting(self, hours_from_now=12)
 
-        with patch("apps.communications.management.commands.send_reminders.send_reminder") as mock_send:
-            mock_send.return_value = (True, "Sent")
+        with patch("apps.communications.management.commands.send_reminders.send_reminders_batch") as mock_send:
+            mock_send.side_effect = _batch_returning(True, "Sent")
             with patch("apps.communications.management.commands.send_reminders.check_and_send_health_alert") as mock_health:
                 call_command("send_reminders", stdout=StringIO())
                 mock_health.assert_called_once()
@@ -211,7 +226,7 @@ class SendRemindersCommandTests(TestCase):
         Meeting.objects.create(event=event, location="Office")
         out = StringIO()
 
-        with patch("apps.communications.management.commands.send_reminders.send_reminder") as mock_send:
+        with patch("apps.communications.management.commands.send_reminders.send_reminders_batch") as mock_send:
             call_command("send_reminders", stdout=out)
             mock_send.assert_not_called()
 
@@ -222,14 +237,229 @@ class SendRemindersCommandTests(TestCase):
         self.assertIn("No meetings need reminders", out.getvalue())
 
     def test_handles_send_exception_gracefully(self):
-        """Unexpected exceptions in send_reminder don't crash the batch."""
+        """An unexpected error for one meeting doesn't crash the batch."""
         _create_meeting(self, hours_from_now=12)
         out = StringIO()
 
-        with patch("apps.communications.management.commands.send_reminders.send_reminder") as mock_send:
-            mock_send.side_effect = RuntimeError("Unexpected error")
+        with patch("apps.communications.services._prepare_reminder") as mock_prepare:
+            mock_prepare.side_effect = RuntimeError("Unexpected error")
             with patch("apps.communications.management.commands.send_reminders.check_and_send_health_alert"):
                 call_command("send_reminders", stdout=out)
 
         output = out.getvalue()
         self.assertIn("failed", output.lower())
+
+
+# ---------------------------------------------------------------------------
+# send_reminders_batch() with stub transports
+# ---------------------------------------------------------------------------
+
+class StubTwilioClient:
+    """Records messages.create() calls; numbers in fail_numbers raise."""
+
+    def __init__(self, fail_numbers=()):
+        self.fail_numbers = set(fail_numbers)
+        self.sent = []
+        self.messages = self
+
+    def create(self, body, from_, to):
+        if to in self.fail_numbers:
+            raise Exception("Twilio error 30006: landline or unreachable carrier")
+        self.sent.append((to, body))
+        return type("Message", (), {"sid": f"SM{len(self.sent):04d}"})()
+
+
+class StubEmailBackend(BaseEmailBackend):
+    """Counts connections opened and messages sent across instances.
+
+    Like the SMTP backend, open() is a no-op on an already open connection.
+    """
+
+    opened = 0
+    outbox = []
+    is_open = False
+
+    def open(self):
+        if self.is_open:
+            return False
+        self.is_open = True
+        StubEmailBackend.opened += 1
+        return True
+
+    def close(self):
+        self.is_open = False
+
+    def send_messages(self, email_messages):
+        StubEmailBackend.outbox.extend(email_messages)
+        return len(email_messages)
+
+
+@override_settings(
+    FIELD_ENCRYPTION_KEY=TEST_KEY,
+    SMS_ENABLED=True,
+    EMAIL_BACKEND="tests.test_send_reminders.StubEmailBackend",
+)
+class SendRemindersBatchTests(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        _setup_fixtures(self)
+        FeatureToggle.objects.update_or_create(
+            feature_key="messaging_email",
+            defaults={"is_enabled": True},
+        )
+        StubEmailBackend.opened = 0
+        StubEmailBackend.outbox = []
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _meeting_for(self, contact_method, phone="", email="", hours_from_now=12):
+        cf = ClientFile()
+        cf.first_name = "Batch"
+        cf.last_name = "Client"
+        cf.phone = phone
+        cf.email = email
+        cf.sms_consent = bool(phone)
+        cf.sms_consent_date = timezone.now().date()
+        cf.email_consent = bool(email)
+        cf.email_consent_date = timezone.now().date()
+        cf.consent_type = "express"
+        cf.preferred_contact_method = contact_method
+        cf.preferred_language = "en"
+        cf.save()
+        self.client_file = cf
+        return _create_meeting(self, hours_from_now=hours_from_now)
+
+    def _pending(self):
+        return list(
+            Meeting.objects.filter(reminder_sent=False)
+            .select_related("event", "event__client_file")
+            .order_by("event__start_timestamp")
+        )
+
+    def test_reuses_one_twilio_client_and_one_email_connection(self):
+        for i in range(3):
+            self._meeting_for("sms", phone=f"+1555000000{i}", hours_from_now=10 + i)
+        for i in range(2):
+            self._meeting_for("email", email=f"client{i}@example.com", hours_from_now=20 + i)
+        twilio = StubTwilioClient()
+
+        with patch("apps.communications.services._get_twilio_client", return_value=twilio) as factory:
+            results = send_reminders_batch(self._pending(), max_workers=3)
+
+        factory.assert_called_once()
+        self.assertEqual(len(twilio.sent), 3)
+        self.assertEqual(StubEmailBackend.opened, 1)
+        self.assertEqual(len(StubEmailBackend.outbox), 2)
+        self.assertIn("To stop receiving these messages", StubEmailBackend.outbox[0].body)
+        self.assertTrue(all(success for _m, success, _r in results))
+        self.assertFalse(Meeting.objects.filter(reminder_sent=False).exists())
+        self.assertEqual(
+            Communication.objects.filter(method="system_sent", delivery_status="sent").count(), 5,
+        )
+        sms_comm = Communication.objects.filter(channel="sms").first()
+        self.assertTrue(sms_comm.external_id.startswith("SM"))
+        self.assertIn("Reminder:", sms_comm.content)
+        self.assertEqual(SystemHealthCheck.objects.get(channel="sms").consecutive_failures, 0)
+        self.assertIsNotNone(SystemHealthCheck.objects.get(channel="email").last_success_at)
+
+    def test_email_connection_is_shared_across_chunks(self):
+        for i in range(3):
+            self._meeting_for("email", email=f"client{i}@example.com", hours_from_now=10 + i)
+
+        with patch("apps.communications.services.get_connection", wraps=services.get_connection) as factory:
+            results = send_reminders_batch(self._pending(), chunk_size=1)
+
+        factory.assert_called_once()
+        self.assertEqual(StubEmailBackend.opened, 1)
+        self.assertEqual(len(StubEmailBackend.outbox), 3)
+        self.assertTrue(all(success for _m, success, _r in results))
+
+    def test_failed_sms_is_left_for_retry(self):
+        ok_meeting = self._meeting_for("sms", phone="+15550000001", hours_from_now=10)
+        bad_meeting = self._meeting_for("sms", phone="+15550000002", hours_from_now=11)
+        twilio = StubTwilioClient(fail_numbers={"+15550000002"})
+
+        results = send_reminders_batch(self._pending(), twilio_client=twilio)
+
+        by_meeting = {m.pk: (success, reason) for m, success, reason in results}
+        self.assertEqual(by_meeting[ok_meeting.pk], (True, "Sent"))
+        self.assertFalse(by_meeting[bad_meeting.pk][0])
+        bad_meeting.refresh_from_db()
+        self.assertFalse(bad_meeting.reminder_sent)
+        self.assertEqual(bad_meeting.reminder_status, "failed")
+        self.assertIn("no longer be in service", bad_meeting.reminder_status_reason)
+        health = SystemHealthCheck.objects.get(channel="sms")
+        self.assertEqual(health.consecutive_failures, 1)
+        self.assertIsNotNone(health.last_success_at)
+
+    def test_no_consent_is_recorded_without_sending(self):
+        meeting = self._meeting_for("none")
+        twilio = StubTwilioClient()
+
+        results = send_reminders_batch(self._pending(), twilio_client=twilio)
+
+        self.assertEqual(results, [(meeting, False, "No consent")])
+        self.assertEqual(twilio.sent, [])
+        self.assertEqual(StubEmailBackend.opened, 0)
+        meeting.refresh_from_db()
+        self.assertEqual(meeting.reminder_status, "no_consent")
+        self.assertFalse(Communication.objects.exists())
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def run_batch(count, offset):
+            for i in range(count):
+                self._meeting_for("sms", phone=f"+1555{offset}{i:05d}", hours_from_now=1 + i)
+            meetings = self._pending()
+            with CaptureQueriesContext(connection) as ctx:
+                send_reminders_batch(meetings, twilio_client=StubTwilioClient())
+            return len(ctx.captured_queries)
+
+        SystemHealthCheck.objects.create(channel="sms")
+        self.assertEqual(run_batch(2, 1), run_batch(8, 2))
+
+    def test_command_end_to_end(self):
+        self._meeting_for("sms", phone="+15550000001", hours_from_now=10)
+        self._meeting_for("email", email="client@example.com", hours_from_now=11)
+        out = StringIO()
+
+        with patch("apps.communications.services._get_twilio_client", return_value=StubTwilioClient()):
+            with patch("apps.communications.management.commands.send_reminders.check_and_send_health_alert"):
+                call_command("send_reminders", "--workers", "2", stdout=out)
+
+        self.assertIn("2 sent", out.getvalue())
+
+    def test_crash_mid_batch_keeps_earlier_chunks_recorded(self):
+        meetings = [
+            self._meeting_for("sms", phone=f"+155500000{i:02d}", hours_from_now=10 + i)
+            for i in range(5)
+        ]
+        twilio = StubTwilioClient()
+        real_dispatch = services._dispatch_sms
+
+        def dispatch(client, phone_number, body):
+            if phone_number == "+15550000003":
+                raise RuntimeError("worker killed")
+            return real_dispatch(client, phone_number, body)
+
+        with patch("apps.communications.services._dispatch_sms", side_effect=dispatch):
+            with self.assertRaises(RuntimeError):
+                send_reminders_batch(self._pending(), twilio_client=twilio, chunk_size=2)
+
+        sent = set(Meeting.objects.filter(reminder_sent=True).values_list("pk", flat=True))
+        self.assertEqual(sent, {meetings[0].pk, meetings[1].pk})
+        self.assertEqual(Communication.objects.filter(delivery_status="sent").count(), 2)
+
+        # The next run resends at most the unrecorded chunk, never earlier ones
+        retry = StubTwilioClient()
+        send_reminders_batch(self._pending(), twilio_client=retry)
+        self.assertEqual(
+            sorted(to for to, _body in retry.sent),
+            ["+15550000002", "+15550000003", "+15550000004"],
+        )
+        self.assertFalse(Meeting.objects.filter(reminder_sent=False).exists())
@@ -791,8 +791,8 @@ class SignalTriggerTests(TransactionTestCase):
     def setUp(self):
         enc_module._fernet = None
         # Enable the surveys feature toggle
-        from django.core.cache import cache
-        cache.delete("feature_toggles")
+        from apps.admin_settings.cached import FEATURE_TOGGLES, invalidate
+        invalidate(FEATURE_TOGGLES)
         FeatureToggle.objects.update_or_create(
             feature_key="surveys",
             defaults={"is_enabled": True},
@@ -869,8 +869,8 @@ class SignalTriggerTests(TransactionTestCase):
 
     def test_signal_skips_when_feature_disabled(self):
         """Signals should not create assignments when surveys feature is off."""
-        from django.core.cache import cache
-        cache.delete("feature_toggles")
+        from apps.admin_settings.cached import FEATURE_TOGGLES, invalidate
+        invalidate(FEATURE_TOGGLES)
         FeatureToggle.objects.update_or_create(
             feature_key="surveys",
             defaults={"is_enabled": False},
@@ -1042,8 +1042,8 @@ class PortalAutoSaveTests(TestCase):
 
     def setUp(self):
         enc_module._fernet = None
-        from django.core.cache import cache
-        cache.delete("feature_toggles")
+        from apps.admin_settings.cached import FEATURE_TOGGLES, invalidate
+        invalidate(FEATURE_TOGGLES)
         FeatureToggle.objects.update_or_create(
             feature_key="surveys",
             defaults={"is_enabled": True},
@@ -1359,8 +1359,8 @@ class StaffLinkGenerationTests(TestCase):
             display_name="LinkGen Staff", is_admin=True,
         )
         self.client.login(username="linkgen_staff", password="testpass123")
-        from django.core.cache import cache
-        cache.delete("feature_toggles")
+        from apps.admin_settings.cached import FEATURE_TOGGLES, invalidate
+        invalidate(FEATURE_TOGGLES)
         FeatureToggle.objects.update_or_create(
             feature_key="surveys",
             defaults={"is_enabled": True},
@@ -1408,8 +1408,8 @@ class SurveyStaffPermissionTests(TestCase):
 
     def setUp(self):
         enc_module._fernet = None
-        from django.core.cache import cache
-        cache.delete("feature_toggles")
+        from apps.admin_settings.cached import FEATURE_TOGGLES, invalidate
+        invalidate(FEATURE_TOGGLES)
         FeatureToggle.objects.update_or_create(
             feature_key="surveys",
             defaults={"is_enabled": True},
@@ -1831,8 +1831,8 @@ class TriggerRuleManagementTests(TestCase):
             display_name="RuleUI Staff", is_admin=True,
         )
         self.client.login(username="ruleui_staff", password="testpass123")
-        from django.core.cache import cache
-        cache.delete("feature_toggles")
+        from apps.admin_settings.cached import FEATURE_TOGGLES, invalidate
+        invalidate(FEATURE_TOGGLES)
         FeatureToggle.objects.update_or_create(
             feature_key="surveys",
             defaults={"is_enabled": True},
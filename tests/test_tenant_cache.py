@@ -0,0 +1,76 @@
+"""Tests for tenant-aware cache keys and versioned settings caching (konote/cache.py)."""
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+
+from apps.admin_settings import cached
+from apps.admin_settings.models import (
+    FeatureToggle, InstanceSetting, OrganizationProfile, TerminologyOverride,
+)
+from konote.cache import get_or_set_versioned, make_key
+
+
+class TenantCacheKeyTest(TestCase):
+
+    def test_keys_are_prefixed_with_schema(self):
+        self.assertEqual(make_key("feature_toggles", "", 1), ":1:public:feature_toggles")
+        connection.schema_name = "youth_services"
+        try:
+            self.assertEqual(
+                make_key("feature_toggles", "", 1), ":1:youth_services:feature_toggles",
+            )
+        finally:
+            del connection.schema_name
+
+    def test_same_key_is_separate_per_tenant(self):
+        cache.set("shared_name", "public value")
+        connection.schema_name = "north_shore"
+        try:
+            self.assertIsNone(cache.get("shared_name"))
+        finally:
+            del connection.schema_name
+        self.assertEqual(cache.get("shared_name"), "public value")
+
+
+class VersionedSettingsCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cached_value_is_reused_until_the_group_is_bumped(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return {"value": len(calls)}
+
+        self.assertEqual(get_or_set_versioned("demo_group", "", loader), {"value": 1})
+        self.assertEqual(get_or_set_versioned("demo_group", "", loader), {"value": 1})
+        cached.invalidate("demo_group")
+        self.assertEqual(get_or_set_versioned("demo_group", "", loader), {"value": 2})
+
+    def test_feature_toggle_save_takes_effect_immediately(self):
+        FeatureToggle.objects.create(feature_key="surveys", is_enabled=False)
+        self.assertFalse(cached.feature_flags()["surveys"])
+        with self.assertNumQueries(0):
+            cached.feature_flags()
+        FeatureToggle.objects.filter(feature_key="surveys").update(is_enabled=True)
+        toggle = FeatureToggle.objects.get(feature_key="surveys")
+        toggle.save()
+        self.assertTrue(cached.feature_flags()["surveys"])
+
+    def test_instance_setting_and_terminology_changes_invalidate(self):
+        cached.instance_settings()
+        InstanceSetting.objects.create(setting_key="product_name", setting_value="Fresh")
+        self.assertEqual(cached.instance_settings()["product_name"], "Fresh")
+
+        cached.terminology("en")
+        TerminologyOverride.objects.create(term_key="client", display_value="Member")
+        self.assertEqual(cached.terminology("en")["client"], "Member")
+
+    def test_organization_profile_save_invalidates(self):
+        self.assertEqual(cached.organization_profile()["operating_name"], "")
+        profile = OrganizationProfile.get_solo()
+        profile.operating_name = "Harbour Services"
+        profile.save()
+        self.assertEqual(cached.organization_profile()["operating_name"], "Harbour Services")
@@ -0,0 +1,116 @@
+"""Tests for the parallel per-tenant command runner (apps/tenants/fanout.py)."""
+import json
+import sys
+import threading
+import time
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from apps.tenants import fanout
+from apps.tenants.fanout import FAILED, OK, TIMED_OUT, TenantRunResult, run_across_tenants
+from apps.tenants.models import Agency
+
+
+def _ok_runner(schema_name, command_name, command_args, timeout):
+    return TenantRunResult(schema_name, OK, 0, 0.01, f"{command_name} {command_args}")
+
+
+class FanOutRunnerTest(SimpleTestCase):
+
+    def test_results_in_schema_order(self):
+        results = run_across_tenants(
+            "send_reminders", ["--dry-run"], schemas=["b", "a", "c"], runner=_ok_runner,
+        )
+        self.assertEqual([r.schema_name for r in results], ["b", "a", "c"])
+        self.assertEqual(results[0].output, "send_reminders ['--dry-run']")
+
+    def test_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+
+        def runner(schema_name, *args):
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.05)
+            with lock:
+                running["now"] -= 1
+            return TenantRunResult(schema_name, OK, 0, 0.05)
+
+        run_across_tenants("x", schemas=[f"t{i}" for i in range(8)], workers=3, runner=runner)
+        self.assertEqual(running["peak"], 3)
+
+    def test_one_failure_does_not_stop_the_others(self):
+        def runner(schema_name, *args):
+            if schema_name == "broken":
+                raise RuntimeError("boom")
+            return TenantRunResult(schema_name, OK, 0, 0.01)
+
+        seen = []
+        results = run_across_tenants(
+            "x", schemas=["a", "broken", "c"], runner=runner, on_result=seen.append,
+        )
+        self.assertEqual([r.status for r in results], [OK, FAILED, OK])
+        self.assertIn("boom", results[1].output)
+        self.assertEqual(len(seen), 3)
+
+    def test_subprocess_timeout_and_exit_status(self):
+        slow = fanout.run_subprocess(
+            "slow", [sys.executable, "-c", "import time; time.sleep(10)"], timeout=0.5,
+        )
+        self.assertEqual(slow.status, TIMED_OUT)
+        self.assertLess(slow.seconds, 5)
+
+        failing = fanout.run_subprocess(
+            "failing", [sys.executable, "-c", "print('bad'); raise SystemExit(3)"], timeout=10,
+        )
+        self.assertEqual((failing.status, failing.returncode), (FAILED, 3))
+        self.assertIn("bad", failing.output)
+
+    def test_tenant_command_argv(self):
+        argv = fanout.tenant_command_argv("send_reminders", ["--hours", "24"], "youth_services")
+        self.assertEqual(
+            argv[2:], ["tenant_command", "send_reminders", "--hours", "24", "--schema=youth_services"],
+        )
+
+
+class RunAcrossTenantsCommandTest(TestCase):
+
+    def setUp(self):
+        for code in ("north-shore", "youth-services"):
+            Agency(name=code, short_code=code).save()
+        Agency(name="Closed", short_code="closed", is_active=False).save()
+
+    def _call(self, *args, runner=_ok_runner):
+        out = StringIO()
+        with patch.object(fanout, "run_for_tenant", runner):
+            call_command("run_across_tenants", *args, stdout=out)
+        return out.getvalue()
+
+    def test_runs_for_active_agencies(self):
+        output = self._call("--json", "send_reminders", "--dry-run")
+        data = json.loads(output)
+        self.assertEqual(data["failed"], 0)
+        self.assertEqual(
+            [r["schema_name"] for r in data["results"]], ["north_shore", "youth_services"],
+        )
+
+    def test_failure_raises_after_summary(self):
+        def runner(schema_name, *args):
+            status = FAILED if schema_name == "north_shore" else OK
+            return TenantRunResult(schema_name, status, 1 if status == FAILED else 0, 0.1, "Traceback")
+
+        with self.assertRaisesMessage(CommandError, "north_shore (failed)"):
+            self._call("send_reminders", runner=runner)
+
+    def test_unknown_schema_rejected(self):
+        with self.assertRaisesMessage(CommandError, "closed"):
+            self._call("--schema", "closed", "send_reminders")
+
+    def test_unknown_command_rejected(self):
+        with self.assertRaisesMessage(CommandError, "Unknown command"):
+            self._call("no_such_command")